@@ -1,11 +1,21 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from typing import Dict, Any, List, Optional, Set
 import asyncio
 import logging
+import os
+import uuid
 
-from app.models.analysis_models import AnalysisSettings, AnalysisResult
+from app.models.analysis_models import AnalysisSettings
 from app.services.youtube_service import YouTubeService
 from app.services.analysis_service import AnalysisService
+from app.services.analysis_runner import AnalysisRunner
+from app.services.state_store import create_state_store
+from app.services.run_cache import RunCache, settings_fingerprint
+from app.services.result_versions import ResultVersionCache, etag_matches
+from app.services.search_index import VideoSearchIndex
+from app.services.analytics_cube import DIMENSIONS, AnalyticsCube
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -14,70 +24,284 @@ logger = logging.getLogger(__name__)
 youtube_service = YouTubeService()
 analysis_service = AnalysisService()
 
-# 분석 상태 저장
-analysis_status = {
-    "is_running": False,
-    "progress": 0,
-    "current_task": "",
-    "error": None,
-    "result": None
-}
+# 분석 상태/결과 저장소 (STATE_BACKEND=sqlite 이면 여러 워커가 공유)
+state_store = create_state_store()
+run_cache = RunCache(state_store)
+analysis_runner = AnalysisRunner(state_store, youtube_service, analysis_service, run_cache)
+
+# 결과 버전별 직렬화/압축 본문 (같은 결과를 다시 요청하면 재직렬화하지 않음)
+result_versions = ResultVersionCache()
+
+# 수집한 영상 제목/채널명 검색 색인 (결과 버전마다 한 번씩 추가, 최근 버전에 없는 영상은 제거)
+search_index = VideoSearchIndex()
+
+def _ensure_indexed():
+    """현재 결과가 색인되지 않았으면 색인 (워커/캐시로 저장된 결과 포함)"""
+    version = state_store.get_result_version()
+    if version and not search_index.has_version(version):
+        result = state_store.get_result()
+        if result:
+            search_index.ingest(result, version)
+
+def _current_cube() -> Optional[AnalyticsCube]:
+    """현재 결과 버전의 집계 큐브 (이 프로세스에서 만든 것이 없으면 저장된 결과로 한 번 생성)"""
+    version = state_store.get_result_version()
+    if not version:
+        return None
+    cube = analysis_runner.cubes.get(version)
+    if cube is None:
+        result = state_store.get_result()
+        if not result:
+            return None
+        cube = AnalyticsCube.from_result(result)
+        analysis_runner.cubes.put(result.get("job_id") or version, cube)
+    return cube
+
+def saved_api_keys() -> List[str]:
+    """설정 화면에 저장된 API 키 (분석 밖의 조회 요청은 그 요청 동안만 키 풀과 함께 사용)"""
+    # settings 모듈이 이 모듈을 import 하므로 호출 시점에 가져옴
+    from app.api.settings import load_settings
+    saved = load_settings()
+    return [saved.get("api_key") or ""] + list(saved.get("api_keys") or [])
+
+# inline: 요청을 받은 API 프로세스에서 실행 / worker: 별도 수집 워커(app.worker)가 실행
+ANALYSIS_EXECUTOR = os.getenv("ANALYSIS_EXECUTOR", "inline").lower()
+
+# inline 으로 실행 중인 분석 작업 (이벤트 루프는 약한 참조만 가지므로 끝날 때까지 보관)
+_running_tasks: Set[asyncio.Task] = set()
+
+if ANALYSIS_EXECUTOR == "worker" and not state_store.shared:
+    logger.warning("ANALYSIS_EXECUTOR=worker 는 공유 저장소(STATE_BACKEND=sqlite)가 필요합니다. inline 모드로 실행합니다.")
+    ANALYSIS_EXECUTOR = "inline"
 
 @router.post("/start")
 async def start_analysis(settings: AnalysisSettings) -> Dict[str, Any]:
     """분석 시작"""
-    global analysis_status
+    job_id = uuid.uuid4().hex
+    settings_key = settings_fingerprint(settings)
     
-    if analysis_status["is_running"]:
-        raise HTTPException(status_code=400, detail="이미 분석이 진행 중입니다.")
-    
-    try:
-        # 분석 상태 초기화
-        analysis_status = {
+    # 같은 설정의 최근 결과가 있으면 재사용 (프로파일 요청은 실제로 실행해야 하므로 제외)
+    cached_result = run_cache.get(settings_key) if not settings.profile else None
+    if cached_result is not None:
+        cached_job_id = cached_result.get("job_id")
+        # 다른 작업처럼 job_id 로 비교 후 쓰기 (그 사이 시작한 작업의 상태/결과를 덮어쓰지 않도록)
+        if not state_store.try_start({
+            "job_id": cached_job_id,
+            "settings_key": settings_key,
             "is_running": True,
             "progress": 0,
-            "current_task": "데이터 수집 중...",
-            "error": None,
-            "result": None
-        }
+            "current_task": "캐시된 결과 불러오는 중..."
+        }):
+            raise HTTPException(status_code=400, detail="이미 분석이 진행 중입니다.")
+        state_store.set_result(cached_result, cached_job_id)
+        state_store.update_status(cached_job_id, is_running=False, current_task="분석 완료 (캐시된 결과)", progress=100)
         
-        # 백그라운드에서 분석 실행
-        asyncio.create_task(_run_analysis_async(settings))
+        return {
+            "message": "최근 동일한 설정의 분석 결과를 사용합니다.",
+            "status": "cached",
+            "job_id": cached_result.get("job_id")
+        }
+    
+    # 분석 상태 초기화 (실행 중인 분석이 있으면 실패)
+    started = state_store.try_start({
+        "job_id": job_id,
+        "settings_key": settings_key,
+        "is_running": True,
+        "progress": 0,
+        "current_task": "데이터 수집 중..."
+    })
+    
+    if not started:
+        # 같은 설정으로 진행 중인 분석이 있으면 그 작업에 합류
+        current = state_store.get_status()
+        if current.get("settings_key") == settings_key:
+            return {
+                "message": "동일한 설정의 분석이 이미 진행 중입니다.",
+                "status": "attached",
+                "job_id": current.get("job_id")
+            }
+        raise HTTPException(status_code=400, detail="이미 분석이 진행 중입니다.")
+    
+    try:
+        if ANALYSIS_EXECUTOR == "worker":
+            # 수집 워커 프로세스가 가져가도록 작업 등록
+            state_store.enqueue_job(job_id, settings.dict())
+        else:
+            # 백그라운드에서 분석 실행 (끝날 때까지 참조를 잡아 둠)
+            task = asyncio.create_task(analysis_runner.run(job_id, settings))
+            _running_tasks.add(task)
+            task.add_done_callback(_running_tasks.discard)
         
         return {
             "message": "분석이 시작되었습니다.",
-            "status": "started"
+            "status": "started",
+            "job_id": job_id
         }
         
     except Exception as e:
-        analysis_status["is_running"] = False
-        analysis_status["error"] = str(e)
+        state_store.update_status(job_id, is_running=False, error=str(e))
         logger.error(f"분석 시작 실패: {e}")
         raise HTTPException(status_code=500, detail=f"분석 시작 실패: {str(e)}")
 
 @router.get("/status")
 async def get_analysis_status() -> Dict[str, Any]:
-    """분석 상태 조회"""
-    return analysis_status
+    """분석 상태 조회 (결과 본문은 result_version 이 바뀔 때 /result 로 받음)"""
+    status = state_store.get_status()
+    status["result_version"] = state_store.get_result_version()
+    return status
 
 @router.get("/result")
-async def get_analysis_result() -> Dict[str, Any]:
-    """분석 결과 조회"""
-    if not analysis_status["result"]:
+async def get_analysis_result(request: Request, since: Optional[str] = None) -> Response:
+    """분석 결과 조회
+
+    ETag(결과 버전)가 같으면 304, since=<버전> 이면 그 버전 이후 바뀐 영상 행만 반환.
+    """
+    version = state_store.get_result_version()
+    if not version:
         raise HTTPException(status_code=404, detail="분석 결과가 없습니다.")
     
-    return analysis_status["result"]
+    headers = {"ETag": f'"{version}"', "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]) and not since:
+        return Response(status_code=304, headers=headers)
+    
+    entry = result_versions.get(version)
+    if entry is None:
+        result = await asyncio.to_thread(state_store.get_result)
+        if not result:
+            raise HTTPException(status_code=404, detail="분석 결과가 없습니다.")
+        # 조회 사이에 결과가 바뀌었으면 실제 읽은 결과의 버전 사용
+        version = result.get("job_id") or version
+        entry = await asyncio.to_thread(result_versions.build, version, result)
+        headers["ETag"] = entry.etag
+    if entry.last_modified:
+        headers["Last-Modified"] = entry.last_modified
+    
+    if since:
+        previous = result_versions.get(since)
+        if previous is not None:
+            if since == entry.version:
+                return JSONResponse({"version": entry.version, "since": since, "delta": True,
+                                     "videos": [], "removed_video_ids": []}, headers=headers)
+            return JSONResponse(jsonable_encoder(entry.delta_since(previous)), headers=headers)
+        # 이전 버전을 더 이상 보관하지 않으면 전체 결과로 응답
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(content=entry.gzipped, media_type="application/json",
+                        headers={**headers, "Content-Encoding": "gzip"})
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+@router.get("/result/videos")
+async def get_analysis_result_videos(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    sort_by: Optional[str] = None,
+    descending: bool = True,
+    min_views: Optional[int] = None,
+    q: Optional[str] = None
+) -> Dict[str, Any]:
+    """분석 결과 영상 목록 페이지 조회 (q: 제목/채널명 검색, 정렬 기준이 없으면 검색 점수 순)"""
+    matches = None
+    if q:
+        await asyncio.to_thread(_ensure_indexed)
+        matches = search_index.matching_ids(q)
+    
+    try:
+        page = state_store.get_result_page(offset, limit, sort_by, descending, min_views, matches)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if page is None:
+        raise HTTPException(status_code=404, detail="분석 결과가 없습니다.")
+    
+    return page
+
+@router.get("/search")
+async def search_videos(
+    q: str = Query(..., min_length=1),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=1000)
+) -> Dict[str, Any]:
+    """최근 결과들에서 수집한 영상의 제목/채널명 검색 (영상 행 + 점수)"""
+    await asyncio.to_thread(_ensure_indexed)
+    matches = search_index.search(q)
+    
+    return {
+        "total": len(matches),
+        "offset": offset,
+        "limit": limit,
+        "matches": [
+            {**(search_index.row(video_id) or {"video_id": video_id}), "score": score}
+            for video_id, score in matches[offset:offset + limit]
+        ],
+        "index": search_index.stats()
+    }
+
+@router.get("/chart")
+async def get_chart(
+    request: Request,
+    group_by: str = "hour",
+    measure: str = "views",
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+) -> Dict[str, Any]:
+    """집계 큐브 차트 조회
+
+    group_by: 쉼표로 구분한 차원 (date, hour, weekday, content_type, channel, views_bucket, 비우면 전체 합계)
+    차원 이름을 파라미터로 주면 필터 (예: content_type=shorts&weekday=5,6&date=2024-01-01..2024-01-07)
+    시간/날짜/요일은 설정의 region_code 시간대 기준.
+    """
+    cube = await asyncio.to_thread(_current_cube)
+    if cube is None:
+        raise HTTPException(status_code=404, detail="분석 결과가 없습니다.")
+    
+    try:
+        dimensions = [d.strip() for d in group_by.split(",") if d.strip()]
+        filters = {
+            name: cube.parse_filter(name, value)
+            for name, value in request.query_params.items() if name in DIMENSIONS
+        }
+        chart = cube.query(dimensions, filters, measure, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {**chart, "cube": cube.stats()}
+
+@router.get("/memory")
+async def get_result_memory_usage() -> Dict[str, Any]:
+    """결과 보관 메모리 사용량"""
+    if not hasattr(state_store, "memory_usage"):
+        return {"backend": type(state_store).__name__}
+    return state_store.memory_usage()
+
+@router.get("/quota")
+async def get_quota_status() -> Dict[str, Any]:
+    """API 키별 할당량 사용 현황 (태평양 시간 기준 일일)"""
+    return youtube_service.quota_status()
+
+# 한 번에 확인할 수 있는 채널 참조 수 (핸들/사용자명은 참조마다 1 unit 조회)
+MAX_RESOLVE_REFS = 100
+
+@router.post("/channels/resolve")
+async def resolve_channels(refs: List[str]) -> Dict[str, Any]:
+    """채널 ID / @핸들 / 채널·영상 URL → channel_id (분석 시작 전 입력 확인용)"""
+    if len(refs) > MAX_RESOLVE_REFS:
+        raise HTTPException(status_code=400, detail=f"채널 참조는 한 번에 {MAX_RESOLVE_REFS}개까지 확인할 수 있습니다.")
+    with youtube_service.key_pool.using(saved_api_keys()):
+        if not len(youtube_service.key_pool):
+            raise HTTPException(status_code=400, detail="YouTube API 키가 설정되지 않았습니다.")
+        resolved = await asyncio.to_thread(youtube_service.resolve_channels, refs)
+    return {
+        "channels": resolved,
+        "unresolved": [ref for ref, channel_id in resolved.items() if channel_id is None]
+    }
 
 @router.post("/stop")
 async def stop_analysis() -> Dict[str, Any]:
-    """분석 중단"""
-    global analysis_status
-    
-    if not analysis_status["is_running"]:
+    """분석 중단 (수집 워커가 아직 가져가지 않은 작업은 대기열에서도 취소)"""
+    job_id = state_store.get_status().get("job_id")
+    if not job_id or not state_store.update_status(job_id, is_running=False, current_task="분석이 중단되었습니다."):
         raise HTTPException(status_code=400, detail="실행 중인 분석이 없습니다.")
     
-    analysis_status["is_running"] = False
-    analysis_status["current_task"] = "분석이 중단되었습니다."
+    state_store.cancel_job(job_id)
     
     return {
         "message": "분석이 중단되었습니다.",
@@ -87,71 +311,9 @@ async def stop_analysis() -> Dict[str, Any]:
 @router.delete("/clear")
 async def clear_results() -> Dict[str, Any]:
     """결과 지우기"""
-    global analysis_status
-    
-    analysis_status = {
-        "is_running": False,
-        "progress": 0,
-        "current_task": "",
-        "error": None,
-        "result": None
-    }
+    state_store.clear()
     
     return {
         "message": "결과가 지워졌습니다.",
         "status": "cleared"
     }
-
-async def _run_analysis_async(settings: AnalysisSettings):
-    """비동기 분석 실행"""
-    global analysis_status
-    
-    try:
-        # 1단계: 데이터 수집
-        analysis_status["current_task"] = "YouTube 데이터 수집 중..."
-        analysis_status["progress"] = 20
-        
-        logger.info(f"분석 시작 - 설정: {settings.dict()}")
-        videos = await youtube_service.collect_data(settings)
-        
-        logger.info(f"수집된 영상 수: {len(videos) if videos else 0}")
-        
-        if not videos:
-            analysis_status["error"] = "수집된 데이터가 없습니다. 검색 조건을 확인해주세요."
-            analysis_status["is_running"] = False
-            logger.warning("수집된 데이터가 없음")
-            return
-        
-        # 2단계: 데이터 분석
-        analysis_status["current_task"] = "데이터 분석 중..."
-        analysis_status["progress"] = 60
-        
-        result = analysis_service.analyze(videos, settings)
-        
-        # 3단계: 차트 데이터 생성
-        analysis_status["current_task"] = "차트 데이터 생성 중..."
-        analysis_status["progress"] = 80
-        
-        charts_data = analysis_service.create_charts_data(result)
-        
-        # 결과 저장
-        analysis_status["result"] = {
-            "videos": [video.dict() for video in result.videos],
-            "total_videos": result.total_videos,
-            "analysis_date": result.analysis_date.isoformat(),
-            "settings": settings.dict(),
-            "summary": result.summary,
-            "charts": charts_data
-        }
-        
-        # 완료
-        analysis_status["current_task"] = "분석 완료"
-        analysis_status["progress"] = 100
-        analysis_status["is_running"] = False
-        
-    except Exception as e:
-        logger.error(f"분석 실행 중 오류: {e}")
-        analysis_status["error"] = str(e)
-        analysis_status["is_running"] = False
-        analysis_status["current_task"] = f"오류 발생: {str(e)}"
-
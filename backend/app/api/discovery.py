@@ -0,0 +1,97 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any, List
+import asyncio
+import logging
+
+from app.models.analysis_models import DiscoveryRequest, DiscoveryWatchlistRequest
+from app.services.channel_discovery import ChannelDiscovery
+from app.api import analysis, watchlist
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 추천 채널 섹션을 따라가는 채널 탐색 (할당량 예산 안에서)
+discovery = ChannelDiscovery(analysis.youtube_service)
+
+# 현재 결과에서 가져올 최대 시작 채널 수
+MAX_RESULT_SEEDS = 20
+
+def _resolve_seeds(refs: List[str]) -> List[str]:
+    return [cid for cid in analysis.youtube_service.resolve_channels(refs).values() if cid]
+
+def _result_seeds() -> List[str]:
+    """현재 분석 결과 중 검색어로 찾은 영상의 채널 (조회수 합계 순)
+
+    채널 모드로 지정한 채널은 이미 알고 있는 채널이므로 뺀다.
+    """
+    result = analysis.state_store.get_result()
+    if not result:
+        return []
+    settings = result.get("settings") or {}
+    if not settings.get("search_terms"):
+        return []
+    
+    targeted = set()
+    if settings.get("channel_ids"):
+        targeted = {cid for cid in analysis.youtube_service.resolve_channels(settings["channel_ids"]).values() if cid}
+    
+    views: Dict[str, int] = {}
+    for video in result.get("videos", []):
+        channel_id = video.get("channel_id")
+        if channel_id and channel_id not in targeted:
+            views[channel_id] = views.get(channel_id, 0) + video.get("views", 0)
+    return sorted(views, key=views.get, reverse=True)[:MAX_RESULT_SEEDS]
+
+@router.get("/")
+async def get_discovery() -> Dict[str, Any]:
+    """마지막 채널 탐색 결과 (후보 채널 점수 순)"""
+    result = discovery.last()
+    if result is None:
+        raise HTTPException(status_code=404, detail="채널 탐색 결과가 없습니다.")
+    return result
+
+@router.post("/run")
+async def run_discovery(request: DiscoveryRequest) -> Dict[str, Any]:
+    """시작 채널에서 추천 채널을 따라가며 후보 채널 탐색"""
+    with analysis.youtube_service.key_pool.using(analysis.saved_api_keys()):
+        return await _run_discovery(request)
+
+async def _run_discovery(request: DiscoveryRequest) -> Dict[str, Any]:
+    if not len(analysis.youtube_service.key_pool):
+        raise HTTPException(status_code=400, detail="YouTube API 키가 설정되지 않았습니다.")
+    if discovery.running:
+        raise HTTPException(status_code=400, detail="이미 채널 탐색이 진행 중입니다.")
+    
+    if len(request.seeds or []) > analysis.MAX_RESOLVE_REFS:
+        raise HTTPException(status_code=400, detail=f"시작 채널은 {analysis.MAX_RESOLVE_REFS}개까지 지정할 수 있습니다.")
+    
+    # 시작 채널 참조 해석도 탐색 안에서 실행해서 탐색 예산에 포함
+    if request.seeds:
+        seeds = lambda: _resolve_seeds(request.seeds)
+    else:
+        seeds = _result_seeds
+    
+    # 이미 감시 목록에 있는 채널은 후보에서 뺌 (탐색 경로로는 사용)
+    watched = [item["value"] for item in watchlist.watchlist.items() if item["kind"] == "channel"]
+    try:
+        return await asyncio.to_thread(
+            discovery.crawl, seeds, request.budget, request.max_channels, request.max_depth, watched
+        )
+    except (RuntimeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/watchlist")
+async def add_candidates_to_watchlist(request: DiscoveryWatchlistRequest) -> Dict[str, Any]:
+    """마지막 탐색의 상위 후보 채널을 감시 목록에 추가"""
+    result = discovery.last()
+    if result is None:
+        raise HTTPException(status_code=404, detail="채널 탐색 결과가 없습니다.")
+    
+    added = []
+    for candidate in result["candidates"]:
+        if len(added) >= request.limit:
+            break
+        if candidate["score"] < request.min_score:
+            break
+        added.append(watchlist.watchlist.add("channel", candidate["channel_id"], request.priority))
+    return {"items": added, "total": len(added)}
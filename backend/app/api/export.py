@@ -5,11 +5,15 @@ import json
 import os
 import csv
 import io
-from datetime import datetime
 from pathlib import Path
 
+from app.services.export_store import ExportStore
+
 router = APIRouter()
 
+# 내보내기 파일 저장소 (인덱스는 서버 시작 시 재구성)
+export_store = ExportStore()
+
 @router.post("/excel")
 async def export_to_excel(data: Dict[str, Any]):
     """CSV 파일로 내보내기 (엑셀 대신 CSV 사용)"""
@@ -18,13 +22,13 @@ async def export_to_excel(data: Dict[str, Any]):
         if not videos:
             raise HTTPException(status_code=400, detail="내보낼 데이터가 없습니다.")
         
-        # 파일명 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"youtube_analysis_{timestamp}.csv"
-        filepath = f"exports/{filename}"
+        # 채널 테이블과 합쳐서 한 행에 채널명/구독자수까지 표시
+        channels = data.get("channels") or {}
+        videos = [{**video, **channels.get(video.get("channel_id"), {})} for video in videos]
         
-        # exports 폴더 생성
-        os.makedirs("exports", exist_ok=True)
+        # 파일명 생성
+        filepath = export_store.new_file_path("youtube_analysis", "csv")
+        filename = filepath.name
         
         # CSV 파일 생성
         with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
@@ -43,7 +47,10 @@ async def export_to_excel(data: Dict[str, Any]):
                     'duration': '영상 길이(초)',
                     'video_url': '영상 링크',
                     'thumbnail_url': '썸네일',
-                    'is_shorts': '쇼츠 여부'
+                    'is_shorts': '쇼츠 여부',
+                    'breakout_score': '급상승 점수',
+                    'baseline_views': '채널 기준 조회수',
+                    'regions': '지역'
                 }
                 
                 # 헤더 작성
@@ -53,15 +60,20 @@ async def export_to_excel(data: Dict[str, Any]):
                 
                 # 데이터 작성
                 for video in videos:
-                    row = {column_mapping.get(k, k): v for k, v in video.items()}
+                    row = {column_mapping.get(k, k): ",".join(v) if isinstance(v, list) else v
+                           for k, v in video.items()}
                     writer.writerow(row)
         
+        export_store.register(filepath, source_job=data.get("job_id"), file_format="csv")
+        
         return FileResponse(
             path=filepath,
             filename=filename,
             media_type='text/csv'
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV 내보내기 실패: {str(e)}")
 
@@ -73,23 +85,23 @@ async def export_to_json(data: Dict[str, Any]) -> FileResponse:
             raise HTTPException(status_code=400, detail="내보낼 데이터가 없습니다.")
         
         # 파일명 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"youtube_analysis_{timestamp}.json"
-        filepath = f"exports/{filename}"
-        
-        # exports 폴더 생성
-        os.makedirs("exports", exist_ok=True)
+        filepath = export_store.new_file_path("youtube_analysis", "json")
+        filename = filepath.name
         
         # JSON 파일 생성
         with open(filepath, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2, default=str)
         
+        export_store.register(filepath, source_job=data.get("job_id"), file_format="json")
+        
         return FileResponse(
             path=filepath,
             filename=filename,
             media_type='application/json'
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"JSON 내보내기 실패: {str(e)}")
 
@@ -97,9 +109,13 @@ async def export_to_json(data: Dict[str, Any]) -> FileResponse:
 async def download_file(filename: str) -> FileResponse:
     """파일 다운로드"""
     try:
-        filepath = f"exports/{filename}"
+        filepath = export_store.touch(filename)
+        if filepath is None and (export_store.directory / filename).is_file():
+            # 수집 워커가 만든 파일(프로파일 등)은 인덱스를 다시 읽어야 보임
+            export_store.rebuild_index()
+            filepath = export_store.touch(filename)
         
-        if not os.path.exists(filepath):
+        if filepath is None or not filepath.exists():
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
         # 파일 타입에 따른 미디어 타입 설정
@@ -107,6 +123,8 @@ async def download_file(filename: str) -> FileResponse:
             media_type = 'text/csv'
         elif filename.endswith('.json'):
             media_type = 'application/json'
+        elif filename.endswith('.folded'):
+            media_type = 'text/plain'
         else:
             media_type = 'application/octet-stream'
         
@@ -116,6 +134,8 @@ async def download_file(filename: str) -> FileResponse:
             media_type=media_type
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 다운로드 실패: {str(e)}")
 
@@ -123,25 +143,29 @@ async def download_file(filename: str) -> FileResponse:
 async def list_exported_files() -> Dict[str, Any]:
     """내보낸 파일 목록 조회"""
     try:
-        exports_dir = Path("exports")
-        
-        if not exports_dir.exists():
-            return {"files": []}
-        
-        files = []
-        for file_path in exports_dir.iterdir():
-            if file_path.is_file():
-                files.append({
-                    "filename": file_path.name,
-                    "size": file_path.stat().st_size,
-                    "created": datetime.fromtimestamp(file_path.stat().st_ctime).isoformat(),
-                    "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-                })
+        # 파일 시스템 대신 인덱스에서 응답
+        return {
+            "files": export_store.list_files(),
+            "usage": export_store.stats()
+        }
         
-        # 최신 순으로 정렬
-        files.sort(key=lambda x: x["modified"], reverse=True)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"파일 목록 조회 실패: {str(e)}")
+
+@router.get("/job/{job_id}")
+async def list_job_files(job_id: str) -> Dict[str, Any]:
+    """작업에서 생성된 파일 목록 (결과 내보내기, 프로파일 파일)"""
+    try:
+        files = export_store.list_by_job(job_id)
+        if not files:
+            export_store.rebuild_index()
+            files = export_store.list_by_job(job_id)
         
-        return {"files": files}
+        return {
+            "job_id": job_id,
+            "files": files,
+            "profile": [f for f in files if f["format"] in ("folded", "profile")]
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 목록 조회 실패: {str(e)}")
@@ -150,17 +174,15 @@ async def list_exported_files() -> Dict[str, Any]:
 async def delete_exported_file(filename: str) -> Dict[str, Any]:
     """내보낸 파일 삭제"""
     try:
-        filepath = f"exports/{filename}"
-        
-        if not os.path.exists(filepath):
+        if not export_store.remove(filename):
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
-        os.remove(filepath)
-        
         return {
             "message": f"파일 '{filename}'이 삭제되었습니다.",
             "status": "deleted"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 삭제 실패: {str(e)}")
\ No newline at end of file
@@ -1,27 +1,62 @@
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
-import json
 import os
-from pathlib import Path
 from dotenv import load_dotenv
 
+from app.models.analysis_models import SettingsProfileRequest
+from app.services.settings_profiles import DEFAULT_PROFILE, ProfileScheduler, SettingsProfiles
+from app.api import analysis
+
 # .env 파일 로드
 load_dotenv()
 
 router = APIRouter()
 
-# 설정 파일 경로
+# 예전 단일 설정 파일 경로 (프로파일 파일이 없을 때 default 프로파일로 가져옴)
 SETTINGS_FILE = "settings.json"
 
+def _get_default_settings() -> Dict[str, Any]:
+    """기본 설정 반환"""
+    # 환경 변수에서 API 키 읽기
+    api_key = os.getenv("YOUTUBE_API_KEY", "")
+    
+    return {
+        "api_key": api_key,
+        "analysis_mode": "both",
+        "content_type": "both",
+        "search_terms": [],
+        "channel_ids": [],
+        "trending_category_ids": [],
+        "days_back": 7,
+        "max_videos_per_channel": 10,
+        "max_videos_per_search": 50,
+        "min_views": 20000,
+        "min_views_per_hour": 10,
+        "shorts_max_duration": 60,
+        "region_code": "KR",
+        "language": "ko",
+        "show_popular_videos": True,
+        "score_breakouts": False
+    }
+
+# 이름별 설정 프로파일 (메모리 보관, 변경 시 원자적 저장)과 cron 주기 예약 실행
+profiles = SettingsProfiles(legacy_path=SETTINGS_FILE, defaults=_get_default_settings)
+scheduler = ProfileScheduler(profiles, executor=analysis.ANALYSIS_EXECUTOR)
+
+def load_settings() -> Dict[str, Any]:
+    """저장된 설정 (없으면 기본 설정)"""
+    return profiles.settings(DEFAULT_PROFILE)
+
+def _save_default(settings: Dict[str, Any]):
+    """default 프로파일 설정만 바꿈 (예약 주기는 유지, 예약 실행할 수 없는 설정이면 ValueError)"""
+    current = profiles.get(DEFAULT_PROFILE) or {}
+    profiles.save(DEFAULT_PROFILE, settings, current.get("schedule"), current.get("enabled", True))
+
 @router.get("/")
 async def get_settings() -> Dict[str, Any]:
     """설정 조회"""
     try:
-        if os.path.exists(SETTINGS_FILE):
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return _get_default_settings()
+        return load_settings()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설정 조회 실패: {str(e)}")
 
@@ -29,13 +64,14 @@ async def get_settings() -> Dict[str, Any]:
 async def save_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
     """설정 저장"""
     try:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        _save_default(settings)
         
         return {
             "message": "설정이 저장되었습니다.",
             "status": "saved"
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설정 저장 실패: {str(e)}")
 
@@ -43,14 +79,14 @@ async def save_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
 async def reset_settings() -> Dict[str, Any]:
     """설정 초기화"""
     try:
-        default_settings = _get_default_settings()
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(default_settings, f, ensure_ascii=False, indent=2)
+        _save_default(_get_default_settings())
         
         return {
             "message": "설정이 초기화되었습니다.",
             "status": "reset"
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설정 초기화 실패: {str(e)}")
 
@@ -58,16 +94,15 @@ async def reset_settings() -> Dict[str, Any]:
 async def export_settings() -> Dict[str, Any]:
     """설정 내보내기"""
     try:
-        if os.path.exists(SETTINGS_FILE):
-            with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                settings = json.load(f)
-            
+        if profiles.get(DEFAULT_PROFILE) is not None:
             return {
-                "settings": settings,
+                "settings": profiles.settings(DEFAULT_PROFILE),
                 "message": "설정 내보내기 완료"
             }
         else:
             raise HTTPException(status_code=404, detail="설정 파일이 없습니다.")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설정 내보내기 실패: {str(e)}")
 
@@ -79,37 +114,67 @@ async def import_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
         if not _validate_settings(settings):
             raise HTTPException(status_code=400, detail="유효하지 않은 설정입니다.")
         
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        _save_default(settings)
         
         return {
             "message": "설정이 가져와졌습니다.",
             "status": "imported"
         }
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"설정 가져오기 실패: {str(e)}")
 
-def _get_default_settings() -> Dict[str, Any]:
-    """기본 설정 반환"""
-    # 환경 변수에서 API 키 읽기
-    api_key = os.getenv("YOUTUBE_API_KEY", "")
+@router.get("/profiles")
+async def list_profiles() -> Dict[str, Any]:
+    """설정 프로파일 목록 (예약 주기, 다음/마지막 실행 시각)"""
+    items = profiles.list()
+    return {"profiles": items, "total": len(items)}
+
+@router.get("/profiles/{name}")
+async def get_profile(name: str) -> Dict[str, Any]:
+    """설정 프로파일 조회"""
+    profile = profiles.get(name)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="없는 프로파일입니다.")
+    return profile
+
+@router.put("/profiles/{name}")
+async def save_profile(name: str, request: SettingsProfileRequest) -> Dict[str, Any]:
+    """설정 프로파일 저장 (schedule: cron 식, @hourly 등 또는 "@every 30m", 비우면 수동 실행만)"""
+    try:
+        return profiles.save(name, request.settings, request.schedule, request.enabled)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/profiles/{name}")
+async def delete_profile(name: str) -> Dict[str, Any]:
+    """설정 프로파일 삭제 (default 제외)"""
+    try:
+        removed = profiles.delete(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not removed:
+        raise HTTPException(status_code=404, detail="없는 프로파일입니다.")
+    return {"message": "삭제되었습니다.", "status": "removed"}
+
+@router.post("/profiles/{name}/run")
+async def run_profile(name: str) -> Dict[str, Any]:
+    """프로파일을 지금 실행 (백그라운드, 진행 상황은 /api/analysis/status)"""
+    if profiles.get(name) is None:
+        raise HTTPException(status_code=404, detail="없는 프로파일입니다.")
+    try:
+        claimed = scheduler.claim(name, analysis.state_store)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"실행할 수 없는 설정입니다: {e}")
+    if claimed is None:
+        raise HTTPException(status_code=400, detail="이미 분석이 진행 중입니다.")
     
-    return {
-        "api_key": api_key,
-        "analysis_mode": "both",
-        "content_type": "both",
-        "search_terms": [],
-        "channel_ids": [],
-        "days_back": 7,
-        "max_videos_per_channel": 10,
-        "max_videos_per_search": 50,
-        "min_views": 20000,
-        "min_views_per_hour": 10,
-        "shorts_max_duration": 60,
-        "region_code": "KR",
-        "language": "ko",
-        "show_popular_videos": True
-    }
+    job_id, settings = claimed
+    scheduler.spawn(name, job_id, settings, analysis.analysis_runner)
+    return {"message": f"프로파일 '{name}' 실행을 시작했습니다.", "status": "started", "job_id": job_id}
 
 def _validate_settings(settings: Dict[str, Any]) -> bool:
     """설정 유효성 검증"""
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+import asyncio
+import logging
+
+from app.services.thumbnail_cache import ThumbnailCache, VARIANTS
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 썸네일 디스크 캐시 (인덱스는 서버 시작 시 재구성)
+thumbnail_cache = ThumbnailCache()
+
+@router.get("/stats")
+async def get_thumbnail_stats():
+    """썸네일 캐시 사용량"""
+    return thumbnail_cache.stats()
+
+@router.get("/{video_id}")
+async def get_thumbnail(request: Request, video_id: str, size: str = Query("row")):
+    """썸네일 이미지 (캐시에 없으면 YouTube 에서 받아 저장)"""
+    if size not in VARIANTS:
+        raise HTTPException(status_code=400, detail=f"size 는 {', '.join(VARIANTS)} 중 하나여야 합니다.")
+
+    try:
+        data, media_type, digest = await asyncio.to_thread(thumbnail_cache.get, video_id, size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.warning(f"썸네일 가져오기 실패 {video_id}: {e}")
+        raise HTTPException(status_code=502, detail="썸네일을 가져올 수 없습니다.")
+
+    # 내용 해시가 곧 ETag (같은 이미지면 재전송하지 않음)
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=86400"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=data, media_type=media_type, headers=headers)
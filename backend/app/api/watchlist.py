@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException
+from typing import Dict, Any
+import asyncio
+import logging
+
+from app.models.analysis_models import WatchlistItem
+from app.services.watchlist import RESULT_SLOT, Watchlist, WatchlistScheduler
+from app.api import analysis
+from app.api.settings import load_settings
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 감시 목록과 할당량 기반 순환 수집
+watchlist = Watchlist()
+scheduler = WatchlistScheduler(watchlist, analysis.youtube_service.key_pool, executor=analysis.ANALYSIS_EXECUTOR)
+
+@router.get("/")
+async def get_watchlist() -> Dict[str, Any]:
+    """감시 목록 (항목별 우선순위, 마지막 수집 시각, 수확률)"""
+    items = sorted(watchlist.items(), key=lambda item: (-item["priority"], item["value"]))
+    return {"items": items, "total": len(items)}
+
+@router.post("/")
+async def add_watchlist_item(item: WatchlistItem) -> Dict[str, Any]:
+    """감시 목록에 채널/검색어 추가 (이미 있으면 우선순위 변경)"""
+    try:
+        return watchlist.add(item.kind, item.value, item.priority)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("/{kind}/{value}")
+async def remove_watchlist_item(kind: str, value: str) -> Dict[str, Any]:
+    """감시 목록에서 삭제"""
+    if not watchlist.remove(kind, value):
+        raise HTTPException(status_code=404, detail="감시 목록에 없는 항목입니다.")
+    return {"message": "삭제되었습니다.", "status": "removed"}
+
+@router.get("/plan")
+async def get_watchlist_plan() -> Dict[str, Any]:
+    """다음 순번에 수집할 항목 미리 보기"""
+    with analysis.youtube_service.key_pool.using(analysis.saved_api_keys()):
+        return scheduler.plan(base=load_settings())
+
+@router.post("/run")
+async def run_watchlist() -> Dict[str, Any]:
+    """다음 순번 항목 수집 시작 (백그라운드, 진행 상황은 /api/analysis/status, 결과는 /api/watchlist/result)"""
+    claimed = scheduler.claim(analysis.state_store, load_settings())
+    if claimed is None:
+        status = analysis.state_store.get_status()
+        if status.get("is_running"):
+            raise HTTPException(status_code=400, detail="이미 분석이 진행 중입니다.")
+        raise HTTPException(status_code=400, detail="배정할 항목이 없습니다.")
+    
+    job_id, settings, keys, plan = claimed
+    scheduler.spawn(job_id, settings, keys, analysis.state_store, analysis.analysis_runner)
+    return {
+        "message": f"감시 목록 {len(keys)}개 항목 수집을 시작했습니다.",
+        "status": "started",
+        "job_id": job_id,
+        "estimated_cost": plan["estimated_cost"]
+    }
+
+@router.get("/result")
+async def get_watchlist_result() -> Dict[str, Any]:
+    """마지막 감시 목록 수집 결과 (분석 화면의 현재 결과와 따로 보관)"""
+    result = await asyncio.to_thread(analysis.state_store.get_result, RESULT_SLOT)
+    if not result:
+        raise HTTPException(status_code=404, detail="감시 목록 수집 결과가 없습니다.")
+    return result
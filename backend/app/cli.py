@@ -0,0 +1,107 @@
+"""
+배치 실행용 CLI (FastAPI 서버 없이 분석 실행)
+
+    python -m app.cli settings/kr_music.json settings/channels.json -o results -j 4
+
+설정 파일은 AnalysisSettings 형식의 JSON 객체 또는 객체 목록이다.
+api_key 가 없으면 YOUTUBE_API_KEY / YOUTUBE_API_KEYS 환경 변수의 키를 사용한다.
+시작 시간을 줄이기 위해 서비스 모듈은 실제로 실행할 때 import 한다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger("app.cli")
+
+def _load_settings_files(paths: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+    """설정 파일들을 읽어 (이름, 설정 dict) 목록으로 반환"""
+    jobs = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        stem = Path(path).stem
+        if isinstance(data, list):
+            jobs.extend((f"{stem}_{i + 1}", item) for i, item in enumerate(data))
+        else:
+            jobs.append((stem, data))
+    return jobs
+
+async def _run_jobs(jobs: List[Tuple[str, Dict[str, Any]]], output_dir: Path, parallel: int) -> int:
+    """설정별 분석을 동시에 실행하고 결과 파일 작성, 실패한 작업 수 반환"""
+    from app.models.analysis_models import AnalysisSettings
+    from app.services.analysis_runner import AnalysisRunner
+    from app.services.state_store import MemoryStateStore, dumps
+
+    # 같은 서비스 인스턴스를 공유해서 작업 간 중복 API 호출을 합침
+    runner = AnalysisRunner(MemoryStateStore())
+    semaphore = asyncio.Semaphore(max(parallel, 1))
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    async def run_one(name: str, data: Dict[str, Any]) -> bool:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                data.setdefault("api_key", "")
+                settings = AnalysisSettings(**data)
+                payload = await runner.execute(f"{name}_{timestamp}", settings)
+            except Exception as e:
+                logger.error(f"[{name}] 분석 실패: {e}")
+                return False
+
+            if payload is None:
+                logger.warning(f"[{name}] 수집된 데이터가 없습니다.")
+                return True
+
+            output_path = output_dir / f"{name}_{timestamp}.json"
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write(dumps(payload))
+
+            logger.info(
+                f"[{name}] 영상 {payload['total_videos']}개, "
+                f"{time.perf_counter() - started:.1f}초 → {output_path}"
+            )
+            return True
+
+    try:
+        results = await asyncio.gather(*(run_one(name, data) for name, data in jobs))
+    finally:
+        runner.youtube_service.close()
+    return sum(1 for ok in results if not ok)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="YouTube Analyzer 배치 실행")
+    parser.add_argument("settings", nargs="+", help="AnalysisSettings JSON 파일 (객체 또는 객체 목록)")
+    parser.add_argument("-o", "--output-dir", default="results", help="결과 저장 폴더 (기본: results)")
+    parser.add_argument("-j", "--parallel", type=int, default=4, help="동시에 실행할 분석 수 (기본: 4)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="수집 과정 로그 출력")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    logger.setLevel(logging.INFO)
+
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    try:
+        jobs = _load_settings_files(args.settings)
+    except (OSError, ValueError) as e:
+        logger.error(f"설정 파일 읽기 실패: {e}")
+        return 2
+
+    failed = asyncio.run(_run_jobs(jobs, Path(args.output_dir), args.parallel))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
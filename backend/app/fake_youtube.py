@@ -0,0 +1,280 @@
+"""
+로컬 테스트용 가짜 YouTube Data API 서버 (부하 테스트, 할당량 없이 전체 흐름 확인)
+
+    python -m app.fake_youtube --port 8090 --latency 0.05
+    YOUTUBE_API_ENDPOINT=http://127.0.0.1:8090/ uvicorn app.main:app
+
+search / videos / channels / channelSections / playlistItems 의 list 만 흉내 낸다. channels 는
+forHandle / forUsername 도 받으며 "missing" 이 들어간 이름은 찾지 못한 것으로 응답한다. 응답은 요청 값에서
+결정적으로 만들어지므로 같은 요청에는 항상 같은 영상이 나온다.
+영상 ID 앞 3자리가 채널 번호라서 어떤 경로로 받아도 영상과 채널이 일관된다.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger("app.fake_youtube")
+
+_WORDS = ["뉴진스", "신곡", "브이로그", "먹방", "리뷰", "게임", "하이라이트", "여행", "일상", "쇼츠",
+          "아이폰", "축구", "요리", "캠핑", "공부", "asmr", "minecraft", "vlog", "music", "live"]
+
+def _digest(value: str) -> int:
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+def parse_fields(mask: str) -> Dict[str, Any]:
+    """partial response 마스크 → 중첩 dict (a/b, a(b,c), 쉼표 구분), 빈 dict 는 그 아래 전부"""
+    tree: Dict[str, Any] = {}
+    stack = [tree]
+    path: List[Dict[str, Any]] = []
+    token = ""
+
+    def flush():
+        nonlocal token
+        if token:
+            node = stack[-1]
+            for part in token.split("/"):
+                node = node.setdefault(part, {})
+            path.append(node)
+        token = ""
+
+    for ch in mask:
+        if ch == "(":
+            flush()
+            stack.append(path[-1])
+        elif ch == ")":
+            flush()
+            stack.pop()
+        elif ch == ",":
+            flush()
+        else:
+            token += ch
+    flush()
+    return tree
+
+def apply_fields(value: Any, tree: Dict[str, Any]) -> Any:
+    """마스크에 있는 필드만 남김"""
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {key: apply_fields(value[key], sub) for key, sub in tree.items() if key in value}
+    return value
+
+class FakeYouTube:
+    """가짜 API 서버 (별도 스레드에서 실행)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, jitter: float = 0.02,
+                 channels: int = 200, results_per_query: int = 50):
+        self.latency = latency
+        self.jitter = jitter
+        self.channels = channels
+        self.results_per_query = results_per_query
+        self.calls: Dict[str, int] = {}
+        # 압축 전 응답 본문 크기 합계 (fields 마스크 효과 확인용)
+        self.bytes_sent = 0
+        self._calls_lock = threading.Lock()
+        self._now = datetime.now(timezone.utc)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self) -> "FakeYouTube":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-youtube", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    # ------------------------------------------------------------------
+    # 데이터 생성
+    # ------------------------------------------------------------------
+    def channel_id(self, number: int) -> str:
+        return f"UC{number:022d}"
+
+    def video_id(self, channel_number: int, seed: str) -> str:
+        return f"{channel_number:03d}" + hashlib.sha256(seed.encode("utf-8")).hexdigest()[:8]
+
+    def video_item(self, video_id: str) -> Dict[str, Any]:
+        h = _digest(video_id)
+        channel_number = int(video_id[:3]) if video_id[:3].isdigit() else h % self.channels
+        published = self._now - timedelta(minutes=h % (30 * 24 * 60))
+        words = [_WORDS[(h >> (5 * i)) % len(_WORDS)] for i in range(4)]
+        return {
+            "kind": "youtube#video",
+            "id": video_id,
+            "snippet": {
+                "publishedAt": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "channelId": self.channel_id(channel_number),
+                "title": " ".join(words) + f" #{h % 1000}",
+                "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}
+            },
+            "contentDetails": {"duration": f"PT{h % 20}M{h % 60}S"},
+            "statistics": {"viewCount": str(1000 + (h % 5_000_000))}
+        }
+
+    def channel_item(self, channel_id: str) -> Dict[str, Any]:
+        h = _digest(channel_id)
+        return {
+            "kind": "youtube#channel",
+            "id": channel_id,
+            "snippet": {"title": f"채널 {channel_id[-4:]}"},
+            "statistics": {"subscriberCount": str(100 + h % 2_000_000)},
+            "contentDetails": {"relatedPlaylists": {"uploads": "UU" + channel_id[2:]}}
+        }
+
+    def search(self, params: Dict[str, str]) -> Dict[str, Any]:
+        limit = min(int(params.get("maxResults", 5)), self.results_per_query)
+        seed = params.get("q") or params.get("channelId") or ""
+        if params.get("channelId", "").startswith("UC"):
+            channel_numbers = [int(params["channelId"][2:]) % 1000] * limit
+        else:
+            channel_numbers = [(_digest(f"{seed}:{i}") % self.channels) for i in range(limit)]
+        # 지역을 지정하면 결과의 1/3 은 지역마다 다른 영상 (나머지는 지역 공통)
+        region = params.get("regionCode")
+        seeds = [f"{seed}:{region}:{i}" if region and i % 3 == 2 else f"{seed}:{i}" for i in range(limit)]
+        items = [
+            {"id": {"kind": "youtube#video", "videoId": self.video_id(number, seeds[i])},
+             "snippet": {"channelId": self.channel_id(number)}}
+            for i, number in enumerate(channel_numbers)
+        ]
+        return {"kind": "youtube#searchListResponse", "items": items}
+
+    def videos(self, params: Dict[str, str]) -> Dict[str, Any]:
+        if params.get("chart") == "mostPopular":
+            limit = min(int(params.get("maxResults", 5)), 50)
+            seed = f"popular:{params.get('regionCode')}:{params.get('videoCategoryId')}"
+            ids = [self.video_id(_digest(f"{seed}:{i}") % self.channels, f"{seed}:{i}") for i in range(limit)]
+        else:
+            ids = [v for v in params.get("id", "").split(",") if v]
+        return {"kind": "youtube#videoListResponse", "items": [self.video_item(v) for v in ids]}
+
+    def channels_list(self, params: Dict[str, str]) -> Dict[str, Any]:
+        name = params.get("forHandle") or params.get("forUsername")
+        if name is not None:
+            name = name.lstrip("@").lower()
+            ids = [] if "missing" in name else [self.channel_id(_digest(name) % self.channels)]
+        else:
+            ids = [c for c in params.get("id", "").split(",") if c]
+        return {"kind": "youtube#channelListResponse", "items": [self.channel_item(c) for c in ids]}
+
+    def channel_sections(self, params: Dict[str, str]) -> Dict[str, Any]:
+        """채널 홈의 섹션 - 채널 4개 중 3개는 추천 채널 섹션이 1~2개 (채널 3~5개씩)"""
+        channel_id = params.get("channelId", "")
+        h = _digest(channel_id)
+        items = []
+        for s in range(0 if h % 4 == 0 else 1 + h % 2):
+            count = 3 + (h >> (3 + s)) % 3
+            channels = [self.channel_id(_digest(f"{channel_id}:{s}:{k}") % self.channels) for k in range(count)]
+            items.append({
+                "kind": "youtube#channelSection",
+                "id": f"{channel_id}.{s}",
+                "snippet": {"type": "multipleChannels", "channelId": channel_id},
+                "contentDetails": {"channels": channels}
+            })
+        return {"kind": "youtube#channelSectionListResponse", "items": items}
+
+    def playlist_items(self, params: Dict[str, str]) -> Dict[str, Any]:
+        playlist_id = params.get("playlistId", "")
+        number = int(playlist_id[2:]) % 1000 if playlist_id[2:].isdigit() else 0
+        limit = min(int(params.get("maxResults", 5)), 50)
+        items = []
+        for i in range(limit):
+            video_id = self.video_id(number, f"{playlist_id}:{i}")
+            published = self.video_item(video_id)["snippet"]["publishedAt"]
+            items.append({"contentDetails": {"videoId": video_id, "videoPublishedAt": published}})
+        return {"kind": "youtube#playlistItemListResponse", "items": items}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _route(self, path: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        resource = path.rstrip("/").rsplit("/", 1)[-1]
+        handler = {
+            "search": self.search,
+            "videos": self.videos,
+            "channels": self.channels_list,
+            "channelSections": self.channel_sections,
+            "playlistItems": self.playlist_items
+        }.get(resource)
+        if handler is None:
+            return None
+        with self._calls_lock:
+            self.calls[resource] = self.calls.get(resource, 0) + 1
+        return handler(params)
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                if fake.latency or fake.jitter:
+                    time.sleep(max(fake.latency + random.uniform(-fake.jitter, fake.jitter), 0))
+
+                body = fake._route(parsed.path, params)
+                status = 200 if body is not None else 404
+                if body is not None and params.get("fields"):
+                    body = apply_fields(body, parse_fields(params["fields"]))
+                data = json.dumps(body if body is not None else {"error": {"code": 404}}).encode("utf-8")
+                fake.bytes_sent += len(data)
+
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json; charset=UTF-8")
+                    if "gzip" in self.headers.get("Accept-Encoding", ""):
+                        data = gzip.compress(data)
+                        self.send_header("Content-Encoding", "gzip")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 앱 프로세스가 요청 도중 종료된 경우
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.fake_youtube", description="가짜 YouTube Data API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연 (초, 기본: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="지연 편차 (초, 기본: 0.02)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    fake = FakeYouTube(args.host, args.port, args.latency, args.jitter).start()
+    logger.info(f"가짜 YouTube API 서버 실행 중: {fake.url} (YOUTUBE_API_ENDPOINT 로 지정)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,418 @@
+"""
+부하 테스트 (실제 FastAPI 앱 + 가짜 YouTube API 서버)
+
+    python -m app.loadtest --users 20 --duration 30 --latency 0.05
+    python -m app.loadtest --save-baseline      # 현재 측정값을 기준선으로 저장
+    python -m app.loadtest --mix status=50,result=30,start=20
+
+가짜 API 서버(app.fake_youtube)를 띄우고 YOUTUBE_API_ENDPOINT 를 그쪽으로 돌린 uvicorn 을
+임시 폴더에서 실행한 뒤, 동시 사용자들이 분석 시작/상태 조회/결과 조회/내보내기를 섞어서 요청한다.
+경로별 처리량과 p50/p95/p99 지연 시간을 분석 실행 중(busy)/대기 중(idle)으로 나눠 보고하고,
+기준선 파일이 있으면 비교해서 느려진 경로가 있으면 종료 코드 1 을 반환한다.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("app.loadtest")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 요청 종류별 기본 비중 (프론트엔드 사용 패턴: 대부분 상태/결과 조회)
+DEFAULT_MIX = {
+    "status": 35,
+    "result": 20,
+    "result_videos": 15,
+    "search": 10,
+    "start": 10,
+    "export_json": 5,
+    "export_csv": 5
+}
+
+SEARCH_TERMS = ["뉴진스", "먹방", "브이로그", "게임", "여행", "요리", "축구", "minecraft", "music", "asmr"]
+QUERIES = ["신곡", "먹방 리뷰", "vlog", "게임 하이라이트", "여행", "live"]
+
+def parse_mix(text: Optional[str]) -> Dict[str, int]:
+    """status=50,result=30 형식 → 비중 dict"""
+    if not text:
+        return dict(DEFAULT_MIX)
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"알 수 없는 요청 종류: {name} ({', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight or 1)
+    return mix
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """정렬된 값의 분위수 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize(latencies: List[float], duration: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "rps": round(len(values) / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0
+    }
+
+class LoadStats:
+    """경로별 지연 시간 수집 (분석 실행 중 여부로 구분)"""
+
+    def __init__(self):
+        self.samples: Dict[str, Dict[str, List[float]]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[int, int]] = {}
+        self.busy = False
+        self.analyses_started = 0
+
+    def record(self, route: str, seconds: float, status: int, busy: bool):
+        phases = self.samples.setdefault(route, {"busy": [], "idle": []})
+        phases["busy" if busy else "idle"].append(seconds)
+        codes = self.statuses.setdefault(route, {})
+        codes[status] = codes.get(status, 0) + 1
+        if status == 0 or status >= 500:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def report(self, duration: float) -> Dict[str, Any]:
+        routes = {}
+        for route, phases in sorted(self.samples.items()):
+            routes[route] = {
+                **summarize(phases["busy"] + phases["idle"], duration),
+                "errors": self.errors.get(route, 0),
+                "status_codes": {str(code): n for code, n in sorted(self.statuses[route].items())},
+                "busy": summarize(phases["busy"], duration),
+                "idle": summarize(phases["idle"], duration)
+            }
+        total = sum(route["count"] for route in routes.values())
+        return {
+            "duration_seconds": round(duration, 2),
+            "requests": total,
+            "throughput_rps": round(total / duration, 2) if duration else 0.0,
+            "errors": sum(self.errors.values()),
+            "analyses_started": self.analyses_started,
+            "routes": routes
+        }
+
+def start_settings(rng: random.Random) -> Dict[str, Any]:
+    """분석 시작 요청 본문 (검색어 조합이 달라 매번 실제 수집이 일어남)"""
+    return {
+        "api_key": "",
+        "analysis_mode": "keyword",
+        "content_type": "both",
+        "search_terms": rng.sample(SEARCH_TERMS, 2),
+        "days_back": 30,
+        "max_videos_per_search": 50,
+        "min_views": 0,
+        "min_views_per_hour": 0,
+        "show_popular_videos": True,
+        "score_breakouts": True
+    }
+
+class VirtualUser:
+    """요청 비중에 따라 쉬지 않고 요청을 보내는 사용자 (프론트엔드처럼 ETag/결과를 기억)"""
+
+    def __init__(self, client, stats: LoadStats, mix: Dict[str, int], seed: int, think: float):
+        self.client = client
+        self.stats = stats
+        self.routes = list(mix)
+        self.weights = [mix[r] for r in self.routes]
+        self.rng = random.Random(seed)
+        self.think = think
+        self.etag: Optional[str] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+    async def run(self, deadline: float):
+        while time.perf_counter() < deadline:
+            route = self.rng.choices(self.routes, self.weights)[0]
+            busy = self.stats.busy
+            started = time.perf_counter()
+            try:
+                status = await getattr(self, f"_{route}")()
+            except Exception as e:
+                logger.debug(f"{route} 요청 실패: {e}")
+                status = 0
+            if status is not None:
+                self.stats.record(route, time.perf_counter() - started, status, busy)
+            if self.think:
+                await asyncio.sleep(self.rng.uniform(0, 2 * self.think))
+
+    async def _start(self) -> int:
+        response = await self.client.post("/api/analysis/start", json=start_settings(self.rng))
+        if response.status_code == 200 and response.json().get("status") == "started":
+            self.stats.busy = True
+            self.stats.analyses_started += 1
+        return response.status_code
+
+    async def _status(self) -> int:
+        response = await self.client.get("/api/analysis/status")
+        if response.status_code == 200:
+            self.stats.busy = bool(response.json().get("is_running"))
+        return response.status_code
+
+    async def _result(self) -> int:
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        response = await self.client.get("/api/analysis/result", headers=headers)
+        if response.status_code == 200:
+            self.etag = response.headers.get("etag")
+            self.result = response.json()
+        return response.status_code
+
+    async def _result_videos(self) -> int:
+        response = await self.client.get("/api/analysis/result/videos", params={
+            "offset": self.rng.randrange(0, 200, 50), "limit": 50, "sort_by": "views_per_hour"
+        })
+        return response.status_code
+
+    async def _search(self) -> int:
+        response = await self.client.get("/api/analysis/search", params={"q": self.rng.choice(QUERIES), "limit": 20})
+        return response.status_code
+
+    async def _export(self, fmt: str) -> Optional[int]:
+        if self.result is None:
+            await self._result()
+            if self.result is None:
+                return None
+        response = await self.client.post(f"/api/export/{fmt}", json=self.result)
+        return response.status_code
+
+    async def _export_json(self) -> Optional[int]:
+        return await self._export("json")
+
+    async def _export_csv(self) -> Optional[int]:
+        return await self._export("excel")
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def launch_app(api_endpoint: str, workdir: str, port: int, extra_env: Dict[str, str]) -> subprocess.Popen:
+    """가짜 API 서버를 쓰도록 설정한 uvicorn 실행 (상태/파일은 모두 임시 폴더에)"""
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_DIR), env.get("PYTHONPATH")])),
+        "YOUTUBE_API_ENDPOINT": api_endpoint,
+        "YOUTUBE_API_KEY": "loadtest",
+        "YOUTUBE_API_KEYS": "",
+        "YOUTUBE_DAILY_QUOTA": "100000000",
+        "YOUTUBE_WARMUP": "false",
+        "STATE_BACKEND": "memory",
+        "ANALYSIS_EXECUTOR": "inline",
+        "RUN_CACHE_TTL": "0",
+        "THUMBNAIL_PREFETCH": "false",
+        "WATCHLIST_AUTORUN": "false",
+        "QUOTA_USAGE_FILE": os.path.join(workdir, "quota_usage.json"),
+        "EXPORTS_DIR": os.path.join(workdir, "exports"),
+        "THUMBNAIL_CACHE_DIR": os.path.join(workdir, "thumbnail_cache"),
+        "RESULT_SPILL_DIR": os.path.join(workdir, "result_spill"),
+        "CHANNEL_BASELINE_FILE": os.path.join(workdir, "channel_baselines.json"),
+        "WATCHLIST_FILE": os.path.join(workdir, "watchlist.json")
+    })
+    env.update(extra_env)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=workdir, env=env
+    )
+
+async def wait_until_ready(client, process: Optional[subprocess.Popen], timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"앱 프로세스가 종료되었습니다 (코드 {process.returncode})")
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("앱이 시간 안에 시작되지 않았습니다.")
+
+async def wait_for_analysis(client, timeout: float = 120.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        status = (await client.get("/api/analysis/status")).json()
+        if not status.get("is_running"):
+            if status.get("error"):
+                raise RuntimeError(f"준비 분석 실패: {status['error']}")
+            return
+        await asyncio.sleep(0.2)
+    raise RuntimeError("준비 분석이 시간 안에 끝나지 않았습니다.")
+
+async def run_load(base_url: str, process: Optional[subprocess.Popen], users: int, duration: float,
+                   mix: Dict[str, int], think: float, seed: int) -> Dict[str, Any]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        await wait_until_ready(client, process)
+
+        # 결과 조회/내보내기가 404 만 받지 않도록 측정 전에 분석 한 번 완료
+        response = await client.post("/api/analysis/start", json=start_settings(random.Random(seed)))
+        response.raise_for_status()
+        await wait_for_analysis(client)
+
+        stats = LoadStats()
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            VirtualUser(client, stats, mix, seed + i, think).run(deadline) for i in range(users)
+        ))
+        return stats.report(time.perf_counter() - started)
+
+# ----------------------------------------------------------------------
+# 기준선
+# ----------------------------------------------------------------------
+def load_baselines(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(path: str, name: str, report: Dict[str, Any]):
+    """시나리오 이름별로 기준선 저장 (원자적 저장)"""
+    baselines = load_baselines(path)
+    baselines[name] = report
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            min_delta_ms: float) -> List[str]:
+    """기준선보다 느려진 항목 (p95/p99 가 허용 비율과 최소 차이를 모두 넘거나, 처리량이 허용 비율 이상 감소)"""
+    regressions = []
+    for route, base in baseline.get("routes", {}).items():
+        current = report["routes"].get(route)
+        if current is None or not base.get("count"):
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            before, after = base[key], current[key]
+            if after > before * (1 + tolerance) and after - before > min_delta_ms:
+                regressions.append(f"{route} {key}: {before} → {after}")
+        if current["errors"] > base.get("errors", 0):
+            regressions.append(f"{route} errors: {base.get('errors', 0)} → {current['errors']}")
+
+    before, after = baseline.get("throughput_rps", 0), report["throughput_rps"]
+    if before and after < before * (1 - tolerance):
+        regressions.append(f"throughput_rps: {before} → {after}")
+    return regressions
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n{'route':<14}{'count':>7}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'busy p95':>10}{'idle p95':>10}{'err':>5}")
+    for route, r in report["routes"].items():
+        print(f"{route:<14}{r['count']:>7}{r['rps']:>8}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+              f"{r['busy']['p95_ms']:>10}{r['idle']['p95_ms']:>10}{r['errors']:>5}")
+    print(f"\n총 {report['requests']}건, {report['throughput_rps']} req/s, 오류 {report['errors']}건, "
+          f"분석 {report['analyses_started']}회 (지연 단위: ms)")
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.loadtest", description="YouTube Analyzer 부하 테스트")
+    parser.add_argument("--users", type=int, default=20, help="동시 사용자 수 (기본: 20)")
+    parser.add_argument("--duration", type=float, default=30, help="측정 시간 (초, 기본: 30)")
+    parser.add_argument("--mix", help=f"요청 비중 (기본: {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument("--think", type=float, default=0.0, help="요청 사이 평균 대기 시간 (초, 기본: 0)")
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 API 응답 지연 (초, 기본: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="가짜 API 지연 편차 (초, 기본: 0.02)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--app-url", help="이미 실행 중인 앱 주소 (지정하면 앱/가짜 API 서버를 띄우지 않음)")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="앱 프로세스 환경 변수 추가")
+    parser.add_argument("--name", default="default", help="기준선 시나리오 이름 (기본: default)")
+    parser.add_argument("--baseline-file", default=os.getenv("LOADTEST_BASELINE_FILE", "loadtest_baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true", help="이번 측정값을 기준선으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 악화 비율 (기본: 0.2)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="무시할 지연 차이 (ms, 기본: 5)")
+    parser.add_argument("-o", "--output", help="보고서 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    try:
+        mix = parse_mix(args.mix)
+        extra_env = dict(item.split("=", 1) for item in args.env)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
+    fake, process = None, None
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as workdir:
+        try:
+            if args.app_url:
+                base_url = args.app_url
+            else:
+                from app.fake_youtube import FakeYouTube
+
+                fake = FakeYouTube(latency=args.latency, jitter=args.jitter).start()
+                port = _free_port()
+                process = launch_app(fake.url, workdir, port, extra_env)
+                base_url = f"http://127.0.0.1:{port}"
+
+            logger.info(f"부하 테스트: 사용자 {args.users}명, {args.duration}초, 비중 {mix}")
+            report = asyncio.run(run_load(base_url, process, args.users, args.duration, mix, args.think, args.seed))
+        except RuntimeError as e:
+            logger.error(str(e))
+            return 2
+        finally:
+            if process is not None:
+                process.terminate()
+                try:
+                    process.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+            if fake is not None:
+                fake.stop()
+
+    report["scenario"] = {
+        "users": args.users, "duration": args.duration, "mix": mix, "think": args.think,
+        "latency": args.latency, "jitter": args.jitter
+    }
+    if fake is not None:
+        report["upstream_calls"] = dict(fake.calls)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        save_baseline(args.baseline_file, args.name, report)
+        logger.info(f"기준선 저장: {args.baseline_file} [{args.name}]")
+        return 0
+
+    baseline = load_baselines(args.baseline_file).get(args.name)
+    if baseline is None:
+        logger.info("비교할 기준선이 없습니다 (--save-baseline 으로 저장)")
+        return 0
+    if baseline.get("scenario") != report["scenario"]:
+        logger.warning("기준선과 시나리오 설정이 다릅니다. 비교 결과를 참고용으로만 보세요.")
+
+    regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    for line in regressions:
+        logger.warning(f"성능 저하: {line}")
+    if not regressions:
+        logger.info("기준선 대비 성능 저하 없음")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
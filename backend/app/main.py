@@ -1,15 +1,29 @@
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+import asyncio
+import logging
 import uvicorn
 import os
 from dotenv import load_dotenv
 
-from app.api import analysis, settings, export
+# 서비스 생성 시 환경 변수를 읽으므로 API 모듈 import 전에 로드
+load_dotenv()
+
+from app.api import analysis, settings, export, thumbnails, watchlist, discovery
 from app.services.youtube_service import YouTubeService
 from app.services.analysis_service import AnalysisService
 
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 콜드 스타트 시간 기록 (/health 에서 확인)
+startup_timings = {
+    "import_seconds": round(time.perf_counter() - _import_started, 4)
+}
 
 app = FastAPI(
     title="YouTube Analyzer API",
@@ -30,6 +44,50 @@ app.add_middleware(
 app.include_router(analysis.router, prefix="/api/analysis", tags=["analysis"])
 app.include_router(settings.router, prefix="/api/settings", tags=["settings"])
 app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(thumbnails.router, prefix="/api/thumbnails", tags=["thumbnails"])
+app.include_router(watchlist.router, prefix="/api/watchlist", tags=["watchlist"])
+app.include_router(discovery.router, prefix="/api/discovery", tags=["discovery"])
+
+# 프로파일 요청 작업의 결과 파일은 내보내기 저장소에 등록 (작업 ID 로 조회/다운로드)
+analysis.analysis_runner.artifact_store = export.export_store
+
+# 분석 완료 후 감시 목록 수확률 반영, 썸네일 미리 받기, 검색 색인 (수집 워커와 같은 구성)
+analysis.analysis_runner.register_completion_hooks(
+    watchlist=watchlist.watchlist,
+    thumbnail_cache=thumbnails.thumbnail_cache,
+    search_index=analysis.search_index
+)
+
+@app.on_event("startup")
+async def startup_event():
+    # 내보내기 파일 인덱스는 시작 시 한 번만 재구성
+    export.export_store.rebuild_index()
+    export.export_store.start_reaper()
+    thumbnails.thumbnail_cache.rebuild_index()
+    
+    # 감시 목록 순환 수집 (할당량을 하루에 나눠 사용)
+    if os.getenv("WATCHLIST_AUTORUN", "false").lower() == "true":
+        watchlist.scheduler.start(analysis.state_store, analysis.analysis_runner, settings.load_settings)
+    
+    # 설정 프로파일 예약 실행 (cron 주기가 지정된 프로파일만)
+    if os.getenv("PROFILE_SCHEDULER", "true").lower() == "true":
+        settings.scheduler.start(analysis.state_store, analysis.analysis_runner)
+    
+    # YouTube 클라이언트를 미리 만들어 첫 분석의 지연 제거
+    if os.getenv("YOUTUBE_WARMUP", "true").lower() == "true":
+        started = time.perf_counter()
+        try:
+            startup_timings.update(await asyncio.to_thread(analysis.youtube_service.warm_up))
+        except Exception as e:
+            logger.warning(f"YouTube 클라이언트 준비 실패: {e}")
+        startup_timings["warm_up_seconds"] = round(time.perf_counter() - started, 4)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    export.export_store.stop_reaper()
+    watchlist.scheduler.stop()
+    settings.scheduler.stop()
+    analysis.youtube_service.close()
 
 @app.get("/")
 async def root():
@@ -37,7 +95,7 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "startup": startup_timings}
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,6 +1,5 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from datetime import datetime
 from enum import Enum
 
 class AnalysisMode(str, Enum):
@@ -16,6 +15,7 @@ class ContentType(str, Enum):
 class AnalysisSettings(BaseModel):
     # 기본 설정
     api_key: str
+    api_keys: Optional[List[str]] = []  # 추가 API 키 (할당량 분산)
     analysis_mode: AnalysisMode
     content_type: ContentType
     
@@ -23,6 +23,7 @@ class AnalysisSettings(BaseModel):
     search_terms: Optional[List[str]] = []
     channel_ids: Optional[List[str]] = []
     days_back: int = 7
+    trending_category_ids: Optional[List[str]] = []  # 검색어/채널이 없을 때 인기 영상 카테고리 (비우면 전체)
     
     # 필터링 설정
     max_videos_per_channel: int = 50
@@ -36,31 +37,47 @@ class AnalysisSettings(BaseModel):
     # 지역/언어 설정
     region_code: str = "KR"
     language: str = "ko"
+    region_codes: Optional[List[str]] = []  # 여러 지역 동시 검색 (비우면 region_code 만)
     
     # 채널별 인기영상 보기
     show_popular_videos: bool = True
+    
+    # 채널 평소 조회수 대비 급상승 점수 (채널당 약 2 unit 추가, 기준선은 캐시)
+    score_breakouts: bool = False
+    
+    # 수집/분석 단계 스택 샘플링 (프로파일 파일을 내보내기 목록에 저장, 결과 캐시는 건너뜀)
+    profile: bool = False
 
-class VideoData(BaseModel):
-    video_id: str
-    title: str
-    channel_name: str
+    def search_regions(self) -> List[str]:
+        """검색/인기 영상을 수집할 지역 목록 (중복 제거, 대문자)"""
+        regions = [code.strip().upper() for code in (self.region_codes or []) if code and code.strip()]
+        return list(dict.fromkeys(regions)) or [self.region_code]
+
+class ChannelData(BaseModel):
     channel_id: str
-    upload_date: datetime
-    views: int
-    views_per_hour: float
+    channel_name: str
     subscribers: int
-    views_to_subscribers_ratio: float
-    duration: int  # 초
-    video_url: str
-    thumbnail_url: str
-    is_shorts: bool
 
-class AnalysisResult(BaseModel):
-    videos: List[VideoData]
-    total_videos: int
-    analysis_date: datetime
-    settings: AnalysisSettings
-    summary: Dict[str, Any]
+class WatchlistItem(BaseModel):
+    kind: str  # channel, keyword
+    value: str  # 채널 ID 또는 검색어
+    priority: int = 5  # 1~10
+
+class DiscoveryRequest(BaseModel):
+    seeds: Optional[List[str]] = []  # 시작 채널 (ID/@핸들/URL, 비우면 현재 결과의 검색어 영상 채널)
+    budget: Optional[int] = None  # 할당량 예산 (units)
+    max_channels: Optional[int] = None  # 새로 찾을 최대 채널 수
+    max_depth: Optional[int] = None  # 시작 채널에서 추천 채널을 따라가는 최대 단계
+
+class DiscoveryWatchlistRequest(BaseModel):
+    limit: int = 10  # 감시 목록에 넣을 상위 후보 수
+    min_score: float = 0.0
+    priority: int = 5  # 1~10
+
+class SettingsProfileRequest(BaseModel):
+    settings: Dict[str, Any]  # 분석 설정 (AnalysisSettings 필드)
+    schedule: Optional[str] = None  # cron 식 ("0 * * * *"), @hourly/@daily 또는 "@every 30m" - 비우면 수동 실행만
+    enabled: bool = True
 
 class ExportRequest(BaseModel):
     format: str = "excel"  # excel, json
@@ -0,0 +1,202 @@
+from typing import Dict, Any, List, Optional, Callable
+from contextlib import nullcontext
+import json
+import os
+import sys
+import logging
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.youtube_service import YouTubeService
+from app.services.analysis_service import AnalysisService
+from app.services.state_store import StateStore
+from app.services.run_cache import RunCache, settings_fingerprint
+from app.services.profiler import SamplingProfiler
+from app.services.analytics_cube import AnalyticsCubeCache
+
+logger = logging.getLogger(__name__)
+
+# 수집된 영상이 없을 때 상태에 기록하는 오류 메시지
+NO_VIDEOS_ERROR = "수집된 데이터가 없습니다. 검색 조건을 확인해주세요."
+
+class AnalysisCancelled(Exception):
+    """중단 요청 또는 다른 작업으로 교체됨"""
+
+class AnalysisRunner:
+    """수집 → 분석 → 결과 저장 파이프라인 (API 프로세스와 수집 워커가 공유)"""
+
+    def __init__(self, store: StateStore, youtube_service: Optional[YouTubeService] = None,
+                 analysis_service: Optional[AnalysisService] = None, run_cache: Optional[RunCache] = None):
+        self.store = store
+        self.youtube_service = youtube_service or YouTubeService()
+        self.analysis_service = analysis_service or AnalysisService()
+        self.run_cache = run_cache or RunCache(store)
+        # 결과 저장 후 호출할 함수 (payload 를 받음, 예: 썸네일 미리 받기)
+        self.completion_hooks: List[Callable[[Dict[str, Any]], None]] = []
+        # 작업별 차트 집계 큐브 (차트 조회 API 가 결과 버전으로 찾음)
+        self.cubes = AnalyticsCubeCache()
+        # 프로파일 결과 파일을 등록할 내보내기 저장소 (없으면 요약만 결과에 포함)
+        self.artifact_store = None
+
+    def register_completion_hooks(self, watchlist=None, thumbnail_cache=None, search_index=None):
+        """API 서버와 수집 워커가 같이 쓰는 완료 후 작업 등록 (없는 서비스는 건너뜀)
+
+        watchlist: 결과의 검색어/채널별 통과 영상 수를 수확률에 반영
+        thumbnail_cache: 결과 표에 쓸 썸네일을 백그라운드로 미리 받아둠 (THUMBNAIL_PREFETCH=false 면 끔)
+        search_index: 결과 영상 제목/채널명 색인
+        """
+        if watchlist is not None:
+            self.completion_hooks.append(lambda payload: watchlist.record_yield(payload.get("source_yield") or {}))
+        if thumbnail_cache is not None and os.getenv("THUMBNAIL_PREFETCH", "true").lower() == "true":
+            self.completion_hooks.append(
+                lambda payload: thumbnail_cache.prefetch(v["video_id"] for v in payload.get("videos", []))
+            )
+        if search_index is not None:
+            self.completion_hooks.append(lambda payload: search_index.ingest(payload, payload.get("job_id")))
+
+    async def execute(self, job_id: str, settings: AnalysisSettings,
+                      on_progress: Optional[Callable[[str, int], None]] = None) -> Optional[Dict[str, Any]]:
+        """수집 → 분석 → 차트 생성 후 결과 dict 반환 (수집된 영상이 없으면 None)
+
+        settings.profile 이면 실행 중 스택을 샘플링해서 프로파일 파일을 남기고 결과에 요약을 넣는다.
+        """
+        report = on_progress or (lambda task, progress: None)
+        if not settings.profile:
+            return await self._execute(job_id, settings, report, lambda name: nullcontext())
+
+        profiler = SamplingProfiler()
+        profiler.start(sys._getframe())
+        try:
+            payload = await self._execute(job_id, settings, report, profiler.stage)
+        finally:
+            profiler.stop()
+            summary = self._save_profile(job_id, profiler)
+
+        if payload is not None:
+            payload["profile"] = summary
+        return payload
+
+    async def _execute(self, job_id: str, settings: AnalysisSettings, report: Callable[[str, int], None],
+                       stage: Callable[[str], Any]) -> Optional[Dict[str, Any]]:
+        # 1단계: 데이터 수집
+        report("YouTube 데이터 수집 중...", 20)
+
+        logger.info(f"분석 시작 [{job_id}] - 설정: {settings.dict(exclude={'api_key', 'api_keys'})}")
+        sources: Dict[str, List[str]] = {}
+        with stage("collect"):
+            videos, channels = await self.youtube_service.collect_data(settings, sources)
+
+        logger.info(f"수집된 영상 수: {len(videos) if videos else 0}")
+
+        if not videos:
+            logger.warning("수집된 데이터가 없음")
+            return None
+
+        # 2단계: 데이터 분석
+        report("데이터 분석 중...", 60)
+
+        with stage("analyze"):
+            result = self.analysis_service.analyze(videos, settings, channels)
+
+        # 3단계: 차트 데이터 생성
+        report("차트 데이터 생성 중...", 80)
+
+        with stage("charts"):
+            cube = self.analysis_service.build_cube(result)
+            charts_data = self.analysis_service.create_charts_data(result, cube)
+            payload = self.build_payload(job_id, result, settings, charts_data)
+            self.cubes.put(job_id, cube)
+        
+        # 검색어/채널별로 필터를 통과한 영상 수 (감시 목록 수확률 계산용)
+        passed = set(result.videos.video_ids)
+        payload["source_yield"] = {
+            source: sum(1 for video_id in set(found) if video_id in passed)
+            for source, found in sources.items()
+        }
+        return payload
+
+    async def run(self, job_id: str, settings: AnalysisSettings, slot: Optional[str] = None):
+        """분석 실행 후 상태/결과를 저장소에 기록 (slot: 현재 결과 대신 저장할 결과 이름)
+
+        모든 쓰기는 job_id 를 확인하는 비교 후 교체라서, 중단된 뒤 늦게 끝난 작업은
+        그 사이 시작된 다른 작업의 상태/결과를 덮어쓰지 않는다.
+        """
+        def report(task: str, progress: int):
+            if not self.store.update_status(job_id, current_task=task, progress=progress):
+                raise AnalysisCancelled()
+
+        try:
+            payload = await self.execute(job_id, settings, report)
+
+            if payload is None:
+                self.store.update_status(job_id, error=NO_VIDEOS_ERROR, is_running=False)
+                return
+
+            # 결과 저장 (중단 요청 또는 다른 작업으로 교체되었으면 저장하지 않음)
+            if not self.store.set_result(payload, job_id, slot):
+                raise AnalysisCancelled()
+            # 프로파일 요약은 이 작업의 측정값이므로 재사용 캐시에 넣지 않음
+            # (메모리 저장소는 현재 결과와 캐시가 job_id 로 같은 결과를 함께 쓰므로 요약을 뺀 복사본도 둘 수 없음)
+            if "profile" not in payload:
+                self.run_cache.put(settings_fingerprint(settings), payload)
+
+            # 완료
+            self.store.update_status(job_id, current_task="분석 완료", progress=100, is_running=False)
+
+            for hook in self.completion_hooks:
+                try:
+                    hook(payload)
+                except Exception as e:
+                    logger.warning(f"완료 후 작업 실패: {e}")
+
+        except AnalysisCancelled:
+            logger.info(f"분석 [{job_id}] 중단됨")
+
+        except Exception as e:
+            logger.error(f"분석 실행 중 오류: {e}")
+            self.store.update_status(
+                job_id,
+                error=str(e),
+                is_running=False,
+                current_task=f"오류 발생: {str(e)}"
+            )
+
+    def _save_profile(self, job_id: str, profiler: SamplingProfiler) -> Dict[str, Any]:
+        """folded stack 파일과 상위 함수 통계 파일을 작업 결과물로 등록하고 요약 반환"""
+        summary = profiler.summary()
+        summary["artifacts"] = {}
+        if self.artifact_store is None:
+            return summary
+
+        try:
+            folded_path = self.artifact_store.new_file_path(f"profile_{job_id}", "folded")
+            with open(folded_path, 'w', encoding='utf-8') as f:
+                f.write(profiler.folded())
+            self.artifact_store.register(folded_path, source_job=job_id, file_format="folded")
+
+            stats_path = self.artifact_store.new_file_path(f"profile_{job_id}", "json")
+            with open(stats_path, 'w', encoding='utf-8') as f:
+                json.dump({"job_id": job_id, **summary}, f, ensure_ascii=False, indent=2)
+            self.artifact_store.register(stats_path, source_job=job_id, file_format="profile")
+
+            summary["artifacts"] = {"folded": folded_path.name, "stats": stats_path.name}
+            logger.info(f"프로파일 저장 [{job_id}]: 샘플 {summary['samples']}개 → {folded_path.name}")
+        except Exception as e:
+            logger.warning(f"프로파일 저장 실패: {e}")
+        return summary
+
+    def build_payload(self, job_id: str, result, settings: AnalysisSettings, charts_data: Dict[str, Any]) -> Dict[str, Any]:
+        """API 응답용 결과 dict 생성"""
+        return {
+            "job_id": job_id,
+            "videos": result.videos.rows(),
+            # 채널 정보는 영상마다 반복하지 않고 channel_id 로 한 번만 전달
+            "channels": {
+                channel_id: channel.dict(exclude={"channel_id"})
+                for channel_id, channel in result.channels.items()
+            },
+            "total_videos": result.total_videos,
+            "analysis_date": result.analysis_date.isoformat(),
+            "settings": settings.dict(),
+            "summary": result.summary,
+            "charts": charts_data
+        }
@@ -1,35 +1,55 @@
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import List, Dict, Any, Optional
+from datetime import datetime, tzinfo
 from collections import defaultdict
 
-from app.models.analysis_models import VideoData, AnalysisResult, AnalysisSettings
+from app.models.analysis_models import ChannelData, AnalysisSettings
+from app.services.analytics_cube import VIEWS_BUCKET_LABELS, AnalyticsCube, chart_region, region_timezone
+from app.services.video_decoder import VideoColumns
+
+class ColumnarResult:
+    """분석 결과 - 영상은 VideoColumns 로 두고 영상별 dict 는 응답을 만들 때(build_payload) 생성"""
+
+    def __init__(self, videos: VideoColumns, channels: Dict[str, ChannelData], analysis_date: datetime,
+                 settings: AnalysisSettings, summary: Dict[str, Any]):
+        self.videos = videos
+        self.channels = channels
+        self.total_videos = len(videos)
+        self.analysis_date = analysis_date
+        self.settings = settings
+        self.summary = summary
 
 class AnalysisService:
     def __init__(self):
         pass
     
-    def analyze(self, videos: List[VideoData], settings: AnalysisSettings) -> AnalysisResult:
-        """영상 데이터 분석"""
-        if not videos:
-            return AnalysisResult(
-                videos=[],
-                total_videos=0,
-                analysis_date=datetime.now(),
-                settings=settings,
-                summary={}
-            )
+    def analyze(self, videos: VideoColumns, settings: AnalysisSettings,
+                channels: Optional[Dict[str, ChannelData]] = None) -> ColumnarResult:
+        """영상 데이터 분석 (videos: annotate() 를 거친 열, channels: channel_id → 채널 정보)"""
+        channels = channels or {}
+        if len(videos) and settings.score_breakouts:
+            # 서버에서 급상승 점수 순으로 정렬 (점수가 같으면 조회수 순)
+            videos = videos.select(sorted(
+                range(len(videos)), key=lambda i: (videos.breakout_scores[i], videos.views[i]), reverse=True
+            ))
+        
+        if not len(videos):
+            return ColumnarResult(VideoColumns(), {}, datetime.now(), settings, {})
+        
+        rows = list(range(len(videos)))
         
         # 기본 통계 계산
-        summary = self._calculate_summary(videos)
+        summary = self._calculate_summary(videos, channels)
         
-        # 시간당 조회수 그래프 데이터 생성
-        hourly_data = self._calculate_hourly_views(videos)
+        # 시간당 조회수 그래프 데이터 생성 (업로드 시각은 차트 기준 지역 시간대, 지역별 시간대는 regions 통계)
+        hourly_data = self._calculate_hourly_views(
+            videos, rows, region_timezone(chart_region(settings.region_code, settings.region_codes))
+        )
         
         # 채널별 통계
-        channel_stats = self._calculate_channel_stats(videos)
+        channel_stats = self._calculate_channel_stats(videos, channels)
         
         # 인기 영상 (상위 10개)
-        popular_videos = self._get_popular_videos(videos, 10)
+        popular_videos = self._get_popular_videos(videos, rows, 10)
         
         summary.update({
             'hourly_views': hourly_data,
@@ -37,66 +57,62 @@ class AnalysisService:
             'popular_videos': popular_videos
         })
         
-        return AnalysisResult(
-            videos=videos,
-            total_videos=len(videos),
-            analysis_date=datetime.now(),
-            settings=settings,
-            summary=summary
-        )
+        # 지역별 통계 (여러 지역을 함께 수집한 경우)
+        if settings.region_codes:
+            summary['regions'] = self._calculate_region_stats(videos, settings.search_regions())
+        
+        # 급상승 영상 (채널 평소 대비 점수 상위 10개)
+        if settings.score_breakouts:
+            summary['breakout_videos'] = self._get_popular_videos(videos, rows, 10, key=videos.breakout_scores)
+        
+        return ColumnarResult(videos, channels, datetime.now(), settings, summary)
     
-    def _calculate_summary(self, videos: List[VideoData]) -> Dict[str, Any]:
+    def _calculate_summary(self, videos: VideoColumns, channels: Dict[str, ChannelData]) -> Dict[str, Any]:
         """기본 통계 계산"""
-        if not videos:
+        n = len(videos)
+        if not n:
             return {}
         
-        total_views = sum(v.views for v in videos)
-        views_list = [v.views for v in videos]
-        views_per_hour_list = [v.views_per_hour for v in videos]
+        total_views = sum(videos.views)
         
         # 중앙값 계산
-        sorted_views = sorted(views_list)
-        n = len(sorted_views)
+        sorted_views = sorted(videos.views)
         median_views = sorted_views[n // 2] if n % 2 == 1 else (sorted_views[n // 2 - 1] + sorted_views[n // 2]) / 2
         
-        sorted_vph = sorted(views_per_hour_list)
+        sorted_vph = sorted(videos.vph)
         median_vph = sorted_vph[n // 2] if n % 2 == 1 else (sorted_vph[n // 2 - 1] + sorted_vph[n // 2]) / 2
         
-        # 채널 수 계산
-        unique_channels = set(v.channel_name for v in videos)
-        
         # 쇼츠/롱폼 카운트
-        shorts_count = sum(1 for v in videos if v.is_shorts)
-        long_form_count = len(videos) - shorts_count
+        shorts_count = sum(videos.shorts)
         
         return {
-            'total_videos': len(videos),
+            'total_videos': n,
             'total_views': total_views,
-            'avg_views': total_views / len(videos),
+            'avg_views': total_views / n,
             'median_views': median_views,
-            'avg_views_per_hour': sum(views_per_hour_list) / len(views_per_hour_list),
+            'avg_views_per_hour': sum(videos.vph) / n,
             'median_views_per_hour': median_vph,
-            'total_channels': len(unique_channels),
+            'total_channels': len(set(videos.channel_ids)),
             'shorts_count': shorts_count,
-            'long_form_count': long_form_count,
-            'avg_duration': sum(v.duration for v in videos) / len(videos),
-            'avg_subscribers': sum(v.subscribers for v in videos) / len(videos),
-            'avg_views_to_subscribers_ratio': sum(v.views_to_subscribers_ratio for v in videos) / len(videos)
+            'long_form_count': n - shorts_count,
+            'avg_duration': sum(videos.durations) / n,
+            'avg_subscribers': sum(channels[cid].subscribers for cid in videos.channel_ids if cid in channels) / n,
+            'avg_views_to_subscribers_ratio': sum(videos.ratios) / n
         }
     
-    def _calculate_hourly_views(self, videos: List[VideoData]) -> List[Dict[str, Any]]:
-        """시간당 조회수 데이터 계산"""
-        if not videos:
+    def _calculate_hourly_views(self, videos: VideoColumns, rows: List[int], tz: tzinfo) -> List[Dict[str, Any]]:
+        """시간당 조회수 데이터 계산 (rows 행만, tz 기준 업로드 시)"""
+        if not rows:
             return []
         
         # 시간별로 그룹화
         hourly_data = defaultdict(lambda: {'total_views': 0, 'video_count': 0, 'views_per_hour_sum': 0})
         
-        for video in videos:
-            hour = video.upload_date.hour
-            hourly_data[hour]['total_views'] += video.views
+        for i in rows:
+            hour = datetime.fromtimestamp(videos.published[i], tz).hour
+            hourly_data[hour]['total_views'] += videos.views[i]
             hourly_data[hour]['video_count'] += 1
-            hourly_data[hour]['views_per_hour_sum'] += video.views_per_hour
+            hourly_data[hour]['views_per_hour_sum'] += videos.vph[i]
         
         # 결과 변환
         result = []
@@ -113,41 +129,38 @@ class AnalysisService:
         
         return result
     
-    def _calculate_channel_stats(self, videos: List[VideoData]) -> List[Dict[str, Any]]:
-        """채널별 통계 계산"""
-        if not videos:
+    def _calculate_channel_stats(self, videos: VideoColumns, channels: Dict[str, ChannelData]) -> List[Dict[str, Any]]:
+        """채널별 통계 계산 (channel_id 기준, 채널명/구독자수는 채널 테이블에서)"""
+        if not len(videos):
             return []
         
         # 채널별로 그룹화
         channel_data = defaultdict(lambda: {
-            'channel_id': '',
             'total_views': 0,
             'video_count': 0,
             'views_per_hour_sum': 0,
-            'subscribers': 0,
             'views_to_subscribers_ratio_sum': 0
         })
         
-        for video in videos:
-            ch_name = video.channel_name
-            channel_data[ch_name]['channel_id'] = video.channel_id
-            channel_data[ch_name]['total_views'] += video.views
-            channel_data[ch_name]['video_count'] += 1
-            channel_data[ch_name]['views_per_hour_sum'] += video.views_per_hour
-            channel_data[ch_name]['subscribers'] = video.subscribers  # 마지막 값 사용
-            channel_data[ch_name]['views_to_subscribers_ratio_sum'] += video.views_to_subscribers_ratio
+        for channel_id, views, vph, ratio in zip(videos.channel_ids, videos.views, videos.vph, videos.ratios):
+            data = channel_data[channel_id]
+            data['total_views'] += views
+            data['video_count'] += 1
+            data['views_per_hour_sum'] += vph
+            data['views_to_subscribers_ratio_sum'] += ratio
         
         # 결과 변환 및 정렬
         result = []
-        for channel_name, data in channel_data.items():
+        for channel_id, data in channel_data.items():
+            channel = channels.get(channel_id)
             result.append({
-                'channel_name': channel_name,
-                'channel_id': data['channel_id'],
+                'channel_id': channel_id,
+                'channel_name': channel.channel_name if channel else channel_id,
                 'total_views': data['total_views'],
                 'avg_views': round(data['total_views'] / data['video_count'], 2),
                 'video_count': data['video_count'],
                 'avg_views_per_hour': round(data['views_per_hour_sum'] / data['video_count'], 2),
-                'subscribers': data['subscribers'],
+                'subscribers': channel.subscribers if channel else 0,
                 'avg_views_to_subscribers_ratio': round(data['views_to_subscribers_ratio_sum'] / data['video_count'], 2)
             })
         
@@ -156,80 +169,126 @@ class AnalysisService:
         
         return result
     
-    def _get_popular_videos(self, videos: List[VideoData], limit: int = 10) -> List[Dict[str, Any]]:
-        """인기 영상 상위 N개 반환"""
-        if not videos:
+    def _calculate_region_stats(self, videos: VideoColumns, regions: List[str]) -> Dict[str, Any]:
+        """지역별 통계 (영상의 regions 기준, 여러 지역에서 찾은 영상은 각 지역에 모두 포함)"""
+        by_region: Dict[str, List[int]] = {region: [] for region in regions}
+        for i, found_in in enumerate(videos.regions):
+            for region in found_in:
+                if region in by_region:
+                    by_region[region].append(i)
+        
+        stats = []
+        for region, rows in by_region.items():
+            count = len(rows)
+            total_views = sum(videos.views[i] for i in rows)
+            shorts_count = sum(videos.shorts[i] for i in rows)
+            hourly = self._calculate_hourly_views(videos, rows, region_timezone(region))
+            stats.append({
+                'region_code': region,
+                'total_videos': count,
+                'total_views': total_views,
+                'avg_views': round(total_views / count, 2) if count else 0,
+                'avg_views_per_hour': round(sum(videos.vph[i] for i in rows) / count, 2) if count else 0,
+                'total_channels': len(set(videos.channel_ids[i] for i in rows)),
+                'shorts_count': shorts_count,
+                'long_form_count': count - shorts_count,
+                # 이 지역에서만 찾은 영상 수
+                'exclusive_count': sum(1 for i in rows if len(videos.regions[i]) == 1),
+                # 지역 시간대 기준 평균 조회수가 가장 높은 업로드 시
+                'best_upload_hour': max(hourly, key=lambda x: x['avg_views'])['upload_hour'] if hourly else None,
+                'popular_videos': self._get_popular_videos(videos, rows, 5)
+            })
+        
+        # 지역 쌍별 겹치는 영상 수 (행 번호가 곧 영상)
+        overlap = []
+        for i, first in enumerate(regions):
+            first_rows = set(by_region[first])
+            for second in regions[i + 1:]:
+                overlap.append({
+                    'regions': [first, second],
+                    'shared_videos': sum(1 for row in by_region[second] if row in first_rows)
+                })
+        
+        return {
+            'codes': regions,
+            'stats': stats,
+            'overlap': overlap,
+            'shared_by_all': sum(1 for found_in in videos.regions if len(found_in) == len(regions)) if len(regions) > 1 else 0
+        }
+    
+    def _get_popular_videos(self, videos: VideoColumns, rows: List[int],
+                            limit: int = 10, key=None) -> List[Dict[str, Any]]:
+        """rows 중 상위 N개 반환 (key: 행별 정렬 값 배열, 주지 않으면 조회수 순)"""
+        if not rows:
             return []
         
         # 조회수 순으로 정렬
-        sorted_videos = sorted(videos, key=lambda x: x.views, reverse=True)[:limit]
+        values = key if key is not None else videos.views
+        top = sorted(rows, key=lambda i: values[i], reverse=True)[:limit]
         
         return [
             {
-                'video_id': v.video_id,
-                'title': v.title,
-                'channel_name': v.channel_name,
-                'views': v.views,
-                'views_per_hour': round(v.views_per_hour, 2),
-                'upload_date': v.upload_date.isoformat(),
-                'video_url': v.video_url,
-                'thumbnail_url': v.thumbnail_url
+                'video_id': videos.video_ids[i],
+                'title': videos.titles[i],
+                'channel_id': videos.channel_ids[i],
+                'views': videos.views[i],
+                'views_per_hour': round(videos.vph[i], 2),
+                'breakout_score': videos.breakout_scores[i],
+                'baseline_views': videos.baseline_views[i],
+                'upload_date': videos.uploaded(i).isoformat(),
+                'video_url': f"https://www.youtube.com/watch?v={videos.video_ids[i]}",
+                'thumbnail_url': videos.thumbnail_urls[i]
             }
-            for v in sorted_videos
+            for i in top
         ]
     
-    def create_charts_data(self, analysis_result: AnalysisResult) -> Dict[str, Any]:
-        """차트 데이터 생성"""
-        if not analysis_result.videos:
+    def build_cube(self, analysis_result: ColumnarResult) -> AnalyticsCube:
+        """차트용 집계 큐브 (차트 기준 지역 시간대 - 여러 지역을 수집했으면 첫 번째 지역)"""
+        settings = analysis_result.settings
+        return AnalyticsCube.from_columns(
+            analysis_result.videos, chart_region(settings.region_code, settings.region_codes), analysis_result.channels
+        )
+    
+    def create_charts_data(self, analysis_result: ColumnarResult,
+                           cube: Optional[AnalyticsCube] = None) -> Dict[str, Any]:
+        """차트 데이터 생성 (집계 큐브에서 조회, 시간은 지역 시간대 기준)"""
+        if not len(analysis_result.videos):
             return {}
         
-        videos = analysis_result.videos
+        cube = cube or self.build_cube(analysis_result)
         
         # 시간별 조회수 그래프
-        hourly_views = [0] * 24
-        for video in videos:
-            hour = video.upload_date.hour
-            hourly_views[hour] += video.views
+        hourly = {row['hour']: row['views'] for row in cube.query(['hour'])['rows']}
         
-        # 채널별 조회수 (상위 10개)
-        channel_views = defaultdict(int)
-        for video in videos:
-            channel_views[video.channel_name] += video.views
-        
-        top_channels = sorted(channel_views.items(), key=lambda x: x[1], reverse=True)[:10]
+        # 채널별 조회수 (상위 10개, 이름이 같은 채널도 구분되도록 channel_id 로 합산)
+        top_channels = cube.query(['channel'], measure='views', limit=10)
         
         # 콘텐츠 타입별 분포
-        shorts_count = sum(1 for v in videos if v.is_shorts)
-        long_form_count = len(videos) - shorts_count
+        content_types = {row['content_type']: row['videos'] for row in cube.query(['content_type'])['rows']}
         
         # 조회수 분포
-        bins = [0, 1000, 10000, 100000, 1000000, float('inf')]
-        labels = ['1K 미만', '1K-10K', '10K-100K', '100K-1M', '1M 이상']
-        distribution = [0] * len(labels)
-        
-        for video in videos:
-            for i, (low, high) in enumerate(zip(bins[:-1], bins[1:])):
-                if low <= video.views < high:
-                    distribution[i] += 1
-                    break
+        buckets = cube.query(['views_bucket'])
+        distribution = {row['views_bucket']: row['videos'] for row in buckets['rows']}
         
         charts_data = {
             'hourly_views_chart': {
                 'labels': [f"{i}시" for i in range(24)],
-                'data': hourly_views
+                'data': [hourly.get(i, 0) for i in range(24)],
+                'timezone': cube.stats()['timezone'],
+                'region_code': cube.region_code
             },
             'channel_views_chart': {
-                'labels': [ch[0] for ch in top_channels],
-                'data': [ch[1] for ch in top_channels]
+                'labels': top_channels['labels'],
+                'data': top_channels['data']
             },
             'content_type_pie': {
                 'labels': ['쇼츠', '롱폼'],
-                'data': [shorts_count, long_form_count]
+                'data': [content_types.get('shorts', 0), content_types.get('long_form', 0)]
             },
             'views_distribution': {
-                'labels': labels,
-                'data': distribution
+                'labels': VIEWS_BUCKET_LABELS,
+                'data': [distribution.get(i, 0) for i in range(len(VIEWS_BUCKET_LABELS))]
             }
         }
         
-        return charts_data
\ No newline at end of file
+        return charts_data
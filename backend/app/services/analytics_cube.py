@@ -0,0 +1,308 @@
+import logging
+import os
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# 지역 코드 → 대표 시간대 (시간대가 여러 개인 나라는 인구가 가장 많은 곳)
+REGION_TIMEZONES = {
+    "KR": "Asia/Seoul", "JP": "Asia/Tokyo", "CN": "Asia/Shanghai", "TW": "Asia/Taipei",
+    "HK": "Asia/Hong_Kong", "SG": "Asia/Singapore", "TH": "Asia/Bangkok", "VN": "Asia/Ho_Chi_Minh",
+    "ID": "Asia/Jakarta", "PH": "Asia/Manila", "MY": "Asia/Kuala_Lumpur", "IN": "Asia/Kolkata",
+    "US": "America/New_York", "CA": "America/Toronto", "MX": "America/Mexico_City", "BR": "America/Sao_Paulo",
+    "AR": "America/Argentina/Buenos_Aires", "GB": "Europe/London", "DE": "Europe/Berlin", "FR": "Europe/Paris",
+    "ES": "Europe/Madrid", "IT": "Europe/Rome", "NL": "Europe/Amsterdam", "RU": "Europe/Moscow",
+    "TR": "Europe/Istanbul", "AU": "Australia/Sydney", "NZ": "Pacific/Auckland"
+}
+
+DIMENSIONS = ("date", "hour", "weekday", "content_type", "channel", "views_bucket")
+MEASURES = ("videos", "views", "views_per_hour")
+
+# 조회수 구간 (create_charts_data 의 조회수 분포와 같은 경계)
+VIEWS_BUCKET_BOUNDS = [1000, 10000, 100000, 1000000]
+VIEWS_BUCKET_LABELS = ['1K 미만', '1K-10K', '10K-100K', '100K-1M', '1M 이상']
+WEEKDAY_LABELS = ['월', '화', '수', '목', '금', '토', '일']
+CONTENT_TYPE_LABELS = {"shorts": "쇼츠", "long_form": "롱폼"}
+
+# 숫자 차원의 값 범위 (필터의 a..b 범위를 이 안으로 자름)
+NUMERIC_DOMAINS = {"hour": (0, 23), "weekday": (0, 6), "views_bucket": (0, len(VIEWS_BUCKET_LABELS) - 1)}
+
+# 미리 합계를 만들어 두는 최대 차원 수 (그 이상이거나 필터가 있으면 셀을 접어서 계산)
+MATERIALIZED_DIMENSIONS = 2
+
+def region_timezone(region_code: Optional[str]) -> ZoneInfo:
+    """지역 코드의 시간대 (모르는 지역은 ANALYTICS_DEFAULT_TZ, 기본 UTC)"""
+    name = REGION_TIMEZONES.get((region_code or "").upper()) or os.getenv("ANALYTICS_DEFAULT_TZ", "UTC")
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        logger.warning(f"알 수 없는 시간대: {name}, UTC 사용")
+        return ZoneInfo("UTC")
+
+def chart_region(region_code: Optional[str], region_codes: Optional[Sequence[str]] = None) -> Optional[str]:
+    """차트 시간대 기준 지역 (여러 지역을 함께 수집했으면 첫 번째 지역, 지역별 시간대 통계는 summary 의 regions)"""
+    regions = [code.strip().upper() for code in (region_codes or []) if code and code.strip()]
+    return regions[0] if regions else region_code
+
+def views_bucket(views: int) -> int:
+    return bisect_right(VIEWS_BUCKET_BOUNDS, views)
+
+class AnalyticsCube:
+    """영상 집계 큐브 (현지 날짜, 시, 요일, 콘텐츠 타입, 채널, 조회수 구간)
+
+    작업마다 한 번 영상을 훑어 차원 조합별 (영상 수, 조회수 합, 시간당 조회수 합) 셀을 만들고,
+    차원 2개 이하의 합계는 모두 미리 계산해 둔다. 필터가 없는 1~2차원 조회는 미리 만든 합계를
+    그대로 돌려주고, 그 밖의 조회는 셀(영상보다 적음)만 접어서 계산한 뒤 결과를 캐시한다.
+    """
+
+    def __init__(self, tz: ZoneInfo, channel_names: Optional[Dict[str, str]] = None, cache_size: int = 64,
+                 region_code: Optional[str] = None):
+        self.tz = tz
+        # 시간대를 정한 지역 (응답에 함께 표시)
+        self.region_code = region_code
+        self.channel_names = channel_names or {}
+        self.cells: Dict[Tuple[Any, ...], List[float]] = {}
+        self._rollups: Dict[Tuple[int, ...], Dict[Tuple[Any, ...], List[float]]] = {}
+        self._cache: "OrderedDict[Any, Dict[str, Any]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.video_count = 0
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, records: Iterable[Tuple[datetime, int, float, bool, str]], tz: ZoneInfo,
+              channel_names: Optional[Dict[str, str]] = None, region_code: Optional[str] = None) -> "AnalyticsCube":
+        """(업로드 시각, 조회수, 시간당 조회수, 쇼츠 여부, channel_id) 목록으로 큐브 생성"""
+        cube = cls(tz, channel_names, region_code=region_code)
+        cells = cube.cells
+        for uploaded, views, vph, is_shorts, channel_id in records:
+            if uploaded.tzinfo is None:
+                uploaded = uploaded.replace(tzinfo=timezone.utc)
+            local = uploaded.astimezone(tz)
+            key = (local.date().isoformat(), local.hour, local.weekday(),
+                   "shorts" if is_shorts else "long_form", channel_id, views_bucket(views))
+            cell = cells.get(key)
+            if cell is None:
+                cell = cells[key] = [0, 0, 0.0]
+            cell[0] += 1
+            cell[1] += views
+            cell[2] += vph
+            cube.video_count += 1
+
+        for size in range(MATERIALIZED_DIMENSIONS + 1):
+            for dims in combinations(range(len(DIMENSIONS)), size):
+                cube._rollups[dims] = cube._fold(dims)
+        return cube
+
+    @classmethod
+    def from_columns(cls, videos, region_code: Optional[str], channels=None) -> "AnalyticsCube":
+        """annotate() 를 거친 VideoColumns 로 생성 (region_code: 시간대 기준 지역, channels: channel_id → ChannelData)"""
+        names = {cid: channel.channel_name for cid, channel in (channels or {}).items()}
+        return cls.build(
+            ((videos.uploaded(i), videos.views[i], videos.vph[i], bool(videos.shorts[i]), videos.channel_ids[i])
+             for i in range(len(videos))),
+            region_timezone(region_code), names, region_code
+        )
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "AnalyticsCube":
+        """저장된 결과 dict 로 생성 (영상 행 + 채널 테이블 + 설정의 차트 기준 지역)"""
+        rows = result.get("videos") or []
+        names = {cid: channel.get("channel_name") for cid, channel in (result.get("channels") or {}).items()}
+        settings = result.get("settings") or {}
+        region_code = chart_region(settings.get("region_code"), settings.get("region_codes"))
+
+        def records():
+            for row in rows:
+                uploaded = row.get("upload_date")
+                if isinstance(uploaded, str):
+                    uploaded = datetime.fromisoformat(uploaded.replace("Z", "+00:00"))
+                yield uploaded, row.get("views", 0), row.get("views_per_hour", 0.0), \
+                    row.get("is_shorts", False), row.get("channel_id")
+
+        return cls.build(records(), region_timezone(region_code), names, region_code)
+
+    def _fold(self, dims: Sequence[int], filters: Optional[Dict[int, set]] = None) -> Dict[Tuple[Any, ...], List[float]]:
+        """셀을 지정한 차원으로 합침 (filters: 차원 번호 → 허용 값)"""
+        folded: Dict[Tuple[Any, ...], List[float]] = {}
+        filter_items = list((filters or {}).items())
+        for key, (count, views, vph) in self.cells.items():
+            if any(key[d] not in allowed for d, allowed in filter_items):
+                continue
+            group = tuple(key[d] for d in dims)
+            target = folded.get(group)
+            if target is None:
+                folded[group] = [count, views, vph]
+            else:
+                target[0] += count
+                target[1] += views
+                target[2] += vph
+        return folded
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def parse_filter(self, dimension: str, text: str) -> set:
+        """차원 필터 값 (쉼표 목록, 날짜/숫자 차원은 a..b 범위 가능)
+
+        범위는 값 목록으로 펼치지 않고 차원의 값 범위(숫자) 또는 큐브에 있는 날짜 안에서만 고르므로
+        0001-01-01..9999-12-31 같은 범위도 큐브 크기만큼만 계산한다.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"알 수 없는 차원: {dimension} ({', '.join(DIMENSIONS)})")
+        values: set = set()
+        for part in filter(None, (p.strip() for p in text.split(","))):
+            low, sep, high = part.partition("..")
+            if dimension == "date":
+                if sep:
+                    start, end = date.fromisoformat(low).isoformat(), date.fromisoformat(high).isoformat()
+                    values.update(d for (d,) in self._rollups[(0,)] if start <= d <= end)
+                else:
+                    values.add(date.fromisoformat(part).isoformat())
+            elif dimension in NUMERIC_DOMAINS:
+                lo, hi = NUMERIC_DOMAINS[dimension]
+                if sep:
+                    values.update(range(max(int(low), lo), min(int(high), hi) + 1))
+                else:
+                    values.add(int(part))
+            else:
+                values.add(part)
+        return values
+
+    def query(self, group_by: Sequence[str], filters: Optional[Dict[str, Iterable[Any]]] = None,
+              measure: str = "views", limit: Optional[int] = None) -> Dict[str, Any]:
+        """차원별 합계 (group_by 가 비면 전체 합계), filters: 차원 → 허용 값 목록"""
+        if measure not in MEASURES:
+            raise ValueError(f"measure 는 {', '.join(MEASURES)} 중 하나여야 합니다.")
+        unknown = [d for d in list(group_by) + list(filters or {}) if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"알 수 없는 차원: {', '.join(unknown)} ({', '.join(DIMENSIONS)})")
+        if len(set(group_by)) != len(group_by):
+            raise ValueError("group_by 에 같은 차원이 중복되었습니다.")
+
+        filter_sets = {DIMENSIONS.index(d): frozenset(values) for d, values in (filters or {}).items()}
+        dims = tuple(DIMENSIONS.index(d) for d in group_by)
+        cache_key = (dims, tuple(sorted(filter_sets.items())), measure, limit)
+        with self._lock:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                return cached
+
+        materialized = self._rollups.get(tuple(sorted(dims)))
+        if not filter_sets and materialized is not None:
+            order = [sorted(dims).index(d) for d in dims]
+            groups = {tuple(key[i] for i in order): values for key, values in materialized.items()}
+        else:
+            groups = self._fold(dims, filter_sets)
+
+        response = self._format(group_by, groups, measure, limit)
+        with self._lock:
+            self._cache[cache_key] = response
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return response
+
+    def _format(self, group_by: Sequence[str], groups: Dict[Tuple[Any, ...], List[float]],
+                measure: str, limit: Optional[int]) -> Dict[str, Any]:
+        index = MEASURES.index(measure)
+        if "channel" in group_by:
+            # 채널은 자연 순서가 없으므로 측정값 순
+            keys = sorted(groups, key=lambda k: groups[k][index], reverse=True)
+        else:
+            keys = sorted(groups)
+        if limit:
+            keys = keys[:limit]
+
+        rows = []
+        for key in keys:
+            count, views, vph = groups[key]
+            row = {dim: value for dim, value in zip(group_by, key)}
+            row.update({
+                "videos": count,
+                "views": views,
+                "views_per_hour": round(vph, 2),
+                "avg_views": round(views / count, 2) if count else 0,
+                "avg_views_per_hour": round(vph / count, 2) if count else 0
+            })
+            rows.append(row)
+
+        response = {
+            "group_by": list(group_by),
+            "measure": measure,
+            "timezone": str(self.tz),
+            "rows": rows
+        }
+        if len(group_by) == 1:
+            response["labels"] = [self.label(group_by[0], key[0]) for key in keys]
+            response["data"] = [row[measure] for row in rows]
+        elif len(group_by) == 2:
+            response.update(self._pivot(group_by, rows, measure))
+        return response
+
+    def _pivot(self, group_by: Sequence[str], rows: List[Dict[str, Any]], measure: str) -> Dict[str, Any]:
+        """2차원 결과 → 첫 차원을 x 축, 두 번째 차원을 계열로"""
+        first, second = group_by
+        xs = list(dict.fromkeys(row[first] for row in rows))
+        series_keys = list(dict.fromkeys(row[second] for row in rows))
+        position = {x: i for i, x in enumerate(xs)}
+        series = {key: [0] * len(xs) for key in series_keys}
+        for row in rows:
+            series[row[second]][position[row[first]]] = row[measure]
+        return {
+            "labels": [self.label(first, x) for x in xs],
+            "series": [{"label": self.label(second, key), "key": key, "data": series[key]} for key in series_keys]
+        }
+
+    def label(self, dimension: str, value: Any) -> str:
+        """차원 값의 표시 이름"""
+        if dimension == "hour":
+            return f"{value}시"
+        if dimension == "weekday":
+            return WEEKDAY_LABELS[value]
+        if dimension == "content_type":
+            return CONTENT_TYPE_LABELS.get(value, value)
+        if dimension == "views_bucket":
+            return VIEWS_BUCKET_LABELS[value]
+        if dimension == "channel":
+            return self.channel_names.get(value) or value
+        return str(value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "videos": self.video_count,
+            "cells": len(self.cells),
+            "rollups": sum(len(r) for r in self._rollups.values()),
+            "timezone": str(self.tz),
+            "region_code": self.region_code
+        }
+
+class AnalyticsCubeCache:
+    """결과 버전(job_id)별 큐브 (최근 몇 개만 보관)"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("ANALYTICS_CUBE_CACHE_SIZE", 4))
+        self._lock = threading.Lock()
+        self._cubes: "OrderedDict[str, AnalyticsCube]" = OrderedDict()
+
+    def get(self, version: str) -> Optional[AnalyticsCube]:
+        with self._lock:
+            cube = self._cubes.get(version)
+            if cube is not None:
+                self._cubes.move_to_end(version)
+            return cube
+
+    def put(self, version: str, cube: AnalyticsCube):
+        with self._lock:
+            self._cubes[version] = cube
+            self._cubes.move_to_end(version)
+            while len(self._cubes) > max(self.max_entries, 1):
+                self._cubes.popitem(last=False)
@@ -0,0 +1,292 @@
+import json
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.video_decoder import VideoColumns, parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# 업로드 후 경과 시간 구간 경계 (시간): 1일 / 3일 / 7일 / 30일
+AGE_BUCKET_BOUNDS = [24, 72, 168, 720]
+
+# MAD → 표준편차 환산 계수 (정규분포 가정)
+MAD_SCALE = 1.4826
+
+# 분산이 거의 없는 채널에서 점수가 폭주하지 않도록 하는 최소 척도 (log 조회수 기준)
+MIN_SPREAD = 0.1
+
+def age_bucket(age_hours: float) -> int:
+    """경과 시간 → 구간 번호"""
+    return bisect_right(AGE_BUCKET_BOUNDS, age_hours)
+
+def uploads_playlist_id(channel_id: str, channel_item: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """채널의 업로드 재생목록 ID (channels.list contentDetails, 없으면 UC → UU 규칙)"""
+    try:
+        return channel_item['contentDetails']['relatedPlaylists']['uploads']
+    except (KeyError, TypeError):
+        pass
+    return "UU" + channel_id[2:] if channel_id.startswith("UC") else None
+
+def _sorted_median(values: List[float]) -> float:
+    """정렬된 값의 중앙값"""
+    n = len(values)
+    middle = n // 2
+    return values[middle] if n % 2 else (values[middle - 1] + values[middle]) / 2
+
+def _kth_distance(values: List[float], center: float, k: int) -> float:
+    """정렬된 값 중 center 에서 k 번째로 가까운 값까지의 거리 (가장 가까운 k 개 구간을 이분 탐색)"""
+    lo, hi = 0, len(values) - k
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if center - values[mid] > values[mid + k] - center:
+            lo = mid + 1
+        else:
+            hi = mid
+    return max(center - values[lo], values[lo + k - 1] - center)
+
+def _sorted_stats(values: List[float]) -> List[float]:
+    """정렬된 log 조회수 → [중앙값, MAD, 표본 수] (MAD 도 정렬된 배열에서 O(log n))"""
+    n = len(values)
+    center = _sorted_median(values)
+    middle = n // 2
+    if n % 2:
+        mad = _kth_distance(values, center, middle + 1)
+    else:
+        mad = (_kth_distance(values, center, middle) + _kth_distance(values, center, middle + 1)) / 2
+    return [center, mad, n]
+
+class ChannelBaselines:
+    """채널별 평소 성과 기준선 (최근 업로드 영상의 경과 시간 구간별 log 조회수 중앙값/MAD)
+
+    관측값은 (영상, 경과 시간 구간) 마다 하나씩 누적되므로 같은 영상도 나이가 들면서
+    다른 구간의 표본이 된다. 새로 관측된 채널만 통계를 다시 계산하고,
+    점수 계산은 미리 계산한 (채널, 구간) 통계를 조회만 하므로 영상 수에 비례한다.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_hours: Optional[float] = None,
+                 min_samples: Optional[int] = None, max_observations: int = 300):
+        self.path = path if path is not None else os.getenv("CHANNEL_BASELINE_FILE", "channel_baselines.json")
+        self.ttl = float(ttl_hours if ttl_hours is not None else os.getenv("CHANNEL_BASELINE_TTL_HOURS", 12)) * 3600
+        self.min_samples = min_samples if min_samples is not None else int(os.getenv("CHANNEL_BASELINE_MIN_SAMPLES", 5))
+        self.max_observations = max_observations
+
+        self._lock = threading.Lock()
+        # channel_id → {"refreshed": epoch, "observations": {"video_id:bucket": [age_hours, log_views, observed]},
+        #               "stats": {bucket: [median, mad, n]}}
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        # channel_id → 구간별 (중앙값, 척도) - 표본이 부족한 구간은 가까운 구간으로 미리 채움
+        self._resolved: Dict[str, List[Optional[Tuple[float, float]]]] = {}
+        # channel_id → (구간별 정렬된 log 조회수, video_id → [(구간, log 조회수)]) - 자기 관측값을 뺀 기준선용
+        self._samples: Dict[str, Tuple[Dict[int, List[float]], Dict[str, List[Tuple[int, float]]]]] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def stale(self, channel_ids: Iterable[str], now: Optional[float] = None) -> List[str]:
+        """기준선이 없거나 TTL 이 지난 채널"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            return [
+                cid for cid in dict.fromkeys(channel_ids)
+                if now - self._channels.get(cid, {}).get("refreshed", 0) > self.ttl
+            ]
+
+    def refresh(self, channel_ids: Iterable[str],
+                fetch_uploads: Callable[[List[str]], Dict[str, List[Dict[str, Any]]]],
+                now: Optional[float] = None) -> int:
+        """오래된 채널만 최근 업로드 영상을 받아 관측값 추가, 갱신한 채널 수 반환
+
+        fetch_uploads: channel_id 목록 → channel_id 별 videos.list 항목(snippet, statistics)
+        """
+        now = now if now is not None else time.time()
+        targets = self.stale(channel_ids, now)
+        if not targets:
+            return 0
+
+        uploads = fetch_uploads(targets)
+        with self._lock:
+            for channel_id in targets:
+                self._observe(channel_id, uploads.get(channel_id) or [], now)
+            self._save()
+
+        logger.info(f"채널 기준선 갱신: {len(targets)}개 채널")
+        return len(targets)
+
+    def _observe(self, channel_id: str, items: List[Dict[str, Any]], now: float):
+        """관측값 추가 후 해당 채널 통계만 다시 계산 (lock 안에서 호출)"""
+        entry = self._channels.setdefault(channel_id, {"refreshed": 0, "observations": {}, "stats": {}})
+        observations = entry["observations"]
+
+        for item in items:
+            try:
+                age_hours = max((now - parse_timestamp(item['snippet']['publishedAt'])) / 3600, 0)
+                views = int(item['statistics'].get('viewCount', 0))
+            except (KeyError, TypeError, ValueError):
+                continue
+            observations[f"{item['id']}:{age_bucket(age_hours)}"] = [round(age_hours, 2), math.log1p(views), now]
+
+        # 오래된 관측부터 버림
+        if len(observations) > self.max_observations:
+            keep = sorted(observations.items(), key=lambda kv: kv[1][2], reverse=True)[:self.max_observations]
+            entry["observations"] = observations = dict(keep)
+
+        entry["refreshed"] = now
+        entry["stats"] = self._compute_stats(observations.values())
+        self._resolved.pop(channel_id, None)
+        self._samples.pop(channel_id, None)
+
+    @staticmethod
+    def _compute_stats(observations: Iterable[List[float]]) -> Dict[str, List[float]]:
+        """구간별 [log 조회수 중앙값, MAD, 표본 수]"""
+        by_bucket: Dict[int, List[float]] = {}
+        for age_hours, log_views, _ in observations:
+            by_bucket.setdefault(age_bucket(age_hours), []).append(log_views)
+
+        return {str(bucket): _sorted_stats(sorted(values)) for bucket, values in by_bucket.items()}
+
+    # ------------------------------------------------------------------
+    # 점수
+    # ------------------------------------------------------------------
+    def baseline(self, channel_id: str, age_hours: float) -> Optional[Tuple[float, float]]:
+        """해당 나이의 (중앙값, 척도) - 표본이 부족하면 가장 가까운 구간 사용"""
+        with self._lock:
+            return self._resolve(channel_id)[age_bucket(age_hours)]
+
+    def _resolve(self, channel_id: str) -> List[Optional[Tuple[float, float]]]:
+        """채널의 구간별 기준선 표 (lock 안에서 호출, 채널 통계가 바뀔 때만 다시 만듦)"""
+        resolved = self._resolved.get(channel_id)
+        if resolved is not None:
+            return resolved
+
+        resolved = self._table(self._channels.get(channel_id, {}).get("stats") or {})
+        self._resolved[channel_id] = resolved
+        return resolved
+
+    def _channel_samples(self, channel_id: str):
+        """채널의 구간별 정렬된 관측값과 영상별 관측값 (lock 안에서 호출, 채널 통계가 바뀔 때만 다시 만듦)"""
+        samples = self._samples.get(channel_id)
+        if samples is not None:
+            return samples
+
+        by_bucket: Dict[int, List[float]] = {}
+        by_video: Dict[str, List[Tuple[int, float]]] = {}
+        for key, (age_hours, log_views, _) in self._channels.get(channel_id, {}).get("observations", {}).items():
+            bucket = age_bucket(age_hours)
+            by_bucket.setdefault(bucket, []).append(log_views)
+            by_video.setdefault(key.rsplit(":", 1)[0], []).append((bucket, log_views))
+        for values in by_bucket.values():
+            values.sort()
+
+        samples = self._samples[channel_id] = (by_bucket, by_video)
+        return samples
+
+    def _resolve_without(self, channel_id: str, own: List[Tuple[int, float]]) -> List[Optional[Tuple[float, float]]]:
+        """영상 자신의 관측값(own)을 뺀 기준선 표 (점수를 매기는 영상이 자기 기준선에 들어가지 않도록, lock 안에서 호출)
+
+        영상이 관측된 구간만 정렬된 배열에서 그 값을 빼고 다시 계산한다.
+        """
+        by_bucket = self._channel_samples(channel_id)[0]
+        stats = dict(self._channels[channel_id]["stats"])
+        removed: Dict[int, List[float]] = {}
+        for bucket, log_views in own:
+            removed.setdefault(bucket, []).append(log_views)
+
+        for bucket, own_values in removed.items():
+            rest = list(by_bucket[bucket])
+            for log_views in own_values:
+                del rest[bisect_left(rest, log_views)]
+            if rest:
+                stats[str(bucket)] = _sorted_stats(rest)
+            else:
+                stats.pop(str(bucket), None)
+        return self._table(stats)
+
+    def _table(self, stats: Dict[str, List[float]]) -> List[Optional[Tuple[float, float]]]:
+        """구간별 (중앙값, 척도) 표 - 표본이 부족한 구간은 가장 가까운 구간으로 채움"""
+        buckets = range(len(AGE_BUCKET_BOUNDS) + 1)
+        resolved = []
+        for bucket in buckets:
+            choice = None
+            for candidate in sorted(buckets, key=lambda b: abs(b - bucket)):
+                values = stats.get(str(candidate))
+                if values and values[2] >= self.min_samples:
+                    choice = (values[0], max(MAD_SCALE * values[1], MIN_SPREAD))
+                    break
+            resolved.append(choice)
+        return resolved
+
+    def score(self, columns: VideoColumns, now: Optional[float] = None) -> Tuple[array, array]:
+        """(급상승 점수, 기준 조회수) 배열 - 점수는 log 조회수의 로버스트 z-score, 기준선이 없으면 0
+
+        채널 최근 업로드로 관측된 영상은 자기 관측값을 뺀 기준선과 비교한다.
+        """
+        now = now if now is not None else time.time()
+        scores = array('d', bytes(8 * len(columns)))
+        expected = array('q', bytes(8 * len(columns)))
+        bounds = AGE_BUCKET_BOUNDS
+        log1p = math.log1p
+
+        with self._lock:
+            tables = {cid: self._resolve(cid) for cid in set(columns.channel_ids)}
+            # 채널별 video_id → 관측값 (기준선이 있는 채널만)
+            observed = {cid: self._channel_samples(cid)[1] for cid in tables if cid in self._channels}
+            for i, (video_id, channel_id, published, views) in enumerate(
+                    zip(columns.video_ids, columns.channel_ids, columns.published, columns.views)):
+                table = tables[channel_id]
+                own = observed.get(channel_id, {}).get(video_id)
+                if own:
+                    table = self._resolve_without(channel_id, own)
+                base = table[bisect_right(bounds, (now - published) / 3600)]
+                if base is None:
+                    continue
+                center, spread = base
+                scores[i] = round((log1p(views) - center) / spread, 3)
+                expected[i] = round(math.expm1(center))
+
+        return scores, expected
+
+    def snapshot(self, channel_id: str) -> Optional[Dict[str, Any]]:
+        """채널 기준선 요약 (구간별 기준 조회수)"""
+        with self._lock:
+            entry = self._channels.get(channel_id)
+            if not entry:
+                return None
+            return {
+                "refreshed": entry["refreshed"],
+                "observations": len(entry["observations"]),
+                "buckets": {
+                    bucket: {"median_views": round(math.expm1(center)), "mad": round(mad, 4), "samples": n}
+                    for bucket, (center, mad, n) in sorted(entry["stats"].items())
+                }
+            }
+
+    # ------------------------------------------------------------------
+    # 저장
+    # ------------------------------------------------------------------
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._channels = json.load(f)
+        except Exception as e:
+            logger.warning(f"채널 기준선 파일 읽기 실패: {e}")
+
+    def _save(self):
+        """원자적 저장 (lock 안에서 호출)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._channels, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"채널 기준선 저장 실패: {e}")
@@ -0,0 +1,273 @@
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.services.key_pool import metering, quota_cost
+from app.services.video_decoder import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# 업로드 속도를 재는 기간 (일)
+VELOCITY_WINDOW_DAYS = 28
+
+# channels.list 한 번에 조회할 수 있는 채널 수
+CHANNELS_PER_REQUEST = 50
+
+def uploads_per_week(published: Iterable[str], sample_size: int, now: Optional[float] = None) -> float:
+    """최근 업로드 속도 (주당 영상 수)
+
+    표본이 모두 기간 안에 있으면 (한 페이지를 꽉 채울 만큼 자주 올리는 채널) 표본이 걸친 기간으로 나눈다.
+    """
+    now = now if now is not None else time.time()
+    ages = sorted((now - parse_timestamp(value)) / 86400 for value in published)
+    recent = [age for age in ages if age <= VELOCITY_WINDOW_DAYS]
+    if not recent:
+        return 0.0
+    if len(recent) == len(ages) and len(ages) >= sample_size:
+        return round(len(recent) / max(recent[-1] / 7, 1 / 7), 3)
+    return round(len(recent) / (VELOCITY_WINDOW_DAYS / 7), 3)
+
+def discovery_score(subscribers: int, velocity: float) -> float:
+    """구독자 규모(log) × 업로드 속도(log) - 둘 중 하나만 큰 채널보다 둘 다 적당히 큰 채널이 위로"""
+    return round(math.log10(max(subscribers, 0) + 10) * math.log2(2 + velocity), 4)
+
+class ChannelDiscovery:
+    """검색어 결과 채널에서 시작해 추천 채널 섹션을 따라가는 채널 탐색 (할당량 예산 안에서)
+
+    점수가 높은 채널부터 펼치는 best-first 탐색이다. 펼칠 때 channelSections.list (1 unit),
+    새 채널의 점수를 매길 때 channels.list (50개당 1 unit) 와 업로드 재생목록 한 페이지 (1 unit) 를 쓴다.
+    이미 본 채널은 다시 조회하지 않고, 다음 단계 비용이 남은 예산을 넘으면 멈춘다.
+
+    예산은 요청 전에 최대 비용으로 예약(reserved)하고, 실제로 보낸 요청(spent, requests)은 따로 센다.
+    동시에 도는 분석과 같은 요청은 SingleFlight 로 응답을 나눠 받으므로 실제 사용량이 예약보다 적을 수 있다.
+    """
+
+    def __init__(self, youtube_service, budget: Optional[int] = None, max_channels: Optional[int] = None,
+                 max_depth: Optional[int] = None, max_children: Optional[int] = None,
+                 upload_sample: Optional[int] = None):
+        self.youtube_service = youtube_service
+        self.budget = budget if budget is not None else int(os.getenv("DISCOVERY_BUDGET", 200))
+        self.max_channels = max_channels if max_channels is not None else int(os.getenv("DISCOVERY_MAX_CHANNELS", 100))
+        self.max_depth = max_depth if max_depth is not None else int(os.getenv("DISCOVERY_MAX_DEPTH", 2))
+        self.max_children = max_children if max_children is not None else int(os.getenv("DISCOVERY_MAX_CHILDREN", 20))
+        self.upload_sample = upload_sample if upload_sample is not None else int(os.getenv("DISCOVERY_UPLOAD_SAMPLE", 20))
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._last: Optional[Dict[str, Any]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        """마지막 탐색 결과"""
+        return self._last
+
+    def crawl(self, seeds: Callable[[], Iterable[str]], budget: Optional[int] = None,
+              max_channels: Optional[int] = None, max_depth: Optional[int] = None,
+              exclude: Iterable[str] = ()) -> Dict[str, Any]:
+        """seeds() 가 돌려준 channel_id 에서 탐색한 후보 채널 순위 (exclude 는 후보에서만 빼고 탐색 경로로는 씀)
+
+        seeds 는 탐색 안에서 호출하므로 채널 참조 해석에 쓴 할당량도 이 탐색의 예산에 포함된다.
+        다른 탐색이 실행 중이면 RuntimeError, 시작 채널이 없으면 ValueError.
+        """
+        with self._lock:
+            if self._running:
+                raise RuntimeError("이미 채널 탐색이 진행 중입니다.")
+            self._running = True
+        try:
+            result = _Crawl(
+                self, seeds,
+                budget if budget is not None else self.budget,
+                max_channels if max_channels is not None else self.max_channels,
+                max_depth if max_depth is not None else self.max_depth,
+                set(exclude)
+            ).run()
+            self._last = result
+            return result
+        finally:
+            self._running = False
+
+class _Crawl:
+    """탐색 한 번의 상태 (프런티어, 본 채널, 사용한 할당량)"""
+
+    def __init__(self, discovery: ChannelDiscovery, seeds: Callable[[], Iterable[str]], budget: int,
+                 max_channels: int, max_depth: int, exclude: set):
+        self.discovery = discovery
+        self.service = discovery.youtube_service
+        self.resolve_seeds = seeds
+        self.seeds: List[str] = []
+        # 다른 작업이 쓸 할당량까지 쓰지 않도록 남은 할당량으로 제한
+        self.budget = min(budget, self.service.key_pool.remaining())
+        self.max_channels = max_channels
+        self.max_depth = max_depth
+        self.exclude = exclude
+
+        # 예산에서 뺀 할당량 / 요청 수 (요청 전 최대 비용으로 예약)
+        self.reserved = 0
+        self.reserved_requests: Dict[str, int] = {}
+        # 시드를 뺀 새로 찾은 채널 수
+        self.discovered = 0
+        self.seen: set = set()
+        self.candidates: Dict[str, Dict[str, Any]] = {}
+        # (-점수, 순번, channel_id) - 점수가 높은 채널부터 펼침
+        self.frontier: List[Tuple[float, int, str]] = []
+        self._order = 0
+        self.stop_reason = "frontier_empty"
+
+    def _charge(self, method: str, count: int = 1) -> bool:
+        """예산 안이면 예약에 더하고 True"""
+        cost = quota_cost(method) * count
+        if self.reserved + cost > self.budget:
+            return False
+        self._reserve(cost, {method: count})
+        return True
+
+    def _reserve(self, units: int, requests: Dict[str, int]):
+        self.reserved += units
+        for method, count in requests.items():
+            self.reserved_requests[method] = self.reserved_requests.get(method, 0) + count
+
+    def _affordable(self, count: int) -> int:
+        """남은 예산으로 점수를 매길 수 있는 채널 수 (채널당 업로드 1 unit + 50개당 channels 1 unit)"""
+        per_channel = quota_cost("playlistItems.list")
+        left = self.budget - self.reserved
+        n = min(count, max(left, 0) // per_channel)
+        while n > 0 and n * per_channel + math.ceil(n / CHANNELS_PER_REQUEST) * quota_cost("channels.list") > left:
+            n -= 1
+        return n
+
+    def _score(self, channel_ids: List[str], depth: int, parents: Dict[str, str]) -> List[Dict[str, Any]]:
+        """채널 정보 + 업로드 속도로 점수 계산 후 후보/프런티어에 추가"""
+        channel_ids = channel_ids[:self._affordable(len(channel_ids))]
+        if not channel_ids:
+            return []
+        self._charge("channels.list", math.ceil(len(channel_ids) / CHANNELS_PER_REQUEST))
+        items = self.service.channel_details(channel_ids)
+        found = [cid for cid in channel_ids if cid in items]
+        self._charge("playlistItems.list", len(found))
+
+        sample = self.discovery.upload_sample
+        dates = self.service.transport.map(
+            lambda cid: self.service.upload_dates(cid, items[cid], sample), found
+        )
+
+        now = time.time()
+        scored = []
+        for channel_id, published in zip(found, dates):
+            item = items[channel_id]
+            subscribers = int((item.get('statistics') or {}).get('subscriberCount', 0) or 0)
+            velocity = uploads_per_week(published, sample, now)
+            candidate = {
+                "channel_id": channel_id,
+                "channel_name": (item.get('snippet') or {}).get('title', channel_id),
+                "subscribers": subscribers,
+                "uploads_per_week": velocity,
+                "last_upload": max(published) if published else None,
+                "score": discovery_score(subscribers, velocity),
+                "depth": depth,
+                "found_via": parents.get(channel_id),
+                "seed": depth == 0
+            }
+            self.candidates[channel_id] = candidate
+            self.discovered += 1 if depth > 0 else 0
+            scored.append(candidate)
+            if depth < self.max_depth:
+                self._order += 1
+                heapq.heappush(self.frontier, (-candidate["score"], self._order, channel_id))
+        return scored
+
+    def _expand(self, batch: List[str]) -> Dict[str, str]:
+        """채널 섹션의 추천 채널 중 처음 보는 채널 → 찾은 경로 채널"""
+        featured = self.service.transport.map(self.service.featured_channels, batch)
+        children: Dict[str, str] = {}
+        for parent, channel_ids in zip(batch, featured):
+            new = [cid for cid in channel_ids if cid not in self.seen][:self.discovery.max_children]
+            for channel_id in new:
+                self.seen.add(channel_id)
+                children[channel_id] = parent
+        return children
+
+    def run(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        with metering() as used:
+            self._resolve()
+            self._crawl()
+
+        ranked = sorted(
+            (c for c in self.candidates.values() if not c["seed"] and c["channel_id"] not in self.exclude),
+            key=lambda c: c["score"], reverse=True
+        )
+        for rank, candidate in enumerate(ranked, 1):
+            candidate["rank"] = rank
+
+        logger.info(
+            f"채널 탐색: 시드 {len(self.seeds)}개 → 후보 {len(ranked)}개 "
+            f"(사용 {used.units} / 예약 {self.reserved} / 예산 {self.budget} units, 종료: {self.stop_reason})"
+        )
+        return {
+            "seeds": [self.candidates[cid] for cid in self.seeds if cid in self.candidates],
+            "candidates": ranked,
+            "budget": self.budget,
+            "reserved": self.reserved,
+            "reserved_requests": self.reserved_requests,
+            "spent": used.units,
+            "requests": dict(used.calls),
+            "stop_reason": self.stop_reason,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "finished": datetime.now(timezone.utc).isoformat()
+        }
+
+    def _resolve(self):
+        """시작 채널 확인 (참조 해석은 비용을 미리 알 수 없으므로 실제 사용량을 예약에 더함)"""
+        with metering() as used:
+            self.seeds = list(dict.fromkeys(self.resolve_seeds()))
+        self._reserve(used.units, used.calls)
+        if not self.seeds:
+            raise ValueError("시작 채널이 없습니다. 검색어 분석을 먼저 실행하거나 seeds 를 지정해주세요.")
+        self.seen.update(self.seeds)
+
+    def _crawl(self):
+        if self.reserved >= self.budget:
+            self.stop_reason = "budget"
+            return
+        self._score(self.seeds, 0, {})
+
+        concurrency = max(self.service.transport.concurrency, 1)
+        while self.frontier:
+            if self.discovered >= self.max_channels:
+                self.stop_reason = "max_channels"
+                break
+            # 같은 깊이 제한 안에서 점수 높은 채널 몇 개를 한 번에 펼침 (섹션 요청은 동시에)
+            batch = []
+            while self.frontier and len(batch) < concurrency:
+                _, _, channel_id = heapq.heappop(self.frontier)
+                if self.candidates[channel_id]["depth"] < self.max_depth:
+                    batch.append(channel_id)
+            if not batch:
+                continue
+            affordable = min(len(batch), (self.budget - self.reserved) // quota_cost("channelSections.list"))
+            if affordable <= 0:
+                self.stop_reason = "budget"
+                break
+            batch = batch[:affordable]
+            self._charge("channelSections.list", len(batch))
+
+            children = self._expand(batch)
+            child_ids = list(children)[:max(self.max_channels - self.discovered, 0)]
+            # 펼친 채널의 깊이 + 1 (한 배치 안의 채널은 깊이가 다를 수 있어 채널별로 나눔)
+            by_depth: Dict[int, List[str]] = {}
+            for channel_id in child_ids:
+                by_depth.setdefault(self.candidates[children[channel_id]]["depth"] + 1, []).append(channel_id)
+            for depth, channel_ids in sorted(by_depth.items()):
+                scored = self._score(channel_ids, depth, children)
+                if len(scored) < len(channel_ids) and self._affordable(1) == 0:
+                    self.stop_reason = "budget"
+            if self.stop_reason == "budget":
+                break
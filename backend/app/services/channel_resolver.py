@@ -0,0 +1,158 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+# 채널 참조 종류 - id 는 조회 없이 그대로 사용, 나머지는 1 unit 조회 (search.list 미사용)
+#   handle: channels.list(forHandle)   username: channels.list(forUsername)   video: videos.list(id, 50개씩)
+RESOLVE_KINDS = ("handle", "username", "video")
+
+_CHANNEL_ID = re.compile(r"^UC[0-9A-Za-z_-]{22}$")
+_VIDEO_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+_YOUTUBE_HOSTS = ("youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com", "youtu.be")
+
+def parse_channel_ref(value: str) -> Optional[Tuple[str, str]]:
+    """채널 ID / @핸들 / 채널·영상 URL → (종류, 값), 해석할 수 없으면 None
+
+    UC...                              → ("id", "UC...")
+    @name, youtube.com/@name           → ("handle", "@name")
+    youtube.com/c/name, 그냥 name      → ("handle", "@name")  (맞춤 URL 은 대부분 핸들로 전환됨)
+    youtube.com/user/name              → ("username", "name")
+    watch?v=ID, youtu.be/ID, /shorts/ID → ("video", "ID")
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    if _CHANNEL_ID.match(value):
+        return ("id", value)
+    if value.startswith("@"):
+        return ("handle", value.rstrip("/").lower())
+
+    url = value if "://" in value else f"https://{value}"
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host not in _YOUTUBE_HOSTS:
+        # URL 이 아닌 이름은 핸들로 간주 (forHandle 은 @ 없이도 찾지만 캐시 키를 맞추기 위해 붙임)
+        if "/" in value:
+            return None
+        return ("handle", f"@{value.lower()}")
+
+    parts = [part for part in parsed.path.split("/") if part]
+    if host == "youtu.be":
+        return ("video", parts[0]) if parts and _VIDEO_ID.match(parts[0]) else None
+    if not parts:
+        return None
+    if parts[0] == "watch":
+        video_id = parse_qs(parsed.query).get("v", [""])[0]
+        return ("video", video_id) if _VIDEO_ID.match(video_id) else None
+    if parts[0] in ("shorts", "live", "embed") and len(parts) > 1:
+        return ("video", parts[1]) if _VIDEO_ID.match(parts[1]) else None
+    if parts[0] == "channel" and len(parts) > 1:
+        return ("id", parts[1]) if _CHANNEL_ID.match(parts[1]) else None
+    if parts[0].startswith("@"):
+        return ("handle", parts[0].lower())
+    if parts[0] == "c" and len(parts) > 1:
+        return ("handle", f"@{parts[1].lower()}")
+    if parts[0] == "user" and len(parts) > 1:
+        return ("username", parts[1].lower())
+    return None
+
+class ChannelResolver:
+    """채널 참조(@핸들, 채널/영상 URL) → channel_id 변환 (결과를 파일에 보관해 이름마다 한 번만 조회)
+
+    핸들/사용자명/영상 → 채널 대응은 거의 바뀌지 않으므로 TTL 없이 보관한다.
+    찾지 못한 참조는 오타일 수 있으므로 저장하지 않고 다음 실행에서 다시 조회한다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.getenv("CHANNEL_RESOLVER_FILE", "channel_handles.json")
+        self._lock = threading.Lock()
+        # "종류:값" → {"channel_id": ..., "resolved": epoch}
+        self._mapping: Dict[str, Dict[str, Any]] = {}
+        self._stats = {"hits": 0, "lookups": 0, "unresolved": 0}
+        self._load()
+
+    def resolve(self, refs: Iterable[str],
+                lookup: Callable[[str, List[str]], Dict[str, str]]) -> Dict[str, Optional[str]]:
+        """입력 순서대로 참조 → channel_id (찾지 못하면 None)
+
+        lookup: (종류, 값 목록) → 값 별 channel_id - 캐시에 없는 값만 종류별로 모아서 한 번 호출
+        """
+        parsed = {ref: parse_channel_ref(ref) for ref in dict.fromkeys(refs)}
+
+        with self._lock:
+            missing: Dict[str, Dict[str, None]] = {}
+            for ref, target in parsed.items():
+                if target is None or target[0] == "id":
+                    continue
+                kind, value = target
+                if f"{kind}:{value}" in self._mapping:
+                    self._stats["hits"] += 1
+                else:
+                    missing.setdefault(kind, {})[value] = None
+
+        found: Dict[str, str] = {}
+        for kind, values in missing.items():
+            try:
+                for value, channel_id in lookup(kind, list(values)).items():
+                    found[f"{kind}:{value}"] = channel_id
+            except Exception as e:
+                logger.warning(f"채널 참조 조회 실패 ({kind} {len(values)}개): {e}")
+
+        resolved: Dict[str, Optional[str]] = {}
+        with self._lock:
+            now = time.time()
+            self._stats["lookups"] += sum(len(values) for values in missing.values())
+            for key, channel_id in found.items():
+                self._mapping[key] = {"channel_id": channel_id, "resolved": now}
+            if found:
+                self._save()
+
+            for ref, target in parsed.items():
+                if target is None:
+                    resolved[ref] = None
+                elif target[0] == "id":
+                    resolved[ref] = target[1]
+                else:
+                    entry = self._mapping.get(f"{target[0]}:{target[1]}")
+                    resolved[ref] = entry["channel_id"] if entry else None
+                if resolved[ref] is None:
+                    self._stats["unresolved"] += 1
+                    logger.warning(f"채널을 찾지 못함: {ref}")
+        return resolved
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "cached": len(self._mapping)}
+
+    def _load(self):
+        self._mapping = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"채널 참조 파일 읽기 실패: {e}")
+            return {}
+
+    def _save(self):
+        """원자적 저장 (lock 안에서 호출) - 다른 프로세스가 그 사이 저장한 항목과 합쳐서 씀"""
+        if not self.path:
+            return
+        self._mapping = {**self._read(), **self._mapping}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._mapping, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"채널 참조 저장 실패: {e}")
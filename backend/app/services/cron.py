@@ -0,0 +1,106 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Set
+
+# (최소, 최대) - 분 / 시 / 일 / 월 / 요일(0=일요일, 7 도 일요일)
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *"
+}
+
+_EVERY = re.compile(r"^@every\s+(\d+)\s*([mhd])$")
+_EVERY_UNITS = {"m": 60, "h": 3600, "d": 86400}
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    """*, */n, a, a-b, a-b/n 과 쉼표 목록"""
+    values: Set[int] = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"간격은 1 이상이어야 합니다: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"범위를 벗어난 값: {field} ({low}~{high})")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """cron 형식 실행 주기 ("분 시 일 월 요일", @hourly/@daily/@weekly/@monthly, "@every 30m")
+
+    일과 요일을 둘 다 지정하면 cron 과 같이 둘 중 하나만 맞아도 실행한다.
+    @every 는 epoch 기준으로 정렬된 간격이라 재시작해도 실행 시각이 밀리지 않는다.
+    """
+
+    def __init__(self, expression: str, tz: timezone = timezone.utc):
+        self.expression = expression.strip()
+        self.tz = tz
+        self.every: Optional[int] = None
+
+        text = _ALIASES.get(self.expression.lower(), self.expression)
+        match = _EVERY.match(text.lower())
+        if match:
+            self.every = int(match.group(1)) * _EVERY_UNITS[match.group(2)]
+            if self.every <= 0:
+                raise ValueError(f"간격은 0 보다 커야 합니다: {expression}")
+            return
+
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 식은 '분 시 일 월 요일' 5개 필드여야 합니다: {expression}")
+        try:
+            parsed: List[Set[int]] = [_parse_field(f, lo, hi) for f, (lo, hi) in zip(fields, _FIELD_RANGES)]
+        except ValueError as e:
+            raise ValueError(f"잘못된 cron 식 '{expression}': {e}")
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {d % 7 for d in weekdays}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, current: datetime) -> bool:
+        day_ok = current.day in self.days
+        weekday_ok = (current.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """after 이후 첫 실행 시각 (timezone 포함)"""
+        if after.tzinfo is None:
+            after = after.replace(tzinfo=timezone.utc)
+        if self.every:
+            seconds = (int(after.timestamp()) // self.every + 1) * self.every
+            return datetime.fromtimestamp(seconds, timezone.utc).astimezone(self.tz)
+
+        current = after.astimezone(self.tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 5)
+        while current < limit:
+            if current.month not in self.months:
+                # 다음 달 1일 0시
+                year, month = (current.year + 1, 1) if current.month == 12 else (current.year, current.month + 1)
+                current = current.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = (current + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if current.hour not in self.hours:
+                current = (current + timedelta(hours=1)).replace(minute=0)
+                continue
+            if current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+                continue
+            return current
+        raise ValueError(f"실행 시각이 없는 cron 식입니다: {self.expression}")
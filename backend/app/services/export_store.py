@@ -0,0 +1,294 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".index.json"
+
+class ExportStore:
+    """내보내기 파일 관리 (인덱스 + 용량 제한 + 백그라운드 정리)
+
+    인덱스 파일은 API 서버와 수집 워커가 같이 쓰므로 저장할 때마다 디스크의 항목과 합친다.
+    manage=False (수집 워커) 는 자기가 만든 파일만 등록하고, 용량 제한/정리는 API 서버 저장소가 맡는다.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        eviction_policy: Optional[str] = None,
+        reap_interval: Optional[int] = None,
+        manage: bool = True
+    ):
+        self.directory = Path(directory or os.getenv("EXPORTS_DIR", "exports"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv("EXPORTS_MAX_BYTES", 500 * 1024 * 1024))
+        self.max_age_days = max_age_days if max_age_days is not None else float(os.getenv("EXPORTS_MAX_AGE_DAYS", 30))
+        self.eviction_policy = (eviction_policy or os.getenv("EXPORTS_EVICTION_POLICY", "lru")).lower()
+        self.reap_interval = reap_interval if reap_interval is not None else int(os.getenv("EXPORTS_REAP_INTERVAL", 600))
+        self.manage = manage
+
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._reaper_task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # 인덱스 관리
+    # ------------------------------------------------------------------
+    def rebuild_index(self) -> int:
+        """디렉토리를 한 번 스캔해서 인덱스 재구성 (서버 시작 시 호출)"""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            saved_meta = self._load_meta()
+
+            previous, self._index = self._index, {}
+            self._total_bytes = 0
+            for entry in os.scandir(self.directory):
+                if not entry.is_file() or entry.name.startswith("."):
+                    continue
+                self._adopt(entry.name, saved_meta.get(entry.name, {}), entry.stat(), previous.get(entry.name))
+
+            self._save_meta()
+            logger.info(f"내보내기 인덱스 재구성 완료: {len(self._index)}개 파일, {self._total_bytes} bytes")
+            return len(self._index)
+
+    def new_file_path(self, prefix: str, extension: str) -> Path:
+        """타임스탬프 기반 새 파일 경로 생성 (같은 초에 생성되면 번호를 붙임)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"{prefix}_{timestamp}.{extension}"
+
+        with self._lock:
+            counter = 1
+            while filename in self._index or (self.directory / filename).exists():
+                filename = f"{prefix}_{timestamp}_{counter}.{extension}"
+                counter += 1
+
+        return self.directory / filename
+
+    def register(self, path: Path, source_job: Optional[str] = None, file_format: Optional[str] = None) -> Dict[str, Any]:
+        """새로 작성된 파일을 인덱스에 등록하고 용량 제한 적용"""
+        path = Path(path)
+        stat = path.stat()
+        now = time.time()
+
+        with self._lock:
+            previous = self._index.get(path.name)
+            if previous:
+                self._total_bytes -= previous["size"]
+
+            entry = {
+                "filename": path.name,
+                "size": stat.st_size,
+                "created": now,
+                "last_accessed": now,
+                "source_job": source_job,
+                "format": file_format or self._guess_format(path.name)
+            }
+            self._index[path.name] = entry
+            self._total_bytes += stat.st_size
+
+            if self.manage:
+                self._enforce_quota(protect=path.name)
+            self._save_meta()
+
+        return dict(entry)
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """인덱스에서 파일 정보 조회"""
+        with self._lock:
+            entry = self._index.get(filename)
+            return dict(entry) if entry else None
+
+    def touch(self, filename: str) -> Optional[Path]:
+        """다운로드 시 접근 시간 갱신 후 파일 경로 반환"""
+        with self._lock:
+            entry = self._index.get(filename)
+            if not entry:
+                return None
+            entry["last_accessed"] = time.time()
+            return self.directory / filename
+
+    def list_files(self) -> List[Dict[str, Any]]:
+        """인덱스 기반 파일 목록 (최신 순)"""
+        with self._lock:
+            entries = sorted(self._index.values(), key=lambda x: x["created"], reverse=True)
+            return [self._to_response(entry) for entry in entries]
+
+    def list_by_job(self, source_job: str) -> List[Dict[str, Any]]:
+        """특정 작업에서 생성된 파일 목록"""
+        with self._lock:
+            entries = [e for e in self._index.values() if e["source_job"] == source_job]
+            entries.sort(key=lambda x: x["created"], reverse=True)
+            return [self._to_response(entry) for entry in entries]
+
+    def remove(self, filename: str) -> bool:
+        """파일 삭제 및 인덱스에서 제거"""
+        with self._lock:
+            if filename not in self._index:
+                return False
+            self._delete(filename)
+            self._save_meta()
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 사용량 정보"""
+        with self._lock:
+            return {
+                "file_count": len(self._index),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_days": self.max_age_days,
+                "eviction_policy": self.eviction_policy
+            }
+
+    # ------------------------------------------------------------------
+    # 정리 (eviction)
+    # ------------------------------------------------------------------
+    def reap(self) -> List[str]:
+        """오래된 파일 삭제 + 용량 제한 적용"""
+        removed = []
+        with self._lock:
+            # 수집 워커가 인덱스 파일에 등록한 파일도 정리 대상에 포함
+            for filename, meta in self._load_meta().items():
+                path = self.directory / filename
+                if filename not in self._index and path.is_file():
+                    self._adopt(filename, meta, path.stat())
+
+            if self.max_age_days > 0:
+                cutoff = time.time() - self.max_age_days * 86400
+                for filename in [name for name, e in self._index.items() if e["created"] < cutoff]:
+                    self._delete(filename)
+                    removed.append(filename)
+
+            removed.extend(self._enforce_quota())
+
+            if removed:
+                self._save_meta()
+                logger.info(f"내보내기 파일 {len(removed)}개 정리됨")
+
+        return removed
+
+    async def _reaper_loop(self):
+        """주기적으로 reap 실행"""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await asyncio.to_thread(self.reap)
+            except Exception as e:
+                logger.error(f"내보내기 파일 정리 실패: {e}")
+
+    def start_reaper(self):
+        """백그라운드 정리 작업 시작"""
+        if self.reap_interval > 0 and self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reaper_loop())
+
+    def stop_reaper(self):
+        """백그라운드 정리 작업 중지"""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+
+    def _enforce_quota(self, protect: Optional[str] = None) -> List[str]:
+        """용량 초과 시 정책(lru/age)에 따라 파일 삭제"""
+        removed = []
+        if self.max_bytes <= 0 or self._total_bytes <= self.max_bytes:
+            return removed
+
+        sort_key = "created" if self.eviction_policy == "age" else "last_accessed"
+        candidates = sorted(
+            (e for e in self._index.values() if e["filename"] != protect),
+            key=lambda x: x[sort_key]
+        )
+
+        for entry in candidates:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._delete(entry["filename"])
+            removed.append(entry["filename"])
+
+        return removed
+
+    def _adopt(self, filename: str, meta: Dict[str, Any], stat: os.stat_result,
+               previous: Optional[Dict[str, Any]] = None):
+        """디스크의 파일을 인덱스에 추가 (lock 안에서 호출, 접근 시간은 메모리/인덱스 파일 중 최근 값)"""
+        last_accessed = meta.get("last_accessed", stat.st_mtime)
+        if previous:
+            last_accessed = max(last_accessed, previous["last_accessed"])
+        self._index[filename] = {
+            "filename": filename,
+            "size": stat.st_size,
+            "created": meta.get("created", stat.st_mtime),
+            "last_accessed": last_accessed,
+            "source_job": meta.get("source_job"),
+            "format": meta.get("format") or self._guess_format(filename)
+        }
+        self._total_bytes += stat.st_size
+
+    def _delete(self, filename: str):
+        """파일과 인덱스 항목 삭제 (lock 안에서 호출)"""
+        entry = self._index.pop(filename)
+        self._total_bytes -= entry["size"]
+        try:
+            (self.directory / filename).unlink()
+        except FileNotFoundError:
+            pass
+
+    # ------------------------------------------------------------------
+    # 메타데이터 저장
+    # ------------------------------------------------------------------
+    def _load_meta(self) -> Dict[str, Dict[str, Any]]:
+        meta_path = self.directory / INDEX_FILENAME
+        if not meta_path.exists():
+            return {}
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"내보내기 인덱스 파일 읽기 실패: {e}")
+            return {}
+
+    def _save_meta(self):
+        """인덱스 파일 저장 (다른 프로세스가 등록한 항목은 파일이 남아 있으면 유지)"""
+        meta_path = self.directory / INDEX_FILENAME
+        tmp_path = meta_path.with_suffix(f".{os.getpid()}.tmp")
+        saved = self._load_meta()
+        meta = {
+            name: entry for name, entry in saved.items()
+            if name not in self._index and (self.directory / name).is_file()
+        }
+        for name, e in self._index.items():
+            meta[name] = {
+                "created": e["created"],
+                "last_accessed": max(e["last_accessed"], saved.get(name, {}).get("last_accessed", 0)),
+                "source_job": e["source_job"] or saved.get(name, {}).get("source_job"),
+                "format": e["format"]
+            }
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_path, meta_path)
+        except Exception as e:
+            logger.warning(f"내보내기 인덱스 파일 저장 실패: {e}")
+
+    def _guess_format(self, filename: str) -> str:
+        return filename.rsplit(".", 1)[-1].lower() if "." in filename else "unknown"
+
+    def _to_response(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "filename": entry["filename"],
+            "size": entry["size"],
+            "created": datetime.fromtimestamp(entry["created"]).isoformat(),
+            "modified": datetime.fromtimestamp(entry["created"]).isoformat(),
+            "last_accessed": datetime.fromtimestamp(entry["last_accessed"]).isoformat(),
+            "source_job": entry["source_job"],
+            "format": entry["format"]
+        }
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+# YouTube Data API 할당량은 태평양 시간 자정에 초기화됨
+PACIFIC_TZ = ZoneInfo("America/Los_Angeles")
+
+DEFAULT_DAILY_QUOTA = 10000
+
+# 메서드별 할당량 비용 (https://developers.google.com/youtube/v3/determine_quota_cost)
+QUOTA_COSTS = {
+    "search.list": 100
+}
+
+def quota_cost(method: str) -> int:
+    """API 메서드의 할당량 비용 (기본 1)"""
+    return QUOTA_COSTS.get(method, 1)
+
+# 분석 설정으로 들어온 키 - 그 실행(과 실행 안의 스레드)에서만 풀의 키와 함께 사용
+_run_keys: ContextVar[Tuple[str, ...]] = ContextVar("run_keys", default=())
+
+# 열려 있는 metering() 구간의 요청 집계 (바깥 구간부터, 구간 안에서 넘긴 스레드에도 복사됨)
+_call_meters: ContextVar[Tuple["CallMeter", ...]] = ContextVar("call_meters", default=())
+
+class CallMeter:
+    """실제로 보낸 API 요청 수/할당량 (SingleFlight 로 다른 호출의 응답을 나눠 받은 요청은 빠짐)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.units = 0
+        self.calls: Dict[str, int] = {}
+
+    def add(self, method: str, cost: int):
+        with self._lock:
+            self.units += cost
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+@contextmanager
+def metering() -> Iterator[CallMeter]:
+    """구간 안에서 보낸 요청을 집계 (구간이 겹치면 바깥 구간에도 함께 더함)"""
+    meter = CallMeter()
+    token = _call_meters.set(_call_meters.get() + (meter,))
+    try:
+        yield meter
+    finally:
+        _call_meters.reset(token)
+
+def meter_call(method: str, cost: int):
+    """요청 한 번을 열려 있는 구간 집계에 더함 (구간 밖이면 무시)"""
+    for meter in _call_meters.get():
+        meter.add(method, cost)
+
+class QuotaExhaustedError(Exception):
+    """모든 API 키의 일일 할당량이 소진됨"""
+
+def _key_id(key: str) -> str:
+    """사용량 파일에는 키 원문 대신 해시 저장"""
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+def _mask(key: str) -> str:
+    return f"{key[:4]}...{key[-4:]}" if len(key) > 8 else "****"
+
+class ApiKeyPool:
+    """여러 API 키의 일일 사용량을 추적하고 남은 할당량이 가장 많은 키로 요청을 보냄"""
+
+    def __init__(self, keys: Optional[Iterable[str]] = None, daily_quota: Optional[int] = None,
+                 usage_file: Optional[str] = None):
+        self.daily_quota = daily_quota or int(os.getenv("YOUTUBE_DAILY_QUOTA", DEFAULT_DAILY_QUOTA))
+        self.usage_file = usage_file if usage_file is not None else os.getenv("QUOTA_USAGE_FILE", "quota_usage.json")
+
+        self._lock = threading.Lock()
+        self._keys: List[str] = []
+        self._day = self._pacific_day()
+        self._usage: Dict[str, int] = {}
+        # 보냈지만 아직 응답이 오지 않은 요청의 비용 (동시 요청이 같은 남은 할당량을 보고 넘치지 않도록)
+        self._reserved: Dict[str, int] = {}
+        self._exhausted = set()
+        # 폐기/무효 키 (keyInvalid 등) - 날짜가 바뀌어도 다시 쓰지 않음
+        self._invalid = set()
+        self._saved: Dict[str, Any] = {}
+        self._saved_invalid: set = set()
+        self._last_saved = 0.0
+
+        self._load_usage()
+        self.add_keys(keys or [])
+
+    @classmethod
+    def from_env(cls) -> "ApiKeyPool":
+        """YOUTUBE_API_KEYS(쉼표 구분)와 YOUTUBE_API_KEY 에서 키 읽기"""
+        keys = [k.strip() for k in os.getenv("YOUTUBE_API_KEYS", "").split(",")]
+        keys.append(os.getenv("YOUTUBE_API_KEY", "").strip())
+        return cls(keys)
+
+    def add_keys(self, keys: Iterable[str]):
+        """키 추가 (빈 값/중복은 무시)"""
+        with self._lock:
+            for key in keys:
+                if key and key not in self._keys:
+                    self._keys.append(key)
+                    self._restore(key)
+
+    @contextmanager
+    def using(self, keys: Iterable[str]) -> Iterator[None]:
+        """구간 안에서만 keys 를 풀의 키와 함께 사용 (요청 설정의 키를 다른 실행과 공유하지 않음)
+
+        사용량과 소진/무효 기록은 키별로 남으므로 같은 키를 다시 넘기면 이어서 계산된다.
+        """
+        extra = tuple(dict.fromkeys(k for k in keys if k))
+        with self._lock:
+            for key in extra:
+                if key not in self._usage:
+                    self._restore(key)
+        token = _run_keys.set(extra)
+        try:
+            yield
+        finally:
+            _run_keys.reset(token)
+
+    def _restore(self, key: str):
+        """재시작 전 오늘 사용량/소진/무효 기록 복원 (lock 안에서 호출)"""
+        self._usage.setdefault(key, self._saved.get("usage", {}).get(_key_id(key), 0))
+        if _key_id(key) in self._saved.get("exhausted", []):
+            self._exhausted.add(key)
+        if _key_id(key) in self._saved_invalid:
+            self._invalid.add(key)
+
+    def _active_keys(self) -> List[str]:
+        """풀의 키 + 현재 실행의 키 (lock 안에서 호출)"""
+        return self._keys + [k for k in _run_keys.get() if k not in self._keys]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len([k for k in self._active_keys() if k not in self._invalid])
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [k for k in self._active_keys() if k not in self._invalid]
+
+    def acquire(self, cost: int = 1) -> str:
+        """남은 할당량이 가장 많은 키 선택 후 비용 예약 (응답 후 record, 보내지 못했으면 release)"""
+        with self._lock:
+            self._roll_day()
+            candidates = [k for k in self._active_keys() if k not in self._exhausted and k not in self._invalid]
+            if not candidates:
+                raise QuotaExhaustedError("사용 가능한 API 키가 없습니다. (모든 키의 일일 할당량 소진)")
+
+            key = max(candidates, key=self._left)
+            if self._left(key) < cost:
+                raise QuotaExhaustedError("남은 API 할당량이 부족합니다.")
+            self._reserved[key] = self._reserved.get(key, 0) + cost
+            return key
+
+    def record(self, key: str, cost: int):
+        """예약한 비용을 사용량으로 기록"""
+        with self._lock:
+            self._roll_day()
+            self._unreserve(key, cost)
+            self._usage[key] = self._usage.get(key, 0) + cost
+            self._save_usage()
+
+    def release(self, key: str, cost: int):
+        """사용하지 않은 예약 반환 (요청 실패, 키 소진/무효 응답)"""
+        with self._lock:
+            self._unreserve(key, cost)
+
+    def _left(self, key: str) -> int:
+        """예약을 뺀 남은 할당량 (lock 안에서 호출)"""
+        return self.daily_quota - self._usage.get(key, 0) - self._reserved.get(key, 0)
+
+    def _unreserve(self, key: str, cost: int):
+        left = self._reserved.get(key, 0) - cost
+        if left > 0:
+            self._reserved[key] = left
+        else:
+            self._reserved.pop(key, None)
+
+    def mark_exhausted(self, key: str):
+        """quotaExceeded 응답을 받은 키는 오늘 남은 시간 동안 사용하지 않음"""
+        with self._lock:
+            self._exhausted.add(key)
+            self._usage[key] = max(self._usage.get(key, 0), self.daily_quota)
+            self._save_usage(force=True)
+        logger.warning(f"API 키 {_mask(key)} 할당량 소진, 다른 키로 전환")
+
+    def mark_invalid(self, key: str):
+        """keyInvalid/accessNotConfigured 등 키 자체가 거부된 경우 - 날짜가 바뀌어도 다시 쓰지 않음"""
+        with self._lock:
+            self._invalid.add(key)
+            self._save_usage(force=True)
+        logger.warning(f"API 키 {_mask(key)} 가 거부됨 (무효/사용 불가), 이후 사용하지 않음")
+
+    def remaining(self) -> int:
+        """전체 남은 할당량"""
+        with self._lock:
+            self._roll_day()
+            return sum(
+                max(self._left(k), 0)
+                for k in self._active_keys() if k not in self._exhausted and k not in self._invalid
+            )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """키별 사용량 (키는 마스킹)"""
+        with self._lock:
+            self._roll_day()
+            return {
+                "day": self._day,
+                "daily_quota": self.daily_quota,
+                "keys": [
+                    {
+                        "key": _mask(k),
+                        "used": self._usage.get(k, 0),
+                        "reserved": self._reserved.get(k, 0),
+                        "remaining": max(self.daily_quota - self._usage.get(k, 0), 0),
+                        "exhausted": k in self._exhausted,
+                        "invalid": k in self._invalid
+                    }
+                    for k in self._active_keys()
+                ]
+            }
+
+    def _pacific_day(self) -> str:
+        return datetime.now(PACIFIC_TZ).date().isoformat()
+
+    def _roll_day(self):
+        """태평양 시간 기준 날짜가 바뀌면 사용량 초기화 (lock 안에서 호출)"""
+        today = self._pacific_day()
+        if today != self._day:
+            self._day = today
+            self._usage = {k: 0 for k in self._keys}
+            self._exhausted = set()
+            self._saved = {}
+
+    def _load_usage(self):
+        if not self.usage_file or not os.path.exists(self.usage_file):
+            return
+        try:
+            with open(self.usage_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 무효 키는 날짜와 관계없이 유지
+            self._saved_invalid = set(data.get("invalid", []))
+            if data.get("day") == self._day:
+                self._saved = data
+        except Exception as e:
+            logger.warning(f"할당량 사용량 파일 읽기 실패: {e}")
+
+    def _save_usage(self, force: bool = False):
+        """사용량 파일 저장 (매 호출마다 쓰지 않도록 5초 간격, lock 안에서 호출)"""
+        if not self.usage_file:
+            return
+        now = time.time()
+        if not force and now - self._last_saved < 5:
+            return
+        self._last_saved = now
+
+        tmp_path = f"{self.usage_file}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "day": self._day,
+                    "usage": {_key_id(k): used for k, used in self._usage.items()},
+                    "exhausted": sorted(_key_id(k) for k in self._exhausted),
+                    "invalid": sorted(self._saved_invalid | {_key_id(k) for k in self._invalid})
+                }, f)
+            os.replace(tmp_path, self.usage_file)
+        except Exception as e:
+            logger.warning(f"할당량 사용량 파일 저장 실패: {e}")
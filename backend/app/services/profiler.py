@@ -0,0 +1,167 @@
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 실행 중인 작업의 프로파일러 (asyncio.to_thread / ApiTransport.map 이 복사하는 컨텍스트로 작업 스레드에 전달)
+_current_profiler: ContextVar[Optional["SamplingProfiler"]] = ContextVar("job_profiler", default=None)
+
+def job_call(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """작업 스레드에서 fn 실행 (컨텍스트에 프로파일러가 있으면 실행하는 동안 이 스레드를 측정 대상에 포함)"""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        return fn(*args, **kwargs)
+    profiler._enter_thread()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        profiler._exit_thread()
+
+def _label(code) -> str:
+    """프레임 표시 이름 (앱 코드는 app/ 기준 경로, 그 외는 파일명) - folded 형식 구분자 ';' 제거"""
+    filename = code.co_filename
+    if filename.startswith(APP_DIR):
+        location = os.path.relpath(filename, os.path.dirname(APP_DIR))
+    else:
+        location = os.path.basename(filename)
+    return f"{code.co_name} ({location}:{code.co_firstlineno})".replace(";", ",")
+
+class SamplingProfiler:
+    """작업 단위 벽시계 샘플링 프로파일러
+
+    수집은 이벤트 루프와 asyncio.to_thread 작업 스레드에 나뉘어 실행되므로 cProfile(스레드 하나만 측정)
+    대신 별도 스레드가 일정 간격으로 모든 스레드의 스택을 읽는다. 이벤트 루프 스레드는 작업 코루틴
+    프레임(start 의 root)이 스택에 있을 때만, 다른 스레드는 job_call 로 이 작업을 실행 중일 때만 남기므로
+    동시에 돌고 있는 다른 요청/작업은 빠지고, API 응답 대기 시간은 그대로 잡힌다.
+    """
+
+    def __init__(self, interval_ms: Optional[float] = None, top_n: Optional[int] = None):
+        self.interval = float(interval_ms if interval_ms is not None
+                              else os.getenv("PROFILE_SAMPLE_INTERVAL_MS", 5)) / 1000
+        self.top_n = top_n if top_n is not None else int(os.getenv("PROFILE_TOP_N", 30))
+
+        self._stage = "setup"
+        self._stages: Dict[str, float] = {}
+        # (단계, 스레드 이름, 루트 → 말단 프레임 이름들) → 샘플 수
+        self._counts: Dict[Tuple[str, ...], int] = {}
+        self._ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+        self._elapsed = 0.0
+        # 측정 대상: 작업 코루틴 프레임, 작업을 실행 중인 스레드 (스레드 id → 중첩 횟수)
+        self._root = None
+        self._threads: Dict[int, int] = {}
+        self._threads_lock = threading.Lock()
+        self._token = None
+
+    def start(self, root=None):
+        """샘플링 시작 (root: 작업 코루틴 프레임, 현재 컨텍스트에서 시작한 작업 스레드도 측정 대상이 됨)"""
+        self._root = root
+        self._token = _current_profiler.set(self)
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="job-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._token is not None:
+            _current_profiler.reset(self._token)
+            self._token = None
+        self._elapsed = time.perf_counter() - self._started
+
+    def _enter_thread(self):
+        ident = threading.get_ident()
+        with self._threads_lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def _exit_thread(self):
+        ident = threading.get_ident()
+        with self._threads_lock:
+            if self._threads.get(ident, 0) <= 1:
+                self._threads.pop(ident, None)
+            else:
+                self._threads[ident] -= 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """단계 구간 표시 (샘플에 단계 이름을 붙이고 단계별 소요 시간 기록)"""
+        previous, self._stage = self._stage, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stages[name] = round(self._stages.get(name, 0.0) + time.perf_counter() - started, 4)
+            self._stage = previous
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            self._ticks += 1
+            stage = self._stage
+            with self._threads_lock:
+                job_threads = set(self._threads)
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack, relevant = [], thread_id in job_threads
+                while frame is not None:
+                    relevant = relevant or frame is self._root
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if not relevant:
+                    continue
+
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                key = (stage, names.get(thread_id, str(thread_id)), *(_label(code) for code in reversed(stack)))
+                self._counts[key] = self._counts.get(key, 0) + 1
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+    def folded(self) -> str:
+        """flamegraph.pl / speedscope 에서 읽는 folded stack 형식 (단계;스레드;프레임... 샘플 수)"""
+        # 스레드 풀 이름의 번호는 빼서 같은 코드 경로가 한 줄로 합쳐지도록 함
+        merged: Dict[str, int] = {}
+        for (stage, thread, *frames), count in self._counts.items():
+            line = ";".join([stage, thread.rsplit("_", 1)[0], *frames])
+            merged[line] = merged.get(line, 0) + count
+        return "".join(f"{line} {count}\n" for line, count in sorted(merged.items()))
+
+    def top(self, limit: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """함수별 self(말단) / total(스택에 포함) 샘플 수 상위 목록"""
+        total = sum(self._counts.values()) or 1
+        own: Dict[str, int] = {}
+        inclusive: Dict[str, int] = {}
+        for (_, _, *frames), count in self._counts.items():
+            own[frames[-1]] = own.get(frames[-1], 0) + count
+            for frame in set(frames):
+                inclusive[frame] = inclusive.get(frame, 0) + count
+
+        def rank(counts: Dict[str, int]) -> List[Dict[str, Any]]:
+            ranked = sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:limit or self.top_n]
+            return [{"function": name, "samples": n, "percent": round(100 * n / total, 2)} for name, n in ranked]
+
+        return {"self": rank(own), "total": rank(inclusive)}
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "interval_ms": self.interval * 1000,
+            "elapsed_seconds": round(self._elapsed, 4),
+            "ticks": self._ticks,
+            "samples": sum(self._counts.values()),
+            "stages": dict(self._stages),
+            "top": self.top()
+        }
@@ -0,0 +1,353 @@
+import json
+import logging
+import mmap
+import os
+import shutil
+import sys
+import threading
+import uuid
+import weakref
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 영상 행의 열 구성 (이름, 종류)
+#   str: 문자열 / dict: 반복이 많은 문자열(사전 인코딩) / int, float, bool / datetime: epoch 초
+#   tags: 짧은 문자열 목록 (쉼표로 이어서 사전 인코딩)
+# 채널명/구독자수는 결과의 channels 테이블(channel_id → 채널 정보)에 한 번만 저장
+VIDEO_COLUMNS: List[Tuple[str, str]] = [
+    ("video_id", "str"),
+    ("title", "str"),
+    ("channel_id", "dict"),
+    ("upload_date", "datetime"),
+    ("views", "int"),
+    ("views_per_hour", "float"),
+    ("views_to_subscribers_ratio", "float"),
+    ("duration", "int"),
+    ("thumbnail_url", "str"),
+    ("is_shorts", "bool"),
+    ("breakout_score", "float"),
+    ("baseline_views", "int"),
+    ("regions", "tags"),
+]
+
+# 저장하지 않고 다른 열에서 계산하는 값
+DERIVED_COLUMNS = {
+    "video_url": lambda row: f"https://www.youtube.com/watch?v={row['video_id']}"
+}
+
+# channel_id 로 채널 테이블에서 가져오는 값 (정렬에 사용 가능)
+CHANNEL_COLUMNS = ("channel_name", "subscribers")
+
+_COLUMN_KINDS = dict(VIDEO_COLUMNS)
+
+_TYPECODES = {"int": "q", "float": "d", "bool": "b", "datetime": "d", "dict": "l", "tags": "l"}
+
+def referenced_channels(channels: Dict[str, Dict[str, Any]], channel_ids) -> Dict[str, Dict[str, Any]]:
+    """영상 목록이 참조하는 채널만 추린 채널 테이블"""
+    return {cid: channels[cid] for cid in dict.fromkeys(channel_ids) if cid in channels}
+
+def channel_sort_key(channels: Dict[str, Dict[str, Any]], name: str):
+    """channel_id → 채널 테이블 값 (정렬용, 없는 채널은 빈 값)"""
+    empty = "" if name == "channel_name" else 0
+    return lambda channel_id: (channels.get(channel_id) or {}).get(name, empty)
+
+def _to_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    return float(value or 0)
+
+class CompactVideoTable:
+    """메모리에 보관하는 열 단위 영상 테이블
+
+    숫자는 array, 채널명/채널 ID 는 사전 인코딩(값 목록 + 코드 배열), 나머지 문자열은 intern 된 list.
+    video_url 처럼 계산 가능한 값은 저장하지 않는다.
+    """
+
+    spilled = False
+
+    def __init__(self):
+        self.columns: Dict[str, Any] = {}
+        self.dictionaries: Dict[str, List[str]] = {}
+        self.length = 0
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "CompactVideoTable":
+        table = cls()
+        table.length = len(rows)
+
+        for name, kind in VIDEO_COLUMNS:
+            if kind == "str":
+                table.columns[name] = [sys.intern(str(row.get(name) or "")) for row in rows]
+            elif kind in ("dict", "tags"):
+                values: Dict[str, int] = {}
+                raw = (row.get(name) for row in rows)
+                if kind == "tags":
+                    raw = (",".join(value or []) for value in raw)
+                codes = array('l', (values.setdefault(str(value or ""), len(values)) for value in raw))
+                table.columns[name] = codes
+                table.dictionaries[name] = list(values)
+            elif kind == "datetime":
+                table.columns[name] = array('d', (_to_epoch(row.get(name)) for row in rows))
+            elif kind == "float":
+                table.columns[name] = array('d', (float(row.get(name) or 0) for row in rows))
+            else:
+                table.columns[name] = array(_TYPECODES[kind], (int(row.get(name) or 0) for row in rows))
+
+        return table
+
+    def __len__(self) -> int:
+        return self.length
+
+    def value(self, name: str, index: int) -> Any:
+        kind = _COLUMN_KINDS[name]
+        raw = self.columns[name][index]
+        if kind == "dict":
+            return self.dictionaries[name][raw]
+        if kind == "tags":
+            value = self.dictionaries[name][raw]
+            return value.split(",") if value else []
+        return raw
+
+    def column(self, name: str):
+        """정렬/필터용 원시 열 (사전 인코딩 열은 코드)"""
+        return self.columns[name]
+
+    def row(self, index: int) -> Dict[str, Any]:
+        row = {}
+        for name, kind in VIDEO_COLUMNS:
+            value = self.value(name, index)
+            if kind == "datetime":
+                value = datetime.fromtimestamp(value, timezone.utc)
+            elif kind == "bool":
+                value = bool(value)
+            row[name] = value
+        for name, derive in DERIVED_COLUMNS.items():
+            row[name] = derive(row)
+        return row
+
+    def nbytes(self) -> int:
+        """대략적인 메모리 사용량"""
+        total = 0
+        for name, kind in VIDEO_COLUMNS:
+            column = self.columns[name]
+            if kind == "str":
+                # 포인터 + 문자열 객체 (intern 으로 중복은 한 번만)
+                total += 8 * len(column) + sum(sys.getsizeof(s) for s in set(column))
+            else:
+                total += column.itemsize * len(column)
+        for values in self.dictionaries.values():
+            total += sum(sys.getsizeof(v) for v in values)
+        return total
+
+    def spill(self, directory: Path) -> "SpilledVideoTable":
+        """열별 파일로 저장 후 memory-mapped 테이블 반환"""
+        directory.mkdir(parents=True, exist_ok=True)
+
+        for name, kind in VIDEO_COLUMNS:
+            column = self.columns[name]
+            if kind == "str":
+                # 문자열은 UTF-8 데이터 + 오프셋 배열
+                offsets = array('q', [0])
+                with open(directory / f"{name}.dat", 'wb') as f:
+                    for value in column:
+                        encoded = value.encode('utf-8')
+                        f.write(encoded)
+                        offsets.append(offsets[-1] + len(encoded))
+                with open(directory / f"{name}.idx", 'wb') as f:
+                    offsets.tofile(f)
+            else:
+                with open(directory / f"{name}.bin", 'wb') as f:
+                    column.tofile(f)
+
+        with open(directory / "meta.json", 'w', encoding='utf-8') as f:
+            json.dump({"length": self.length, "dictionaries": self.dictionaries}, f, ensure_ascii=False)
+
+        return SpilledVideoTable(directory)
+
+class SpilledVideoTable(CompactVideoTable):
+    """디스크로 내보낸 테이블 (mmap 으로 필요한 부분만 읽음)"""
+
+    spilled = True
+
+    def __init__(self, directory: Path):
+        super().__init__()
+        self.directory = directory
+        self._maps: List[mmap.mmap] = []
+
+        with open(directory / "meta.json", 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.length = meta["length"]
+        self.dictionaries = meta["dictionaries"]
+
+        for name, kind in VIDEO_COLUMNS:
+            if kind == "str":
+                self.columns[name] = _MappedStrings(self._map(directory / f"{name}.dat"),
+                                                    self._map(directory / f"{name}.idx").cast('q'))
+            else:
+                self.columns[name] = self._map(directory / f"{name}.bin").cast(_TYPECODES[kind])
+
+    def _map(self, path: Path) -> memoryview:
+        if path.stat().st_size == 0:
+            return memoryview(b"")
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped)
+
+    def nbytes(self) -> int:
+        # 페이지 캐시는 OS 가 관리하므로 메모리 예산에 포함하지 않음
+        return 0
+
+    def close(self):
+        """mmap 해제 (열 참조를 먼저 끊어야 함)"""
+        self.columns = {}
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass
+        self._maps = []
+
+class _MappedStrings:
+    """mmap 된 UTF-8 데이터 + 오프셋으로 구성된 문자열 열"""
+
+    def __init__(self, data: memoryview, offsets: memoryview):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, index: int) -> str:
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]]).decode('utf-8')
+
+class ResultRetention:
+    """분석 결과 보관소 (메모리 예산을 넘으면 오래 안 쓴 결과부터 디스크로 내보냄)"""
+
+    def __init__(self, budget_bytes: Optional[int] = None, spill_dir: Optional[str] = None):
+        self.budget_bytes = budget_bytes if budget_bytes is not None else \
+            int(float(os.getenv("RESULT_MEMORY_BUDGET_MB", 256)) * 1024 * 1024)
+        # 같은 폴더를 쓰는 다른 프로세스(CLI 등)와 겹치지 않도록 인스턴스별 하위 폴더 사용
+        spill_root = Path(spill_dir or os.getenv("RESULT_SPILL_DIR", "result_spill"))
+        self.spill_dir = spill_root / f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+        # 메모리 저장소의 결과는 재시작 후 유지되지 않으므로 종료 시 삭제
+        weakref.finalize(self, shutil.rmtree, str(self.spill_dir), True)
+
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], CompactVideoTable]]" = OrderedDict()
+
+    def put(self, result_id: str, payload: Dict[str, Any]):
+        """결과 저장 (videos 는 열 단위로 압축)"""
+        meta = {k: v for k, v in payload.items() if k != "videos"}
+        table = CompactVideoTable.from_rows(payload.get("videos") or [])
+
+        with self._lock:
+            self._discard(result_id)
+            self._entries[result_id] = (meta, table)
+            self._enforce_budget()
+
+    def has(self, result_id: str) -> bool:
+        with self._lock:
+            return result_id in self._entries
+
+    def get(self, result_id: str) -> Optional[Dict[str, Any]]:
+        """전체 결과 (videos 포함)"""
+        with self._lock:
+            entry = self._touch(result_id)
+            if entry is None:
+                return None
+            meta, table = entry
+            return {**meta, "videos": [table.row(i) for i in range(len(table))]}
+
+    def page(self, result_id: str, offset: int = 0, limit: int = 100, sort_by: Optional[str] = None,
+             descending: bool = True, min_views: Optional[int] = None,
+             matches: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """videos 일부만 조회 (정렬/최소 조회수 필터, matches: 검색 결과 video_id → 점수)"""
+        with self._lock:
+            entry = self._touch(result_id)
+            if entry is None:
+                return None
+            meta, table = entry
+            channels = meta.get("channels") or {}
+
+            indices = range(len(table))
+            if matches is not None:
+                video_ids = table.column("video_id")
+                indices = [i for i in indices if video_ids[i] in matches]
+            if min_views is not None:
+                views = table.column("views")
+                indices = [i for i in indices if views[i] >= min_views]
+            if matches is not None and not sort_by:
+                # 정렬 기준이 없으면 검색 점수 순
+                video_ids = table.column("video_id")
+                indices = sorted(indices, key=lambda i: matches[video_ids[i]], reverse=True)
+            elif sort_by in CHANNEL_COLUMNS:
+                channel_value = channel_sort_key(channels, sort_by)
+                indices = sorted(indices, key=lambda i: channel_value(table.value("channel_id", i)),
+                                 reverse=descending)
+            elif sort_by:
+                if sort_by not in _COLUMN_KINDS:
+                    raise ValueError(f"정렬할 수 없는 열입니다: {sort_by}")
+                indices = sorted(indices, key=lambda i: table.value(sort_by, i), reverse=descending)
+
+            indices = list(indices)
+            videos = [table.row(i) for i in indices[offset:offset + limit]]
+            return {
+                "total": len(indices),
+                "offset": offset,
+                "limit": limit,
+                "videos": videos,
+                "channels": referenced_channels(channels, (v["channel_id"] for v in videos))
+            }
+
+    def remove(self, result_id: str):
+        with self._lock:
+            self._discard(result_id)
+
+    def memory_usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "budget_bytes": self.budget_bytes,
+                "in_memory_bytes": sum(t.nbytes() for _, t in self._entries.values()),
+                "results": len(self._entries),
+                "spilled": sum(1 for _, t in self._entries.values() if t.spilled)
+            }
+
+    def _touch(self, result_id: str):
+        entry = self._entries.get(result_id)
+        if entry is not None:
+            self._entries.move_to_end(result_id)
+        return entry
+
+    def _discard(self, result_id: str):
+        entry = self._entries.pop(result_id, None)
+        if entry and entry[1].spilled:
+            entry[1].close()
+            shutil.rmtree(entry[1].directory, ignore_errors=True)
+
+    def _enforce_budget(self):
+        """예산 초과 시 가장 오래 안 쓴 결과부터 디스크로 (가장 최근 결과는 유지)"""
+        total = sum(t.nbytes() for _, t in self._entries.values())
+        for result_id in list(self._entries)[:-1]:
+            if total <= self.budget_bytes:
+                break
+            meta, table = self._entries[result_id]
+            if table.spilled or len(table) == 0:
+                continue
+
+            size = table.nbytes()
+            try:
+                self._entries[result_id] = (meta, table.spill(self.spill_dir / result_id))
+                total -= size
+                logger.info(f"분석 결과 {result_id} 디스크로 이동 ({size} bytes)")
+            except OSError as e:
+                logger.error(f"분석 결과 {result_id} 디스크 저장 실패: {e}")
+                break
@@ -0,0 +1,117 @@
+import gzip
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, List, Optional
+
+from app.services.result_store import referenced_channels
+from app.services.state_store import dumps
+
+logger = logging.getLogger(__name__)
+
+# If-None-Match 의 entity-tag 하나 (W/ 접두사는 약한 비교에서 무시, 따옴표 안의 쉼표 허용)
+_ENTITY_TAG = re.compile(r'\s*(?:W/)?"([^"]*)"\s*(?:,|$)')
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 etag 와 일치하는지 (RFC 9110: 약한 비교, 쉼표 목록, *)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    opaque = opaque.strip('"')
+    return any(tag == opaque for tag in _ENTITY_TAG.findall(if_none_match))
+
+class ResultVersion:
+    """한 버전의 결과를 직렬화/압축해 둔 응답 본문"""
+
+    def __init__(self, version: str, result: Dict[str, Any]):
+        self.version = version
+        self.meta = {k: v for k, v in result.items() if k != "videos"}
+
+        # 행 단위로 한 번만 직렬화해서 본문과 행 지문(delta 비교용)을 같이 만든다
+        self.rows: List[Dict[str, Any]] = result.get("videos") or []
+        encoded_rows = [dumps(row) for row in self.rows]
+        self.row_hashes: Dict[str, int] = {
+            row.get("video_id"): hash(encoded) for row, encoded in zip(self.rows, encoded_rows)
+        }
+
+        # {..., "version": ..., "videos": [...]} - 메타 JSON 의 닫는 괄호 앞에 영상 배열을 이어 붙임
+        meta_json = dumps({**self.meta, "version": version})
+        body = meta_json[:-1] + ', "videos": [' + ", ".join(encoded_rows) + ']}'
+
+        self.body = body.encode("utf-8")
+        self.gzipped = gzip.compress(self.body, compresslevel=6)
+        self.etag = f'"{version}"'
+        self.last_modified = _http_date(self.meta.get("analysis_date"))
+
+    def delta_since(self, previous: "ResultVersion") -> Dict[str, Any]:
+        """이전 버전 이후 바뀌거나 추가된 영상 행과 삭제된 영상 ID"""
+        changed = [
+            row for row in self.rows
+            if previous.row_hashes.get(row.get("video_id")) != self.row_hashes.get(row.get("video_id"))
+        ]
+        removed = [video_id for video_id in previous.row_hashes if video_id not in self.row_hashes]
+        channels = self.meta.get("channels") or {}
+
+        return {
+            **self.meta,
+            "version": self.version,
+            "since": previous.version,
+            "delta": True,
+            "videos": changed,
+            "removed_video_ids": removed,
+            "channels": referenced_channels(channels, (row.get("channel_id") for row in changed))
+        }
+
+def _http_date(value: Any) -> Optional[str]:
+    """analysis_date → Last-Modified 헤더 형식"""
+    if not value:
+        return None
+    try:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.astimezone()
+    return format_datetime(moment.astimezone(timezone.utc), usegmt=True)
+
+class ResultVersionCache:
+    """결과 버전별 직렬화/압축 본문 캐시 (같은 버전은 한 번만 직렬화)
+
+    버전은 저장소의 결과 식별자(job_id)이므로 결과가 바뀌지 않는 한 다시 계산하지 않는다.
+    delta 요청을 위해 최근 몇 개 버전을 함께 보관한다.
+    """
+
+    def __init__(self, max_versions: Optional[int] = None):
+        self.max_versions = max_versions if max_versions is not None else \
+            int(os.getenv("RESULT_VERSION_CACHE_SIZE", 4))
+        self._lock = threading.Lock()
+        self._versions: "OrderedDict[str, ResultVersion]" = OrderedDict()
+
+    def get(self, version: str) -> Optional[ResultVersion]:
+        with self._lock:
+            entry = self._versions.get(version)
+            if entry is not None:
+                self._versions.move_to_end(version)
+            return entry
+
+    def build(self, version: str, result: Dict[str, Any]) -> ResultVersion:
+        """결과를 직렬화해 캐시에 넣고 반환 (이미 있으면 기존 것 사용)"""
+        entry = self.get(version)
+        if entry is not None:
+            return entry
+
+        entry = ResultVersion(version, result)
+        logger.info(f"결과 버전 {version} 직렬화: {len(entry.body)} bytes (gzip {len(entry.gzipped)} bytes)")
+
+        with self._lock:
+            self._versions[version] = entry
+            self._versions.move_to_end(version)
+            while len(self._versions) > max(self.max_versions, 1):
+                self._versions.popitem(last=False)
+        return entry
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+def settings_fingerprint(settings: AnalysisSettings) -> str:
+    """분석 설정의 정규화 해시 (API 키/프로파일 여부 제외, 검색어/채널 목록은 정렬)"""
+    data = settings.dict(exclude={"api_key", "api_keys", "profile"})
+    data["search_terms"] = sorted(set(data.get("search_terms") or []))
+    data["channel_ids"] = sorted(set(data.get("channel_ids") or []))
+    data["region_codes"] = sorted(settings.search_regions()) if settings.region_codes else []
+
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class RunCache:
+    """같은 설정으로 다시 시작한 분석은 일정 시간 동안 이전 결과를 재사용"""
+
+    def __init__(self, store: StateStore, ttl: Optional[float] = None, max_entries: Optional[int] = None):
+        self.store = store
+        self.ttl = ttl if ttl is not None else float(os.getenv("RUN_CACHE_TTL", 600))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv("RUN_CACHE_MAX_ENTRIES", 20))
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """유효 기간 안의 결과 반환"""
+        if not self.enabled:
+            return None
+
+        cached = self.store.get_cached_run(key)
+        if not cached:
+            return None
+
+        created, result = cached
+        if time.time() - created > self.ttl:
+            return None
+
+        logger.info(f"캐시된 분석 결과 사용: {key[:12]}")
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]):
+        """결과 저장"""
+        if self.enabled:
+            self.store.put_cached_run(key, result, self.max_entries)
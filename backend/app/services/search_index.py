@@ -0,0 +1,198 @@
+import logging
+import os
+import threading
+import unicodedata
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 검색 결과로 돌려주는 영상 필드 (채널명은 결과의 채널 표에서 붙임)
+ROW_FIELDS = ("video_id", "title", "channel_id", "upload_date", "views", "views_per_hour",
+              "duration", "video_url", "thumbnail_url", "is_shorts")
+
+def normalize(text: str) -> str:
+    """검색용 정규화 (NFKC, 소문자, 공백/기호 제거 - 띄어쓰기가 달라도 찾을 수 있도록)"""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return "".join(ch for ch in text if ch.isalnum())
+
+def grams(text: str) -> List[str]:
+    """정규화된 문자열의 글자 bigram (한 글자면 unigram)"""
+    if len(text) < 2:
+        return [text] if text else []
+    return [text[i:i + 2] for i in range(len(text) - 1)]
+
+class VideoSearchIndex:
+    """영상 제목/채널명 역색인 (글자 bigram)
+
+    한국어는 띄어쓰기 없이 붙여 쓰는 경우가 많아 단어 대신 글자 두 개 단위로 색인한다.
+    게시 목록은 문서 번호가 증가하는 순서로만 추가되는 array 이고, 제목이 바뀐 영상은
+    새 번호로 다시 색인한 뒤 이전 번호를 무효 처리한다 (무효 문서가 많아지면 재구성).
+    검색은 가장 드문 gram 의 게시 목록만 훑고 원문 포함 여부로 확인한다.
+    최근 max_versions 개 결과 버전에 한 번도 나오지 않은 영상은 색인에서 뺀다.
+    """
+
+    def __init__(self, max_versions: Optional[int] = None):
+        self.max_versions = max_versions if max_versions is not None else int(os.getenv("SEARCH_INDEX_MAX_VERSIONS", 8))
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, array] = {}
+        # 문서 번호 → (video_id, 정규화 제목, 정규화 채널명), 무효 문서는 None
+        self._docs: List[Optional[Tuple[str, str, str]]] = []
+        self._doc_ids: Dict[str, int] = {}
+        self._dead = 0
+        # 결과 버전 → 색인 순번 (오래된 것부터), video_id → (마지막으로 나온 순번, 검색 결과 행)
+        self._ingested_versions: Dict[str, int] = {}
+        self._seq = 0
+        self._rows: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def add(self, video_id: str, title: str, channel_name: str = "") -> bool:
+        """영상 색인 (내용이 같으면 건너뜀), 새로 색인했으면 True"""
+        title_norm, channel_norm = normalize(title), normalize(channel_name)
+        with self._lock:
+            doc_id = self._doc_ids.get(video_id)
+            if doc_id is not None:
+                if self._docs[doc_id] == (video_id, title_norm, channel_norm):
+                    return False
+                self._docs[doc_id] = None
+                self._dead += 1
+
+            doc_id = len(self._docs)
+            self._docs.append((video_id, title_norm, channel_norm))
+            self._doc_ids[video_id] = doc_id
+            self._index_doc(doc_id, title_norm, channel_norm)
+
+            if self._dead > 1000 and self._dead > len(self._docs) // 4:
+                self._compact()
+            return True
+
+    def ingest(self, result: Dict[str, Any], version: Optional[str] = None) -> int:
+        """분석 결과의 영상들을 색인 (같은 버전은 한 번만), 새로 색인한 영상 수 반환"""
+        with self._lock:
+            if version is not None and version in self._ingested_versions:
+                return 0
+            self._seq += 1
+            seq = self._seq
+            if version is not None:
+                self._ingested_versions[version] = seq
+
+        channels = result.get("channels") or {}
+        added = 0
+        for video in result.get("videos") or []:
+            channel = channels.get(video.get("channel_id")) or {}
+            channel_name = channel.get("channel_name") or video.get("channel_name") or ""
+            if self.add(video["video_id"], video.get("title") or "", channel_name):
+                added += 1
+            row = {field: video.get(field) for field in ROW_FIELDS}
+            row["channel_name"] = channel_name
+            with self._lock:
+                if video["video_id"] in self._doc_ids:
+                    self._rows[video["video_id"]] = (seq, row)
+
+        evicted = self._evict()
+        if added or evicted:
+            logger.info(f"검색 색인: 영상 {added}개 추가, {evicted}개 제거 (전체 {len(self)}개)")
+        return added
+
+    def has_version(self, version: str) -> bool:
+        return version in self._ingested_versions
+
+    def row(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """색인된 영상의 마지막 결과 행 (제목, 채널명, 조회수 등)"""
+        with self._lock:
+            entry = self._rows.get(video_id)
+            return dict(entry[1]) if entry else None
+
+    def _evict(self) -> int:
+        """오래된 결과 버전을 잊고, 남은 버전에 나오지 않은 영상을 색인에서 제거"""
+        with self._lock:
+            if len(self._ingested_versions) <= self.max_versions:
+                return 0
+            while len(self._ingested_versions) > self.max_versions:
+                del self._ingested_versions[next(iter(self._ingested_versions))]
+            oldest = min(self._ingested_versions.values())
+
+            stale = [video_id for video_id, (seq, _) in self._rows.items() if seq < oldest]
+            for video_id in stale:
+                self._docs[self._doc_ids.pop(video_id)] = None
+                self._dead += 1
+                del self._rows[video_id]
+            if self._dead > len(self._docs) // 4:
+                self._compact()
+            return len(stale)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(video_id, 점수) 목록 - 점수 순
+
+        공백으로 나눈 검색어가 모두 제목 또는 채널명에 있어야 일치한다.
+        제목 일치 > 채널명 일치, 앞쪽에서 일치할수록, 검색어 전체가 붙어서 일치하면 점수가 높다.
+        """
+        terms = [term for term in (normalize(t) for t in query.split()) if term]
+        if not terms:
+            return []
+        phrase = "".join(terms)
+
+        with self._lock:
+            lists = [self._postings.get(gram) for term in terms for gram in set(grams(term))]
+            if any(postings is None for postings in lists):
+                return []
+            rarest = min(lists, key=len)
+
+            matches = []
+            for doc_id in rarest:
+                doc = self._docs[doc_id]
+                if doc is None:
+                    continue
+                video_id, title, channel = doc
+                score = 0.0
+                for term in terms:
+                    position = title.find(term)
+                    if position >= 0:
+                        score += 2.0 + 1.0 / (1 + position)
+                    elif term in channel:
+                        score += 1.0
+                    else:
+                        break
+                else:
+                    if len(terms) > 1 and phrase in title:
+                        score += 1.0
+                    matches.append((video_id, round(score + len(phrase) / max(len(title), 1), 4)))
+
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches[:limit] if limit else matches
+
+    def matching_ids(self, query: str) -> Dict[str, float]:
+        """video_id → 점수 (결과 페이지 필터용)"""
+        return dict(self.search(query))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "videos": len(self._doc_ids),
+                "grams": len(self._postings),
+                "postings": sum(len(p) for p in self._postings.values()),
+                "dead_documents": self._dead,
+                "ingested_versions": len(self._ingested_versions),
+                "max_versions": self.max_versions
+            }
+
+    def _compact(self):
+        """무효 문서를 빼고 다시 색인 (lock 안에서 호출)"""
+        live = [doc for doc in self._docs if doc is not None]
+        self._postings, self._docs, self._doc_ids, self._dead = {}, [], {}, 0
+        for video_id, title, channel in live:
+            doc_id = len(self._docs)
+            self._docs.append((video_id, title, channel))
+            self._doc_ids[video_id] = doc_id
+            self._index_doc(doc_id, title, channel)
+
+    def _index_doc(self, doc_id: int, title: str, channel: str):
+        """게시 목록에 문서 추가 (제목과 채널명이 이어지는 gram 이 생기지 않도록 따로 추출, 한 글자 검색용 unigram 포함)"""
+        for gram in set(grams(title)) | set(grams(channel)) | set(title) | set(channel):
+            postings = self._postings.get(gram)
+            if postings is None:
+                postings = self._postings[gram] = array('l')
+            postings.append(doc_id)
@@ -0,0 +1,316 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.cron import CronSchedule
+
+logger = logging.getLogger(__name__)
+
+# 설정 화면의 "현재 설정" (GET/POST /api/settings/)
+DEFAULT_PROFILE = "default"
+
+_PROFILE_NAME = re.compile(r"^[\w\- ]{1,64}$")
+
+def schedule_timezone():
+    """예약 실행 cron 식의 시간대 (PROFILE_SCHEDULE_TZ, 기본 UTC)"""
+    name = os.getenv("PROFILE_SCHEDULE_TZ", "UTC")
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        logger.warning(f"알 수 없는 시간대 '{name}', UTC 사용")
+        return timezone.utc
+
+def build_settings(data: Dict[str, Any]) -> AnalysisSettings:
+    """저장된 설정 dict → 분석 설정 (키가 비어 있으면 키 풀의 환경 변수 키 사용)"""
+    data = dict(data)
+    data.setdefault("api_key", "")
+    return AnalysisSettings(**data)
+
+class SettingsProfiles:
+    """이름별 분석 설정 (메모리에 두고 바뀔 때만 파일에 원자적으로 저장)
+
+    예전 단일 settings.json 이 있고 프로파일 파일이 없으면 그 내용을 default 프로파일로 가져온다.
+    """
+
+    def __init__(self, path: Optional[str] = None, legacy_path: Optional[str] = "settings.json",
+                 defaults: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.path = path if path is not None else os.getenv("SETTINGS_PROFILES_FILE", "settings_profiles.json")
+        self.legacy_path = legacy_path
+        self.defaults = defaults or (lambda: {})
+        self.tz = schedule_timezone()
+        self._lock = threading.Lock()
+        # 이름 → {"name", "settings", "schedule", "enabled", "created", "updated",
+        #          "next_run", "last_run", "last_job_id", "runs"}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    # ------------------------------------------------------------------
+    # 조회/저장
+    # ------------------------------------------------------------------
+    def names(self) -> List[str]:
+        with self._lock:
+            return sorted(self._profiles)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """프로파일 목록 (설정 내용 제외)"""
+        with self._lock:
+            return [
+                {k: v for k, v in profile.items() if k != "settings"}
+                for _, profile in sorted(self._profiles.items())
+            ]
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            profile = self._profiles.get(name)
+            return copy.deepcopy(profile) if profile else None
+
+    def settings(self, name: str = DEFAULT_PROFILE) -> Dict[str, Any]:
+        """프로파일 설정 (default 가 없으면 기본 설정)"""
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is not None:
+                return copy.deepcopy(profile["settings"])
+        if name == DEFAULT_PROFILE:
+            return self.defaults()
+        raise KeyError(name)
+
+    def save(self, name: str, settings: Dict[str, Any], schedule: Optional[str] = None,
+             enabled: bool = True) -> Dict[str, Any]:
+        """프로파일 저장 (새 이름이면 추가), 잘못된 이름/cron 식은 ValueError
+
+        설정 화면은 입력 중인 값도 저장하므로 분석 설정 검증은 예약 실행하는 프로파일만 한다.
+        """
+        name = name.strip()
+        if not _PROFILE_NAME.match(name):
+            raise ValueError("프로파일 이름은 64자 이하의 문자, 숫자, 공백, -, _ 만 쓸 수 있습니다.")
+        schedule = (schedule or "").strip() or None
+        cron = CronSchedule(schedule, self.tz) if schedule else None
+        now = time.time()
+        # 검증은 모두 저장된 프로파일을 바꾸기 전에 (실행 시각이 없는 cron 식도 여기서 ValueError)
+        next_run = self._next_run(cron, now) if cron is not None else None
+        if cron is not None:
+            try:
+                build_settings(settings)
+            except Exception as e:
+                raise ValueError(f"예약 실행할 수 없는 설정입니다: {e}")
+
+        with self._lock:
+            profile = self._profiles.setdefault(name, {
+                "name": name,
+                "created": now,
+                "next_run": None,
+                "last_run": None,
+                "last_job_id": None,
+                "runs": 0
+            })
+            rescheduled = profile.get("schedule") != schedule or not profile.get("enabled")
+            profile.update({
+                "settings": copy.deepcopy(settings),
+                "schedule": schedule,
+                "enabled": bool(enabled),
+                "updated": now
+            })
+            if cron is None or not enabled:
+                profile["next_run"] = None
+            elif rescheduled or profile["next_run"] is None:
+                profile["next_run"] = next_run
+            self._save()
+            return copy.deepcopy(profile)
+
+    def delete(self, name: str) -> bool:
+        if name == DEFAULT_PROFILE:
+            raise ValueError("default 프로파일은 삭제할 수 없습니다.")
+        with self._lock:
+            removed = self._profiles.pop(name, None) is not None
+            if removed:
+                self._save()
+            return removed
+
+    # ------------------------------------------------------------------
+    # 예약 실행
+    # ------------------------------------------------------------------
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """실행 시각이 지난 프로파일 (오래 기다린 순)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            due = [p for p in self._profiles.values() if p.get("enabled") and p.get("next_run") and p["next_run"] <= now]
+            return [p["name"] for p in sorted(due, key=lambda p: p["next_run"])]
+
+    def mark_run(self, name: str, job_id: str, now: Optional[float] = None):
+        """실행 기록 + 다음 실행 시각 (밀린 회차는 한 번만 실행하고 건너뜀)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                return
+            profile["last_run"] = now
+            profile["last_job_id"] = job_id
+            profile["runs"] = profile.get("runs", 0) + 1
+            if profile.get("schedule") and profile.get("enabled"):
+                try:
+                    profile["next_run"] = self._next_run(CronSchedule(profile["schedule"], self.tz), now)
+                except ValueError as e:
+                    # 파일을 직접 고친 경우 등 - 예약을 끄고 실행 기록은 남김
+                    logger.error(f"프로파일 '{name}' 예약 해제: {e}")
+                    profile["next_run"] = None
+                    profile["enabled"] = False
+            self._save()
+
+    @staticmethod
+    def _next_run(cron: CronSchedule, now: float) -> float:
+        return cron.next_after(datetime.fromtimestamp(now, timezone.utc)).timestamp()
+
+    # ------------------------------------------------------------------
+    # 파일
+    # ------------------------------------------------------------------
+    def _load(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._profiles = json.load(f)
+            except Exception as e:
+                logger.warning(f"설정 프로파일 파일 읽기 실패: {e}")
+            return
+
+        if self.legacy_path and os.path.exists(self.legacy_path):
+            try:
+                with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+                now = time.time()
+                self._profiles[DEFAULT_PROFILE] = {
+                    "name": DEFAULT_PROFILE, "settings": legacy, "schedule": None, "enabled": True,
+                    "created": now, "updated": now, "next_run": None, "last_run": None,
+                    "last_job_id": None, "runs": 0
+                }
+                with self._lock:
+                    self._save()
+                logger.info(f"{self.legacy_path} 를 default 프로파일로 가져옴")
+            except Exception as e:
+                logger.warning(f"설정 파일 읽기 실패: {e}")
+
+    def _save(self):
+        """원자적 저장 (lock 안에서 호출)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._profiles, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"설정 프로파일 저장 실패: {e}")
+
+class ProfileScheduler:
+    """cron 주기가 지정된 프로파일을 백그라운드에서 실행
+
+    한 번에 분석 하나만 실행되므로 같은 순번에 도래한 프로파일은 차례로 실행한다.
+    예약 실행 중에는 수집 요청 결과를 PROFILE_SHARED_FETCH_MINUTES 동안 보관해서
+    같은 채널/검색어를 다루는 프로파일들이 영상/채널/검색 결과를 다시 받지 않는다.
+    """
+
+    def __init__(self, profiles: SettingsProfiles, tick_seconds: Optional[float] = None,
+                 shared_fetch_minutes: Optional[float] = None, executor: str = "inline"):
+        self.profiles = profiles
+        # inline: 이 프로세스에서 실행 / worker: 수집 워커 대기열에 등록 (ANALYSIS_EXECUTOR 와 같음)
+        self.executor = executor
+        self.tick = float(tick_seconds if tick_seconds is not None
+                          else os.getenv("PROFILE_SCHEDULER_TICK_SECONDS", 30))
+        self.shared_fetch_seconds = float(shared_fetch_minutes if shared_fetch_minutes is not None
+                                          else os.getenv("PROFILE_SHARED_FETCH_MINUTES", 10)) * 60
+        self._task: Optional[asyncio.Task] = None
+        # 수동 실행 작업 (끝날 때까지 참조를 유지해서 GC 되지 않도록)
+        self._runs: set = set()
+
+    def claim(self, name: str, store) -> Optional[Tuple[str, AnalysisSettings]]:
+        """프로파일 실행 상태로 전환 - 다른 분석이 실행 중이면 None, 실행할 수 없는 설정은 예외"""
+        settings = build_settings(self.profiles.settings(name))
+        job_id = uuid.uuid4().hex
+        if not store.try_start({
+            "job_id": job_id,
+            "is_running": True,
+            "progress": 0,
+            "current_task": f"프로파일 '{name}' 실행 중...",
+            "profile": name
+        }):
+            return None
+
+        try:
+            self.profiles.mark_run(name, job_id)
+        except Exception as e:
+            # 실행 상태로 바꾼 뒤 실패하면 되돌림 (그대로 두면 /stop 전까지 다른 분석을 시작할 수 없음)
+            store.update_status(job_id, is_running=False, error=str(e), current_task=f"오류 발생: {e}")
+            raise
+        return job_id, settings
+
+    async def execute(self, name: str, job_id: str, settings: AnalysisSettings, runner):
+        """claim 한 작업 실행 (수집 결과는 이어지는 예약 실행과 공유)
+
+        worker 모드면 수집 워커 대기열에 등록만 한다 (워커 프로세스와는 수집 결과를 공유하지 않음).
+        """
+        if self.executor == "worker":
+            logger.info(f"프로파일 '{name}' 작업 등록 [{job_id}]")
+            runner.store.enqueue_job(job_id, settings.dict())
+            return
+        logger.info(f"프로파일 '{name}' 실행 [{job_id}]")
+        with runner.youtube_service.sharing_fetches(self.shared_fetch_seconds):
+            await runner.run(job_id, settings)
+
+    def spawn(self, name: str, job_id: str, settings: AnalysisSettings, runner) -> asyncio.Task:
+        """claim 한 작업을 백그라운드로 실행 (수동 실행용)"""
+        task = asyncio.create_task(self.execute(name, job_id, settings, runner))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        return task
+
+    async def run_profile(self, name: str, store, runner) -> Optional[str]:
+        """프로파일 하나 실행 - 다른 분석이 실행 중이면 None (다음 순번에 다시 시도)"""
+        claimed = self.claim(name, store)
+        if claimed is None:
+            return None
+        job_id, settings = claimed
+        await self.execute(name, job_id, settings, runner)
+        return job_id
+
+    async def run_due(self, store, runner, now: Optional[float] = None) -> List[str]:
+        """실행 시각이 지난 프로파일을 차례로 실행, 실행한 작업 ID 목록"""
+        job_ids = []
+        for name in self.profiles.due(now):
+            try:
+                job_id = await self.run_profile(name, store, runner)
+            except Exception as e:
+                logger.error(f"프로파일 '{name}' 실행 실패: {e}")
+                self.profiles.mark_run(name, "", now)
+                continue
+            if job_id is None:
+                logger.info("프로파일 예약 실행: 다른 분석이 실행 중이라 다음 순번에 다시 시도")
+                break
+            job_ids.append(job_id)
+        return job_ids
+
+    async def _loop(self, store, runner):
+        while True:
+            try:
+                await self.run_due(store, runner)
+            except Exception as e:
+                logger.error(f"프로파일 예약 실행 실패: {e}")
+            await asyncio.sleep(self.tick)
+
+    def start(self, store, runner):
+        """백그라운드 예약 실행 시작"""
+        if self.tick > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop(store, runner))
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,133 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+class _Call:
+    """진행 중인 호출 하나 (결과를 기다리는 쪽과 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+    def wait(self) -> Any:
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 요청을 하나의 API 호출로 합침
+
+    먼저 들어온 호출자가 실제 요청을 보내고, 나머지는 그 결과를 기다렸다가 함께 받는다.
+    평소에는 결과를 캐시하지 않고 호출이 끝나면 키를 바로 해제한다.
+    retaining() 구간(예약 실행)에서는 성공한 결과를 잠시 보관해서 이어지는 실행이 같은 요청을 다시 보내지 않는다.
+    구간은 contextvar 라서 그 실행(과 실행이 넘긴 스레드)에만 적용되고, 동시에 도는 다른 요청은 보관된 결과를 읽지 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # key → (만료 시각, 결과) - retaining() 구간에서만 읽고 씀
+        self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+        self._retain_seconds: ContextVar[float] = ContextVar(f"single_flight_retain_{id(self)}", default=0.0)
+
+    @contextmanager
+    def retaining(self, seconds: float):
+        """구간 안에서는 끝난 호출 결과를 seconds 동안 보관/재사용"""
+        token = self._retain_seconds.set(seconds)
+        try:
+            yield
+        finally:
+            self._retain_seconds.reset(token)
+            with self._lock:
+                now = time.time()
+                self._recent = {key: entry for key, entry in self._recent.items() if entry[0] > now}
+
+    def _recall(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        """보관된 결과 (lock 안에서 호출)"""
+        entry = self._recent.get(key) if self._retain_seconds.get() > 0 else None
+        if entry is None or entry[0] <= now:
+            return False, None
+        return True, entry[1]
+
+    def _retain(self, key: Hashable, result: Any):
+        """lock 안에서 호출"""
+        seconds = self._retain_seconds.get()
+        if seconds > 0:
+            self._recent[key] = (time.time() + seconds, result)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """key 에 대해 fn 을 한 번만 실행하고 결과를 공유"""
+        with self._lock:
+            found, result = self._recall(key, time.time())
+            if found:
+                return result
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            return call.wait()
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                if call.error is None:
+                    self._retain(key, call.result)
+            call.done.set()
+
+        return call.wait()
+
+    def do_many(self, keys: Iterable[Hashable], fetch: Callable[[List[Hashable]], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """여러 키를 한 번에 요청
+
+        다른 호출자가 이미 요청 중인 키는 그 결과를 기다리고,
+        나머지 키만 모아서 fetch 한 번(배치 요청)으로 가져온다.
+        fetch 결과에 없는 키는 None 으로 채운다.
+        """
+        owned: Dict[Hashable, _Call] = {}
+        waiting: Dict[Hashable, _Call] = {}
+        results = {}
+
+        with self._lock:
+            now = time.time()
+            for key in dict.fromkeys(keys):
+                found, result = self._recall(key, now)
+                if found:
+                    results[key] = result
+                    continue
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    owned[key] = call
+                else:
+                    waiting[key] = call
+
+        if owned:
+            try:
+                fetched = fetch(list(owned))
+                for key, call in owned.items():
+                    call.result = fetched.get(key)
+            except BaseException as e:
+                for call in owned.values():
+                    call.error = e
+            finally:
+                with self._lock:
+                    for key, call in owned.items():
+                        self._calls.pop(key, None)
+                        if call.error is None:
+                            self._retain(key, call.result)
+                for call in owned.values():
+                    call.done.set()
+
+        for key, call in {**owned, **waiting}.items():
+            results[key] = call.wait()
+        return results
@@ -0,0 +1,425 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from app.services.result_store import CHANNEL_COLUMNS, ResultRetention, channel_sort_key, referenced_channels
+
+logger = logging.getLogger(__name__)
+
+def default_status() -> Dict[str, Any]:
+    """초기 분석 상태"""
+    return {
+        "job_id": None,
+        "settings_key": None,
+        "is_running": False,
+        "progress": 0,
+        "current_task": "",
+        "error": None
+    }
+
+def _is_current(status: Dict[str, Any], job_id: str) -> bool:
+    """상태가 job_id 작업의 실행 중 상태인지"""
+    return status.get("job_id") == job_id and bool(status.get("is_running"))
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def dumps(value: Any) -> str:
+    """저장소 직렬화 (datetime은 isoformat)"""
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+class StateStore(ABC):
+    """분석 상태/결과 저장소 인터페이스
+
+    여러 uvicorn 워커와 수집 워커 프로세스가 같은 상태를 보도록 하기 위한 계층.
+    Redis 같은 외부 서버를 쓰려면 추상 메서드들만 구현하면 된다.
+
+    job_id 를 주는 쓰기는 비교 후 교체다: 상태의 job_id 가 같고 실행 중일 때만 반영하고 반영 여부를 반환한다.
+    중단 후 새 작업이 시작된 뒤에 끝난 이전 작업이 새 작업의 상태/결과를 덮어쓰지 않도록 하기 위한 것.
+    """
+
+    shared = False  # 여러 프로세스가 공유 가능한 저장소인지
+
+    @abstractmethod
+    def get_status(self) -> Dict[str, Any]:
+        """현재 분석 상태"""
+
+    @abstractmethod
+    def update_status(self, job_id: Optional[str] = None, **fields) -> bool:
+        """상태 갱신 (job_id 를 주면 그 작업이 실행 중일 때만)"""
+
+    @abstractmethod
+    def try_start(self, status: Dict[str, Any], clear_result: bool = True) -> bool:
+        """실행 중인 분석이 없을 때만 상태를 원자적으로 교체 (clear_result: 현재 결과도 비움)"""
+
+    @abstractmethod
+    def get_result(self, slot: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """현재 결과 (없으면 None), slot 을 주면 그 이름의 결과"""
+
+    @abstractmethod
+    def set_result(self, result: Optional[Dict[str, Any]], job_id: Optional[str] = None,
+                   slot: Optional[str] = None) -> bool:
+        """결과 저장 (job_id 를 주면 그 작업이 실행 중일 때만)
+
+        slot 을 주면 사용자가 보고 있는 현재 결과 대신 그 이름의 결과로 저장한다 (감시 목록 자동 수집 등).
+        """
+
+    def get_result_version(self) -> Optional[str]:
+        """현재 결과의 버전 (job_id, 결과를 읽지 않고 조회 가능해야 함)"""
+        result = self.get_result()
+        return result.get("job_id") if result else None
+
+    def get_result_page(self, offset: int = 0, limit: int = 100, sort_by: Optional[str] = None,
+                        descending: bool = True, min_views: Optional[int] = None,
+                        matches: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        """결과의 영상 목록 일부 조회 (기본 구현은 전체 결과에서 잘라냄, matches: 검색 결과 video_id → 점수)"""
+        result = self.get_result()
+        if result is None:
+            return None
+
+        videos = result.get("videos") or []
+        channels = result.get("channels") or {}
+        if matches is not None:
+            videos = [v for v in videos if v.get("video_id") in matches]
+        if min_views is not None:
+            videos = [v for v in videos if v.get("views", 0) >= min_views]
+        if matches is not None and not sort_by:
+            videos = sorted(videos, key=lambda v: matches[v["video_id"]], reverse=True)
+        elif sort_by in CHANNEL_COLUMNS:
+            channel_value = channel_sort_key(channels, sort_by)
+            videos = sorted(videos, key=lambda v: channel_value(v.get("channel_id")), reverse=descending)
+        elif sort_by:
+            videos = sorted(videos, key=lambda v: v.get(sort_by), reverse=descending)
+
+        page = videos[offset:offset + limit]
+        return {
+            "total": len(videos),
+            "offset": offset,
+            "limit": limit,
+            "videos": page,
+            "channels": referenced_channels(channels, (v.get("channel_id") for v in page))
+        }
+
+    @abstractmethod
+    def clear(self) -> None:
+        """상태와 결과 초기화"""
+
+    @abstractmethod
+    def get_cached_run(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """설정 해시로 저장된 (저장 시각, 결과) 조회"""
+
+    @abstractmethod
+    def put_cached_run(self, key: str, result: Dict[str, Any], max_entries: int) -> None:
+        """설정 해시로 결과 저장 (max_entries 초과 시 오래된 것부터 삭제)"""
+
+    @abstractmethod
+    def enqueue_job(self, job_id: str, settings: Dict[str, Any], slot: Optional[str] = None) -> None:
+        """수집 워커가 처리할 작업 등록 (slot: 결과를 저장할 이름, 없으면 현재 결과)"""
+
+    @abstractmethod
+    def claim_job(self) -> Optional[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """대기 중인 작업 하나를 가져감 (job_id, 설정, slot), 없으면 None"""
+
+    @abstractmethod
+    def cancel_job(self, job_id: str) -> bool:
+        """아직 워커가 가져가지 않은 작업 취소 (취소했으면 True)"""
+
+class MemoryStateStore(StateStore):
+    """단일 프로세스용 메모리 저장소 (기본값)
+
+    결과는 ResultRetention 에 열 단위로 보관하고, 메모리 예산을 넘으면 디스크로 내보낸다.
+    현재 결과와 재사용 캐시는 같은 결과를 job_id 로 참조한다.
+    """
+
+    def __init__(self, retention: Optional[ResultRetention] = None):
+        self._lock = threading.Lock()
+        self._status = default_status()
+        self._results = retention or ResultRetention()
+        self._result_id: Optional[str] = None
+        # 이름별 결과 (slot → result_id)
+        self._slots: Dict[str, str] = {}
+        self._jobs = []
+        self._run_cache: Dict[str, Tuple[float, str]] = {}
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._status)
+
+    def update_status(self, job_id: Optional[str] = None, **fields) -> bool:
+        with self._lock:
+            if job_id is not None and not _is_current(self._status, job_id):
+                return False
+            self._status.update(fields)
+            return True
+
+    def try_start(self, status: Dict[str, Any], clear_result: bool = True) -> bool:
+        with self._lock:
+            if self._status["is_running"]:
+                return False
+            self._status = {**default_status(), **status}
+            if clear_result:
+                self._set_current(None)
+            return True
+
+    def get_result(self, slot: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        result_id = self._slots.get(slot) if slot else self._result_id
+        return self._results.get(result_id) if result_id else None
+
+    def get_result_version(self) -> Optional[str]:
+        return self._result_id
+
+    def get_result_page(self, offset: int = 0, limit: int = 100, sort_by: Optional[str] = None,
+                        descending: bool = True, min_views: Optional[int] = None,
+                        matches: Optional[Dict[str, float]] = None) -> Optional[Dict[str, Any]]:
+        result_id = self._result_id
+        if not result_id:
+            return None
+        return self._results.page(result_id, offset, limit, sort_by, descending, min_views, matches)
+
+    def set_result(self, result: Optional[Dict[str, Any]], job_id: Optional[str] = None,
+                   slot: Optional[str] = None) -> bool:
+        with self._lock:
+            if job_id is not None and not _is_current(self._status, job_id):
+                return False
+            result_id = self._hold(result) if result is not None else None
+            if not slot:
+                self._set_current(result_id)
+                return True
+            previous = self._slots.pop(slot, None)
+            if result_id:
+                self._slots[slot] = result_id
+            if previous and previous != result_id:
+                self._release(previous)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._status = default_status()
+            self._set_current(None)
+
+    def memory_usage(self) -> Dict[str, Any]:
+        return self._results.memory_usage()
+
+    def _hold(self, result: Dict[str, Any]) -> str:
+        """결과를 보관소에 넣고 id 반환 (이미 있으면 그대로 사용, lock 안에서 호출)"""
+        result_id = result.get("job_id") or uuid.uuid4().hex
+        if not self._results.has(result_id):
+            self._results.put(result_id, result)
+        return result_id
+
+    def _set_current(self, result_id: Optional[str]):
+        previous = self._result_id
+        self._result_id = result_id
+        if previous and previous != result_id:
+            self._release(previous)
+
+    def _release(self, result_id: str):
+        """현재 결과도, 이름별 결과도 아니고 캐시에서도 참조하지 않으면 보관소에서 삭제"""
+        if result_id == self._result_id or result_id in self._slots.values():
+            return
+        if any(rid == result_id for _, rid in self._run_cache.values()):
+            return
+        self._results.remove(result_id)
+
+    def get_cached_run(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._lock:
+            cached = self._run_cache.get(key)
+        if not cached:
+            return None
+        result = self._results.get(cached[1])
+        return (cached[0], result) if result is not None else None
+
+    def put_cached_run(self, key: str, result: Dict[str, Any], max_entries: int) -> None:
+        with self._lock:
+            result_id = self._hold(result)
+            previous = self._run_cache.pop(key, None)
+            self._run_cache[key] = (time.time(), result_id)
+            if previous:
+                self._release(previous[1])
+            while len(self._run_cache) > max_entries:
+                _, evicted = self._run_cache.pop(next(iter(self._run_cache)))
+                self._release(evicted)
+
+    def enqueue_job(self, job_id: str, settings: Dict[str, Any], slot: Optional[str] = None) -> None:
+        with self._lock:
+            self._jobs.append((job_id, settings, slot))
+
+    def claim_job(self) -> Optional[Tuple[str, Dict[str, Any], Optional[str]]]:
+        with self._lock:
+            return self._jobs.pop(0) if self._jobs else None
+
+    def cancel_job(self, job_id: str) -> bool:
+        with self._lock:
+            remaining = [job for job in self._jobs if job[0] != job_id]
+            cancelled = len(remaining) != len(self._jobs)
+            self._jobs = remaining
+            return cancelled
+
+class SQLiteStateStore(StateStore):
+    """로컬 SQLite 파일 기반 저장소 (여러 프로세스가 공유)"""
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, settings TEXT, state TEXT, created REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_cache ("
+                "key TEXT PRIMARY KEY, result TEXT, created REAL)"
+            )
+            # 이전 버전 파일에는 slot 열이 없음
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "slot" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN slot TEXT")
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """다른 프로세스와 경쟁하지 않도록 쓰기 잠금을 먼저 잡는 트랜잭션"""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _get(self, conn: sqlite3.Connection, key: str) -> Any:
+        row = conn.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _put(self, conn: sqlite3.Connection, key: str, value: Any) -> None:
+        conn.execute(
+            "INSERT INTO state (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, dumps(value))
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._connection() as conn:
+            return self._get(conn, "status") or default_status()
+
+    def update_status(self, job_id: Optional[str] = None, **fields) -> bool:
+        with self._transaction() as conn:
+            status = self._get(conn, "status") or default_status()
+            if job_id is not None and not _is_current(status, job_id):
+                return False
+            status.update(fields)
+            self._put(conn, "status", status)
+            return True
+
+    def try_start(self, status: Dict[str, Any], clear_result: bool = True) -> bool:
+        with self._transaction() as conn:
+            current = self._get(conn, "status") or default_status()
+            if current["is_running"]:
+                return False
+            self._put(conn, "status", {**default_status(), **status})
+            if clear_result:
+                conn.execute("DELETE FROM state WHERE key IN ('result', 'result_version')")
+            return True
+
+    def get_result(self, slot: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._connection() as conn:
+            return self._get(conn, f"result:{slot}" if slot else "result")
+
+    def get_result_version(self) -> Optional[str]:
+        with self._connection() as conn:
+            return self._get(conn, "result_version")
+
+    def set_result(self, result: Optional[Dict[str, Any]], job_id: Optional[str] = None,
+                   slot: Optional[str] = None) -> bool:
+        with self._transaction() as conn:
+            if job_id is not None and not _is_current(self._get(conn, "status") or default_status(), job_id):
+                return False
+            if slot:
+                self._put(conn, f"result:{slot}", result)
+                return True
+            self._put(conn, "result", result)
+            # 결과 본문을 읽지 않고 버전만 확인할 수 있도록 따로 저장
+            version = (result.get("job_id") or uuid.uuid4().hex) if result is not None else None
+            self._put(conn, "result_version", version)
+            return True
+
+    def clear(self) -> None:
+        with self._transaction() as conn:
+            self._put(conn, "status", default_status())
+            conn.execute("DELETE FROM state WHERE key IN ('result', 'result_version')")
+
+    def get_cached_run(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._connection() as conn:
+            row = conn.execute("SELECT created, result FROM run_cache WHERE key = ?", (key,)).fetchone()
+            return (row[0], json.loads(row[1])) if row else None
+
+    def put_cached_run(self, key: str, result: Dict[str, Any], max_entries: int) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO run_cache (key, result, created) VALUES (?, ?, ?)",
+                (key, dumps(result), time.time())
+            )
+            conn.execute(
+                "DELETE FROM run_cache WHERE key NOT IN "
+                "(SELECT key FROM run_cache ORDER BY created DESC LIMIT ?)",
+                (max_entries,)
+            )
+
+    def enqueue_job(self, job_id: str, settings: Dict[str, Any], slot: Optional[str] = None) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, settings, state, created, slot) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, dumps(settings), time.time(), slot)
+            )
+
+    def claim_job(self) -> Optional[Tuple[str, Dict[str, Any], Optional[str]]]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT job_id, settings, slot FROM jobs WHERE state = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute("UPDATE jobs SET state = 'claimed' WHERE job_id = ?", (row[0],))
+            return row[0], json.loads(row[1]), row[2]
+
+    def cancel_job(self, job_id: str) -> bool:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET state = 'cancelled' WHERE job_id = ? AND state = 'queued'", (job_id,)
+            )
+            return cursor.rowcount > 0
+
+def create_state_store() -> StateStore:
+    """환경 변수(STATE_BACKEND)에 따라 저장소 생성"""
+    backend = os.getenv("STATE_BACKEND", "memory").lower()
+
+    if backend == "sqlite":
+        path = os.getenv("STATE_DB_PATH", "analyzer_state.db")
+        logger.info(f"SQLite 상태 저장소 사용: {path}")
+        return SQLiteStateStore(path)
+
+    if backend != "memory":
+        logger.warning(f"알 수 없는 STATE_BACKEND '{backend}', 메모리 저장소 사용")
+
+    return MemoryStateStore()
@@ -0,0 +1,268 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.services.single_flight import SingleFlight
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow 가 없으면 리사이즈 없이 원본 제공
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+
+# 크기별 변형 (최대 너비, 최대 높이, JPEG 품질), original 은 YouTube 원본 그대로
+VARIANTS: Dict[str, Optional[Tuple[int, int, int]]] = {
+    "original": None,
+    "row": (160, 90, 70),
+    "medium": (320, 180, 80),
+}
+
+VIDEO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{6,20}$')
+
+class ThumbnailCache:
+    """썸네일 프록시용 디스크 캐시
+
+    파일은 내용의 SHA-256 으로 저장하고(같은 이미지는 한 번만 저장),
+    (영상 ID, 크기) → 해시 인덱스로 찾는다. 전체 용량이 한도를 넘으면 오래 안 쓴 파일부터 삭제한다.
+    수집 워커도 같은 폴더에 미리 받아두므로, 인덱스 파일이 바뀌었으면 다른 프로세스의 항목을 합친다.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None,
+                 upstream: Optional[str] = None, timeout: float = 10):
+        self.cache_dir = Path(cache_dir or os.getenv("THUMBNAIL_CACHE_DIR", "thumbnail_cache"))
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(float(os.getenv("THUMBNAIL_CACHE_MAX_MB", 200)) * 1024 * 1024)
+        self.upstream = (upstream or os.getenv("THUMBNAIL_UPSTREAM", "https://i.ytimg.com")).rstrip("/")
+        self.timeout = timeout
+
+        self._lock = threading.RLock()
+        # "video_id:variant" → 파일 해시
+        self._keys: Dict[str, str] = {}
+        # 파일 해시 → {"size", "media_type", "last_accessed"}
+        self._files: Dict[str, Dict] = {}
+        self._total_bytes = 0
+        # 마지막으로 읽거나 쓴 인덱스 파일의 수정 시각
+        self._index_mtime: Optional[int] = None
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="thumbnail")
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def get(self, video_id: str, variant: str = "row") -> Tuple[bytes, str, str]:
+        """(이미지 바이트, media type, 해시) 반환 - 캐시에 없으면 원본을 받아 변형 생성"""
+        if not VIDEO_ID_PATTERN.match(video_id):
+            raise ValueError("잘못된 영상 ID 입니다.")
+        if variant not in VARIANTS:
+            raise ValueError(f"지원하지 않는 크기입니다: {variant}")
+
+        cached = self._read(f"{video_id}:{variant}")
+        if cached:
+            return cached
+
+        return self._flight.do(("thumbnail", video_id, variant), lambda: self._create(video_id, variant))
+
+    def prefetch(self, video_ids: Iterable[str], variant: str = "row"):
+        """백그라운드에서 미리 받아두기 (분석 완료 시 호출)"""
+        for video_id in dict.fromkeys(video_ids):
+            self._executor.submit(self._prefetch_one, video_id, variant)
+
+    def _prefetch_one(self, video_id: str, variant: str):
+        try:
+            self.get(video_id, variant)
+        except Exception as e:
+            logger.debug(f"썸네일 미리 받기 실패 {video_id}: {e}")
+
+    def _create(self, video_id: str, variant: str) -> Tuple[bytes, str, str]:
+        cached = self._read(f"{video_id}:{variant}")
+        if cached:
+            return cached
+
+        if variant == "original":
+            data = self._download(video_id)
+            return self._store(f"{video_id}:original", data, "image/jpeg")
+
+        original, _, _ = self.get(video_id, "original")
+        data, media_type = self._resize(original, VARIANTS[variant])
+        return self._store(f"{video_id}:{variant}", data, media_type)
+
+    def _download(self, video_id: str) -> bytes:
+        url = f"{self.upstream}/vi/{video_id}/hqdefault.jpg"
+        request = urllib.request.Request(url, headers={"User-Agent": "youtube-analyzer-thumbnail-proxy"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def _resize(self, data: bytes, spec: Tuple[int, int, int]) -> Tuple[bytes, str]:
+        """비율을 유지해 축소 후 JPEG 재인코딩 (Pillow 가 없으면 원본 반환)"""
+        if Image is None:
+            return data, "image/jpeg"
+
+        width, height, quality = spec
+        with Image.open(io.BytesIO(data)) as image:
+            image = image.convert("RGB")
+            image.thumbnail((width, height))
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+        return output.getvalue(), "image/jpeg"
+
+    # ------------------------------------------------------------------
+    # 저장소
+    # ------------------------------------------------------------------
+    def rebuild_index(self) -> int:
+        """서버 시작 시 인덱스 파일과 실제 파일을 맞춤"""
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            saved = {}
+            index_path = self.cache_dir / INDEX_FILENAME
+            if index_path.exists():
+                try:
+                    with open(index_path, 'r', encoding='utf-8') as f:
+                        saved = json.load(f)
+                except Exception as e:
+                    logger.warning(f"썸네일 인덱스 읽기 실패: {e}")
+
+            self._files = {}
+            self._total_bytes = 0
+            for entry in os.scandir(self.cache_dir):
+                if not entry.is_file() or entry.name == INDEX_FILENAME or entry.name.endswith(".tmp"):
+                    continue
+                stat = entry.stat()
+                media_type = saved.get("files", {}).get(entry.name, {}).get("media_type", "image/jpeg")
+                self._files[entry.name] = {
+                    "size": stat.st_size,
+                    "media_type": media_type,
+                    "last_accessed": stat.st_mtime
+                }
+                self._total_bytes += stat.st_size
+
+            self._keys = {k: h for k, h in saved.get("keys", {}).items() if h in self._files}
+            self._enforce_quota()
+            self._save_index()
+            return len(self._files)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "keys": len(self._keys),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "resize_enabled": Image is not None
+            }
+
+    def _read(self, key: str) -> Optional[Tuple[bytes, str, str]]:
+        with self._lock:
+            if key not in self._keys:
+                self._merge_index()
+            digest = self._keys.get(key)
+            meta = self._files.get(digest) if digest else None
+            if not meta:
+                return None
+            meta["last_accessed"] = time.time()
+
+        try:
+            return (self.cache_dir / digest).read_bytes(), meta["media_type"], digest
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(digest)
+            return None
+
+    def _store(self, key: str, data: bytes, media_type: str) -> Tuple[bytes, str, str]:
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest not in self._files:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_dir / f".{digest}.tmp"
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, self.cache_dir / digest)
+                self._files[digest] = {"size": len(data), "media_type": media_type, "last_accessed": time.time()}
+                self._total_bytes += len(data)
+
+            self._keys[key] = digest
+            self._enforce_quota(protect=digest)
+            self._save_index()
+        return data, media_type, digest
+
+    def _enforce_quota(self, protect: Optional[str] = None):
+        """용량 초과 시 오래 안 쓴 파일부터 삭제 (lock 안에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for digest in sorted(self._files, key=lambda d: self._files[d]["last_accessed"]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            if digest == protect:
+                continue
+            try:
+                (self.cache_dir / digest).unlink()
+            except FileNotFoundError:
+                pass
+            self._forget(digest)
+
+    def _forget(self, digest: str):
+        meta = self._files.pop(digest, None)
+        if meta:
+            self._total_bytes -= meta["size"]
+        self._keys = {k: h for k, h in self._keys.items() if h != digest}
+
+    def _index_file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.cache_dir / INDEX_FILENAME).st_mtime_ns
+        except OSError:
+            return None
+
+    def _merge_index(self):
+        """다른 프로세스가 인덱스 파일을 바꿨으면 그쪽 항목 중 파일이 있는 것만 합침 (lock 안에서 호출)"""
+        mtime = self._index_file_mtime()
+        if mtime is None or mtime == self._index_mtime:
+            return
+        self._index_mtime = mtime
+        try:
+            with open(self.cache_dir / INDEX_FILENAME, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except Exception as e:
+            logger.warning(f"썸네일 인덱스 읽기 실패: {e}")
+            return
+
+        for digest, meta in saved.get("files", {}).items():
+            if digest in self._files:
+                continue
+            try:
+                stat = (self.cache_dir / digest).stat()
+            except OSError:
+                continue
+            self._files[digest] = {
+                "size": stat.st_size,
+                "media_type": meta.get("media_type", "image/jpeg"),
+                "last_accessed": stat.st_mtime
+            }
+            self._total_bytes += stat.st_size
+        for key, digest in saved.get("keys", {}).items():
+            if digest in self._files:
+                self._keys.setdefault(key, digest)
+
+    def _save_index(self):
+        self._merge_index()
+        index_path = self.cache_dir / INDEX_FILENAME
+        tmp_path = index_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "keys": self._keys,
+                    "files": {d: {"media_type": m["media_type"]} for d, m in self._files.items()}
+                }, f)
+            os.replace(tmp_path, index_path)
+            self._index_mtime = self._index_file_mtime()
+        except Exception as e:
+            logger.warning(f"썸네일 인덱스 저장 실패: {e}")
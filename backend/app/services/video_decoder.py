@@ -0,0 +1,199 @@
+import calendar
+import re
+import time
+from array import array
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.analysis_models import AnalysisSettings, ChannelData
+
+# ISO 8601 duration (P1DT2H3M4S, PT4M13S ...)
+_DURATION_PATTERN = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+@lru_cache(maxsize=8192)
+def parse_duration(duration: str) -> int:
+    """ISO 8601 duration을 초 단위로 변환 (같은 값이 많아서 결과를 캐시)"""
+    match = _DURATION_PATTERN.fullmatch(duration or "")
+    if not match:
+        return 0
+
+    days, hours, minutes, seconds = (int(g or 0) for g in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+def parse_timestamp(value: str) -> float:
+    """RFC 3339 시각을 epoch 초로 변환 (YYYY-MM-DDTHH:MM:SSZ 는 빠른 경로)"""
+    if len(value) == 20 and value[-1] == 'Z':
+        return float(calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19])
+        )))
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+class VideoColumns:
+    """videos().list 응답 항목들을 열(column) 단위 배열로 보관
+
+    영상마다 pydantic 모델을 만드는 대신 숫자는 array, 문자열은 list 로 모아 두고
+    필터링/정렬/집계는 배열 위에서 처리한다. 영상별 dict 는 API 응답을 만들 때 rows() 로만 만든다.
+    """
+
+    # select() 가 행을 고를 때 함께 옮기는 열 (annotate 전의 빈 열은 그대로 둠)
+    LIST_COLUMNS = ("video_ids", "titles", "channel_ids", "thumbnail_urls", "regions")
+    ARRAY_COLUMNS = {
+        "published": 'd', "durations": 'l', "views": 'q',
+        "vph": 'd', "ratios": 'd', "shorts": 'b', "breakout_scores": 'd', "baseline_views": 'q'
+    }
+
+    def __init__(self):
+        self.video_ids: List[str] = []
+        self.titles: List[str] = []
+        self.channel_ids: List[str] = []
+        self.thumbnail_urls: List[str] = []
+        self.published = array('d')  # epoch 초
+        self.durations = array('l')  # 초
+        self.views = array('q')
+
+        # annotate() 로 채우는 열 (채널 구독자수, 설정, 채널 기준선이 필요한 값)
+        self.vph = array('d')  # 시간당 조회수
+        self.ratios = array('d')  # 조회수 / 구독자수
+        self.shorts = array('b')
+        self.breakout_scores = array('d')
+        self.baseline_views = array('q')
+        self.regions: List[List[str]] = []  # 이 영상을 찾은 지역
+
+    def __len__(self) -> int:
+        return len(self.video_ids)
+
+    @classmethod
+    def decode(cls, items: Iterable[Dict[str, Any]]) -> "VideoColumns":
+        """응답 항목 묶음을 한 번에 디코딩 (형식이 잘못된 항목은 건너뜀)"""
+        columns = cls()
+        columns.extend(items)
+        return columns
+
+    def extend(self, items: Iterable[Dict[str, Any]]):
+        for item in items:
+            try:
+                snippet = item['snippet']
+                published = parse_timestamp(snippet['publishedAt'])
+                duration = parse_duration(item['contentDetails']['duration'])
+                views = int(item['statistics'].get('viewCount', 0))
+                thumbnail_url = snippet['thumbnails']['high']['url']
+            except (KeyError, TypeError, ValueError):
+                continue
+
+            self.video_ids.append(item['id'])
+            self.titles.append(snippet['title'])
+            self.channel_ids.append(snippet['channelId'])
+            self.thumbnail_urls.append(thumbnail_url)
+            self.published.append(published)
+            self.durations.append(duration)
+            self.views.append(views)
+
+    def views_per_hour(self, now: Optional[float] = None) -> array:
+        """업로드 후 시간당 조회수 (1시간 미만은 1시간으로 계산)"""
+        now = now if now is not None else time.time()
+        return array('d', (
+            views / max((now - published) / 3600, 1)
+            for views, published in zip(self.views, self.published)
+        ))
+
+    def filter_indices(self, settings: AnalysisSettings, now: Optional[float] = None) -> List[int]:
+        """콘텐츠 타입/최소 조회수/최소 시간당 조회수 조건을 통과한 행 번호"""
+        vph = self.views_per_hour(now)
+        shorts_max = settings.shorts_max_duration
+        content_type = settings.content_type
+        min_views = settings.min_views
+        min_vph = settings.min_views_per_hour
+
+        indices = []
+        for i in range(len(self.video_ids)):
+            is_shorts = self.durations[i] <= shorts_max
+            if content_type == "shorts" and not is_shorts:
+                continue
+            if content_type == "long_form" and is_shorts:
+                continue
+            if self.views[i] < min_views or vph[i] < min_vph:
+                continue
+            indices.append(i)
+        return indices
+
+    def select(self, indices: List[int]) -> "VideoColumns":
+        """지정한 행만 지정한 순서로 남긴 새 VideoColumns"""
+        selected = VideoColumns()
+        for name in self.LIST_COLUMNS:
+            values = getattr(self, name)
+            if values:
+                setattr(selected, name, [values[i] for i in indices])
+        for name, typecode in self.ARRAY_COLUMNS.items():
+            values = getattr(self, name)
+            if values:
+                setattr(selected, name, array(typecode, (values[i] for i in indices)))
+        return selected
+
+    def channel_table(self, channels: Dict[str, Dict[str, Any]]) -> Dict[str, ChannelData]:
+        """이 영상들이 참조하는 채널만 channel_id → ChannelData 로 변환 (응답이 없는 채널은 제외)"""
+        table = {}
+        for channel_id in dict.fromkeys(self.channel_ids):
+            channel_data = channels.get(channel_id)
+            if not channel_data:
+                continue
+            try:
+                table[channel_id] = ChannelData(
+                    channel_id=channel_id,
+                    channel_name=channel_data['snippet']['title'],
+                    subscribers=int(channel_data['statistics'].get('subscriberCount', 0))
+                )
+            except (KeyError, TypeError, ValueError):
+                continue
+        return table
+
+    def annotate(self, channels: Dict[str, ChannelData], settings: AnalysisSettings,
+                 now: Optional[float] = None, scores: Optional[Tuple[array, array]] = None) -> "VideoColumns":
+        """채널 테이블에 있는 행만 남기고 파생 열 계산 (scores: 이 열 순서의 (급상승 점수, 기준 조회수) 배열)"""
+        keep = [i for i, channel_id in enumerate(self.channel_ids) if channel_id in channels]
+        vph = self.views_per_hour(now)
+
+        table = self.select(keep)
+        table.vph = array('d', (vph[i] for i in keep))
+        table.ratios = array('d', (
+            views / max(channels[channel_id].subscribers, 1)
+            for views, channel_id in zip(table.views, table.channel_ids)
+        ))
+        table.shorts = array('b', (duration <= settings.shorts_max_duration for duration in table.durations))
+        if scores:
+            table.breakout_scores = array('d', (scores[0][i] for i in keep))
+            table.baseline_views = array('q', (scores[1][i] for i in keep))
+        else:
+            table.breakout_scores = array('d', bytes(8 * len(keep)))
+            table.baseline_views = array('q', bytes(8 * len(keep)))
+        table.regions = [[] for _ in keep]
+        return table
+
+    def uploaded(self, i: int) -> datetime:
+        return datetime.fromtimestamp(self.published[i], timezone.utc)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """행 하나를 API 응답 dict 로 (annotate 후 호출, 채널명/구독자수는 channel_id 로 채널 테이블에서 조회)"""
+        video_id = self.video_ids[i]
+        return {
+            "video_id": video_id,
+            "title": self.titles[i],
+            "channel_id": self.channel_ids[i],
+            "upload_date": self.uploaded(i),
+            "views": self.views[i],
+            "views_per_hour": self.vph[i],
+            "views_to_subscribers_ratio": self.ratios[i],
+            "duration": self.durations[i],  # 초
+            "video_url": f"https://www.youtube.com/watch?v={video_id}",
+            "thumbnail_url": self.thumbnail_urls[i],
+            "is_shorts": bool(self.shorts[i]),
+            # 같은 채널 비슷한 나이 영상 대비 log 조회수 로버스트 z-score / 그 나이 구간의 채널 기준 조회수 (중앙값)
+            "breakout_score": self.breakout_scores[i],
+            "baseline_views": self.baseline_views[i],
+            # 이 영상을 찾은 지역 (검색어/인기 영상 수집 기준)
+            "regions": list(self.regions[i])
+        }
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return [self.row(i) for i in range(len(self.video_ids))]
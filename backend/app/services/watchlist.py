@@ -0,0 +1,321 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.analysis_runner import NO_VIDEOS_ERROR
+from app.services.channel_resolver import parse_channel_ref
+from app.services.key_pool import PACIFIC_TZ, ApiKeyPool, quota_cost
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_KINDS = ("channel", "keyword")
+
+# 한 번도 수집하지 않은 항목의 경과 시간으로 간주할 값 (시간)
+NEVER_COLLECTED_HOURS = 24 * 7
+
+# 감시 목록 수집 결과를 저장하는 결과 이름 (사용자가 보고 있는 현재 결과를 덮어쓰지 않음)
+RESULT_SLOT = "watchlist"
+
+def item_key(kind: str, value: str) -> str:
+    """source_yield 와 같은 형식의 항목 키 (channel:<id> / keyword:<검색어>)"""
+    return f"{kind}:{value}"
+
+def estimated_cost(kind: str, value: str = "", regions: int = 1, score_breakouts: bool = False) -> int:
+    """항목 하나를 수집하는 예상 할당량
+
+    keyword: 지역마다 search.list + 영상/채널 상세 조회
+    channel: 채널 최근 영상 search.list 한 번 + 상세 조회 (@핸들/URL 이면 channel_id 조회 1 unit 추가)
+    급상승 점수를 켜면 채널 기준선 (업로드 재생목록 + 영상 조회) 이 더해진다.
+    """
+    details = quota_cost("videos.list") + quota_cost("channels.list")
+    if kind == "keyword":
+        cost = quota_cost("search.list") * max(regions, 1) + details
+    else:
+        cost = quota_cost("search.list") + details
+        ref = parse_channel_ref(value)
+        if ref is not None and ref[0] != "id":
+            cost += quota_cost("channels.list")
+    if score_breakouts:
+        cost += quota_cost("playlistItems.list") + quota_cost("videos.list")
+    return cost
+
+class Watchlist:
+    """수집 대상 채널/검색어 목록 (우선순위, 마지막 수집 시각, 수확률을 파일에 보관)
+
+    수집 워커도 같은 파일에 수확률을 기록하므로, 다른 프로세스가 파일을 바꿨으면 조회/변경 전에 다시 읽는다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path if path is not None else os.getenv("WATCHLIST_FILE", "watchlist.json")
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        # 마지막으로 읽거나 쓴 파일의 수정 시각
+        self._mtime: Optional[int] = None
+        self._load()
+
+    def add(self, kind: str, value: str, priority: int = 5) -> Dict[str, Any]:
+        """항목 추가 (이미 있으면 우선순위만 변경)"""
+        if kind not in WATCHLIST_KINDS:
+            raise ValueError(f"kind 는 {', '.join(WATCHLIST_KINDS)} 중 하나여야 합니다.")
+        value = value.strip()
+        if not value:
+            raise ValueError("값이 비어 있습니다.")
+
+        with self._lock:
+            self._refresh()
+            key = item_key(kind, value)
+            item = self._items.setdefault(key, {
+                "kind": kind,
+                "value": value,
+                "priority": priority,
+                "added": time.time(),
+                "last_scheduled": None,
+                "last_collected": None,
+                "runs": 0,
+                "hits": 0,
+                "videos_passed": 0
+            })
+            item["priority"] = max(1, min(int(priority), 10))
+            self._save()
+            return dict(item)
+
+    def remove(self, kind: str, value: str) -> bool:
+        with self._lock:
+            self._refresh()
+            removed = self._items.pop(item_key(kind, value), None) is not None
+            if removed:
+                self._save()
+            return removed
+
+    def items(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return [dict(item, **{"yield": self._yield(item)}) for item in self._items.values()]
+
+    def mark_scheduled(self, keys: List[str], now: Optional[float] = None):
+        """작업에 배정된 항목 기록 (수집이 실패해도 다음 순번으로 넘어가도록)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._refresh()
+            for key in keys:
+                if key in self._items:
+                    self._items[key]["last_scheduled"] = now
+            self._save()
+
+    def record_yield(self, source_yield: Dict[str, int], now: Optional[float] = None):
+        """분석 결과의 항목별 통과 영상 수 반영 (감시 목록에 있는 항목만)"""
+        now = now if now is not None else time.time()
+        with self._lock:
+            self._refresh()
+            changed = False
+            for key, passed in source_yield.items():
+                item = self._items.get(key)
+                if item is None:
+                    continue
+                item["runs"] += 1
+                item["hits"] += 1 if passed > 0 else 0
+                item["videos_passed"] += passed
+                item["last_collected"] = now
+                changed = True
+            if changed:
+                self._save()
+
+    def urgency(self, item: Dict[str, Any], now: float) -> float:
+        """우선순위 × 마지막 배정 후 경과 시간 × 수확률 (경과 시간이 계속 늘어나므로 결국 모든 항목이 돌아옴)"""
+        last = item.get("last_scheduled")
+        staleness = (now - last) / 3600 if last else NEVER_COLLECTED_HOURS
+        return item["priority"] * max(staleness, 0.01) * (0.5 + self._yield(item))
+
+    @staticmethod
+    def _yield(item: Dict[str, Any]) -> float:
+        """수확률 (라플라스 보정: 기록이 없으면 0.5)"""
+        return (item["hits"] + 1) / (item["runs"] + 2)
+
+    def _file_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns if self.path else None
+        except OSError:
+            return None
+
+    def _refresh(self):
+        """다른 프로세스가 파일을 바꿨으면 다시 읽음 (lock 안에서 호출)"""
+        if self._file_mtime() != self._mtime:
+            self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self._mtime = self._file_mtime()
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._items = json.load(f)
+        except Exception as e:
+            logger.warning(f"감시 목록 파일 읽기 실패: {e}")
+
+    def _save(self):
+        """원자적 저장 (lock 안에서 호출)"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._items, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._mtime = self._file_mtime()
+        except Exception as e:
+            logger.warning(f"감시 목록 저장 실패: {e}")
+
+class WatchlistScheduler:
+    """남은 할당량을 하루 동안 나눠 쓰면서 감시 목록을 순환 수집
+
+    실행 주기마다 (남은 할당량 - 예비분) / 오늘 남은 실행 횟수 만큼만 배정하고,
+    긴급도(우선순위 × 경과 시간 × 수확률)가 높은 항목부터 예산 안에서 고른다.
+    """
+
+    def __init__(self, watchlist: Watchlist, key_pool: ApiKeyPool,
+                 interval_minutes: Optional[float] = None, reserve_ratio: Optional[float] = None,
+                 max_batch: Optional[int] = None, executor: str = "inline"):
+        self.watchlist = watchlist
+        self.key_pool = key_pool
+        self.interval = float(interval_minutes if interval_minutes is not None
+                              else os.getenv("WATCHLIST_INTERVAL_MINUTES", 60)) * 60
+        self.reserve_ratio = float(reserve_ratio if reserve_ratio is not None
+                                   else os.getenv("WATCHLIST_QUOTA_RESERVE", 0.2))
+        self.max_batch = max_batch if max_batch is not None else int(os.getenv("WATCHLIST_MAX_BATCH", 50))
+        # inline: 이 프로세스에서 실행 / worker: 수집 워커 대기열에 등록 (ANALYSIS_EXECUTOR 와 같음)
+        self.executor = executor
+        self._task: Optional[asyncio.Task] = None
+        # 수동 실행 작업 (끝날 때까지 참조를 유지해서 GC 되지 않도록)
+        self._runs: set = set()
+
+    def budget(self, now: Optional[float] = None) -> int:
+        """이번 실행에 쓸 수 있는 할당량"""
+        now = now if now is not None else time.time()
+        current = datetime.fromtimestamp(now, PACIFIC_TZ)
+        midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        runs_left = max((midnight - current).total_seconds() / self.interval, 1)
+
+        reserve = self.reserve_ratio * self.key_pool.daily_quota * len(self.key_pool)
+        available = max(self.key_pool.remaining() - reserve, 0)
+        return int(available / runs_left)
+
+    def plan(self, now: Optional[float] = None, base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """다음 실행에 배정할 항목 (긴급도 순, 예산 안에서, base: 수집에 쓸 저장된 설정)"""
+        now = now if now is not None else time.time()
+        base = base or {}
+        regions = len(set(base.get("region_codes") or [])) or 1
+        score_breakouts = bool(base.get("score_breakouts", False))
+        budget = self.budget(now)
+        candidates = sorted(self.watchlist.items(), key=lambda item: self.watchlist.urgency(item, now), reverse=True)
+
+        selected, spent = [], 0
+        for item in candidates:
+            if len(selected) >= self.max_batch:
+                break
+            cost = estimated_cost(item["kind"], item["value"], regions, score_breakouts)
+            if spent + cost > budget:
+                continue
+            selected.append(item)
+            spent += cost
+
+        return {
+            "budget": budget,
+            "estimated_cost": spent,
+            "items": selected,
+            "waiting": len(candidates) - len(selected)
+        }
+
+    def build_settings(self, items: List[Dict[str, Any]], base: Dict[str, Any]) -> AnalysisSettings:
+        """저장된 설정에 배정된 채널/검색어를 넣은 분석 설정"""
+        data = dict(base)
+        data["channel_ids"] = [item["value"] for item in items if item["kind"] == "channel"]
+        data["search_terms"] = [item["value"] for item in items if item["kind"] == "keyword"]
+        data["analysis_mode"] = "both"
+        data.setdefault("api_key", "")
+        return AnalysisSettings(**data)
+
+    def claim(self, store, base: Dict[str, Any]) -> Optional[Tuple[str, AnalysisSettings, List[str], Dict[str, Any]]]:
+        """다음 순번 항목으로 실행 상태 전환 - 배정된 항목이 없거나 다른 분석이 실행 중이면 None
+
+        반환: (job_id, 분석 설정, 배정된 항목 키, 계획)
+        """
+        # 저장된 설정의 키도 예산에 포함 (수집할 때도 이 키들을 쓰므로)
+        with self.key_pool.using([base.get("api_key") or ""] + list(base.get("api_keys") or [])):
+            plan = self.plan(base=base)
+        if not plan["items"]:
+            logger.info(f"감시 목록: 배정할 항목 없음 (예산 {plan['budget']} units)")
+            return None
+
+        settings = self.build_settings(plan["items"], base)
+        job_id = uuid.uuid4().hex
+        if not store.try_start({
+            "job_id": job_id,
+            "is_running": True,
+            "progress": 0,
+            "current_task": "감시 목록 수집 중...",
+            "result_slot": RESULT_SLOT
+        }, clear_result=False):
+            logger.info("감시 목록: 다른 분석이 실행 중이라 이번 순번은 건너뜀")
+            return None
+
+        keys = [item_key(item["kind"], item["value"]) for item in plan["items"]]
+        try:
+            self.watchlist.mark_scheduled(keys)
+        except Exception as e:
+            store.update_status(job_id, is_running=False, error=str(e), current_task=f"오류 발생: {e}")
+            raise
+        logger.info(f"감시 목록: {len(keys)}개 항목 수집 (예상 {plan['estimated_cost']} units)")
+        return job_id, settings, keys, plan
+
+    async def execute(self, job_id: str, settings: AnalysisSettings, keys: List[str], store, runner):
+        """claim 한 작업 실행 - 결과는 현재 결과가 아닌 감시 목록 결과(RESULT_SLOT)에 저장"""
+        if self.executor == "worker":
+            store.enqueue_job(job_id, settings.dict(), RESULT_SLOT)
+            return
+        await runner.run(job_id, settings, slot=RESULT_SLOT)
+
+        # 결과가 있으면 완료 후 작업에서 반영됨, 통과한 영상이 하나도 없으면 모두 0 으로 기록
+        status = store.get_status()
+        if status.get("job_id") == job_id and status.get("error") == NO_VIDEOS_ERROR:
+            self.watchlist.record_yield({key: 0 for key in keys})
+
+    def spawn(self, job_id: str, settings: AnalysisSettings, keys: List[str], store, runner) -> asyncio.Task:
+        """claim 한 작업을 백그라운드로 실행 (수동 실행용)"""
+        task = asyncio.create_task(self.execute(job_id, settings, keys, store, runner))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        return task
+
+    async def run_once(self, store, runner, load_base: Callable[[], Dict[str, Any]]) -> Optional[str]:
+        """한 번 실행 - 배정된 항목이 없거나 다른 분석이 실행 중이면 None"""
+        claimed = self.claim(store, load_base())
+        if claimed is None:
+            return None
+        job_id, settings, keys, _ = claimed
+        await self.execute(job_id, settings, keys, store, runner)
+        return job_id
+
+    async def _loop(self, store, runner, load_base: Callable[[], Dict[str, Any]]):
+        while True:
+            try:
+                await self.run_once(store, runner, load_base)
+            except Exception as e:
+                logger.error(f"감시 목록 수집 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, store, runner, load_base: Callable[[], Dict[str, Any]]):
+        """백그라운드 순환 수집 시작"""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop(store, runner, load_base))
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
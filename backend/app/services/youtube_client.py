@@ -0,0 +1,77 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+class YouTubeClientFactory:
+    """YouTube API 클라이언트 생성/캐시
+
+    build() 는 호출할 때마다 discovery 문서(약 400KB JSON)를 다시 읽고 파싱한다.
+    여기서는 라이브러리에 포함된 정적 discovery 문서를 한 번만 파싱해 두고
+    build_from_document() 로 API 키별 클라이언트를 만들어 재사용한다.
+    """
+
+    def __init__(self, document_path: Optional[str] = None, api_endpoint: Optional[str] = None):
+        # 별도 discovery 문서 파일 (없으면 google-api-python-client 내장 문서 사용)
+        self.document_path = document_path or os.getenv("YOUTUBE_DISCOVERY_DOC")
+        # API 서버 주소 변경 (로컬 테스트용 가짜 서버 등)
+        self.api_endpoint = api_endpoint or os.getenv("YOUTUBE_API_ENDPOINT")
+
+        self._document: Optional[Dict[str, Any]] = None
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.timings: Dict[str, float] = {}
+
+    def _load_document(self) -> Dict[str, Any]:
+        """discovery 문서 파싱 (최초 1회, lock 안에서 호출)"""
+        if self._document is None:
+            started = time.perf_counter()
+
+            if self.document_path:
+                with open(self.document_path, 'r', encoding='utf-8') as f:
+                    self._document = json.load(f)
+            else:
+                from googleapiclient.discovery_cache import get_static_doc
+                self._document = json.loads(get_static_doc('youtube', 'v3'))
+
+            self.timings["discovery_load_seconds"] = round(time.perf_counter() - started, 4)
+
+        return self._document
+
+    def get(self, api_key: str):
+        """API 키별 클라이언트 반환 (없으면 생성 후 캐시)"""
+        client = self._clients.get(api_key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                from googleapiclient.discovery import build_from_document
+
+                document = self._load_document()
+                client_options = {"api_endpoint": self.api_endpoint} if self.api_endpoint else None
+                client = build_from_document(document, developerKey=api_key, client_options=client_options)
+                self._clients[api_key] = client
+
+        return client
+
+    def warm_up(self, api_keys: Iterable[str]) -> Dict[str, float]:
+        """서버 시작 시 라이브러리 import, 문서 파싱, 클라이언트 생성을 미리 수행"""
+        started = time.perf_counter()
+        import googleapiclient.discovery  # noqa: F401
+        self.timings["library_import_seconds"] = round(time.perf_counter() - started, 4)
+
+        started = time.perf_counter()
+        with self._lock:
+            self._load_document()
+        for api_key in api_keys:
+            self.get(api_key)
+        self.timings["client_build_seconds"] = round(time.perf_counter() - started, 4)
+
+        logger.info(f"YouTube 클라이언트 준비 완료: {self.timings}")
+        return dict(self.timings)
@@ -1,36 +1,90 @@
 import os
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import asyncio
-from datetime import datetime, timedelta
+import json
+from datetime import datetime, timedelta, timezone
 import logging
 
-from app.models.analysis_models import AnalysisSettings, VideoData
+from app.models.analysis_models import AnalysisSettings, ChannelData
+from app.services.profiler import job_call
+from app.services.single_flight import SingleFlight
+from app.services.key_pool import ApiKeyPool, meter_call, quota_cost
+from app.services.youtube_client import YouTubeClientFactory
+from app.services.youtube_transport import (
+    ApiTransport, CHANNEL_FIELDS, CHANNEL_ID_FIELDS, CHANNEL_SECTION_FIELDS, PLAYLIST_ITEM_FIELDS, SEARCH_FIELDS,
+    UPLOAD_DATE_FIELDS, VIDEO_CHANNEL_FIELDS, VIDEO_FIELDS
+)
+from app.services.video_decoder import VideoColumns, parse_duration, parse_timestamp
+from app.services.channel_baseline import ChannelBaselines, uploads_playlist_id
+from app.services.channel_resolver import ChannelResolver
 
 logger = logging.getLogger(__name__)
 
+# 모든 YouTubeService 가 공유하는 클라이언트 캐시 (작업/스레드 간 재사용)
+_shared_client_factory: Optional[YouTubeClientFactory] = None
+
+def shared_client_factory() -> YouTubeClientFactory:
+    global _shared_client_factory
+    if _shared_client_factory is None:
+        _shared_client_factory = YouTubeClientFactory()
+    return _shared_client_factory
+
+# channels/videos list 의 id 파라미터 최대 개수
+MAX_IDS_PER_REQUEST = 50
+
+# 키를 오늘 하루 쉬게 하는 오류 / 키를 폐기하는 오류 (무효, 만료, API 미사용 설정)
+QUOTA_ERROR_REASONS = {'quotaExceeded', 'dailyLimitExceeded'}
+INVALID_KEY_REASONS = {'keyInvalid', 'keyExpired', 'accessNotConfigured', 'API_KEY_INVALID', 'SERVICE_DISABLED'}
+
+# 채널 기준선에 쓰는 최근 업로드 영상 수 (playlistItems.list 한 페이지)
+BASELINE_SAMPLE_SIZE = int(os.getenv("CHANNEL_BASELINE_SAMPLE_SIZE", 50))
+
 class YouTubeService:
-    def __init__(self):
+    def __init__(self, client_factory: Optional[YouTubeClientFactory] = None):
         self.youtube = None
+        # 여러 API 키의 할당량을 나눠 쓰기 위한 키 풀 (환경 변수 + 분석 설정의 키)
+        self.key_pool = ApiKeyPool.from_env()
+        self._client_factory = client_factory or shared_client_factory()
+        # 동시에 실행되는 수집 작업 사이에서 같은 요청은 한 번만 호출
+        self._flight = SingleFlight()
+        # 스레드별 keep-alive 연결로 전송 (공유 httplib2 클라이언트를 lock 으로 직렬화하지 않음)
+        self.transport = ApiTransport()
+        # 채널별 평소 조회수 기준선 (급상승 점수 계산용, 파일에 누적)
+        self.baselines = ChannelBaselines()
+        # @핸들 / 채널·영상 URL → channel_id (파일에 보관, 이름마다 한 번만 조회)
+        self.resolver = ChannelResolver()
         
+    def close(self):
+        """병렬 요청용 스레드 풀 종료 (서버/워커 종료 시)"""
+        self.transport.close()
+
     def initialize(self, api_key: str):
-        """YouTube API 초기화"""
+        """YouTube API 초기화 (키를 풀에 추가하고 클라이언트 생성)"""
         try:
-            self.youtube = build('youtube', 'v3', developerKey=api_key)
+            self.key_pool.add_keys([api_key])
+            self.youtube = self._get_client(api_key)
             return True
         except Exception as e:
             logger.error(f"YouTube API 초기화 실패: {e}")
             return False
     
-    async def collect_data(self, settings: AnalysisSettings) -> List[VideoData]:
-        """설정에 따라 데이터 수집"""
-        if not self.youtube:
-            if not self.initialize(settings.api_key):
-                raise Exception("YouTube API 초기화 실패")
-        
-        videos = []
-        
+    async def collect_data(self, settings: AnalysisSettings,
+                           sources: Optional[Dict[str, List[str]]] = None) -> Tuple[VideoColumns, Dict[str, ChannelData]]:
+        """설정에 따라 데이터 수집 (영상 열, channel_id → 채널 정보)
+
+        sources 를 넘기면 "channel:<id>" / "keyword:<검색어>" 별로 찾은 후보 영상 id 를 기록한다.
+        region_codes 가 여러 개면 검색어/인기 영상을 지역마다 동시에 수집하고, 상세 정보와 채널은
+        전체 영상 id 합집합으로 한 번만 조회한 뒤 영상별로 찾은 지역(regions)을 기록한다.
+        """
+        # 설정으로 들어온 키는 이 실행에서만 사용 (다른 실행/요청과 공유하지 않음)
+        with self.key_pool.using([settings.api_key] + list(settings.api_keys or [])):
+            if not len(self.key_pool):
+                raise Exception("YouTube API 키가 설정되지 않았습니다.")
+            return await self._collect(settings, sources)
+    
+    async def _collect(self, settings: AnalysisSettings,
+                       sources: Optional[Dict[str, List[str]]]) -> Tuple[VideoColumns, Dict[str, ChannelData]]:
         # 디버깅을 위한 설정 정보 로깅
         logger.info(f"=== 데이터 수집 시작 ===")
         logger.info(f"analysis_mode: {settings.analysis_mode}")
@@ -40,19 +94,27 @@ class YouTubeService:
         logger.info(f"channel_ids 길이: {len(settings.channel_ids) if settings.channel_ids else 0}")
         
         try:
+            # 1단계: 모든 소스에서 후보 영상 id 수집 (순서 유지 + 중복 제거)
+            video_ids: Dict[str, None] = {}
+            prefetched: Dict[str, Dict[str, Any]] = {}
+            # video_id → 찾은 지역 (검색어/인기 영상 수집 기준)
+            membership: Dict[str, Dict[str, None]] = {}
+            regions = settings.search_regions()
+            
             # 채널 모드 또는 둘 다 모드
             if settings.analysis_mode in ["channel", "both"] and settings.channel_ids and len(settings.channel_ids) > 0:
                 logger.info("채널 영상 수집 시작")
-                channel_videos = await self._get_channel_videos(settings)
-                videos.extend(channel_videos)
-                logger.info(f"채널 영상 {len(channel_videos)}개 수집 완료")
+                channel_refs = await asyncio.to_thread(job_call, self.resolve_channels, settings.channel_ids)
+                channel_video_ids = await self._get_channel_video_ids(settings, sources, channel_refs)
+                video_ids.update(dict.fromkeys(channel_video_ids))
+                logger.info(f"채널 영상 {len(channel_video_ids)}개 수집 완료")
             
             # 키워드 모드 또는 둘 다 모드
             if settings.analysis_mode in ["keyword", "both"] and settings.search_terms and len(settings.search_terms) > 0:
                 logger.info("키워드 영상 수집 시작")
-                keyword_videos = await self._get_keyword_videos(settings)
-                videos.extend(keyword_videos)
-                logger.info(f"키워드 영상 {len(keyword_videos)}개 수집 완료")
+                keyword_video_ids = await self._get_keyword_video_ids(settings, sources, regions, membership)
+                video_ids.update(dict.fromkeys(keyword_video_ids))
+                logger.info(f"키워드 영상 {len(keyword_video_ids)}개 수집 완료")
             
             # 검색어와 채널 ID가 모두 없는 경우 전체 인기 영상 수집
             has_search_terms = settings.search_terms and len(settings.search_terms) > 0
@@ -63,287 +125,455 @@ class YouTubeService:
             
             if not has_search_terms and not has_channel_ids:
                 logger.info("검색어와 채널 ID가 모두 없음. 트렌딩 영상 수집 시작")
-                trending_videos = await self._get_trending_videos(settings)
-                videos.extend(trending_videos)
-                logger.info(f"트렌딩 영상 {len(trending_videos)}개 수집 완료")
+                trending_items = await self._get_trending_items(settings, regions, membership)
+                for item in trending_items:
+                    prefetched[item['id']] = item
+                    video_ids[item['id']] = None
+                logger.info(f"트렌딩 영상 {len(trending_items)}개 수집 완료")
             else:
                 logger.info("검색어 또는 채널 ID가 있음. 트렌딩 영상 수집 건너뜀")
             
-            logger.info(f"수집된 총 영상 수: {len(videos)}")
+            logger.info(f"중복 제거 후 후보 영상 수: {len(video_ids)}")
+            
+            # 2단계: 영상 통계/길이 배치 조회 (트렌딩 영상은 이미 포함)
+            items = await self._get_video_items(list(video_ids), prefetched)
             
-            # 중복 제거
-            unique_videos = self._remove_duplicates(videos)
-            logger.info(f"중복 제거 후 영상 수: {len(unique_videos)}")
+            # 3단계: 열 단위로 디코딩 후 조회수/시간당 조회수/콘텐츠 타입 필터 (채널 조회 전에 적용)
+            columns = self._apply_filters(VideoColumns.decode(items), settings)
+            logger.info(f"필터링 후 영상 수: {len(columns)}")
             
-            # 필터링 적용
-            filtered_videos = self._apply_filters(unique_videos, settings)
-            logger.info(f"필터링 후 영상 수: {len(filtered_videos)}")
+            # 4단계: 남은 영상의 채널만 배치 조회
+            videos, channels = await self._build_videos(columns, settings)
+            videos.regions = [
+                [region for region in regions if region in membership.get(video_id, {})]
+                for video_id in videos.video_ids
+            ]
+            logger.info(f"수집된 총 영상 수: {len(videos)} (채널 {len(channels)}개, 지역 {', '.join(regions)})")
             
-            return filtered_videos
+            return videos, channels
             
         except Exception as e:
             logger.error(f"데이터 수집 중 오류: {e}")
             raise
     
-    async def _get_channel_videos(self, settings: AnalysisSettings) -> List[VideoData]:
-        """채널별 영상 수집"""
-        videos = []
+    async def _get_channel_video_ids(self, settings: AnalysisSettings,
+                                     sources: Optional[Dict[str, List[str]]] = None,
+                                     channel_refs: Optional[Dict[str, Optional[str]]] = None) -> List[str]:
+        """채널별 최근 영상 id 수집 (channel_refs: 입력한 채널 참조 → channel_id, sources 는 입력한 값 기준)"""
+        video_ids = []
+        if channel_refs is None:
+            channel_refs = {channel_id: channel_id for channel_id in settings.channel_ids}
+        searched: Dict[str, List[str]] = {}
         
-        for channel_id in settings.channel_ids:
+        for ref, channel_id in channel_refs.items():
+            if channel_id is None:
+                continue
+            if channel_id in searched:
+                # 같은 채널을 다른 형식으로 입력한 경우
+                if sources is not None:
+                    sources[f"channel:{ref}"] = searched[channel_id]
+                continue
             try:
-                # 채널 정보 가져오기
-                channel_info = self.youtube.channels().list(
-                    part='snippet,statistics',
-                    id=channel_id
-                ).execute()
-                
-                if not channel_info['items']:
-                    continue
-                    
-                channel_data = channel_info['items'][0]
-                channel_name = channel_data['snippet']['title']
-                subscribers = int(channel_data['statistics'].get('subscriberCount', 0))
-                
                 # 채널의 최근 영상들 가져오기
-                search_response = self.youtube.search().list(
-                    part='snippet',
+                search_response = await asyncio.to_thread(
+                    job_call,
+                    self._search,
                     channelId=channel_id,
-                    type='video',
                     order='date',
                     maxResults=settings.max_videos_per_channel,
                     publishedAfter=self._get_date_filter(settings.days_back)
-                ).execute()
+                )
                 
-                # 각 영상의 상세 정보 가져오기
-                for item in search_response['items']:
-                    video_id = item['id']['videoId']
-                    video_data = await self._get_video_details(video_id, channel_name, subscribers, settings)
-                    if video_data:
-                        videos.append(video_data)
+                found = [item['id']['videoId'] for item in search_response['items']]
+                video_ids.extend(found)
+                searched[channel_id] = found
+                if sources is not None:
+                    sources[f"channel:{ref}"] = found
                         
             except HttpError as e:
-                logger.error(f"채널 {channel_id} 데이터 수집 실패: {e}")
+                logger.error(f"채널 {ref} 데이터 수집 실패: {e}")
                 continue
                 
-        return videos
+        return video_ids
     
-    async def _get_keyword_videos(self, settings: AnalysisSettings) -> List[VideoData]:
-        """키워드별 영상 수집"""
-        videos = []
+    async def _get_keyword_video_ids(self, settings: AnalysisSettings,
+                                     sources: Optional[Dict[str, List[str]]] = None,
+                                     regions: Optional[List[str]] = None,
+                                     membership: Optional[Dict[str, Dict[str, None]]] = None) -> List[str]:
+        """키워드별 영상 id 수집 (검색어 × 지역 조합을 동시에 검색)"""
+        regions = regions or [settings.region_code]
+        published_after = self._get_date_filter(settings.days_back)
         
-        for keyword in settings.search_terms:
+        async def search(keyword: str, region: str) -> List[str]:
             try:
-                search_response = self.youtube.search().list(
-                    part='snippet',
+                search_response = await asyncio.to_thread(
+                    job_call,
+                    self._search,
                     q=keyword,
-                    type='video',
                     order='relevance',
                     maxResults=settings.max_videos_per_search,
-                    publishedAfter=self._get_date_filter(settings.days_back),
-                    regionCode=settings.region_code
-                ).execute()
-                
-                # 각 영상의 상세 정보 가져오기
-                for item in search_response['items']:
-                    video_id = item['id']['videoId']
-                    channel_id = item['snippet']['channelId']
-                    
-                    # 채널 정보 가져오기
-                    channel_info = self.youtube.channels().list(
-                        part='snippet,statistics',
-                        id=channel_id
-                    ).execute()
-                    
-                    if not channel_info['items']:
-                        continue
-                        
-                    channel_data = channel_info['items'][0]
-                    channel_name = channel_data['snippet']['title']
-                    subscribers = int(channel_data['statistics'].get('subscriberCount', 0))
-                    
-                    video_data = await self._get_video_details(video_id, channel_name, subscribers, settings)
-                    if video_data:
-                        videos.append(video_data)
-                        
+                    publishedAfter=published_after,
+                    regionCode=region
+                )
             except HttpError as e:
-                logger.error(f"키워드 '{keyword}' 검색 실패: {e}")
-                continue
+                logger.error(f"키워드 '{keyword}' ({region}) 검색 실패: {e}")
+                return []
+            return [item['id']['videoId'] for item in search_response['items']]
+        
+        pairs = [(keyword, region) for keyword in settings.search_terms for region in regions]
+        results = await asyncio.gather(*(search(keyword, region) for keyword, region in pairs))
+        
+        video_ids = []
+        by_keyword: Dict[str, Dict[str, None]] = {}
+        for (keyword, region), found in zip(pairs, results):
+            video_ids.extend(found)
+            by_keyword.setdefault(keyword, {}).update(dict.fromkeys(found))
+            if membership is not None:
+                for video_id in found:
+                    membership.setdefault(video_id, {})[region] = None
+        
+        if sources is not None:
+            for keyword, found in by_keyword.items():
+                sources[f"keyword:{keyword}"] = list(found)
                 
-        return videos
+        return video_ids
     
-    async def _get_trending_videos(self, settings: AnalysisSettings) -> List[VideoData]:
-        """트렌딩/인기 영상 수집"""
-        videos = []
+    async def _get_trending_items(self, settings: AnalysisSettings, regions: Optional[List[str]] = None,
+                                  membership: Optional[Dict[str, Dict[str, None]]] = None) -> List[Dict[str, Any]]:
+        """트렌딩/인기 영상 수집 (videos.list chart=mostPopular, 페이지당 50개 / 1 unit, 지역별 동시 수집)"""
+        regions = regions or [settings.region_code]
         
-        # 인기 키워드들로 검색
-        trending_keywords = ["music", "funny", "gaming", "news", "sports", "tech", "cooking", "travel"]
+        # 카테고리를 지정하지 않으면 전체 인기 영상
+        category_ids = settings.trending_category_ids or [None]
+        cutoff = parse_timestamp(self._get_date_filter(settings.days_back))
         
+        async def fetch(region: str, category_id: Optional[str]) -> List[Dict[str, Any]]:
+            label = category_id or "전체"
+            try:
+                logger.info(f"카테고리 '{label}' 인기 영상 수집 시작 (지역: {region})")
+                category_items = await asyncio.to_thread(
+                    job_call, self._fetch_most_popular, region, category_id, settings.max_videos_per_search
+                )
+                logger.info(f"카테고리 '{label}' ({region}) 인기 영상 {len(category_items)}개")
+            except HttpError as e:
+                logger.error(f"카테고리 '{label}' ({region}) 인기 영상 수집 실패: {e}")
+                return []
+            
+            # 기간 필터 (mostPopular 는 publishedAfter 를 지원하지 않음)
+            return [item for item in category_items if parse_timestamp(item['snippet']['publishedAt']) >= cutoff]
+        
+        pairs = [(region, category_id) for region in regions for category_id in category_ids]
+        results = await asyncio.gather(*(fetch(region, category_id) for region, category_id in pairs))
+        
+        items = []
+        for (region, _), region_items in zip(pairs, results):
+            items.extend(region_items)
+            if membership is not None:
+                for item in region_items:
+                    membership.setdefault(item['id'], {})[region] = None
+            
+        return items
+    
+    async def _get_video_items(self, video_ids: List[str],
+                               prefetched: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """영상 상세 정보 배치 조회 (이미 받은 항목은 다시 조회하지 않음)"""
+        prefetched = prefetched or {}
+        missing = [video_id for video_id in video_ids if video_id not in prefetched]
+        
+        video_items = dict(prefetched)
+        if missing:
+            try:
+                video_items.update(await asyncio.to_thread(job_call, self._fetch_videos, missing))
+            except HttpError as e:
+                logger.error(f"영상 상세 정보 가져오기 실패: {e}")
+        
+        return [video_items[video_id] for video_id in video_ids if video_id in video_items]
+    
+    async def _build_videos(self, columns: VideoColumns,
+                            settings: AnalysisSettings) -> Tuple[VideoColumns, Dict[str, ChannelData]]:
+        """필터를 통과한 영상의 채널 정보를 배치 조회해서 파생 열을 채운 영상 열과 채널 테이블 생성"""
         try:
-            for keyword in trending_keywords[:3]:  # 처음 3개 키워드만 사용
-                logger.info(f"키워드 '{keyword}'로 트렌딩 영상 검색 시작")
-                
-                search_response = self.youtube.search().list(
-                    part='snippet',
-                    type='video',
-                    q=keyword,  # 키워드 검색
-                    order='relevance',
-                    maxResults=min(settings.max_videos_per_search // 3, 20),  # 키워드당 20개씩
-                    publishedAfter=self._get_date_filter(settings.days_back),
-                    regionCode=settings.region_code
-                ).execute()
-                
-                logger.info(f"키워드 '{keyword}' 검색 결과: {len(search_response.get('items', []))}개")
-                
-                if not search_response.get('items'):
-                    logger.warning(f"키워드 '{keyword}' 검색 결과가 없습니다.")
+            channels = await asyncio.to_thread(job_call, self._fetch_channels, list(dict.fromkeys(columns.channel_ids)))
+        except HttpError as e:
+            logger.error(f"채널 정보 조회 실패: {e}")
+            return VideoColumns(), {}
+        
+        missing = set(columns.channel_ids) - channels.keys()
+        if missing:
+            logger.warning(f"채널 정보를 찾을 수 없음: {sorted(missing)}")
+        
+        channel_table = columns.channel_table(channels)
+        
+        scores = None
+        if settings.score_breakouts and channel_table:
+            try:
+                await asyncio.to_thread(
+                    job_call, self.baselines.refresh, list(channel_table), lambda ids: self._fetch_uploads(ids, channels)
+                )
+                scores = self.baselines.score(columns)
+            except HttpError as e:
+                logger.error(f"채널 기준선 갱신 실패: {e}")
+        
+        return columns.annotate(channel_table, settings, scores=scores), channel_table
+    
+    # ------------------------------------------------------------------
+    # API 호출 (동시 요청 합치기)
+    # ------------------------------------------------------------------
+    def warm_up(self) -> Dict[str, float]:
+        """discovery 문서 파싱과 현재 키들의 클라이언트 생성을 미리 수행"""
+        return self._client_factory.warm_up(self.key_pool.keys())
+    
+    def _get_client(self, api_key: str):
+        """API 키별 클라이언트 (한 번 만들면 재사용)"""
+        return self._client_factory.get(api_key)
+    
+    def _execute(self, method: str, make_request: Callable[[Any], Any]) -> Dict[str, Any]:
+        """API 요청 실행 - 남은 할당량이 가장 많은 키 사용, 할당량 소진/무효 키면 다음 키로 재시도"""
+        cost = quota_cost(method)
+        
+        while True:
+            # 비용은 보내기 전에 예약 (동시에 보내는 요청들이 같은 남은 할당량으로 키를 고르지 않도록)
+            api_key = self.key_pool.acquire(cost)
+            try:
+                response = self.transport.execute(make_request(self._get_client(api_key)))
+            except HttpError as e:
+                reasons = self._error_reasons(e)
+                if reasons & QUOTA_ERROR_REASONS:
+                    self.key_pool.release(api_key, cost)
+                    self.key_pool.mark_exhausted(api_key)
                     continue
-                
-                # 각 영상의 상세 정보 가져오기
-                for i, item in enumerate(search_response['items']):
-                    try:
-                        video_id = item['id']['videoId']
-                        channel_id = item['snippet']['channelId']
-                        
-                        logger.info(f"영상 {i+1}/{len(search_response['items'])} 처리 중: {video_id}")
-                        
-                        # 채널 정보 가져오기
-                        channel_info = self.youtube.channels().list(
-                            part='snippet,statistics',
-                            id=channel_id
-                        ).execute()
-                        
-                        if not channel_info.get('items'):
-                            logger.warning(f"채널 정보를 찾을 수 없음: {channel_id}")
-                            continue
-                            
-                        channel_data = channel_info['items'][0]
-                        channel_name = channel_data['snippet']['title']
-                        subscribers = int(channel_data['statistics'].get('subscriberCount', 0))
-                        
-                        video_data = await self._get_video_details(video_id, channel_name, subscribers, settings)
-                        if video_data:
-                            videos.append(video_data)
-                            logger.info(f"영상 추가: {video_data.title} (조회수: {video_data.views})")
-                        else:
-                            logger.warning(f"영상 상세 정보 수집 실패: {video_id}")
-                            
-                    except Exception as e:
-                        logger.error(f"영상 {video_id} 처리 실패: {e}")
-                        continue
-                        
+                if reasons & INVALID_KEY_REASONS:
+                    self.key_pool.release(api_key, cost)
+                    self.key_pool.mark_invalid(api_key)
+                    continue
+                self.key_pool.record(api_key, cost)
+                meter_call(method, cost)
+                raise
+            except BaseException:
+                self.key_pool.release(api_key, cost)
+                raise
+            self.key_pool.record(api_key, cost)
+            meter_call(method, cost)
+            return response
+    
+    def _error_reasons(self, error: HttpError) -> set:
+        """오류 응답의 reason 목록 (errors[].reason 과 details[].reason)"""
+        if getattr(error.resp, 'status', None) not in (400, 403):
+            return set()
+        try:
+            content = json.loads(error.content.decode('utf-8')).get('error', {})
+        except Exception:
+            return set()
+        reasons = {e.get('reason') for e in content.get('errors', [])}
+        reasons.update(d.get('reason') for d in content.get('details', []) if isinstance(d, dict))
+        return reasons
+    
+    def quota_status(self) -> Dict[str, Any]:
+        """키별 할당량 사용 현황 + 전송 통계 (요청 수, gzip 응답 수) + 채널 참조 캐시"""
+        return {**self.key_pool.snapshot(), "transport": self.transport.stats(), "resolver": self.resolver.stats()}
+    
+    def channel_details(self, channel_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """채널 정보 (이름, 구독자수, 업로드 재생목록) - 50개당 1 unit"""
+        return self._fetch_channels(channel_ids)
+    
+    def featured_channels(self, channel_id: str) -> List[str]:
+        """채널 홈 섹션에 소개된 채널 (channelSections.list 1 unit, 실패하면 빈 목록)"""
+        try:
+            response = self._flight.do(
+                ("sections", channel_id),
+                lambda: self._execute("channelSections.list", lambda yt: yt.channelSections().list(
+                    part='contentDetails', channelId=channel_id, fields=CHANNEL_SECTION_FIELDS
+                ))
+            )
         except HttpError as e:
-            logger.error(f"트렌딩 영상 수집 실패: {e}")
-        except Exception as e:
-            logger.error(f"트렌딩 영상 수집 중 예상치 못한 오류: {e}")
-            
-        logger.info(f"총 {len(videos)}개의 트렌딩 영상 수집 완료")
-        return videos
+            logger.warning(f"채널 {channel_id} 섹션 조회 실패: {e}")
+            return []
+        
+        featured: Dict[str, None] = {}
+        for item in response.get('items', []):
+            for featured_id in (item.get('contentDetails') or {}).get('channels', []):
+                if featured_id != channel_id:
+                    featured[featured_id] = None
+        return list(featured)
     
-    async def _get_video_details(self, video_id: str, channel_name: str, subscribers: int, settings: AnalysisSettings) -> VideoData:
-        """영상 상세 정보 가져오기"""
+    def upload_dates(self, channel_id: str, channel_item: Optional[Dict[str, Any]], limit: int) -> List[str]:
+        """최근 업로드 영상의 게시 시각 (업로드 재생목록 한 페이지, 1 unit)"""
+        playlist_id = uploads_playlist_id(channel_id, channel_item)
+        if not playlist_id:
+            return []
         try:
-            video_response = self.youtube.videos().list(
-                part='snippet,statistics,contentDetails',
-                id=video_id
-            ).execute()
-            
-            if not video_response['items']:
-                return None
-                
-            video = video_response['items'][0]
-            
-            # 기본 정보
-            title = video['snippet']['title']
-            upload_date = datetime.fromisoformat(video['snippet']['publishedAt'].replace('Z', '+00:00'))
-            views = int(video['statistics'].get('viewCount', 0))
-            duration = self._parse_duration(video['contentDetails']['duration'])
-            
-            # 시간당 조회수 계산
-            hours_since_upload = (datetime.now(upload_date.tzinfo) - upload_date).total_seconds() / 3600
-            views_per_hour = views / max(hours_since_upload, 1)
-            
-            # 구독자 대비 조회수 비율
-            views_to_subscribers_ratio = views / max(subscribers, 1)
-            
-            # 쇼츠 여부 확인
-            is_shorts = duration <= settings.shorts_max_duration
-            
-            # 콘텐츠 타입 필터링
-            if settings.content_type == "shorts" and not is_shorts:
-                return None
-            elif settings.content_type == "long_form" and is_shorts:
+            response = self._flight.do(
+                ("upload_dates", playlist_id, limit),
+                lambda: self._execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+                    part='contentDetails', playlistId=playlist_id, maxResults=min(limit, MAX_IDS_PER_REQUEST),
+                    fields=UPLOAD_DATE_FIELDS
+                ))
+            )
+        except HttpError as e:
+            logger.warning(f"채널 {channel_id} 업로드 목록 조회 실패: {e}")
+            return []
+        return [
+            item['contentDetails']['videoPublishedAt'] for item in response.get('items', [])
+            if item.get('contentDetails', {}).get('videoPublishedAt')
+        ]
+    
+    def sharing_fetches(self, seconds: float):
+        """구간 안의 수집 요청 결과를 seconds 동안 보관해서 이어지는 실행과 공유 (예약 실행용)"""
+        return self._flight.retaining(seconds)
+    
+    def resolve_channels(self, refs: List[str]) -> Dict[str, Optional[str]]:
+        """채널 ID / @핸들 / 채널·영상 URL → channel_id (찾지 못하면 None, 저장된 대응은 재사용)"""
+        return self.resolver.resolve(refs, self._lookup_channel_refs)
+    
+    def _lookup_channel_refs(self, kind: str, values: List[str]) -> Dict[str, str]:
+        """채널 참조 조회 - 영상은 videos.list 50개당 1 unit, 핸들/사용자명은 채널마다 channels.list 1 unit"""
+        if kind == "video":
+            items = self._list_by_ids("videos", 'snippet', VIDEO_CHANNEL_FIELDS, "video", values)
+            return {key[1]: item['snippet']['channelId'] for key, item in items.items()}
+        
+        # forHandle / forUsername 은 한 번에 하나씩만 받으므로 연결 풀에서 동시에 요청
+        param = {"handle": "forHandle", "username": "forUsername"}[kind]
+        
+        def fetch(value: str) -> Optional[str]:
+            try:
+                response = self._flight.do(
+                    (kind, value),
+                    lambda: self._execute("channels.list", lambda yt: yt.channels().list(
+                        part='id', fields=CHANNEL_ID_FIELDS, **{param: value}
+                    ))
+                )
+            except HttpError as e:
+                logger.warning(f"채널 {value} 조회 실패: {e}")
                 return None
-            
-            return VideoData(
-                video_id=video_id,
-                title=title,
-                channel_name=channel_name,
-                channel_id=video['snippet']['channelId'],
-                upload_date=upload_date,
-                views=views,
-                views_per_hour=views_per_hour,
-                subscribers=subscribers,
-                views_to_subscribers_ratio=views_to_subscribers_ratio,
-                duration=duration,
-                video_url=f"https://www.youtube.com/watch?v={video_id}",
-                thumbnail_url=video['snippet']['thumbnails']['high']['url'],
-                is_shorts=is_shorts
+            items = response.get('items') or []
+            return items[0]['id'] if items else None
+        
+        return {value: channel_id for value, channel_id in zip(values, self.transport.map(fetch, values)) if channel_id}
+    
+    def _search(self, **params) -> Dict[str, Any]:
+        """search().list 호출 - 같은 조건의 동시 요청은 한 번만 호출"""
+        key = ("search",) + tuple(sorted(params.items()))
+        return self._flight.do(
+            key,
+            lambda: self._execute("search.list", lambda yt: yt.search().list(
+                part='snippet', type='video', fields=SEARCH_FIELDS, **params
+            ))
+        )
+    
+    def _fetch_channels(self, channel_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """채널 정보 배치 조회 - 다른 작업이 요청 중인 채널은 그 결과를 공유"""
+        results = self._flight.do_many(
+            [("channel", channel_id) for channel_id in channel_ids],
+            lambda keys: self._list_by_ids(
+                "channels", 'snippet,statistics,contentDetails', CHANNEL_FIELDS, "channel", [k[1] for k in keys]
             )
-            
-        except Exception as e:
-            logger.error(f"영상 {video_id} 상세 정보 가져오기 실패: {e}")
-            return None
+        )
+        return {key[1]: item for key, item in results.items() if item}
     
-    def _parse_duration(self, duration: str) -> int:
-        """ISO 8601 duration을 초 단위로 변환"""
-        import re
+    def _fetch_videos(self, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """영상 정보 배치 조회 - 다른 작업이 요청 중인 영상은 그 결과를 공유"""
+        results = self._flight.do_many(
+            [("video", video_id) for video_id in video_ids],
+            lambda keys: self._list_by_ids(
+                "videos", 'snippet,statistics,contentDetails', VIDEO_FIELDS, "video", [k[1] for k in keys]
+            )
+        )
+        return {key[1]: item for key, item in results.items() if item}
+    
+    def _fetch_uploads(self, channel_ids: List[str],
+                       channel_items: Dict[str, Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """채널별 최근 업로드 영상 (업로드 재생목록 1 unit + videos.list 50개당 1 unit, search.list 미사용)
+
+        채널마다 재생목록 요청이 하나씩 필요하므로 연결 풀에서 동시에 보낸다.
+        """
+        def fetch_playlist(channel_id: str) -> List[str]:
+            playlist_id = uploads_playlist_id(channel_id, channel_items.get(channel_id))
+            if not playlist_id:
+                return []
+            try:
+                response = self._flight.do(
+                    ("uploads", playlist_id),
+                    lambda: self._execute("playlistItems.list", lambda yt: yt.playlistItems().list(
+                        part='contentDetails', playlistId=playlist_id, maxResults=BASELINE_SAMPLE_SIZE,
+                        fields=PLAYLIST_ITEM_FIELDS
+                    ))
+                )
+            except HttpError as e:
+                logger.warning(f"채널 {channel_id} 업로드 목록 조회 실패: {e}")
+                return []
+            return [item['contentDetails']['videoId'] for item in response.get('items', [])]
         
-        # PT4M13S -> 4분 13초
-        pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-        match = re.match(pattern, duration)
+        video_channels: Dict[str, str] = {}
+        for channel_id, video_ids in zip(channel_ids, self.transport.map(fetch_playlist, channel_ids)):
+            for video_id in video_ids:
+                video_channels[video_id] = channel_id
         
-        if not match:
-            return 0
-            
-        hours = int(match.group(1) or 0)
-        minutes = int(match.group(2) or 0)
-        seconds = int(match.group(3) or 0)
+        uploads: Dict[str, List[Dict[str, Any]]] = {}
+        for video_id, item in self._fetch_videos(list(video_channels)).items():
+            uploads.setdefault(video_channels[video_id], []).append(item)
+        return uploads
+    
+    def _fetch_most_popular(self, region_code: str, category_id: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """지역/카테고리별 인기 영상 (페이지 단위로 limit 개까지)"""
+        def fetch():
+            items = []
+            page_token = None
+            while len(items) < limit:
+                params = {
+                    "part": 'snippet,statistics,contentDetails',
+                    "fields": VIDEO_FIELDS,
+                    "chart": 'mostPopular',
+                    "regionCode": region_code,
+                    "maxResults": min(MAX_IDS_PER_REQUEST, limit - len(items))
+                }
+                if category_id:
+                    params["videoCategoryId"] = category_id
+                if page_token:
+                    params["pageToken"] = page_token
+                
+                response = self._execute("videos.list", lambda yt: yt.videos().list(**params))
+                items.extend(response.get('items', []))
+                
+                page_token = response.get('nextPageToken')
+                if not page_token:
+                    break
+            return items
+        
+        return self._flight.do(("popular", region_code, category_id, limit), fetch)
+    
+    def _list_by_ids(self, resource: str, part: str, fields: str, kind: str,
+                     ids: List[str]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """id 목록을 50개씩 나눠 list 호출 (묶음들은 연결 풀에서 동시에 요청)"""
+        def fetch(chunk: List[str]) -> Dict[str, Any]:
+            return self._execute(
+                f"{resource}.list",
+                lambda yt: getattr(yt, resource)().list(
+                    part=part, id=",".join(chunk), maxResults=MAX_IDS_PER_REQUEST, fields=fields
+                )
+            )
         
-        return hours * 3600 + minutes * 60 + seconds
+        chunks = [ids[i:i + MAX_IDS_PER_REQUEST] for i in range(0, len(ids), MAX_IDS_PER_REQUEST)]
+        items = {}
+        for response in self.transport.map(fetch, chunks):
+            for item in response.get('items', []):
+                items[(kind, item['id'])] = item
+        return items
+    
+    def _parse_duration(self, duration: str) -> int:
+        """ISO 8601 duration을 초 단위로 변환"""
+        return parse_duration(duration)
     
     def _get_date_filter(self, days_back: int) -> str:
         """날짜 필터 문자열 생성"""
         # 최소 30일 전부터 검색하도록 제한을 완화
         min_days = max(days_back, 30)
-        date = datetime.now() - timedelta(days=min_days)
-        return date.isoformat() + 'Z'
-    
-    def _remove_duplicates(self, videos: List[VideoData]) -> List[VideoData]:
-        """중복 영상 제거"""
-        seen = set()
-        unique_videos = []
-        
-        for video in videos:
-            if video.video_id not in seen:
-                seen.add(video.video_id)
-                unique_videos.append(video)
-                
-        return unique_videos
+        # UTC 날짜 단위로 잘라서 같은 날 실행한 작업의 검색 조건이 같아지도록 함
+        # (분 단위면 보관 중인 search.list 결과를 다음 예약 실행이 공유하지 못함, 범위는 최대 하루 넓어짐)
+        date = (datetime.now(timezone.utc) - timedelta(days=min_days)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return date.strftime('%Y-%m-%dT%H:%M:%SZ')
     
-    def _apply_filters(self, videos: List[VideoData], settings: AnalysisSettings) -> List[VideoData]:
-        """필터 적용"""
-        filtered = []
-        
-        for video in videos:
-            # 최소 조회수 필터
-            if video.views < settings.min_views:
-                continue
-                
-            # 최소 시간당 조회수 필터
-            if video.views_per_hour < settings.min_views_per_hour:
-                continue
-                
-            filtered.append(video)
-            
-        return filtered
-
+    def _apply_filters(self, columns: VideoColumns, settings: AnalysisSettings) -> VideoColumns:
+        """필터 적용 (채널 정보 없이 영상 열 데이터만으로 판단)"""
+        return columns.select(columns.filter_indices(settings))
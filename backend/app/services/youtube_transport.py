@@ -0,0 +1,116 @@
+import contextvars
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import httplib2
+
+from app.services.profiler import job_call
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 필요한 필드만 받는 partial response 마스크 (VideoColumns / 채널 테이블 / 기준선이 읽는 필드)
+VIDEO_FIELDS = ("items(id,snippet(publishedAt,channelId,title,thumbnails/high/url),"
+                "contentDetails/duration,statistics/viewCount),nextPageToken")
+CHANNEL_FIELDS = "items(id,snippet/title,statistics/subscriberCount,contentDetails/relatedPlaylists/uploads)"
+SEARCH_FIELDS = "items(id/videoId,snippet/channelId),nextPageToken"
+PLAYLIST_ITEM_FIELDS = "items/contentDetails/videoId,nextPageToken"
+# 채널 참조 해석용 (핸들/사용자명 → channel_id, 영상 → 채널)
+CHANNEL_ID_FIELDS = "items/id"
+VIDEO_CHANNEL_FIELDS = "items(id,snippet/channelId)"
+# 채널 탐색용 (추천 채널 섹션, 최근 업로드 시각)
+CHANNEL_SECTION_FIELDS = "items/contentDetails/channels"
+UPLOAD_DATE_FIELDS = "items/contentDetails(videoId,videoPublishedAt),nextPageToken"
+
+class MeteredHttp(httplib2.Http):
+    """응답마다 ApiTransport 통계를 기록하는 Http (스레드 하나가 하나씩 사용)"""
+
+    def __init__(self, transport: "ApiTransport", **kwargs):
+        super().__init__(**kwargs)
+        self.transport = transport
+
+    def request(self, *args, **kwargs):
+        response, content = super().request(*args, **kwargs)
+        self.transport._record(response)
+        return response, content
+
+class ApiTransport:
+    """YouTube API 요청 전송 (스레드별 keep-alive 연결, gzip 응답, 병렬 배치 요청)
+
+    httplib2.Http 는 thread-safe 하지 않으므로 공유 클라이언트 하나를 lock 으로 직렬화하는 대신
+    스레드마다 자기 Http(연결 캐시)를 두고 request.execute(http=...) 로 보낸다.
+    같은 스레드의 다음 요청은 열린 연결을 그대로 쓰고, 스레드 사이에는 공유하는 상태가 없다.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, timeout: Optional[float] = None):
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("YOUTUBE_HTTP_CONCURRENCY", 8))
+        self.timeout = timeout if timeout is not None else float(os.getenv("YOUTUBE_HTTP_TIMEOUT", 30))
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"requests": 0, "thread_clients": 0, "gzip_responses": 0}
+
+    def execute(self, request) -> Dict[str, Any]:
+        """googleapiclient HttpRequest 를 현재 스레드의 연결로 실행 (gzip 요청)"""
+        # Google API 는 User-Agent 에 gzip 이 있어야 압축 응답을 보냄
+        user_agent = request.headers.get("user-agent", "")
+        if "gzip" not in user_agent:
+            request.headers["user-agent"] = f"{user_agent} (gzip)".strip()
+        request.headers["accept-encoding"] = "gzip"
+        return request.execute(http=self._http())
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+        """여러 요청을 연결 풀 스레드에서 동시에 실행 (순서 유지, 풀 스레드 안에서는 순차 실행)
+
+        호출한 쪽의 contextvars (실행별 API 키, 작업 프로파일러 등) 를 요청마다 복사해서 넘긴다.
+        """
+        items = list(items)
+        if len(items) <= 1 or self.concurrency <= 1 or getattr(self._local, "pooled", False):
+            return [fn(item) for item in items]
+        pool = self._pool()
+        futures = [pool.submit(contextvars.copy_context().run, job_call, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """연결 풀 스레드 종료 (대기 중인 요청은 취소, 다음 map 호출 시 다시 만듦)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "concurrency": self.concurrency}
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency, thread_name_prefix="youtube-http", initializer=self._mark_pooled
+                )
+            return self._executor
+
+    def _mark_pooled(self):
+        self._local.pooled = True
+
+    def _http(self):
+        """현재 스레드의 Http (없으면 생성, 연결은 스레드가 끝날 때까지 재사용)"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = MeteredHttp(self, timeout=self.timeout)
+            with self._lock:
+                self._stats["thread_clients"] += 1
+        return http
+
+    def _record(self, response):
+        # 받은 크기는 기록하지 않음 (httplib2 가 압축을 풀면서 content-length 도 푼 크기로 바꿈)
+        with self._lock:
+            self._stats["requests"] += 1
+            if response.get("-content-encoding") == "gzip":
+                self._stats["gzip_responses"] += 1
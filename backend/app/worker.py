@@ -0,0 +1,55 @@
+"""
+수집 워커 프로세스
+
+API 서버를 ANALYSIS_EXECUTOR=worker, STATE_BACKEND=sqlite 로 실행하면
+/start 요청은 작업만 등록하고, 실제 수집/분석은 이 프로세스가 처리한다.
+
+    python -m app.worker
+"""
+
+import asyncio
+import logging
+import os
+
+from dotenv import load_dotenv
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.analysis_runner import AnalysisRunner
+from app.services.export_store import ExportStore
+from app.services.state_store import create_state_store
+from app.services.thumbnail_cache import ThumbnailCache
+from app.services.watchlist import Watchlist
+
+logger = logging.getLogger(__name__)
+
+async def run_worker(poll_interval: float = 1.0):
+    """대기 중인 작업을 하나씩 가져와 실행"""
+    store = create_state_store()
+    if not store.shared:
+        raise RuntimeError("수집 워커는 공유 저장소가 필요합니다. STATE_BACKEND=sqlite 로 설정하세요.")
+
+    runner = AnalysisRunner(store)
+    # 프로파일 파일은 API 서버와 같은 내보내기 폴더에 등록만 함 (용량 제한/정리는 API 서버가 맡음)
+    runner.artifact_store = ExportStore(manage=False)
+    # API 서버와 같은 완료 후 작업 (감시 목록/썸네일 파일은 API 서버와 공유)
+    # 검색 색인은 프로세스 메모리에 있으므로 API 서버가 검색할 때 저장된 결과로 만든다
+    runner.register_completion_hooks(watchlist=Watchlist(), thumbnail_cache=ThumbnailCache())
+    logger.info("수집 워커 시작")
+
+    try:
+        while True:
+            job = store.claim_job()
+            if not job:
+                await asyncio.sleep(poll_interval)
+                continue
+
+            job_id, settings_data, slot = job
+            logger.info(f"작업 {job_id} 처리 시작" + (f" (결과: {slot})" if slot else ""))
+            await runner.run(job_id, AnalysisSettings(**settings_data), slot=slot)
+    finally:
+        runner.youtube_service.close()
+
+if __name__ == "__main__":
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker(float(os.getenv("WORKER_POLL_INTERVAL", 1.0))))
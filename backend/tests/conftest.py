@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+
+# backend/ 에서 pytest 를 실행하지 않아도 app 패키지를 찾도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# API 모듈을 import 해도 작업 디렉토리에 파일을 만들거나 백그라운드 작업을 띄우지 않도록
+_scratch = tempfile.mkdtemp(prefix="analyzer-tests-")
+for name, value in {
+    "QUOTA_USAGE_FILE": "",
+    "CHANNEL_BASELINE_FILE": "",
+    "CHANNEL_RESOLVER_FILE": "",
+    "SETTINGS_PROFILES_FILE": os.path.join(_scratch, "settings_profiles.json"),
+    "WATCHLIST_FILE": os.path.join(_scratch, "watchlist.json"),
+    "EXPORTS_DIR": os.path.join(_scratch, "exports"),
+    "THUMBNAIL_CACHE_DIR": os.path.join(_scratch, "thumbnails"),
+    "RESULT_SPILL_DIR": os.path.join(_scratch, "spill"),
+    "STATE_BACKEND": "memory",
+    "ANALYSIS_EXECUTOR": "inline",
+    "PROFILE_SCHEDULER": "false",
+    "YOUTUBE_WARMUP": "false",
+    "THUMBNAIL_PREFETCH": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+import pytest
+
+TEST_KEY = "test-key-0123456789"
+
+@pytest.fixture
+def fake_youtube():
+    """지연 없는 가짜 YouTube Data API 서버"""
+    from app.fake_youtube import FakeYouTube
+    fake = FakeYouTube(latency=0, jitter=0).start()
+    yield fake
+    fake.stop()
+
+@pytest.fixture
+def youtube_service(fake_youtube):
+    """가짜 서버로 요청하는 YouTubeService (환경 변수 키 없이 TEST_KEY 하나만 사용)"""
+    from app.services.key_pool import ApiKeyPool
+    from app.services.youtube_client import YouTubeClientFactory
+    from app.services.youtube_service import YouTubeService
+    service = YouTubeService(YouTubeClientFactory(api_endpoint=fake_youtube.url))
+    service.key_pool = ApiKeyPool([TEST_KEY], usage_file="")
+    yield service
+    service.close()
@@ -0,0 +1,81 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import analysis
+from app.models.analysis_models import AnalysisSettings
+from app.services.result_versions import ResultVersionCache
+from app.services.run_cache import RunCache, settings_fingerprint
+from app.services.state_store import MemoryStateStore
+
+SETTINGS = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "search_terms": ["먹방"]}
+
+@pytest.fixture
+def store(monkeypatch):
+    store = MemoryStateStore()
+    monkeypatch.setattr(analysis, "state_store", store)
+    monkeypatch.setattr(analysis, "run_cache", RunCache(store, ttl=600))
+    return store
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(analysis.router, prefix="/api/analysis")
+    return TestClient(app)
+
+def cache(settings=SETTINGS, job_id="cached-job"):
+    key = settings_fingerprint(AnalysisSettings(**settings))
+    analysis.run_cache.put(key, {"job_id": job_id, "videos": [], "channels": {}, "total_videos": 0})
+
+def test_cached_start_serves_the_cached_result(store, client):
+    cache()
+    response = client.post("/api/analysis/start", json=SETTINGS).json()
+    assert response["status"] == "cached" and response["job_id"] == "cached-job"
+
+    status = client.get("/api/analysis/status").json()
+    assert status["is_running"] is False
+    assert status["progress"] == 100
+    assert status["job_id"] == status["result_version"] == "cached-job"
+
+def test_cached_start_is_rejected_while_another_job_runs(store, client):
+    cache()
+    store.try_start({"job_id": "running", "is_running": True, "current_task": "running"})
+
+    assert client.post("/api/analysis/start", json=SETTINGS).status_code == 400
+    status = store.get_status()
+    assert status["job_id"] == "running" and status["is_running"]
+    assert store.get_result() is None
+
+def test_cached_start_does_not_clobber_a_job_started_meanwhile(store, client, monkeypatch):
+    cache()
+    original = store.set_result
+
+    def start_other_job_first(result, job_id=None, slot=None):
+        # 캐시 결과를 쓰기 직전에 상태가 다른 작업으로 바뀐 경우
+        store.update_status(is_running=False)
+        store.try_start({"job_id": "other", "is_running": True, "current_task": "other"})
+        return original(result, job_id, slot)
+
+    monkeypatch.setattr(store, "set_result", start_other_job_first)
+    client.post("/api/analysis/start", json=SETTINGS)
+    status = store.get_status()
+    assert (status["job_id"], status["is_running"], status["current_task"]) == ("other", True, "other")
+    assert store.get_result() is None
+
+def test_result_honours_weak_and_listed_etags(store, client, monkeypatch):
+    monkeypatch.setattr(analysis, "result_versions", ResultVersionCache())
+    store.set_result({"job_id": "job-1", "videos": [{"video_id": "a", "channel_id": "UCa"}],
+                      "channels": {}, "total_videos": 1})
+
+    response = client.get("/api/analysis/result", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["etag"] == '"job-1"'
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["version"] == "job-1"
+
+    for header in ['"job-1"', 'W/"job-1"', '"old", W/"job-1"', '*']:
+        assert client.get("/api/analysis/result", headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/api/analysis/result", headers={"If-None-Match": '"old"'}).status_code == 200
+
+    delta = client.get("/api/analysis/result", params={"since": "job-1"},
+                       headers={"If-None-Match": '"job-1"'}).json()
+    assert delta["delta"] is True and delta["videos"] == []
@@ -0,0 +1,99 @@
+from app.models.analysis_models import AnalysisSettings, ChannelData
+from app.services.analysis_service import AnalysisService
+from app.services.video_decoder import VideoColumns
+
+NOW = 1_770_000_000.0
+
+def columns(rows):
+    """(video_id, channel_id, views) 목록으로 annotate 전 VideoColumns 구성"""
+    videos = VideoColumns()
+    for video_id, channel_id, views in rows:
+        videos.video_ids.append(video_id)
+        videos.titles.append(f"title {video_id}")
+        videos.channel_ids.append(channel_id)
+        videos.thumbnail_urls.append("")
+        videos.published.append(NOW - 7200)
+        videos.durations.append(300)
+        videos.views.append(views)
+    return videos
+
+SETTINGS = AnalysisSettings(api_key="", analysis_mode="keyword", content_type="both", score_breakouts=False)
+
+def analyze(rows, channels):
+    videos = columns(rows).annotate(channels, SETTINGS, now=NOW)
+    return AnalysisService().analyze(videos, SETTINGS, channels)
+
+def test_channels_with_same_name_are_kept_apart():
+    channels = {
+        "UCa": ChannelData(channel_id="UCa", channel_name="같은 이름", subscribers=100),
+        "UCb": ChannelData(channel_id="UCb", channel_name="같은 이름", subscribers=1000),
+    }
+    result = analyze([("v1", "UCa", 300), ("v2", "UCb", 500), ("v3", "UCa", 100)], channels)
+
+    stats = {row['channel_id']: row for row in result.summary['channel_stats']}
+    assert set(stats) == {"UCa", "UCb"}
+    assert stats["UCa"]["total_views"] == 400 and stats["UCa"]["video_count"] == 2
+    assert stats["UCa"]["subscribers"] == 100 and stats["UCb"]["subscribers"] == 1000
+    assert [row['channel_id'] for row in result.summary['channel_stats']] == ["UCb", "UCa"]
+
+    assert result.summary['total_channels'] == 2
+    assert result.summary['avg_subscribers'] == (100 + 1000 + 100) / 3
+
+def test_rows_reference_channel_table_by_id():
+    channels = {"UCa": ChannelData(channel_id="UCa", channel_name="A", subscribers=10)}
+    # 채널 테이블에 없는 영상은 annotate 에서 제외
+    result = analyze([("v1", "UCa", 30), ("v2", "UCmissing", 50)], channels)
+
+    assert result.videos.video_ids == ["v1"]
+    row = result.videos.row(0)
+    assert row["channel_id"] == "UCa"
+    assert "channel_name" not in row and "subscribers" not in row
+    assert row["views_to_subscribers_ratio"] == 3.0
+
+def test_channel_chart_groups_by_channel_id():
+    channels = {
+        "UCa": ChannelData(channel_id="UCa", channel_name="같은 이름", subscribers=1),
+        "UCb": ChannelData(channel_id="UCb", channel_name="같은 이름", subscribers=1),
+    }
+    service = AnalysisService()
+    result = analyze([("v1", "UCa", 300), ("v2", "UCb", 500)], channels)
+
+    chart = service.create_charts_data(result)['channel_views_chart']
+    assert sorted(chart['data']) == [300, 500]
+    assert len(chart['labels']) == 2
+
+def test_empty_input_returns_empty_summary():
+    result = AnalysisService().analyze(VideoColumns(), SETTINGS, {})
+    assert result.total_videos == 0 and result.summary == {} and result.channels == {}
+    assert AnalysisService().create_charts_data(result) == {}
+
+def test_multi_region_charts_use_the_first_collected_region():
+    channels = {"UCa": ChannelData(channel_id="UCa", channel_name="A", subscribers=1)}
+    settings = AnalysisSettings(api_key="", analysis_mode="keyword", content_type="both", score_breakouts=False,
+                                region_code="KR", region_codes=["us", "JP"])
+    videos = columns([("v1", "UCa", 100)]).annotate(channels, settings, now=NOW)
+    videos.regions = [["US"]]
+    service = AnalysisService()
+    result = service.analyze(videos, settings, channels)
+
+    cube = service.build_cube(result)
+    assert cube.stats()["region_code"] == "US" and cube.stats()["timezone"] == "America/New_York"
+    chart = service.create_charts_data(result, cube)['hourly_views_chart']
+    assert (chart['region_code'], chart['timezone']) == ("US", "America/New_York")
+
+    # 저장된 결과로 다시 만든 큐브도 같은 지역 기준
+    from app.services.analytics_cube import AnalyticsCube
+    stored = AnalyticsCube.from_result({"videos": videos.rows(), "channels": {},
+                                        "settings": settings.dict()})
+    assert stored.stats()["region_code"] == "US"
+    assert stored.query(['hour'])['rows'] == cube.query(['hour'])['rows']
+
+    # 지역별 시간대 통계는 summary 의 regions
+    tokyo = [s for s in result.summary['regions']['stats'] if s['region_code'] == "JP"]
+    assert tokyo and tokyo[0]['total_videos'] == 0
+
+def test_single_region_charts_use_region_code():
+    channels = {"UCa": ChannelData(channel_id="UCa", channel_name="A", subscribers=1)}
+    result = analyze([("v1", "UCa", 100)], channels)
+    chart = AnalysisService().create_charts_data(result)['hourly_views_chart']
+    assert (chart['region_code'], chart['timezone']) == ("KR", "Asia/Seoul")
@@ -0,0 +1,153 @@
+import random
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.models.analysis_models import ChannelData
+from app.services.analytics_cube import DIMENSIONS, AnalyticsCube, views_bucket
+from app.services.video_decoder import VideoColumns
+
+SEOUL = ZoneInfo("Asia/Seoul")
+
+def make_records(count: int = 300, seed: int = 7):
+    rng = random.Random(seed)
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return [
+        (
+            start + timedelta(minutes=rng.randrange(14 * 24 * 60)),
+            rng.choice([50, 5000, 50000, 500000, 5000000]) + rng.randrange(100),
+            round(rng.uniform(0, 1000), 2),
+            rng.random() < 0.3,
+            f"UC{rng.randrange(6)}"
+        )
+        for _ in range(count)
+    ]
+
+def brute_force(records, group_by, filters=None):
+    """영상마다 차원 값을 계산해서 직접 합침"""
+    totals = {}
+    for uploaded, views, vph, is_shorts, channel_id in records:
+        local = uploaded.astimezone(SEOUL)
+        values = {
+            "date": local.date().isoformat(),
+            "hour": local.hour,
+            "weekday": local.weekday(),
+            "content_type": "shorts" if is_shorts else "long_form",
+            "channel": channel_id,
+            "views_bucket": views_bucket(views)
+        }
+        if any(values[d] not in allowed for d, allowed in (filters or {}).items()):
+            continue
+        target = totals.setdefault(tuple(values[d] for d in group_by), [0, 0, 0.0])
+        target[0] += 1
+        target[1] += views
+        target[2] += vph
+    return totals
+
+def as_groups(response, group_by):
+    return {tuple(row[d] for d in group_by): (row["videos"], row["views"]) for row in response["rows"]}
+
+def expected_groups(records, group_by, filters=None):
+    return {key: (count, views) for key, (count, views, _) in brute_force(records, group_by, filters).items()}
+
+@pytest.fixture(scope="module")
+def records():
+    return make_records()
+
+@pytest.fixture(scope="module")
+def cube(records):
+    return AnalyticsCube.build(records, SEOUL, {"UC0": "첫 채널"})
+
+@pytest.mark.parametrize("group_by", [list(c) for n in (1, 2) for c in combinations(DIMENSIONS, n)])
+def test_materialized_rollups_match_videos(records, cube, group_by):
+    assert as_groups(cube.query(group_by), group_by) == expected_groups(records, group_by)
+
+def test_rollup_order_follows_group_by(records, cube):
+    response = cube.query(["channel", "hour"])
+    assert as_groups(response, ["channel", "hour"]) == expected_groups(records, ["channel", "hour"])
+    assert set(response["rows"][0]) >= {"channel", "hour"}
+
+def test_total_and_three_dimensions(records, cube):
+    total = cube.query([])["rows"]
+    assert total[0]["videos"] == len(records)
+    assert total[0]["views"] == sum(r[1] for r in records)
+
+    group_by = ["weekday", "content_type", "views_bucket"]
+    assert as_groups(cube.query(group_by), group_by) == expected_groups(records, group_by)
+
+def test_filtered_queries_fold_cells(records, cube):
+    filters = {"hour": cube.parse_filter("hour", "9..17"), "content_type": {"shorts"}}
+    response = cube.query(["channel"], filters=filters)
+    assert as_groups(response, ["channel"]) == expected_groups(records, ["channel"], filters)
+
+def test_date_range_filter_uses_local_dates(records, cube):
+    dates = cube.parse_filter("date", "2026-03-03..2026-03-05")
+    assert dates == {"2026-03-03", "2026-03-04", "2026-03-05"}
+    assert cube.parse_filter("date", "0001-01-01..9999-12-31") == {key for (key,) in as_groups(cube.query(["date"]), ["date"])}
+
+    response = cube.query(["date"], filters={"date": dates})
+    assert as_groups(response, ["date"]) == expected_groups(records, ["date"], {"date": dates})
+
+def test_local_timezone_shifts_date_and_hour():
+    cube = AnalyticsCube.build([(datetime(2026, 3, 1, 23, 30, tzinfo=timezone.utc), 10, 1.0, False, "UC0")], SEOUL)
+    row = cube.query(["date", "hour"])["rows"][0]
+    assert (row["date"], row["hour"]) == ("2026-03-02", 8)
+
+def test_channel_measure_order_and_labels(records, cube):
+    response = cube.query(["channel"], measure="videos", limit=3)
+    counts = [row["videos"] for row in response["rows"]]
+    assert counts == sorted(counts, reverse=True) and len(counts) == 3
+    assert response["data"] == counts
+    assert "첫 채널" in cube.query(["channel"])["labels"]
+
+def test_pivot_series(records, cube):
+    response = cube.query(["hour", "content_type"], measure="videos")
+    expected = expected_groups(records, ["hour", "content_type"])
+    for series in response["series"]:
+        for label, value in zip(response["labels"], series["data"]):
+            hour = int(label[:-1])
+            assert value == expected.get((hour, series["key"]), (0, 0))[0]
+
+def test_queries_are_cached(cube):
+    assert cube.query(["hour"], filters={"weekday": {0}}) is cube.query(["hour"], filters={"weekday": [0]})
+
+@pytest.mark.parametrize("kwargs", [
+    {"group_by": ["unknown"]},
+    {"group_by": ["hour", "hour"]},
+    {"group_by": ["hour"], "measure": "likes"},
+    {"group_by": ["hour"], "filters": {"unknown": [1]}},
+])
+def test_invalid_queries(cube, kwargs):
+    with pytest.raises(ValueError):
+        cube.query(**kwargs)
+
+def test_from_result_matches_build(records):
+    result = {
+        "videos": [
+            {"upload_date": uploaded.isoformat().replace("+00:00", "Z"), "views": views,
+             "views_per_hour": vph, "is_shorts": is_shorts, "channel_id": channel_id}
+            for uploaded, views, vph, is_shorts, channel_id in records
+        ],
+        "channels": {"UC0": {"channel_name": "첫 채널"}},
+        "settings": {"region_code": "KR"}
+    }
+    restored = AnalyticsCube.from_result(result)
+    assert restored.cells == AnalyticsCube.build(records, SEOUL).cells
+    assert restored.channel_names == {"UC0": "첫 채널"}
+
+def test_from_columns_matches_build(records):
+    columns = VideoColumns()
+    columns.video_ids = [f"v{i}" for i in range(len(records))]
+    columns.channel_ids = [r[4] for r in records]
+    columns.published = array('d', (r[0].timestamp() for r in records))
+    columns.views = array('q', (r[1] for r in records))
+    columns.vph = array('d', (r[2] for r in records))
+    columns.shorts = array('b', (r[3] for r in records))
+    channels = {"UC0": ChannelData(channel_id="UC0", channel_name="첫 채널", subscribers=1)}
+
+    cube = AnalyticsCube.from_columns(columns, "KR", channels)
+    assert cube.cells == AnalyticsCube.build(records, SEOUL).cells
+    assert cube.label("channel", "UC0") == "첫 채널"
@@ -0,0 +1,125 @@
+import math
+import random
+import time
+from statistics import median
+
+import pytest
+
+from app.services import channel_baseline
+from app.services.channel_baseline import MAD_SCALE, MIN_SPREAD, ChannelBaselines, age_bucket
+from app.services.video_decoder import VideoColumns
+
+NOW = 1_770_000_000.0
+
+def upload(video_id, views, hours_ago):
+    return {
+        "id": video_id,
+        "snippet": {"publishedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(NOW - hours_ago * 3600))},
+        "statistics": {"viewCount": str(views)}
+    }
+
+def columns(rows):
+    """(video_id, channel_id, views, hours_ago) 목록"""
+    videos = VideoColumns()
+    for video_id, channel_id, views, hours_ago in rows:
+        videos.video_ids.append(video_id)
+        videos.channel_ids.append(channel_id)
+        videos.published.append(NOW - hours_ago * 3600)
+        videos.views.append(views)
+    return videos
+
+@pytest.fixture
+def baselines(tmp_path):
+    return ChannelBaselines(path=str(tmp_path / "baselines.json"), ttl_hours=12, min_samples=3)
+
+def test_age_bucket_bounds():
+    assert [age_bucket(h) for h in (0, 23.9, 24, 71, 100, 500, 1000)] == [0, 0, 1, 1, 2, 3, 4]
+
+def test_sorted_stats_match_statistics_median():
+    rng = random.Random(7)
+    for n in range(1, 40):
+        values = [round(rng.uniform(0, 15), rng.choice([0, 3])) for _ in range(n)]
+        center = median(values)
+        expected = [center, median(abs(v - center) for v in values), n]
+        assert channel_baseline._sorted_stats(sorted(values)) == pytest.approx(expected)
+
+def test_refresh_computes_bucket_median_and_mad(baselines):
+    views = [100, 1000, 10000, 1000, 1000]
+    uploads = {"UCa": [upload(f"u{i}", v, hours_ago=2) for i, v in enumerate(views)]}
+    calls = []
+
+    def fetch(channel_ids):
+        calls.append(list(channel_ids))
+        return uploads
+
+    assert baselines.refresh(["UCa", "UCa"], fetch, now=NOW) == 1
+    # TTL 안에서는 다시 받지 않음
+    assert baselines.refresh(["UCa"], fetch, now=NOW + 3600) == 0
+    assert calls == [["UCa"]]
+
+    snapshot = baselines.snapshot("UCa")
+    assert snapshot["observations"] == 5
+    assert snapshot["buckets"]["0"]["median_views"] == 1000
+    logs = sorted(math.log1p(v) for v in views)
+    center = median(logs)
+    assert snapshot["buckets"]["0"]["mad"] == round(median(abs(v - center) for v in logs), 4)
+
+    # 표본이 없는 구간은 가장 가까운 구간으로 채움, MAD 가 0 이어도 최소 척도 사용
+    assert baselines.baseline("UCa", 500) == (pytest.approx(center), max(MAD_SCALE * 0.0, MIN_SPREAD))
+    assert baselines.baseline("UCmissing", 5) is None
+
+def test_score_excludes_the_scored_video_from_its_own_baseline(baselines):
+    uploads = [upload(f"u{i}", v, hours_ago=5) for i, v in enumerate([10, 20, 30, 40, 5000])]
+    baselines.refresh(["UCa"], lambda ids: {"UCa": uploads}, now=NOW)
+
+    scores, expected = baselines.score(columns([
+        ("u4", "UCa", 5000, 5),      # 관측된 영상 - 자기 값을 빼고 비교
+        ("new", "UCa", 5000, 5),     # 관측되지 않은 영상
+        ("other", "UCb", 5000, 5),   # 기준선 없는 채널
+    ]), now=NOW)
+
+    def z(values, views):
+        logs = [math.log1p(v) for v in values]
+        center = median(logs)
+        spread = max(MAD_SCALE * median(abs(v - center) for v in logs), MIN_SPREAD)
+        return round((math.log1p(views) - center) / spread, 3), round(math.expm1(center))
+
+    assert (scores[0], expected[0]) == z([10, 20, 30, 40], 5000)
+    assert (scores[1], expected[1]) == z([10, 20, 30, 40, 5000], 5000)
+    assert (scores[2], expected[2]) == (0.0, 0)
+    assert scores[0] > scores[1] > 0
+
+def test_leave_one_out_matches_recomputing_without_the_video(baselines, monkeypatch):
+    rng = random.Random(3)
+    uploads = [upload(f"u{i}", rng.randint(1, 10 ** 6), hours_ago=rng.uniform(1, 900)) for i in range(120)]
+    baselines.refresh(["UCa"], lambda ids: {"UCa": uploads}, now=NOW)
+    observations = baselines._channels["UCa"]["observations"]
+
+    rows = [(u["id"], "UCa", int(u["statistics"]["viewCount"]), (NOW - channel_baseline.parse_timestamp(
+        u["snippet"]["publishedAt"])) / 3600) for u in uploads]
+    scores, _ = baselines.score(columns(rows), now=NOW)
+
+    for i, (video_id, _, views, hours_ago) in enumerate(rows):
+        stats = ChannelBaselines._compute_stats(
+            v for k, v in observations.items() if not k.startswith(f"{video_id}:"))
+        center, spread = baselines._table(stats)[age_bucket(hours_ago)]
+        assert scores[i] == round((math.log1p(views) - center) / spread, 3)
+
+def test_score_does_not_recompute_channel_stats_per_row(baselines, monkeypatch):
+    uploads = [upload(f"u{i}", 100 * (i + 1), hours_ago=3) for i in range(50)]
+    baselines.refresh(["UCa"], lambda ids: {"UCa": uploads}, now=NOW)
+
+    def fail(observations):
+        raise AssertionError("score() 에서 전체 통계를 다시 계산함")
+
+    monkeypatch.setattr(baselines, "_compute_stats", fail)
+    scores, _ = baselines.score(columns([(f"u{i}", "UCa", 100, 3) for i in range(50)]), now=NOW)
+    assert len(scores) == 50
+
+def test_baselines_persist_to_file(baselines, tmp_path):
+    uploads = [upload(f"u{i}", 100, hours_ago=2) for i in range(3)]
+    baselines.refresh(["UCa"], lambda ids: {"UCa": uploads}, now=NOW)
+
+    restored = ChannelBaselines(path=str(tmp_path / "baselines.json"), min_samples=3)
+    assert restored.snapshot("UCa") == baselines.snapshot("UCa")
+    assert restored.stale(["UCa", "UCb"], now=NOW + 3600) == ["UCb"]
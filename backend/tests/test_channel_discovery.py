@@ -0,0 +1,137 @@
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.channel_discovery import CHANNELS_PER_REQUEST, ChannelDiscovery, uploads_per_week
+from app.services.key_pool import meter_call, quota_cost
+
+class FakeKeyPool:
+    def __init__(self, remaining: int):
+        self._remaining = remaining
+
+    def remaining(self) -> int:
+        return self._remaining
+
+class FakeTransport:
+    concurrency = 4
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+class FakeService:
+    """채널마다 추천 채널 fanout 개를 돌려주는 채널 그래프 (요청마다 실제 호출처럼 집계)"""
+
+    def __init__(self, fanout: int = 3, remaining: int = 10000, shared=()):
+        self.fanout = fanout
+        self.key_pool = FakeKeyPool(remaining)
+        self.transport = FakeTransport()
+        # 다른 호출과 응답을 나눠 받아 실제로는 보내지 않는 채널 (SingleFlight)
+        self.shared = set(shared)
+        self.calls = {}
+
+    def _send(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        meter_call(method, quota_cost(method))
+
+    def channel_details(self, channel_ids):
+        for _ in range(math.ceil(len(channel_ids) / CHANNELS_PER_REQUEST)):
+            self._send("channels.list")
+        return {
+            cid: {"snippet": {"title": cid}, "statistics": {"subscriberCount": str(1000 * len(cid))}}
+            for cid in channel_ids
+        }
+
+    def featured_channels(self, channel_id):
+        self._send("channelSections.list")
+        return [f"{channel_id}.{i}" for i in range(self.fanout)]
+
+    def upload_dates(self, channel_id, channel_item, limit):
+        if channel_id not in self.shared:
+            self._send("playlistItems.list")
+        now = datetime.now(timezone.utc)
+        return [(now - timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%SZ") for day in range(0, 20, 2)]
+
+def resolved(*channel_ids, cost: int = 0):
+    """참조 해석에 cost 만큼 쓰는 시드 함수"""
+    def seeds():
+        for _ in range(cost):
+            meter_call("channels.list", 1)
+        return list(channel_ids)
+    return seeds
+
+@pytest.mark.parametrize("budget", [1, 5, 12, 40, 150])
+def test_spending_stays_within_budget(budget):
+    service = FakeService()
+    result = ChannelDiscovery(service, max_depth=5, max_channels=1000).crawl(resolved("UCa", "UCb"), budget=budget)
+
+    assert result["spent"] <= result["reserved"] <= budget
+    assert result["requests"] == service.calls
+    assert result["reserved_requests"] == service.calls
+    assert result["stop_reason"] in ("budget", "frontier_empty")
+
+def test_unbounded_crawl_ends_on_budget():
+    result = ChannelDiscovery(FakeService(), max_depth=10, max_channels=10000).crawl(resolved("UCa"), budget=60)
+    assert result["stop_reason"] == "budget"
+    assert result["candidates"]
+    assert result["spent"] <= result["reserved"] <= 60
+
+def test_seed_resolution_is_charged_to_budget():
+    service = FakeService()
+    result = ChannelDiscovery(service, max_depth=3).crawl(resolved("UCa", cost=9), budget=10)
+
+    assert result["reserved"] <= 10
+    assert result["spent"] == result["reserved"]
+    assert result["requests"]["channels.list"] == 9 + service.calls.get("channels.list", 0)
+    assert result["candidates"] == []
+
+def test_seed_resolution_over_budget_stops_before_scoring():
+    service = FakeService()
+    result = ChannelDiscovery(service).crawl(resolved("UCa", cost=20), budget=10)
+    assert result["stop_reason"] == "budget"
+    assert service.calls == {}
+    assert result["spent"] == result["reserved"] == 20
+
+def test_budget_is_capped_by_remaining_quota():
+    result = ChannelDiscovery(FakeService(remaining=7), max_depth=5).crawl(resolved("UCa"), budget=500)
+    assert result["budget"] == 7
+    assert result["reserved"] <= 7
+
+def test_shared_responses_count_as_reserved_but_not_spent():
+    service = FakeService(fanout=2, shared={"UCa.0", "UCa.1"})
+    result = ChannelDiscovery(service, max_depth=1).crawl(resolved("UCa"), budget=100)
+
+    assert result["stop_reason"] == "frontier_empty"
+    assert result["reserved"] - result["spent"] == 2 * quota_cost("playlistItems.list")
+    assert result["requests"] == service.calls
+
+def test_max_channels_and_depth():
+    result = ChannelDiscovery(FakeService(fanout=5), max_depth=2, max_channels=7).crawl(resolved("UCa"), budget=1000)
+    assert result["stop_reason"] == "max_channels"
+    assert len(result["candidates"]) == 7
+    assert all(1 <= c["depth"] <= 2 for c in result["candidates"])
+    assert [c["rank"] for c in result["candidates"]] == list(range(1, 8))
+
+def test_exclude_keeps_channel_on_the_path():
+    result = ChannelDiscovery(FakeService(fanout=2), max_depth=2).crawl(
+        resolved("UCa"), budget=1000, exclude={"UCa.0"}
+    )
+    ids = {c["channel_id"] for c in result["candidates"]}
+    assert "UCa.0" not in ids
+    assert {"UCa.0.0", "UCa.0.1"} <= ids
+
+def test_missing_seeds_raise_and_release_the_crawler():
+    discovery = ChannelDiscovery(FakeService())
+    with pytest.raises(ValueError):
+        discovery.crawl(resolved(), budget=10)
+    assert not discovery.running
+    assert discovery.crawl(resolved("UCa"), budget=10)["seeds"]
+
+def test_uploads_per_week():
+    now = time.time()
+    stamp = lambda days: datetime.fromtimestamp(now - days * 86400, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    # 표본 전체가 기간 안이면 표본이 걸친 기간 기준
+    assert uploads_per_week([stamp(d) for d in range(7)], sample_size=7, now=now) == pytest.approx(7 / (6 / 7), rel=1e-3)
+    assert uploads_per_week([stamp(1), stamp(40)], sample_size=20, now=now) == pytest.approx(0.25)
+    assert uploads_per_week([stamp(40)], sample_size=20, now=now) == 0.0
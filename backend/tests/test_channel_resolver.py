@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from app.fake_youtube import _digest
+from app.services.channel_resolver import ChannelResolver, parse_channel_ref
+
+CHANNEL = "UC" + "a" * 22
+
+@pytest.mark.parametrize("value, expected", [
+    (CHANNEL, ("id", CHANNEL)),
+    (f"https://www.youtube.com/channel/{CHANNEL}", ("id", CHANNEL)),
+    ("@SomeCreator/", ("handle", "@somecreator")),
+    ("youtube.com/@SomeCreator/videos", ("handle", "@somecreator")),
+    ("SomeCreator", ("handle", "@somecreator")),
+    ("https://www.youtube.com/c/SomeCreator", ("handle", "@somecreator")),
+    ("https://m.youtube.com/user/OldName", ("username", "oldname")),
+    ("https://www.youtube.com/watch?v=abcdefghijk&t=10", ("video", "abcdefghijk")),
+    ("https://youtu.be/abcdefghijk?si=x", ("video", "abcdefghijk")),
+    ("youtube.com/shorts/abcdefghijk", ("video", "abcdefghijk")),
+    ("https://www.youtube.com/watch?v=short", None),
+    ("https://www.youtube.com/channel/UCshort", None),
+    ("https://example.com/@SomeCreator", None),
+    ("https://www.youtube.com/", None),
+    ("  ", None),
+])
+def test_parse_channel_ref(value, expected):
+    assert parse_channel_ref(value) == expected
+
+def test_resolve_looks_up_each_value_once_and_persists(tmp_path):
+    path = tmp_path / "handles.json"
+    lookups = []
+
+    def lookup(kind, values):
+        lookups.append((kind, values))
+        return {value: "UC" + value.strip("@").ljust(22, "x")[:22] for value in values if "missing" not in value}
+
+    resolver = ChannelResolver(path=str(path))
+    refs = [CHANNEL, "@alpha", "https://www.youtube.com/@Alpha", "beta-missing", "https://example.com/x"]
+    resolved = resolver.resolve(refs, lookup)
+
+    # 같은 핸들은 한 번만, 채널 ID 와 해석할 수 없는 URL 은 조회하지 않음
+    assert lookups == [("handle", ["@alpha", "@beta-missing"])]
+    assert resolved[CHANNEL] == CHANNEL
+    assert resolved["@alpha"] == resolved["https://www.youtube.com/@Alpha"] == "UC" + "alpha".ljust(22, "x")
+    assert resolved["beta-missing"] is None and resolved["https://example.com/x"] is None
+    assert resolver.stats() == {"hits": 0, "lookups": 2, "unresolved": 2, "cached": 1}
+
+    # 찾지 못한 참조는 저장하지 않음
+    assert list(json.loads(path.read_text(encoding="utf-8"))) == ["handle:@alpha"]
+
+    # 다른 인스턴스(다음 실행)는 파일에서 읽어 조회 없이 사용, 찾지 못한 참조만 다시 조회
+    lookups.clear()
+    reloaded = ChannelResolver(path=str(path))
+    assert reloaded.resolve(["@alpha", "beta-missing"], lookup)["@alpha"] == resolved["@alpha"]
+    assert lookups == [("handle", ["@beta-missing"])]
+    assert reloaded.stats()["hits"] == 1
+
+def test_failed_lookup_leaves_refs_unresolved():
+    def lookup(kind, values):
+        raise RuntimeError("quota exceeded")
+
+    resolver = ChannelResolver(path="")
+    assert resolver.resolve(["@alpha", "https://youtu.be/abcdefghijk"], lookup) == {
+        "@alpha": None, "https://youtu.be/abcdefghijk": None
+    }
+    assert resolver.stats()["cached"] == 0
+
+def test_service_resolves_handles_and_videos_through_the_api(youtube_service, fake_youtube):
+    video_id = fake_youtube.video_id(7, "seed")
+    refs = ["@Alpha", "https://www.youtube.com/user/beta", f"https://youtu.be/{video_id}", "@someone-missing"]
+    resolved = youtube_service.resolve_channels(refs)
+
+    assert resolved["@Alpha"] == fake_youtube.channel_id(_digest("alpha") % fake_youtube.channels)
+    assert resolved["https://www.youtube.com/user/beta"] == fake_youtube.channel_id(_digest("beta") % fake_youtube.channels)
+    assert resolved[f"https://youtu.be/{video_id}"] == fake_youtube.channel_id(7)
+    assert resolved["@someone-missing"] is None
+    # 핸들/사용자명은 하나씩 channels.list, 영상은 videos.list 한 번 (search.list 미사용)
+    assert fake_youtube.calls == {"channels": 3, "videos": 1}
+
+    # 다시 해석하면 저장된 대응을 재사용하고 찾지 못한 핸들만 다시 조회
+    youtube_service.resolve_channels(refs)
+    assert fake_youtube.calls == {"channels": 4, "videos": 1}
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+from app import cli
+from app.services import youtube_service as youtube_service_module
+from conftest import TEST_KEY
+
+@pytest.fixture
+def fake_env(fake_youtube, monkeypatch):
+    monkeypatch.setenv("YOUTUBE_API_ENDPOINT", fake_youtube.url)
+    monkeypatch.setenv("YOUTUBE_API_KEY", TEST_KEY)
+    monkeypatch.setenv("YOUTUBE_API_KEYS", "")
+    monkeypatch.setattr(youtube_service_module, "_shared_client_factory", None)
+    return fake_youtube
+
+def write_json(path, data):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+SETTINGS = {"analysis_mode": "keyword", "content_type": "both", "min_views": 0, "min_views_per_hour": 0,
+            "max_videos_per_search": 10}
+
+def test_settings_files_accept_objects_and_lists(tmp_path):
+    single = write_json(tmp_path / "one.json", {"search_terms": ["a"]})
+    many = write_json(tmp_path / "many.json", [{"search_terms": ["b"]}, {"search_terms": ["c"]}])
+    jobs = cli._load_settings_files([single, many])
+    assert [name for name, _ in jobs] == ["one", "many_1", "many_2"]
+    assert jobs[2][1] == {"search_terms": ["c"]}
+
+def test_runs_every_job_and_writes_results(fake_env, tmp_path):
+    settings = write_json(tmp_path / "jobs.json", [
+        {**SETTINGS, "search_terms": ["먹방"]},
+        {**SETTINGS, "search_terms": ["여행"]},
+    ])
+    output = tmp_path / "results"
+    assert cli.main([settings, "-o", str(output), "-j", "2"]) == 0
+
+    files = sorted(output.glob("*.json"))
+    assert [f.name.rsplit("_", 2)[0] for f in files] == ["jobs_1", "jobs_2"]
+    payload = json.loads(files[0].read_text(encoding="utf-8"))
+    assert payload["total_videos"] == len(payload["videos"]) > 0
+    assert set(payload["channels"]) >= {v["channel_id"] for v in payload["videos"]}
+
+def test_failed_job_sets_exit_code(fake_env, tmp_path):
+    settings = write_json(tmp_path / "bad.json", [{**SETTINGS, "search_terms": ["먹방"]}, {"analysis_mode": "nope"}])
+    assert cli.main([settings, "-o", str(tmp_path / "out")]) == 1
+    assert len(list((tmp_path / "out").glob("*.json"))) == 1
+
+def test_unreadable_settings_file(tmp_path):
+    assert cli.main([str(tmp_path / "missing.json")]) == 2
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    assert cli.main([str(tmp_path / "broken.json")]) == 2
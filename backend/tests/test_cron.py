@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.services.cron import CronSchedule
+from app.services.settings_profiles import SettingsProfiles
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("*/15 * * * *", utc(2026, 3, 2, 10, 7), utc(2026, 3, 2, 10, 15)),
+    ("*/15 * * * *", utc(2026, 3, 2, 10, 45), utc(2026, 3, 2, 11, 0)),
+    ("30 9 * * *", utc(2026, 3, 2, 9, 30), utc(2026, 3, 3, 9, 30)),
+    # 평일 9시 - 금요일 10시 다음은 월요일
+    ("0 9 * * 1-5", utc(2026, 3, 6, 10, 0), utc(2026, 3, 9, 9, 0)),
+    # 7 도 일요일
+    ("0 0 * * 7", utc(2026, 3, 2, 0, 0), utc(2026, 3, 8, 0, 0)),
+    ("0 0 1 */3 *", utc(2026, 2, 15, 0, 0), utc(2026, 4, 1, 0, 0)),
+    ("@daily", utc(2026, 12, 31, 12, 0), utc(2027, 1, 1, 0, 0)),
+    ("@monthly", utc(2026, 1, 31, 0, 0), utc(2026, 2, 1, 0, 0)),
+])
+def test_next_after(expression, after, expected):
+    assert CronSchedule(expression).next_after(after) == expected
+
+def test_day_and_weekday_match_either():
+    # 13일 또는 금요일 (cron 규칙)
+    cron = CronSchedule("0 0 13 * 5")
+    assert cron.next_after(utc(2026, 3, 1)) == utc(2026, 3, 6)
+    assert cron.next_after(utc(2026, 3, 12, 1)) == utc(2026, 3, 13)
+
+def test_restricted_day_with_any_weekday():
+    # 요일이 * 이면 일만 봄 - 2월 30일은 건너뛰고 다음 30일
+    assert CronSchedule("0 0 30 * *").next_after(utc(2026, 2, 1)) == utc(2026, 3, 30)
+
+def test_timezone():
+    cron = CronSchedule("0 9 * * *", ZoneInfo("Asia/Seoul"))
+    result = cron.next_after(utc(2026, 3, 2, 1, 0))
+    assert result.astimezone(timezone.utc) == utc(2026, 3, 3, 0, 0)
+    assert result.hour == 9
+
+def test_naive_datetime_is_utc():
+    assert CronSchedule("0 * * * *").next_after(datetime(2026, 3, 2, 10, 5)) == utc(2026, 3, 2, 11, 0)
+
+def test_every_is_aligned_to_epoch():
+    cron = CronSchedule("@every 30m")
+    assert cron.next_after(utc(2026, 3, 2, 10, 7, 13)) == utc(2026, 3, 2, 10, 30)
+    assert cron.next_after(utc(2026, 3, 2, 10, 30)) == utc(2026, 3, 2, 11, 0)
+    assert CronSchedule("@every 1d").next_after(utc(2026, 3, 2, 23, 59)) == utc(2026, 3, 3)
+
+@pytest.mark.parametrize("expression", [
+    "* * * *",
+    "60 * * * *",
+    "* 24 * * *",
+    "*/0 * * * *",
+    "5-1 * * * *",
+    "a * * * *",
+    "@every 0m",
+    "@every 5s",
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+def test_expression_without_any_run():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(utc(2026, 1, 1))
+
+def test_profile_skips_missed_runs(tmp_path):
+    profiles = SettingsProfiles(path=str(tmp_path / "profiles.json"), legacy_path=None)
+    profiles.save("hourly", {"analysis_mode": "keyword", "content_type": "both", "search_terms": ["a"]},
+                  schedule="0 * * * *")
+    assert profiles.due(profiles.get("hourly")["next_run"] - 1) == []
+
+    # 세 시간 밀렸어도 한 번만 실행하고 다음 정각으로
+    late = profiles.get("hourly")["next_run"] + 3 * 3600 + 60
+    assert profiles.due(late) == ["hourly"]
+    profiles.mark_run("hourly", "job", late)
+    profile = profiles.get("hourly")
+    assert profile["runs"] == 1
+    assert profile["next_run"] == late - 60 + 3600
+    assert profiles.due(late) == []
+
+def test_profile_rejects_invalid_schedule(tmp_path):
+    profiles = SettingsProfiles(path=str(tmp_path / "profiles.json"), legacy_path=None)
+    with pytest.raises(ValueError):
+        profiles.save("bad", {"analysis_mode": "keyword", "content_type": "both"}, schedule="every hour")
+    assert profiles.get("bad") is None
@@ -0,0 +1,106 @@
+import os
+import time
+
+import pytest
+
+from app.services.export_store import INDEX_FILENAME, ExportStore
+
+def write(store: ExportStore, name: str, size: int, **register):
+    path = store.directory / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return store.register(path, **register)
+
+@pytest.fixture
+def store(tmp_path):
+    return ExportStore(directory=str(tmp_path), max_bytes=300, max_age_days=0, reap_interval=0)
+
+def test_register_tracks_size_and_format(store):
+    entry = write(store, "a.csv", 100, source_job="job1")
+    assert entry["format"] == "csv" and entry["source_job"] == "job1"
+    assert store.stats()["total_bytes"] == 100
+    assert [f["filename"] for f in store.list_by_job("job1")] == ["a.csv"]
+
+    # 같은 이름으로 다시 등록하면 크기를 교체
+    write(store, "a.csv", 50)
+    assert store.stats()["total_bytes"] == 50
+
+def test_lru_eviction_keeps_recently_accessed_and_new_file(store):
+    write(store, "a.csv", 100)
+    write(store, "b.csv", 100)
+    write(store, "c.csv", 100)
+    store._index["a.csv"]["last_accessed"] = time.time() + 10
+    store._index["b.csv"]["last_accessed"] = time.time() - 10
+
+    write(store, "d.csv", 100)
+    assert sorted(store._index) == ["a.csv", "c.csv", "d.csv"]
+    assert not (store.directory / "b.csv").exists()
+    assert store.stats()["total_bytes"] == 300
+
+def test_age_policy_evicts_oldest_created(tmp_path):
+    store = ExportStore(directory=str(tmp_path), max_bytes=200, max_age_days=0, eviction_policy="age", reap_interval=0)
+    write(store, "old.csv", 100)
+    write(store, "new.csv", 100)
+    store._index["old.csv"]["created"] -= 100
+    store.touch("old.csv")
+
+    write(store, "newest.csv", 100)
+    assert sorted(store._index) == ["new.csv", "newest.csv"]
+
+def test_file_larger_than_quota_is_kept(store):
+    write(store, "a.csv", 100)
+    write(store, "big.csv", 500)
+    assert list(store._index) == ["big.csv"]
+
+def test_reap_removes_expired_files(tmp_path):
+    store = ExportStore(directory=str(tmp_path), max_bytes=0, max_age_days=1, reap_interval=0)
+    write(store, "old.csv", 10)
+    write(store, "new.csv", 10)
+    store._index["old.csv"]["created"] = time.time() - 2 * 86400
+
+    assert store.reap() == ["old.csv"]
+    assert list(store._index) == ["new.csv"]
+    assert store.reap() == []
+
+def test_remove_and_touch(store):
+    write(store, "a.csv", 10)
+    assert store.touch("a.csv") == store.directory / "a.csv"
+    assert store.remove("a.csv") is True
+    assert store.remove("a.csv") is False
+    assert store.touch("a.csv") is None
+    assert store.stats()["total_bytes"] == 0
+
+def test_new_file_path_does_not_collide(store):
+    first = store.new_file_path("export", "csv")
+    first.write_text("a")
+    second = store.new_file_path("export", "csv")
+    assert first != second and second.suffix == ".csv"
+
+def test_rebuild_index_restores_metadata_and_skips_hidden_files(tmp_path):
+    store = ExportStore(directory=str(tmp_path), max_bytes=0, max_age_days=0, reap_interval=0)
+    write(store, "a.json", 10, source_job="job1")
+    (tmp_path / "untracked.csv").write_text("abc")
+
+    restored = ExportStore(directory=str(tmp_path), max_bytes=0, max_age_days=0, reap_interval=0)
+    assert restored.rebuild_index() == 2
+    assert restored.get("a.json")["source_job"] == "job1"
+    assert restored.get("untracked.csv")["size"] == 3
+    assert restored.get(INDEX_FILENAME) is None
+
+def test_worker_registrations_are_merged_and_reaped(tmp_path):
+    server = ExportStore(directory=str(tmp_path), max_bytes=150, max_age_days=0, reap_interval=0)
+    worker = ExportStore(directory=str(tmp_path), max_bytes=150, max_age_days=0, reap_interval=0, manage=False)
+    write(server, "server.csv", 100)
+    # 워커는 용량 제한을 적용하지 않고 인덱스 파일에 자기 항목만 더함
+    write(worker, "worker.csv", 100, source_job="job2")
+    assert (tmp_path / "server.csv").exists()
+
+    server.touch("server.csv")
+    server.reap()
+    assert list(server._index) == ["server.csv"]
+    assert not (tmp_path / "worker.csv").exists()
+
+    # 인덱스 파일에 서버 항목이 남아 있음 (워커 저장이 덮어쓰지 않음)
+    saved = ExportStore(directory=str(tmp_path), max_bytes=0, max_age_days=0, reap_interval=0)
+    saved.rebuild_index()
+    assert list(saved._index) == ["server.csv"]
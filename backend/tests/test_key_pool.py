@@ -0,0 +1,125 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services import key_pool as key_pool_module
+from app.services.key_pool import ApiKeyPool, QuotaExhaustedError, _key_id
+
+KEYS = ["key-aaaa-1111", "key-bbbb-2222"]
+
+@pytest.fixture
+def day(monkeypatch):
+    """태평양 시간 날짜를 테스트에서 바꿀 수 있도록"""
+    current = ["2026-03-01"]
+    monkeypatch.setattr(ApiKeyPool, "_pacific_day", lambda self: current[0])
+    return current
+
+def test_acquire_picks_key_with_most_quota_left(day):
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file="")
+    key = pool.acquire(100)
+    pool.record(key, 100)
+    assert pool.acquire(1) != key
+    assert pool.remaining() == 2000 - 100 - 1
+
+def test_exhausted_and_invalid_keys_are_skipped(day):
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file="")
+    pool.mark_exhausted(KEYS[0])
+    assert {pool.acquire() for _ in range(3)} == {KEYS[1]}
+    pool.mark_invalid(KEYS[1])
+    assert len(pool) == 1
+    with pytest.raises(QuotaExhaustedError):
+        pool.acquire()
+
+def test_not_enough_quota_for_cost(day):
+    pool = ApiKeyPool(KEYS[:1], daily_quota=150, usage_file="")
+    pool.record(pool.acquire(100), 100)
+    with pytest.raises(QuotaExhaustedError):
+        pool.acquire(100)
+    assert pool.acquire(1) == KEYS[0]
+
+def test_pacific_day_rollover_resets_usage_but_not_invalid_keys(day):
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file="")
+    pool.record(pool.acquire(100), 100)
+    pool.mark_exhausted(KEYS[1])
+    pool.mark_invalid(KEYS[0])
+
+    day[0] = "2026-03-02"
+    snapshot = {k["key"]: k for k in pool.snapshot()["keys"]}
+    assert pool.snapshot()["day"] == "2026-03-02"
+    assert all(k["used"] == 0 and not k["exhausted"] for k in snapshot.values())
+    assert pool.keys() == [KEYS[1]]
+
+def test_pacific_day_uses_los_angeles_time(monkeypatch):
+    class FixedDatetime:
+        @staticmethod
+        def now(tz):
+            from datetime import datetime, timezone
+            # UTC 3월 2일 05:00 = 태평양 3월 1일 21:00 (PST)
+            return datetime(2026, 3, 2, 5, 0, tzinfo=timezone.utc).astimezone(tz)
+
+    monkeypatch.setattr(key_pool_module, "datetime", FixedDatetime)
+    assert ApiKeyPool([], usage_file="")._pacific_day() == "2026-03-01"
+
+def test_usage_is_restored_for_the_same_day_only(day, tmp_path):
+    path = str(tmp_path / "usage.json")
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file=path)
+    pool.record(pool.acquire(100), 100)
+    pool.mark_exhausted(KEYS[1])
+    pool.mark_invalid("key-cccc-3333")
+
+    saved = json.load(open(path))
+    assert KEYS[0] not in json.dumps(saved)
+    assert saved["usage"][_key_id(KEYS[0])] == 100
+
+    restored = ApiKeyPool(KEYS + ["key-cccc-3333"], daily_quota=1000, usage_file=path)
+    snapshot = restored.snapshot()["keys"]
+    assert [k["used"] for k in snapshot[:2]] == [100, 1000]
+    assert snapshot[1]["exhausted"] and snapshot[2]["invalid"]
+
+    day[0] = "2026-03-02"
+    next_day = ApiKeyPool(KEYS + ["key-cccc-3333"], daily_quota=1000, usage_file=path)
+    assert [k["used"] for k in next_day.snapshot()["keys"]] == [0, 0, 0]
+    assert next_day.keys() == KEYS
+
+def test_run_keys_are_scoped_to_the_context(day):
+    pool = ApiKeyPool(KEYS[:1], daily_quota=1000, usage_file="")
+    with pool.using(["run-key-9999"]):
+        assert pool.keys() == [KEYS[0], "run-key-9999"]
+        with ThreadPoolExecutor(1) as executor:
+            # 구간을 복사하지 않은 다른 스레드에서는 보이지 않음
+            assert executor.submit(pool.keys).result() == [KEYS[0]]
+    assert pool.keys() == [KEYS[0]]
+
+def test_acquire_reserves_cost_until_record_or_release(day):
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file="")
+    first = pool.acquire(600)
+    # 아직 응답을 받지 않았어도 예약한 비용만큼 남은 할당량이 줄어 다른 키를 고름
+    second = pool.acquire(600)
+    assert first != second
+    assert pool.remaining() == 800
+    with pytest.raises(QuotaExhaustedError):
+        pool.acquire(600)
+
+    pool.release(first, 600)
+    pool.record(second, 600)
+    snapshot = {entry["key"]: entry for entry in pool.snapshot()["keys"]}
+    assert sum(entry["reserved"] for entry in snapshot.values()) == 0
+    assert sum(entry["used"] for entry in snapshot.values()) == 600
+    assert pool.remaining() == 1400
+
+def test_concurrent_acquires_never_overbook(day):
+    pool = ApiKeyPool(KEYS, daily_quota=1000, usage_file="")
+
+    def try_acquire(_):
+        try:
+            return pool.acquire(100)
+        except QuotaExhaustedError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        keys = list(executor.map(try_acquire, range(40)))
+    granted = [key for key in keys if key]
+    assert len(granted) == 20
+    assert {key: granted.count(key) for key in KEYS} == {KEYS[0]: 10, KEYS[1]: 10}
+    assert pool.remaining() == 0
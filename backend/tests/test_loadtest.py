@@ -0,0 +1,73 @@
+import json
+import urllib.request
+
+import pytest
+
+from app.fake_youtube import apply_fields, parse_fields
+from app.loadtest import DEFAULT_MIX, LoadStats, compare, parse_mix, percentile, save_baseline, load_baselines
+
+def test_parse_mix():
+    assert parse_mix(None) == DEFAULT_MIX
+    assert parse_mix("status=50, result=30,start") == {"status": 50, "result": 30, "start": 1}
+    with pytest.raises(ValueError):
+        parse_mix("unknown=1")
+
+def test_percentile_nearest_rank():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 100) == 100.0
+    assert percentile([], 99) == 0.0
+
+def test_report_splits_busy_and_idle_and_counts_errors():
+    stats = LoadStats()
+    stats.record("status", 0.010, 200, busy=False)
+    stats.record("status", 0.030, 200, busy=True)
+    stats.record("status", 0.050, 503, busy=True)
+    stats.record("start", 0.100, 0, busy=False)
+
+    report = stats.report(duration=2.0)
+    status = report["routes"]["status"]
+    assert status["count"] == 3 and status["busy"]["count"] == 2 and status["idle"]["count"] == 1
+    assert status["status_codes"] == {"200": 2, "503": 1}
+    assert report["errors"] == 2 and report["requests"] == 4 and report["throughput_rps"] == 2.0
+
+def test_compare_flags_only_meaningful_regressions():
+    baseline = {"throughput_rps": 100, "routes": {"status": {"count": 10, "p95_ms": 10, "p99_ms": 20, "errors": 0}}}
+
+    def report(p95, p99, rps=100, errors=0):
+        return {"throughput_rps": rps,
+                "routes": {"status": {"count": 10, "p95_ms": p95, "p99_ms": p99, "errors": errors}}}
+
+    # 비율은 넘었지만 차이가 최소 기준보다 작으면 무시
+    assert compare(report(14, 24), baseline, tolerance=0.25, min_delta_ms=5) == []
+    assert compare(report(20, 20), baseline, tolerance=0.25, min_delta_ms=5) == ["status p95_ms: 10 → 20"]
+    assert compare(report(10, 20, rps=70, errors=1), baseline, tolerance=0.25, min_delta_ms=5) == [
+        "status errors: 0 → 1", "throughput_rps: 100 → 70"]
+
+def test_baselines_are_saved_per_scenario(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    save_baseline(path, "default", {"requests": 1})
+    save_baseline(path, "heavy", {"requests": 2})
+    assert load_baselines(path) == {"default": {"requests": 1}, "heavy": {"requests": 2}}
+
+def test_field_masks():
+    tree = parse_fields("items(id,snippet(title,channelId)),nextPageToken")
+    assert tree == {"items": {"id": {}, "snippet": {"title": {}, "channelId": {}}}, "nextPageToken": {}}
+    value = {"items": [{"id": "a", "snippet": {"title": "t", "channelId": "c", "tags": ["x"]}, "etag": "e"}],
+             "kind": "k"}
+    assert apply_fields(value, tree) == {"items": [{"id": "a", "snippet": {"title": "t", "channelId": "c"}}]}
+
+def test_fake_youtube_is_deterministic_and_counts_calls(fake_youtube):
+    def get(path):
+        with urllib.request.urlopen(f"{fake_youtube.url}{path}") as response:
+            return json.loads(response.read())
+
+    first = get("/youtube/v3/search?q=먹방&maxResults=5".replace("먹방", "%EB%A8%B9%EB%B0%A9"))
+    again = get("/youtube/v3/search?q=%EB%A8%B9%EB%B0%A9&maxResults=5")
+    assert first == again and len(first["items"]) == 5
+
+    video_id = first["items"][0]["id"]["videoId"]
+    video = get(f"/youtube/v3/videos?id={video_id}&fields=items(id,statistics/viewCount)")["items"][0]
+    assert set(video) == {"id", "statistics"} and set(video["statistics"]) == {"viewCount"}
+    assert fake_youtube.calls["search"] == 2 and fake_youtube.calls["videos"] == 1
@@ -0,0 +1,34 @@
+import asyncio
+
+from app.models.analysis_models import AnalysisSettings
+
+def settings(**overrides) -> AnalysisSettings:
+    data = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "min_views": 0,
+            "min_views_per_hour": 0, "max_videos_per_search": 9}
+    data.update(overrides)
+    return AnalysisSettings(**data)
+
+def test_search_regions_normalizes_codes():
+    assert settings(region_codes=["us", " KR ", "US", ""]).search_regions() == ["US", "KR"]
+    assert settings(region_code="JP").search_regions() == ["JP"]
+
+def test_keywords_fan_out_per_region_and_share_detail_fetches(youtube_service, fake_youtube):
+    videos, channels = asyncio.run(youtube_service.collect_data(
+        settings(search_terms=["먹방"], region_codes=["KR", "US", "JP"])))
+
+    # 지역마다 search.list, 상세/채널은 합집합으로 한 번씩
+    assert fake_youtube.calls["search"] == 3
+    assert fake_youtube.calls["videos"] == 1 and fake_youtube.calls["channels"] == 1
+
+    # 가짜 서버는 검색 결과 3개 중 1개가 지역별로 다름: 공통 6개 + 지역별 3개씩
+    assert len(videos) == 15
+    memberships = [tuple(regions) for regions in videos.regions]
+    assert memberships.count(("KR", "US", "JP")) == 6
+    assert sorted(m for m in memberships if len(m) == 1) == [("JP",)] * 3 + [("KR",)] * 3 + [("US",)] * 3
+
+def test_trending_fans_out_per_region(youtube_service, fake_youtube):
+    videos, _ = asyncio.run(youtube_service.collect_data(settings(region_codes=["KR", "US"])))
+
+    assert fake_youtube.calls["videos"] == 2 and "search" not in fake_youtube.calls
+    assert all(regions for regions in videos.regions)
+    assert {region for regions in videos.regions for region in regions} == {"KR", "US"}
@@ -0,0 +1,51 @@
+import asyncio
+import time
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.video_decoder import VideoColumns
+
+NOW = time.time()
+
+def item(video_id, views, duration="PT5M", hours_ago=10):
+    published = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(NOW - hours_ago * 3600))
+    return {
+        "id": video_id,
+        "snippet": {"publishedAt": published, "channelId": f"UC{video_id}", "title": video_id,
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}},
+        "contentDetails": {"duration": duration},
+        "statistics": {"viewCount": str(views)}
+    }
+
+def settings(**overrides) -> AnalysisSettings:
+    data = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "min_views": 0, "min_views_per_hour": 0}
+    data.update(overrides)
+    return AnalysisSettings(**data)
+
+def test_decode_skips_malformed_items():
+    broken = item("b", 1)
+    del broken["statistics"]
+    columns = VideoColumns.decode([item("a", 10), broken, {"id": "c"}])
+    assert columns.video_ids == ["a"]
+
+def test_filter_indices():
+    columns = VideoColumns.decode([
+        item("short", 5000, "PT45S"),
+        item("long", 5000, "PT10M"),
+        item("few-views", 50, "PT10M"),
+        item("slow", 5000, "PT10M", hours_ago=1000),
+    ])
+    assert columns.filter_indices(settings(), NOW) == [0, 1, 2, 3]
+    assert columns.filter_indices(settings(content_type="shorts"), NOW) == [0]
+    assert columns.filter_indices(settings(content_type="long_form"), NOW) == [1, 2, 3]
+    assert columns.filter_indices(settings(min_views=1000, min_views_per_hour=100), NOW) == [0, 1]
+
+def test_duplicate_candidates_are_fetched_once(youtube_service, fake_youtube):
+    # 같은 검색어가 두 번 있어도 영상 상세 정보는 id 합집합으로 한 번
+    videos, _ = asyncio.run(youtube_service.collect_data(settings(search_terms=["먹방", "먹방"], max_videos_per_search=40)))
+    assert len(videos) == len(set(videos.video_ids)) == 40
+    assert fake_youtube.calls["videos"] == 1
+
+def test_filtered_out_videos_skip_channel_lookups(youtube_service, fake_youtube):
+    videos, channels = asyncio.run(youtube_service.collect_data(settings(search_terms=["먹방"], min_views=10 ** 9)))
+    assert len(videos) == 0 and channels == {}
+    assert "channels" not in fake_youtube.calls
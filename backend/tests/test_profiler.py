@@ -0,0 +1,75 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.analysis_runner import AnalysisRunner
+from app.services.export_store import ExportStore
+from app.services.profiler import SamplingProfiler, job_call
+from app.services.run_cache import RunCache, settings_fingerprint
+from app.services.state_store import MemoryStateStore
+
+def busy_job_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+def busy_other_work(stop):
+    while not stop.is_set():
+        pass
+
+def sampled_functions(profiler):
+    return {frame.split(" ")[0] for key in profiler._counts for frame in key[2:]}
+
+def test_only_job_threads_are_sampled():
+    profiler = SamplingProfiler(interval_ms=1, top_n=5)
+    stop = threading.Event()
+    other = threading.Thread(target=busy_other_work, args=(stop,), name="other-request")
+    other.start()
+    try:
+        profiler.start()
+        with profiler.stage("collect"):
+            # asyncio.to_thread 처럼 현재 컨텍스트를 복사해서 작업 스레드 실행
+            context = contextvars.copy_context()
+            worker = threading.Thread(target=context.run, args=(job_call, busy_job_work, 0.1), name="worker_0")
+            worker.start()
+            worker.join()
+        profiler.stop()
+    finally:
+        stop.set()
+        other.join()
+
+    functions = sampled_functions(profiler)
+    assert "busy_job_work" in functions
+    assert "busy_other_work" not in functions
+    assert {key[0] for key in profiler._counts} == {"collect"}
+
+    # 스레드 풀 번호는 folded 출력에서 합쳐짐
+    lines = profiler.folded().splitlines()
+    assert lines and all(line.startswith("collect;worker;") for line in lines)
+    summary = profiler.summary()
+    assert summary["samples"] > 0 and summary["stages"]["collect"] >= 0.1
+    assert summary["top"]["self"][0]["function"].startswith("busy_job_work")
+
+def test_job_call_outside_a_profile_runs_directly():
+    assert job_call(lambda a, b=0: a + b, 1, b=2) == 3
+
+def test_profiled_run_registers_artifacts_and_skips_run_cache(youtube_service, tmp_path):
+    store = MemoryStateStore()
+    run_cache = RunCache(store, ttl=600)
+    runner = AnalysisRunner(store, youtube_service, run_cache=run_cache)
+    runner.artifact_store = ExportStore(directory=str(tmp_path), reap_interval=0)
+    settings = AnalysisSettings(api_key="", analysis_mode="keyword", content_type="both",
+                                search_terms=["먹방"], max_results=5, profile=True)
+
+    payload = asyncio.run(runner.execute("job-1", settings))
+    profile = payload["profile"]
+    assert set(profile["stages"]) >= {"collect", "analyze"}
+    assert {entry["format"] for entry in runner.artifact_store.list_by_job("job-1")} == {"folded", "profile"}
+    assert set(profile["artifacts"]) == {"folded", "stats"}
+
+    store.try_start({"job_id": "job-1", "is_running": True})
+    asyncio.run(runner.run("job-1", settings))
+    assert store.get_result()["job_id"] == "job-1"
+    assert run_cache.get(settings_fingerprint(settings)) is None
@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.services.result_store import CompactVideoTable, ResultRetention
+
+BASE = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+def video(i, channel_id="UCa", **extra):
+    return {
+        "video_id": f"v{i}",
+        "title": f"제목 {i}",
+        "channel_id": channel_id,
+        "upload_date": BASE + timedelta(hours=i),
+        "views": 1000 * i,
+        "views_per_hour": 10.5 * i,
+        "views_to_subscribers_ratio": 0.5,
+        "duration": 60 + i,
+        "thumbnail_url": f"https://i.ytimg.com/vi/v{i}/hqdefault.jpg",
+        "is_shorts": i % 2 == 0,
+        "breakout_score": 1.25,
+        "baseline_views": 400,
+        "regions": ["KR", "US"] if i % 2 else [],
+        **extra
+    }
+
+def payload(count, channel_id="UCa"):
+    return {
+        "total_videos": count,
+        "videos": [video(i, channel_id) for i in range(1, count + 1)],
+        "channels": {channel_id: {"channel_name": "채널", "subscribers": 2000}}
+    }
+
+def test_compact_table_round_trips_rows():
+    rows = [video(1), video(2, channel_id="UCb")]
+    table = CompactVideoTable.from_rows(rows)
+
+    restored = [table.row(i) for i in range(len(table))]
+    for original, row in zip(rows, restored):
+        assert row == {**original, "video_url": f"https://www.youtube.com/watch?v={original['video_id']}"}
+    # 채널 ID 는 사전 인코딩
+    assert table.dictionaries["channel_id"] == ["UCa", "UCb"]
+    assert list(table.column("channel_id")) == [0, 1]
+
+def test_compact_table_accepts_iso_strings_and_missing_values():
+    table = CompactVideoTable.from_rows([{"video_id": "v1", "upload_date": "2026-03-01T00:00:00Z"}])
+    row = table.row(0)
+    assert row["upload_date"] == BASE
+    assert row["views"] == 0 and row["title"] == "" and row["regions"] == []
+
+def test_spilled_table_reads_same_rows(tmp_path):
+    table = CompactVideoTable.from_rows(payload(5)["videos"])
+    spilled = table.spill(tmp_path / "r1")
+    try:
+        assert spilled.spilled and spilled.nbytes() == 0
+        assert len(spilled) == 5
+        assert [spilled.row(i) for i in range(5)] == [table.row(i) for i in range(5)]
+    finally:
+        spilled.close()
+
+def test_retention_spills_least_recently_used_over_budget(tmp_path):
+    retention = ResultRetention(budget_bytes=1, spill_dir=str(tmp_path))
+    retention.put("old", payload(3))
+    retention.put("mid", payload(3))
+    retention.get("old")  # old 를 최근 사용으로
+    retention.put("new", payload(3))
+
+    spilled = {result_id for result_id, (_, table) in retention._entries.items() if table.spilled}
+    # 가장 최근 결과는 예산을 넘어도 메모리에 유지
+    assert spilled == {"old", "mid"}
+    assert retention.memory_usage()["spilled"] == 2
+    assert (retention.spill_dir / "mid" / "meta.json").exists()
+
+    # 내보낸 결과도 그대로 조회
+    assert retention.get("mid")["videos"] == retention.get("new")["videos"]
+    assert retention.get("mid")["total_videos"] == 3
+
+def test_retention_keeps_everything_in_memory_within_budget(tmp_path):
+    retention = ResultRetention(budget_bytes=10 * 1024 * 1024, spill_dir=str(tmp_path))
+    retention.put("a", payload(3))
+    retention.put("b", payload(3))
+    usage = retention.memory_usage()
+    assert usage["results"] == 2 and usage["spilled"] == 0 and usage["in_memory_bytes"] > 0
+
+def test_remove_and_replace_delete_spill_files(tmp_path):
+    retention = ResultRetention(budget_bytes=1, spill_dir=str(tmp_path))
+    retention.put("a", payload(2))
+    retention.put("b", payload(2))
+    assert (retention.spill_dir / "a").exists()
+
+    retention.put("a", payload(1))
+    assert not (retention.spill_dir / "a").exists()
+    assert len(retention.get("a")["videos"]) == 1
+
+    retention.put("c", payload(2))
+    retention.remove("b")
+    assert not retention.has("b")
+    assert not (retention.spill_dir / "b").exists()
+
+def test_page_filters_sorts_and_limits_channels(tmp_path):
+    retention = ResultRetention(spill_dir=str(tmp_path))
+    data = payload(4)
+    data["videos"].append(video(5, channel_id="UCb"))
+    data["channels"]["UCb"] = {"channel_name": "가나다", "subscribers": 10}
+    retention.put("r", data)
+
+    page = retention.page("r", offset=0, limit=2, sort_by="views", min_views=2000)
+    assert page["total"] == 4
+    assert [v["video_id"] for v in page["videos"]] == ["v5", "v4"]
+    assert set(page["channels"]) == {"UCa", "UCb"}
+
+    page = retention.page("r", sort_by="subscribers", descending=False, limit=1)
+    assert [v["video_id"] for v in page["videos"]] == ["v5"]
+    assert page["channels"] == {"UCb": data["channels"]["UCb"]}
+
+    page = retention.page("r", matches={"v2": 0.1, "v3": 0.9})
+    assert [v["video_id"] for v in page["videos"]] == ["v3", "v2"]
+
+    with pytest.raises(ValueError):
+        retention.page("r", sort_by="nope")
+    assert retention.page("missing") is None
@@ -0,0 +1,62 @@
+import gzip
+import json
+
+import pytest
+
+from app.services.result_versions import ResultVersion, ResultVersionCache, etag_matches
+
+def result(views, channels=None):
+    return {
+        "job_id": "job",
+        "analysis_date": "2026-03-01T09:00:00+09:00",
+        "total_videos": len(views),
+        "videos": [{"video_id": video_id, "channel_id": "UC" + video_id, "views": count}
+                   for video_id, count in views.items()],
+        "channels": channels or {"UC" + video_id: {"channel_name": video_id} for video_id in views}
+    }
+
+@pytest.mark.parametrize("header, expected", [
+    ('"v1"', True),
+    ('W/"v1"', True),
+    ('"v0", W/"v1"', True),
+    ('"v0","v2"', False),
+    ('*', True),
+    (' * ', True),
+    ('"v1,x"', False),
+    ('v1', False),
+    ('', False),
+    (None, False),
+])
+def test_etag_matches_uses_weak_comparison(header, expected):
+    assert etag_matches(header, '"v1"') is expected
+
+def test_version_body_gzip_and_headers():
+    entry = ResultVersion("v1", result({"a": 1, "b": 2}))
+    body = json.loads(entry.body)
+    assert body["version"] == "v1" and body["total_videos"] == 2
+    assert [v["video_id"] for v in body["videos"]] == ["a", "b"]
+    assert gzip.decompress(entry.gzipped) == entry.body
+    assert entry.etag == '"v1"'
+    assert entry.last_modified == "Sun, 01 Mar 2026 00:00:00 GMT"
+
+def test_delta_since_lists_changed_added_and_removed_rows():
+    old = ResultVersion("v1", result({"a": 1, "b": 2, "c": 3}))
+    new = ResultVersion("v2", result({"a": 1, "b": 20, "d": 4}))
+
+    delta = new.delta_since(old)
+    assert (delta["version"], delta["since"], delta["delta"]) == ("v2", "v1", True)
+    assert [v["video_id"] for v in delta["videos"]] == ["b", "d"]
+    assert delta["removed_video_ids"] == ["c"]
+    # 바뀐 행이 참조하는 채널만 포함
+    assert set(delta["channels"]) == {"UCb", "UCd"}
+
+def test_cache_builds_each_version_once_and_keeps_recent(monkeypatch):
+    cache = ResultVersionCache(max_versions=2)
+    first = cache.build("v1", result({"a": 1}))
+    assert cache.build("v1", result({"a": 999})) is first
+
+    cache.build("v2", result({"a": 2}))
+    cache.get("v1")  # v1 을 최근 사용으로
+    cache.build("v3", result({"a": 3}))
+    assert cache.get("v2") is None
+    assert cache.get("v1") is first and cache.get("v3") is not None
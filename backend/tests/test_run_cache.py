@@ -0,0 +1,56 @@
+import pytest
+
+from app.models.analysis_models import AnalysisSettings
+from app.services.run_cache import RunCache, settings_fingerprint
+from app.services.state_store import MemoryStateStore
+
+def settings(**overrides) -> AnalysisSettings:
+    data = {"api_key": "key-1", "analysis_mode": "keyword", "content_type": "both", "search_terms": ["a", "b"]}
+    data.update(overrides)
+    return AnalysisSettings(**data)
+
+def test_fingerprint_ignores_keys_profile_and_list_order():
+    base = settings_fingerprint(settings())
+    assert settings_fingerprint(settings(api_key="other", api_keys=["x"])) == base
+    assert settings_fingerprint(settings(profile=True)) == base
+    assert settings_fingerprint(settings(search_terms=["b", "a", "a"])) == base
+    assert settings_fingerprint(settings(channel_ids=["UC2", "UC1"])) == settings_fingerprint(settings(channel_ids=["UC1", "UC2"]))
+
+def test_fingerprint_normalizes_regions():
+    assert settings_fingerprint(settings(region_codes=["us", "KR", " US "])) == \
+        settings_fingerprint(settings(region_codes=["KR", "US"]))
+
+@pytest.mark.parametrize("change", [
+    {"search_terms": ["a"]},
+    {"min_views": 0},
+    {"days_back": 3},
+    {"content_type": "shorts"},
+    {"region_code": "US"},
+    {"region_codes": ["KR", "JP"]},
+    {"score_breakouts": True},
+])
+def test_fingerprint_changes_with_analysis_inputs(change):
+    assert settings_fingerprint(settings(**change)) != settings_fingerprint(settings())
+
+def test_cache_returns_results_within_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.run_cache.time.time", lambda: clock[0])
+    store = MemoryStateStore()
+    cache = RunCache(store, ttl=60, max_entries=5)
+    key = settings_fingerprint(settings())
+
+    assert cache.get(key) is None
+    cache.put(key, {"job_id": "A", "videos": [], "channels": {}})
+    stored_at = store.get_cached_run(key)[0]
+
+    clock[0] = stored_at + 30
+    assert cache.get(key)["job_id"] == "A"
+    clock[0] = stored_at + 61
+    assert cache.get(key) is None
+
+def test_disabled_cache_stores_nothing():
+    store = MemoryStateStore()
+    cache = RunCache(store, ttl=0)
+    cache.put("key", {"job_id": "A"})
+    assert store.get_cached_run("key") is None
+    assert cache.get("key") is None
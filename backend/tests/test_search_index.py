@@ -0,0 +1,70 @@
+from app.services.search_index import VideoSearchIndex, grams, normalize
+
+def result(*videos, channels=None):
+    return {
+        "videos": [{"video_id": video_id, "title": title, "channel_id": channel_id}
+                   for video_id, title, channel_id in videos],
+        "channels": channels or {}
+    }
+
+def ids(matches):
+    return [video_id for video_id, _ in matches]
+
+def test_normalize_and_grams():
+    assert normalize("Ｈｅｌｌｏ, 먹방 Vlog!") == "hello먹방vlog"
+    assert grams("먹방여행") == ["먹방", "방여", "여행"]
+    assert grams("a") == ["a"] and grams("") == []
+
+def test_search_ignores_spacing_and_ranks_title_matches():
+    index = VideoSearchIndex()
+    index.add("v1", "제주도 여행 브이로그", "여행채널")
+    index.add("v2", "서울 맛집", "제주여행가")
+    index.add("v3", "여행 준비물 제주도편", "")
+
+    # 띄어쓰기가 달라도 일치
+    assert ids(index.search("제주 도여행")) == ["v1"]
+    # 제목 일치 > 채널명 일치, 앞쪽 일치가 더 높음
+    assert ids(index.search("여행")) == ["v3", "v1", "v2"]
+    # 모든 검색어가 있어야 함
+    assert ids(index.search("제주 맛집")) == ["v2"]
+    assert index.search("없는말") == [] and index.search("  ") == []
+    assert ids(index.search("여", limit=1)) == ["v3"]
+
+def test_changed_title_is_reindexed():
+    index = VideoSearchIndex()
+    assert index.add("v1", "먹방 라이브")
+    assert not index.add("v1", "먹방  라이브!")  # 정규화 결과가 같으면 건너뜀
+    assert index.add("v1", "캠핑 라이브")
+
+    assert index.search("먹방") == []
+    assert ids(index.search("캠핑")) == ["v1"]
+    assert index.stats()["dead_documents"] == 1 and len(index) == 1
+
+def test_compaction_drops_dead_documents():
+    index = VideoSearchIndex()
+    for i in range(1200):
+        index.add("v1", f"제목 {i}")
+    stats = index.stats()
+    assert stats["dead_documents"] <= 1000 and len(index._docs) - stats["dead_documents"] == 1
+    assert ids(index.search("제목 1199")) == ["v1"]
+
+def test_ingest_uses_channel_table_and_runs_once_per_version():
+    index = VideoSearchIndex()
+    data = result(("v1", "오늘의 요리", "UCa"), channels={"UCa": {"channel_name": "백종원"}})
+
+    assert index.ingest(data, "job-1") == 1
+    assert index.ingest(data, "job-1") == 0
+    assert index.has_version("job-1")
+    assert ids(index.search("백종원 요리")) == ["v1"]
+    assert index.row("v1")["channel_name"] == "백종원"
+    assert index.matching_ids("요리") == dict(index.search("요리"))
+
+def test_videos_missing_from_recent_versions_are_evicted():
+    index = VideoSearchIndex(max_versions=2)
+    index.ingest(result(("old", "오래된 영상", "UCa"), ("kept", "계속 나오는 영상", "UCa")), "v1")
+    index.ingest(result(("kept", "계속 나오는 영상", "UCa")), "v2")
+    index.ingest(result(("kept", "계속 나오는 영상", "UCa"), ("new", "새 영상", "UCa")), "v3")
+
+    assert not index.has_version("v1")
+    assert sorted(ids(index.search("영상"))) == ["kept", "new"]
+    assert index.row("old") is None and len(index) == 2
@@ -0,0 +1,38 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import settings
+from app.services.settings_profiles import DEFAULT_PROFILE, SettingsProfiles
+
+VALID = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "search_terms": ["먹방"]}
+
+@pytest.fixture
+def profiles(monkeypatch, tmp_path):
+    profiles = SettingsProfiles(path=str(tmp_path / "profiles.json"), legacy_path=None,
+                                defaults=settings._get_default_settings)
+    monkeypatch.setattr(settings, "profiles", profiles)
+    return profiles
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(settings.router, prefix="/api/settings")
+    return TestClient(app)
+
+def test_save_keeps_the_default_schedule(profiles, client):
+    profiles.save(DEFAULT_PROFILE, VALID, "@hourly")
+    response = client.post("/api/settings/", json={**VALID, "search_terms": ["여행"]})
+
+    assert response.status_code == 200
+    profile = profiles.get(DEFAULT_PROFILE)
+    assert profile["schedule"] == "@hourly" and profile["settings"]["search_terms"] == ["여행"]
+
+def test_unschedulable_settings_are_rejected_with_400(profiles, client):
+    # 예약 실행 중인 default 프로파일에 분석할 수 없는 설정을 저장하면 400 (저장하지 않음)
+    profiles.save(DEFAULT_PROFILE, VALID, "@hourly")
+    response = client.post("/api/settings/", json={**VALID, "content_type": "unknown"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("예약 실행할 수 없는 설정입니다")
+    assert profiles.get(DEFAULT_PROFILE)["settings"] == VALID
@@ -0,0 +1,97 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+class Counter:
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            value = self.calls
+        time.sleep(self.delay)
+        return value
+
+def test_concurrent_calls_share_one_request():
+    flight = SingleFlight()
+    fetch = Counter(delay=0.1)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: flight.do("key", fetch), range(8)))
+    assert fetch.calls == 1
+    assert results == [1] * 8
+
+def test_results_are_not_kept_outside_retaining():
+    flight = SingleFlight()
+    fetch = Counter()
+    assert flight.do("key", fetch) == 1
+    assert flight.do("key", fetch) == 2
+
+def test_retaining_reuses_finished_results():
+    flight = SingleFlight()
+    fetch = Counter()
+    with flight.retaining(60):
+        assert flight.do("key", fetch) == 1
+        assert flight.do("key", fetch) == 1
+        assert flight.do("other", fetch) == 2
+    # 구간 밖에서는 보관된 결과를 읽지 않음
+    assert flight.do("key", fetch) == 3
+
+def test_retained_results_expire():
+    flight = SingleFlight()
+    fetch = Counter()
+    with flight.retaining(0.05):
+        assert flight.do("key", fetch) == 1
+        time.sleep(0.1)
+        assert flight.do("key", fetch) == 2
+    # 구간이 끝나면 만료된 결과는 정리됨
+    time.sleep(0.1)
+    with flight.retaining(60):
+        pass
+    assert flight._recent == {}
+
+def test_retaining_applies_only_to_its_context():
+    flight = SingleFlight()
+    fetch = Counter()
+    with flight.retaining(60):
+        flight.do("key", fetch)
+        # 구간을 넘겨받은 스레드는 보관된 결과를 씀
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(1) as pool:
+            assert pool.submit(context.run, flight.do, "key", fetch).result() == 1
+            # 동시에 도는 다른 요청 (구간 밖) 은 새로 요청
+            assert pool.submit(flight.do, "key", fetch).result() == 2
+
+def test_errors_are_not_retained():
+    flight = SingleFlight()
+    attempts = []
+
+    def failing():
+        attempts.append(1)
+        raise RuntimeError("boom")
+
+    with flight.retaining(60):
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                flight.do("key", failing)
+    assert len(attempts) == 2
+
+def test_do_many_fetches_only_missing_keys():
+    flight = SingleFlight()
+    batches = []
+
+    def fetch(keys):
+        batches.append(list(keys))
+        return {key: key.upper() for key in keys if key != "missing"}
+
+    with flight.retaining(60):
+        assert flight.do_many(["a", "b"], fetch) == {"a": "A", "b": "B"}
+        assert flight.do_many(["b", "c", "missing"], fetch) == {"b": "B", "c": "C", "missing": None}
+    assert batches == [["a", "b"], ["c", "missing"]]
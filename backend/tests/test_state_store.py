@@ -0,0 +1,89 @@
+import pytest
+
+from app.services.state_store import MemoryStateStore, SQLiteStateStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateStore()
+    return SQLiteStateStore(str(tmp_path / "state.db"))
+
+def result(job_id, *views):
+    return {
+        "job_id": job_id,
+        "videos": [{"video_id": f"{job_id}-{i}", "channel_id": "UC1", "views": v} for i, v in enumerate(views)],
+        "channels": {"UC1": {"channel_name": "채널", "subscribers": 10}}
+    }
+
+def start(store, job_id, **status):
+    return store.try_start({"job_id": job_id, "is_running": True, **status})
+
+def test_only_one_job_runs_at_a_time(store):
+    assert start(store, "A")
+    assert not start(store, "B")
+    assert store.update_status("A", is_running=False)
+    assert start(store, "B")
+    assert store.get_status()["job_id"] == "B"
+
+def test_writes_from_a_replaced_job_are_rejected(store):
+    start(store, "A")
+    # A 를 중단하고 B 를 시작
+    assert store.update_status(is_running=False, error="cancelled")
+    start(store, "B", current_task="B")
+
+    assert not store.update_status("A", progress=90, current_task="A")
+    assert not store.set_result(result("A", 1), "A")
+    assert store.get_status()["current_task"] == "B"
+    assert store.get_result() is None
+
+    assert store.set_result(result("B", 5), "B")
+    assert store.update_status("B", is_running=False, progress=100)
+    assert store.get_result_version() == "B"
+
+def test_finished_job_cannot_write_again(store):
+    start(store, "A")
+    store.update_status("A", is_running=False)
+    assert not store.update_status("A", progress=1)
+    assert not store.set_result(result("A", 1), "A")
+
+def test_unscoped_writes_always_apply(store):
+    start(store, "A")
+    assert store.update_status(current_task="x")
+    assert store.set_result(result("Z", 1))
+    assert store.get_result_version() == "Z"
+
+def test_try_start_clears_current_result_unless_asked(store):
+    store.set_result(result("A", 1))
+    assert store.try_start({"job_id": "B"}, clear_result=False)
+    assert store.get_result_version() == "A"
+    assert store.try_start({"job_id": "C"})
+    assert store.get_result() is None
+
+def test_slot_results_leave_current_result_alone(store):
+    store.set_result(result("A", 1))
+    assert store.try_start({"job_id": "W", "is_running": True}, clear_result=False)
+    assert store.set_result(result("W", 2), "W", slot="watchlist")
+    assert store.get_result_version() == "A"
+    assert store.get_result("watchlist")["job_id"] == "W"
+
+def test_result_page_sorts_and_filters(store):
+    store.set_result(result("A", 5, 50, 20))
+    page = store.get_result_page(offset=0, limit=2, sort_by="views", min_views=10)
+    assert page["total"] == 2
+    assert [v["views"] for v in page["videos"]] == [50, 20]
+    assert set(page["channels"]) == {"UC1"}
+
+def test_cached_runs_keep_newest_entries(store):
+    for i in range(3):
+        store.put_cached_run(f"key{i}", result(f"R{i}", i), max_entries=2)
+    assert store.get_cached_run("key0") is None
+    assert store.get_cached_run("key2")[1]["job_id"] == "R2"
+
+def test_job_queue(store):
+    store.enqueue_job("A", {"analysis_mode": "keyword"})
+    store.enqueue_job("B", {"analysis_mode": "channel"}, slot="watchlist")
+    assert store.cancel_job("A")
+    assert not store.cancel_job("A")
+    job_id, settings, slot = store.claim_job()
+    assert (job_id, settings["analysis_mode"], slot) == ("B", "channel", "watchlist")
+    assert store.claim_job() is None
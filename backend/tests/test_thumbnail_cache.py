@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app.services import thumbnail_cache
+from app.services.thumbnail_cache import ThumbnailCache
+
+class Upstream:
+    """video_id 별로 정해진 바이트를 돌려주는 가짜 원본 서버"""
+
+    def __init__(self, images):
+        self.images = images
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, video_id):
+        with self.lock:
+            self.calls.append(video_id)
+        time.sleep(0.01)
+        return self.images[video_id]
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    def make(images, max_bytes=1000):
+        cache = ThumbnailCache(cache_dir=str(tmp_path), max_bytes=max_bytes)
+        upstream = Upstream(images)
+        monkeypatch.setattr(cache, "_download", upstream)
+        return cache, upstream
+    return make
+
+def test_original_is_downloaded_once_and_stored_by_content_hash(make_cache, tmp_path):
+    cache, upstream = make_cache({"video_aaa": b"A" * 100, "video_bbb": b"A" * 100})
+
+    data, media_type, digest = cache.get("video_aaa", "original")
+    assert data == b"A" * 100 and media_type == "image/jpeg"
+    assert cache.get("video_aaa", "original")[2] == digest
+    assert upstream.calls == ["video_aaa"]
+
+    # 같은 내용은 파일 하나를 공유
+    assert cache.get("video_bbb", "original")[2] == digest
+    assert cache.stats()["files"] == 1 and cache.stats()["keys"] == 2
+    assert (tmp_path / digest).read_bytes() == data
+
+def test_concurrent_misses_share_one_download(make_cache):
+    cache, upstream = make_cache({"video_aaa": b"A" * 10})
+    threads = [threading.Thread(target=cache.get, args=("video_aaa", "original")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert upstream.calls == ["video_aaa"]
+
+def test_lru_quota_evicts_least_recently_used(make_cache):
+    cache, _ = make_cache({"video_aaa": b"A" * 400, "video_bbb": b"B" * 400, "video_ccc": b"C" * 400})
+    cache.get("video_aaa", "original")
+    cache.get("video_bbb", "original")
+    cache._files[cache._keys["video_aaa:original"]]["last_accessed"] = time.time() + 10
+
+    cache.get("video_ccc", "original")
+    assert sorted(cache._keys) == ["video_aaa:original", "video_ccc:original"]
+    assert cache.stats()["total_bytes"] == 800
+
+def test_rebuild_index_restores_keys_and_drops_missing_files(make_cache, tmp_path):
+    cache, _ = make_cache({"video_aaa": b"A" * 10, "video_bbb": b"B" * 10})
+    cache.get("video_aaa", "original")
+    _, _, missing = cache.get("video_bbb", "original")
+    (tmp_path / missing).unlink()
+
+    restored = ThumbnailCache(cache_dir=str(tmp_path), max_bytes=1000)
+    assert restored.rebuild_index() == 1
+    assert list(restored._keys) == ["video_aaa:original"]
+    assert restored.get("video_aaa", "original")[0] == b"A" * 10
+
+def test_resized_variant_is_derived_from_cached_original(make_cache, monkeypatch):
+    cache, upstream = make_cache({"video_aaa": b"A" * 10})
+    monkeypatch.setattr(cache, "_resize", lambda data, spec: (data[:spec[0] // 40], "image/jpeg"))
+
+    row, _, _ = cache.get("video_aaa", "row")
+    medium, _, _ = cache.get("video_aaa", "medium")
+    assert row == b"AAAA" and medium == b"AAAAAAAA"
+    assert upstream.calls == ["video_aaa"]
+
+@pytest.mark.skipif(thumbnail_cache.Image is None, reason="Pillow 없음")
+def test_resize_fits_variant_box(make_cache):
+    import io
+    from PIL import Image
+
+    source = io.BytesIO()
+    Image.new("RGB", (480, 360), "red").save(source, format="JPEG")
+    cache, _ = make_cache({"video_aaa": source.getvalue()}, max_bytes=10 ** 6)
+
+    data, _, _ = cache.get("video_aaa", "row")
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == (120, 90)
+
+@pytest.mark.parametrize("video_id, variant", [("../etc", "row"), ("video_aaa", "huge")])
+def test_invalid_requests_are_rejected(make_cache, video_id, variant):
+    cache, upstream = make_cache({})
+    with pytest.raises(ValueError):
+        cache.get(video_id, variant)
+    assert upstream.calls == []
+
+def test_prefetch_from_another_process_is_visible(make_cache, tmp_path):
+    worker, _ = make_cache({"video_aaa": b"A" * 10})
+    api = ThumbnailCache(cache_dir=str(tmp_path), max_bytes=1000)
+    api.rebuild_index()
+
+    worker.get("video_aaa", "original")
+    index = tmp_path / thumbnail_cache.INDEX_FILENAME
+    stat = index.stat()
+    os.utime(index, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    data, _, _ = api.get("video_aaa", "original")
+    assert data == b"A" * 10
+
+    # API 서버가 인덱스를 저장해도 워커 항목이 남음
+    api._store("video_bbb:original", b"B" * 10, "image/jpeg")
+    restored = ThumbnailCache(cache_dir=str(tmp_path), max_bytes=1000)
+    restored.rebuild_index()
+    assert set(restored._keys) == {"video_aaa:original", "video_bbb:original"}
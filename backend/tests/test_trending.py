@@ -0,0 +1,33 @@
+import asyncio
+
+from app.models.analysis_models import AnalysisSettings
+
+def trending_settings(**overrides) -> AnalysisSettings:
+    data = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "min_views": 0, "min_views_per_hour": 0}
+    data.update(overrides)
+    return AnalysisSettings(**data)
+
+def test_trending_uses_most_popular_chart_without_search(youtube_service, fake_youtube):
+    videos, channels = asyncio.run(youtube_service.collect_data(trending_settings(max_videos_per_search=30)))
+
+    assert len(videos) == 30
+    assert set(videos.channel_ids) <= set(channels)
+    # 인기 영상 응답에 상세 정보가 있으므로 videos.list 를 다시 부르지 않고, search.list (100 unit) 도 쓰지 않음
+    assert fake_youtube.calls == {"videos": 1, "channels": 1}
+    assert youtube_service.key_pool.snapshot()["keys"][0]["used"] == 2
+
+def test_trending_fetches_each_category(youtube_service, fake_youtube):
+    settings = trending_settings(trending_category_ids=["10", "20"], max_videos_per_search=10)
+    videos, _ = asyncio.run(youtube_service.collect_data(settings))
+
+    assert fake_youtube.calls["videos"] == 2
+    assert 10 < len(videos) <= 20
+    assert "search" not in fake_youtube.calls
+
+def test_trending_respects_the_date_cutoff(youtube_service, fake_youtube, monkeypatch):
+    # 가짜 서버 영상은 최근 30일 안 - 기준일을 현재로 옮기면 모두 제외
+    monkeypatch.setattr(type(youtube_service), "_get_date_filter",
+                        lambda self, days_back: fake_youtube._now.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    settings = trending_settings(max_videos_per_search=10)
+    items = asyncio.run(youtube_service._get_trending_items(settings))
+    assert items == []
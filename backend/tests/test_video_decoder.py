@@ -0,0 +1,87 @@
+import time
+from array import array
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.analysis_models import AnalysisSettings, ChannelData
+from app.services.video_decoder import VideoColumns, parse_duration, parse_timestamp
+
+NOW = 1_770_000_000.0
+
+def item(video_id, channel_id, views, duration="PT2M", hours_ago=10):
+    return {
+        "id": video_id,
+        "snippet": {"publishedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(NOW - hours_ago * 3600)),
+                    "channelId": channel_id, "title": f"title {video_id}",
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}}},
+        "contentDetails": {"duration": duration},
+        "statistics": {"viewCount": str(views)}
+    }
+
+SETTINGS = AnalysisSettings(api_key="", analysis_mode="keyword", content_type="both")
+CHANNELS = {"UCa": ChannelData(channel_id="UCa", channel_name="A", subscribers=100),
+            "UCb": ChannelData(channel_id="UCb", channel_name="B", subscribers=0)}
+
+@pytest.mark.parametrize("text, seconds", [("PT4M13S", 253), ("P1DT2H", 93600), ("PT45S", 45), ("", 0), ("bad", 0)])
+def test_parse_duration(text, seconds):
+    assert parse_duration(text) == seconds
+
+def test_parse_timestamp_fast_path_matches_fromisoformat():
+    for value in ["2026-03-01T12:34:56Z", "2026-03-01T12:34:56.5Z", "2026-03-01T21:34:56+09:00"]:
+        expected = datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        assert parse_timestamp(value) == pytest.approx(expected)
+
+def test_annotate_drops_rows_without_channel_and_fills_derived_columns():
+    columns = VideoColumns.decode([
+        item("v1", "UCa", 500, "PT30S", hours_ago=5),
+        item("v2", "UCmissing", 900),
+        item("v3", "UCb", 40, "PT10M", hours_ago=0.5),
+    ])
+    scores = (array('d', [1.5, 9.0, -0.5]), array('q', [300, 9, 80]))
+    table = columns.annotate(CHANNELS, SETTINGS, now=NOW, scores=scores)
+
+    assert table.video_ids == ["v1", "v3"]
+    assert list(table.vph) == [pytest.approx(100.0), pytest.approx(40.0)]
+    assert list(table.ratios) == [5.0, 40.0]
+    assert list(table.shorts) == [1, 0]
+    assert list(table.breakout_scores) == [1.5, -0.5]
+    assert list(table.baseline_views) == [300, 80]
+    assert table.regions == [[], []]
+
+def test_select_keeps_annotated_columns_in_order():
+    table = VideoColumns.decode([item("v1", "UCa", 1), item("v2", "UCa", 2)]).annotate(CHANNELS, SETTINGS, now=NOW)
+    table.regions = [["KR"], ["US"]]
+    reordered = table.select([1, 0])
+    assert reordered.video_ids == ["v2", "v1"]
+    assert list(reordered.views) == [2, 1]
+    assert reordered.regions == [["US"], ["KR"]]
+    assert list(reordered.breakout_scores) == [0.0, 0.0]
+
+def test_rows_are_built_from_columns():
+    table = VideoColumns.decode([item("v1", "UCa", 500, "PT30S", hours_ago=5)]).annotate(CHANNELS, SETTINGS, now=NOW)
+    table.regions = [["KR"]]
+    assert table.rows() == [{
+        "video_id": "v1",
+        "title": "title v1",
+        "channel_id": "UCa",
+        "upload_date": datetime.fromtimestamp(NOW - 5 * 3600, timezone.utc),
+        "views": 500,
+        "views_per_hour": pytest.approx(100.0),
+        "views_to_subscribers_ratio": 5.0,
+        "duration": 30,
+        "video_url": "https://www.youtube.com/watch?v=v1",
+        "thumbnail_url": "https://i.ytimg.com/vi/v1/hqdefault.jpg",
+        "is_shorts": True,
+        "breakout_score": 0.0,
+        "baseline_views": 0,
+        "regions": ["KR"]
+    }]
+
+def test_channel_table_skips_missing_and_malformed_channels():
+    columns = VideoColumns.decode([item("v1", "UCa", 1), item("v2", "UCb", 1), item("v3", "UCc", 1)])
+    table = columns.channel_table({
+        "UCa": {"snippet": {"title": "A"}, "statistics": {"subscriberCount": "12"}},
+        "UCb": {"snippet": {}},
+    })
+    assert table == {"UCa": ChannelData(channel_id="UCa", channel_name="A", subscribers=12)}
@@ -0,0 +1,132 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from app.services.analysis_runner import AnalysisRunner
+from app.services.key_pool import PACIFIC_TZ, ApiKeyPool
+from app.services.state_store import MemoryStateStore
+from app.services.watchlist import RESULT_SLOT, Watchlist, WatchlistScheduler, estimated_cost
+
+# 태평양 시간 자정 - 오늘 남은 실행이 24번 (1시간 주기)
+MIDNIGHT = datetime(2026, 3, 1, tzinfo=PACIFIC_TZ).timestamp()
+
+BASE = {"api_key": "", "content_type": "both"}
+
+@pytest.fixture
+def watchlist(tmp_path):
+    return Watchlist(path=str(tmp_path / "watchlist.json"))
+
+def scheduler(watchlist, quota=10000, **kwargs):
+    pool = ApiKeyPool(["key-aaaa-1111"], daily_quota=quota, usage_file="")
+    return WatchlistScheduler(watchlist, pool, interval_minutes=60, reserve_ratio=0.2, **kwargs)
+
+def test_estimated_cost():
+    assert estimated_cost("keyword", "먹방") == 102
+    assert estimated_cost("keyword", "먹방", regions=3) == 302
+    assert estimated_cost("channel", "UC" + "a" * 22) == 102
+    assert estimated_cost("channel", "@handle") == 103
+    assert estimated_cost("channel", "UC" + "a" * 22, score_breakouts=True) == 104
+
+def test_budget_spreads_remaining_quota_over_the_day(watchlist):
+    planner = scheduler(watchlist)
+    # (10000 - 예비 2000) / 남은 24번
+    assert planner.budget(MIDNIGHT) == 333
+    assert planner.budget(MIDNIGHT + 23 * 3600) == 8000
+
+def test_plan_picks_most_urgent_items_within_budget(watchlist):
+    for value, priority in [("low", 1), ("high", 9), ("mid", 5), ("extra", 3)]:
+        watchlist.add("keyword", value, priority)
+
+    plan = scheduler(watchlist).plan(MIDNIGHT)
+    assert [item["value"] for item in plan["items"]] == ["high", "mid", "extra"]
+    assert plan["estimated_cost"] == 306 and plan["budget"] == 333
+    assert plan["waiting"] == 1
+
+    # 여러 지역을 수집하는 설정이면 항목당 비용이 늘어나 더 적게 배정
+    plan = scheduler(watchlist).plan(MIDNIGHT, base={"region_codes": ["KR", "US"]})
+    assert [item["value"] for item in plan["items"]] == ["high"]
+
+def test_recently_scheduled_items_wait_their_turn(watchlist):
+    watchlist.add("keyword", "a", 5)
+    watchlist.add("keyword", "b", 5)
+    watchlist.mark_scheduled(["keyword:a"], now=MIDNIGHT)
+
+    plan = scheduler(watchlist, max_batch=1).plan(MIDNIGHT + 60)
+    assert [item["value"] for item in plan["items"]] == ["b"]
+
+def test_record_yield_updates_hit_rate(watchlist):
+    watchlist.add("channel", "UCx", 5)
+    watchlist.record_yield({"channel:UCx": 3, "keyword:unknown": 1}, now=MIDNIGHT)
+    watchlist.record_yield({"channel:UCx": 0}, now=MIDNIGHT)
+
+    item, = watchlist.items()
+    assert (item["runs"], item["hits"], item["videos_passed"]) == (2, 1, 3)
+    assert item["yield"] == 0.5
+    assert item["last_collected"] == MIDNIGHT
+
+def test_changes_from_another_process_are_picked_up(watchlist):
+    watchlist.add("keyword", "먹방", 5)
+    worker_copy = Watchlist(path=watchlist.path)
+    worker_copy.record_yield({"keyword:먹방": 2})
+    # mtime 해상도가 낮은 파일 시스템에서도 바뀐 것으로 보이도록
+    stat = os.stat(watchlist.path)
+    os.utime(watchlist.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    watchlist.add("keyword", "여행", 5)
+    items = {item["value"]: item for item in Watchlist(path=watchlist.path).items()}
+    assert items["먹방"]["videos_passed"] == 2
+    assert set(items) == {"먹방", "여행"}
+
+def test_claim_starts_watchlist_slot_without_clearing_current_result(watchlist):
+    watchlist.add("keyword", "먹방", 5)
+    store = MemoryStateStore()
+    store.set_result({"job_id": "current", "videos": []})
+
+    claimed = scheduler(watchlist, quota=10 ** 6).claim(store, BASE)
+    job_id, settings, keys, plan = claimed
+    assert keys == ["keyword:먹방"] and settings.search_terms == ["먹방"]
+    assert store.get_status()["result_slot"] == RESULT_SLOT
+    assert store.get_result()["job_id"] == "current"
+    assert watchlist.items()[0]["last_scheduled"] is not None
+
+    # 실행 중이면 다음 순번은 건너뜀
+    assert scheduler(watchlist, quota=10 ** 6).claim(store, BASE) is None
+
+def test_completion_hooks_are_shared_with_the_worker(watchlist, monkeypatch):
+    class Recorder:
+        def __init__(self):
+            self.calls = []
+
+        def prefetch(self, video_ids):
+            self.calls.append(list(video_ids))
+
+        def ingest(self, payload, version):
+            self.calls.append(version)
+
+    watchlist.add("keyword", "먹방", 5)
+    thumbnails, index = Recorder(), Recorder()
+    runner = AnalysisRunner(MemoryStateStore())
+    monkeypatch.setenv("THUMBNAIL_PREFETCH", "true")
+    runner.register_completion_hooks(watchlist=watchlist, thumbnail_cache=thumbnails, search_index=index)
+
+    payload = {"job_id": "job", "videos": [{"video_id": "v1"}], "source_yield": {"keyword:먹방": 1}}
+    for hook in runner.completion_hooks:
+        hook(payload)
+    assert watchlist.items()[0]["hits"] == 1
+    assert thumbnails.calls == [["v1"]] and index.calls == ["job"]
+
+def test_worker_registers_completion_hooks(monkeypatch, tmp_path):
+    from app import worker
+
+    registered = {}
+    monkeypatch.setenv("STATE_BACKEND", "sqlite")
+    monkeypatch.setenv("STATE_DB_PATH", str(tmp_path / "state.db"))
+    monkeypatch.setattr(AnalysisRunner, "register_completion_hooks",
+                        lambda self, **services: registered.update(services))
+    monkeypatch.setattr(worker.asyncio, "sleep", lambda interval: (_ for _ in ()).throw(SystemExit))
+
+    with pytest.raises(SystemExit):
+        worker.asyncio.run(worker.run_worker(0))
+    assert isinstance(registered["watchlist"], Watchlist)
+    assert registered["thumbnail_cache"] is not None
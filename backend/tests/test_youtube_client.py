@@ -0,0 +1,35 @@
+import json
+
+from googleapiclient.discovery_cache import get_static_doc
+
+from app.services.youtube_client import YouTubeClientFactory
+from conftest import TEST_KEY
+
+def test_clients_are_cached_per_key():
+    factory = YouTubeClientFactory()
+    first = factory.get("key-a")
+    assert factory.get("key-a") is first
+    assert factory.get("key-b") is not first
+    # discovery 문서는 한 번만 파싱
+    assert list(factory.timings) == ["discovery_load_seconds"]
+
+def test_document_path_is_used_instead_of_bundled_document(tmp_path):
+    document = json.loads(get_static_doc("youtube", "v3"))
+    document["rootUrl"] = "https://example.invalid/"
+    path = tmp_path / "youtube.json"
+    path.write_text(json.dumps(document), encoding="utf-8")
+
+    client = YouTubeClientFactory(document_path=str(path)).get("key-a")
+    assert client._baseUrl.startswith("https://example.invalid/")
+
+def test_api_endpoint_points_clients_at_another_server(fake_youtube):
+    client = YouTubeClientFactory(api_endpoint=fake_youtube.url).get(TEST_KEY)
+    response = client.channels().list(part="snippet", id="UC0000000000000000000001").execute()
+    assert [item["id"] for item in response["items"]] == ["UC0000000000000000000001"]
+    assert fake_youtube.calls == {"channels": 1}
+
+def test_warm_up_builds_clients_ahead_of_time():
+    factory = YouTubeClientFactory()
+    timings = factory.warm_up(["key-a", "key-b"])
+    assert {"library_import_seconds", "discovery_load_seconds", "client_build_seconds"} <= set(timings)
+    assert set(factory._clients) == {"key-a", "key-b"}
@@ -0,0 +1,37 @@
+import asyncio
+from datetime import datetime, timezone
+
+from app.models.analysis_models import AnalysisSettings
+from app.services import youtube_service as youtube_service_module
+
+def settings(**overrides) -> AnalysisSettings:
+    data = {"api_key": "", "analysis_mode": "keyword", "content_type": "both", "search_terms": ["먹방"],
+            "min_views": 0, "min_views_per_hour": 0, "max_videos_per_search": 9}
+    data.update(overrides)
+    return AnalysisSettings(**data)
+
+def freeze(monkeypatch, moments):
+    """youtube_service 모듈의 datetime.now() 가 moments 를 차례로 돌려주도록"""
+    moments = iter(moments)
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return next(moments)
+
+    monkeypatch.setattr(youtube_service_module, "datetime", Clock)
+
+def test_date_filter_is_rounded_to_the_utc_day(youtube_service, monkeypatch):
+    freeze(monkeypatch, [datetime(2026, 3, 31, 23, 59, 30, tzinfo=timezone.utc)])
+    # 최소 30일 전부터, 그날 0시 (UTC)
+    assert youtube_service._get_date_filter(7) == "2026-03-01T00:00:00Z"
+
+def test_scheduled_runs_minutes_apart_share_search(youtube_service, fake_youtube, monkeypatch):
+    freeze(monkeypatch, [datetime(2026, 3, 31, 10, 1, tzinfo=timezone.utc),
+                         datetime(2026, 3, 31, 10, 7, tzinfo=timezone.utc)])
+    with youtube_service.sharing_fetches(600):
+        first = asyncio.run(youtube_service._get_keyword_video_ids(settings()))
+        second = asyncio.run(youtube_service._get_keyword_video_ids(settings()))
+
+    assert first == second
+    assert fake_youtube.calls == {"search": 1}
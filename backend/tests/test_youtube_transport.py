@@ -0,0 +1,45 @@
+import contextvars
+import threading
+
+from app.services.youtube_transport import ApiTransport
+
+marker = contextvars.ContextVar("marker", default=None)
+
+def test_requests_use_field_masks_gzip_and_per_thread_connections(youtube_service, fake_youtube):
+    ids = [fake_youtube.video_id(i, f"seed:{i}") for i in range(120)]
+    videos = youtube_service._fetch_videos(ids)
+
+    assert len(videos) == 120
+    item = videos[ids[0]]
+    # fields 마스크에 없는 필드는 받지 않음
+    assert set(item) == {"id", "snippet", "contentDetails", "statistics"}
+    assert set(item["snippet"]) == {"publishedAt", "channelId", "title", "thumbnails"}
+    assert set(item["statistics"]) == {"viewCount"}
+
+    stats = youtube_service.transport.stats()
+    assert stats["requests"] == fake_youtube.calls["videos"] == 3
+    assert stats["gzip_responses"] == stats["requests"]
+    assert stats["thread_clients"] <= min(stats["requests"], stats["concurrency"])
+
+    # 요청마다 예약한 비용은 모두 사용량으로 기록됨
+    key, = youtube_service.key_pool.snapshot()["keys"]
+    assert (key["used"], key["reserved"]) == (3, 0)
+
+def test_map_keeps_order_and_copies_context():
+    transport = ApiTransport(concurrency=4)
+    marker.set("job-1")
+    try:
+        results = transport.map(lambda i: (i, marker.get(), threading.current_thread().name), range(10))
+        assert [r[0] for r in results] == list(range(10))
+        assert {r[1] for r in results} == {"job-1"}
+        assert all(r[2].startswith("youtube-http") for r in results)
+
+        # 풀 스레드 안에서 다시 map 하면 순차 실행 (풀이 자기 자신을 기다리며 멈추지 않도록)
+        nested = transport.map(lambda i: transport.map(lambda j: (threading.current_thread().name, j), [i, i]),
+                               range(4))
+        assert all(a[0] == b[0] for a, b in nested)
+
+        transport.close()
+        assert transport.map(lambda i: i * 2, [1, 2, 3]) == [2, 4, 6]
+    finally:
+        transport.close()
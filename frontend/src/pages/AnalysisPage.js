@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   Card, 
   Form, 
@@ -40,6 +40,9 @@ const AnalysisPage = () => {
 
   // 폴링을 위한 상태
   const [pollingInterval, setPollingInterval] = useState(null);
+  // 마지막으로 받은 결과와 버전 (상태 조회에는 결과 버전만 오므로 버전이 바뀔 때만 결과를 받음)
+  const resultVersion = useRef(null);
+  const resultData = useRef(null);
 
   useEffect(() => {
     // 컴포넌트 마운트 시 설정 로드
@@ -72,16 +75,21 @@ const AnalysisPage = () => {
     const interval = setInterval(async () => {
       try {
         const response = await analysisAPI.getStatus();
-        setAnalysisStatus(response.data);
+        const status = response.data;
+        if (status.result_version !== resultVersion.current) {
+          resultVersion.current = status.result_version;
+          resultData.current = status.result_version ? (await analysisAPI.getResult()).data : null;
+        }
+        setAnalysisStatus({ ...status, result: resultData.current });
         
         // 분석이 완료되거나 오류가 발생하면 폴링 중지
-        if (!response.data.is_running) {
+        if (!status.is_running) {
           clearInterval(interval);
           setPollingInterval(null);
           
-          if (response.data.result) {
+          if (resultData.current) {
             message.success('분석이 완료되었습니다!');
-          } else if (response.data.error) {
+          } else if (status.error) {
             message.error('분석 중 오류가 발생했습니다.');
           }
         }
@@ -149,6 +157,8 @@ const AnalysisPage = () => {
   const handleClearResults = async () => {
     try {
       await analysisAPI.clearResults();
+      resultVersion.current = null;
+      resultData.current = null;
       setAnalysisStatus({
         is_running: false,
         progress: 0,
@@ -238,8 +248,10 @@ const AnalysisPage = () => {
             min_views_per_hour: 10,
             shorts_max_duration: 60,
             region_code: 'KR',
+            region_codes: [],
             language: 'ko',
-            show_popular_videos: true
+            show_popular_videos: true,
+            score_breakouts: false
           }}
         >
           <Row gutter={16}>
@@ -304,13 +316,13 @@ const AnalysisPage = () => {
           </Form.Item>
 
           <Form.Item
-            label="채널 ID (채널 모드)"
+            label="채널 (채널 모드)"
             name="channel_ids"
-            help="여러 채널 ID는 쉼표로 구분하세요"
+            help="채널 ID, @핸들, 채널/영상 URL 을 쉼표로 구분해 입력하세요"
           >
             <TextArea 
               rows={3} 
-              placeholder="예: UC_x5XG1OV2P6uZZ5FSM9Ttw, UCvjgXvBlb6ydBjjpiqj4Q"
+              placeholder="예: UC_x5XG1OV2P6uZZ5FSM9Ttw, @GoogleDevelopers, https://youtu.be/dQw4w9WgXcQ"
             />
           </Form.Item>
 
@@ -406,6 +418,35 @@ const AnalysisPage = () => {
               </Form.Item>
             </Col>
           </Row>
+
+          <Row gutter={16}>
+            <Col span={24}>
+              <Form.Item
+                label="여러 지역 동시 검색 (비우면 대상 국가만)"
+                name="region_codes"
+                extra="검색어/인기 영상을 지역마다 검색하고, 지역별 통계를 함께 계산합니다."
+              >
+                <Select mode="multiple" allowClear placeholder="지역 선택">
+                  <Option value="KR">한국</Option>
+                  <Option value="US">미국</Option>
+                  <Option value="JP">일본</Option>
+                  <Option value="CN">중국</Option>
+                </Select>
+              </Form.Item>
+            </Col>
+          </Row>
+
+          <Row gutter={16}>
+            <Col span={12}>
+              <Form.Item
+                label="급상승 점수 계산 (채널 평소 조회수 대비)"
+                name="score_breakouts"
+                valuePropName="checked"
+              >
+                <Switch />
+              </Form.Item>
+            </Col>
+          </Row>
         </Form>
 
         <Divider />
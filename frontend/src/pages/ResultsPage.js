@@ -22,7 +22,7 @@ import {
   SortAscendingOutlined,
   SortDescendingOutlined
 } from '@ant-design/icons';
-import { analysisAPI, exportAPI, downloadBlob } from '../services/api';
+import { analysisAPI, exportAPI, downloadBlob, thumbnailUrl } from '../services/api';
 
 const { Title } = Typography;
 const { Option } = Select;
@@ -43,8 +43,14 @@ const ResultsPage = () => {
     try {
       setLoading(true);
       const response = await analysisAPI.getResult();
-      setAnalysisResult(response.data);
-      setFilteredData(response.data.videos || []);
+      // 영상 행에 channel_id 로 채널명/구독자수 합치기
+      const channels = response.data.channels || {};
+      const videos = (response.data.videos || []).map(video => ({
+        ...video,
+        ...channels[video.channel_id],
+      }));
+      setAnalysisResult({ ...response.data, videos });
+      setFilteredData(videos);
     } catch (error) {
       console.error('결과 로드 실패:', error);
       if (error.response?.status === 404) {
@@ -79,18 +85,24 @@ const ResultsPage = () => {
     setFilteredData(sorted);
   };
 
-  const handleSearch = (value) => {
+  const handleSearch = async (value) => {
     if (!value) {
       setFilteredData(analysisResult?.videos || []);
       return;
     }
     
-    const filtered = (analysisResult?.videos || []).filter(video =>
-      video.title.toLowerCase().includes(value.toLowerCase()) ||
-      video.channel_name.toLowerCase().includes(value.toLowerCase())
-    );
-    
-    setFilteredData(filtered);
+    // 서버 색인으로 제목/채널명 검색 (띄어쓰기가 달라도 일치, 관련도 순)
+    try {
+      const response = await analysisAPI.getResultVideos({ q: value, limit: 1000 });
+      const channels = response.data.channels || {};
+      setFilteredData(response.data.videos.map(video => ({
+        ...video,
+        ...channels[video.channel_id],
+      })));
+    } catch (error) {
+      console.error('검색 실패:', error);
+      message.error('검색에 실패했습니다.');
+    }
   };
 
   const handleExportExcel = async () => {
@@ -375,18 +387,35 @@ const ResultsPage = () => {
       },
       sorter: (a, b) => (a.views_to_subscribers_ratio || 0) - (b.views_to_subscribers_ratio || 0),
     },
+    {
+      title: '급상승 점수',
+      dataIndex: 'breakout_score',
+      key: 'breakout_score',
+      width: 70,
+      render: (score, record) => {
+        if (!record.baseline_views) return 'N/A';
+        return (
+          <span title={`채널 기준 조회수 ${record.baseline_views.toLocaleString()}`}>
+            {score.toFixed(2)}
+          </span>
+        );
+      },
+      sorter: (a, b) => (a.breakout_score || 0) - (b.breakout_score || 0),
+    },
     {
       title: '썸네일',
       dataIndex: 'thumbnail_url',
       key: 'thumbnail',
       width: 60,
-      render: (url) => (
+      render: (url, record) => (
         <Image
-          src={url}
+          src={thumbnailUrl(record.video_id, 'row')}
           alt="thumbnail"
+          loading="lazy"
           style={{ width: 50, height: 28, objectFit: 'cover', cursor: 'pointer' }}
           preview={{
-            mask: '크게 보기'
+            mask: '크게 보기',
+            src: thumbnailUrl(record.video_id, 'original')
           }}
         />
       ),
@@ -502,7 +531,11 @@ const ResultsPage = () => {
                 {analysisResult.settings?.shorts_max_duration && (
                   <Tag color="red">쇼츠 기준: {analysisResult.settings.shorts_max_duration}초</Tag>
                 )}
-                <Tag color="red">지역: {analysisResult.settings?.region_code || 'KR'}</Tag>
+                <Tag color="red">
+                  지역: {analysisResult.settings?.region_codes?.length
+                    ? analysisResult.settings.region_codes.join(', ')
+                    : analysisResult.settings?.region_code || 'KR'}
+                </Tag>
                 <Tag color="red">언어: {analysisResult.settings?.language || 'ko'}</Tag>
               </div>
             </div>
@@ -566,6 +599,7 @@ const ResultsPage = () => {
               <Option value="views_per_hour">시간당 조회수</Option>
               <Option value="subscribers">구독자수</Option>
               <Option value="views_to_subscribers_ratio">구독자 대비 조회수</Option>
+              <Option value="breakout_score">급상승 점수</Option>
               <Option value="upload_date">업로드일</Option>
               <Option value="duration">영상 길이</Option>
             </Select>
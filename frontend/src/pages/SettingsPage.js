@@ -127,7 +127,8 @@ const SettingsPage = () => {
             shorts_max_duration: 60,
             region_code: 'KR',
             language: 'ko',
-            show_popular_videos: true
+            show_popular_videos: true,
+            score_breakouts: false
           }}
         >
           <Row gutter={16}>
@@ -274,6 +275,18 @@ const SettingsPage = () => {
               </Form.Item>
             </Col>
           </Row>
+
+          <Row gutter={16}>
+            <Col span={12}>
+              <Form.Item
+                label="급상승 점수 계산 (채널 평소 조회수 대비)"
+                name="score_breakouts"
+                valuePropName="checked"
+              >
+                <Input type="checkbox" />
+              </Form.Item>
+            </Col>
+          </Row>
         </Form>
 
         <Divider />
@@ -58,6 +58,15 @@ export const analysisAPI = {
   // 분석 결과 조회
   getResult: () => api.get('/api/analysis/result'),
   
+  // 분석 결과 영상 페이지 조회 (offset, limit, sort_by, descending, min_views)
+  getResultVideos: (params) => api.get('/api/analysis/result/videos', { params }),
+  
+  // 집계 차트 (group_by 차원별 합계, 차원 이름 파라미터는 필터)
+  getChart: (params) => api.get('/api/analysis/chart', { params }),
+  
+  // 채널 참조(@핸들, 채널/영상 URL) → 채널 ID 확인
+  resolveChannels: (refs) => api.post('/api/analysis/channels/resolve', refs),
+  
   // 분석 중단
   stopAnalysis: () => api.post('/api/analysis/stop'),
   
@@ -65,6 +74,18 @@ export const analysisAPI = {
   clearResults: () => api.delete('/api/analysis/clear'),
 };
 
+// 채널 탐색 API
+export const discoveryAPI = {
+  // 마지막 탐색 결과
+  getDiscovery: () => api.get('/api/discovery/'),
+  
+  // 탐색 실행 (seeds 를 비우면 현재 검색어 결과의 채널에서 시작)
+  runDiscovery: (request) => api.post('/api/discovery/run', request, { timeout: 120000 }),
+  
+  // 상위 후보를 감시 목록에 추가
+  addToWatchlist: (request) => api.post('/api/discovery/watchlist', request),
+};
+
 // 설정 API
 export const settingsAPI = {
   // 설정 조회
@@ -81,6 +102,12 @@ export const settingsAPI = {
   
   // 설정 가져오기
   importSettings: (settings) => api.post('/api/settings/import', settings),
+  
+  // 설정 프로파일 (schedule: cron 식, 비우면 수동 실행만)
+  getProfiles: () => api.get('/api/settings/profiles'),
+  saveProfile: (name, profile) => api.put(`/api/settings/profiles/${encodeURIComponent(name)}`, profile),
+  deleteProfile: (name) => api.delete(`/api/settings/profiles/${encodeURIComponent(name)}`),
+  runProfile: (name) => api.post(`/api/settings/profiles/${encodeURIComponent(name)}/run`),
 };
 
 // 내보내기 API
@@ -107,6 +134,10 @@ export const exportAPI = {
   deleteFile: (filename) => api.delete(`/api/export/${filename}`),
 };
 
+// 썸네일 프록시 주소 (size: row | medium | original)
+export const thumbnailUrl = (videoId, size = 'row') =>
+  `${API_BASE_URL}/api/thumbnails/${videoId}?size=${size}`;
+
 // 유틸리티 함수
 export const downloadBlob = (blob, filename) => {
   const url = window.URL.createObjectURL(blob);